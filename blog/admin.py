@@ -43,8 +43,9 @@ class CategoryAdmin(SEOAdminMixin, SEOPreviewMixin, SEOValidationMixin, CustomHe
         return readonly
 
     def get_posts_count(self, obj):
-        return obj.post_set.count()
+        return obj.published_count
     get_posts_count.short_description = 'Количество статей'
+    get_posts_count.admin_order_field = 'published_count'
 
 
 class PostAdmin(SEOAdminMixin, SEOPreviewMixin, SEOValidationMixin, CustomHeadScriptsMixin, admin.ModelAdmin):
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:12
+
+import django.db.models.deletion
+import django_ckeditor_5.fields
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seo_title', models.CharField(blank=True, help_text='Рекомендуется 50-60 символов. Если не указан, будет использован обычный заголовок.', max_length=60, null=True, verbose_name='SEO заголовок (title)')),
+                ('seo_description', models.TextField(blank=True, help_text='Рекомендуется 150-160 символов. Краткое описание страницы для поисковых систем.', max_length=160, null=True, verbose_name='SEO описание (description)')),
+                ('seo_index', models.BooleanField(default=True, help_text='Разрешить поисковым системам индексировать эту страницу', verbose_name='Индексировать страницу')),
+                ('seo_canonical', models.URLField(blank=True, help_text='Укажите канонический URL, если страница доступна по нескольким адресам', max_length=500, null=True, verbose_name='Канонический URL')),
+                ('name', models.CharField(max_length=100, verbose_name='Название категории')),
+                ('slug', models.SlugField(max_length=100, unique=True, verbose_name='URL-идентификатор')),
+                ('description', models.TextField(blank=True, verbose_name='Описание категории')),
+                ('color', models.CharField(default='#007bff', help_text='Например: #007bff для синего цвета', max_length=7, verbose_name='Цвет категории (HEX)')),
+                ('order', models.IntegerField(default=100, verbose_name='Порядок отображения')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Активна')),
+                ('show_breadcrumbs', models.BooleanField(default=True, help_text='Включить/выключить отображение хлебных крошек на этой странице', verbose_name='Показывать хлебные крошки')),
+                ('custom_breadcrumbs', models.JSONField(blank=True, default=list, help_text='Оставьте пустым для автоматических крошек. Формат: [{"title": "Название", "url": "/url/"}]', verbose_name='Пользовательские хлебные крошки')),
+            ],
+            options={
+                'verbose_name': 'Категория блога',
+                'verbose_name_plural': 'Категории блога',
+                'ordering': ['order', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Post',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seo_title', models.CharField(blank=True, help_text='Рекомендуется 50-60 символов. Если не указан, будет использован обычный заголовок.', max_length=60, null=True, verbose_name='SEO заголовок (title)')),
+                ('seo_description', models.TextField(blank=True, help_text='Рекомендуется 150-160 символов. Краткое описание страницы для поисковых систем.', max_length=160, null=True, verbose_name='SEO описание (description)')),
+                ('seo_index', models.BooleanField(default=True, help_text='Разрешить поисковым системам индексировать эту страницу', verbose_name='Индексировать страницу')),
+                ('seo_canonical', models.URLField(blank=True, help_text='Укажите канонический URL, если страница доступна по нескольким адресам', max_length=500, null=True, verbose_name='Канонический URL')),
+                ('title', models.CharField(max_length=200, verbose_name='Заголовок')),
+                ('slug', models.SlugField(max_length=200, unique=True, verbose_name='URL-идентификатор')),
+                ('content', django_ckeditor_5.fields.CKEditor5Field(verbose_name='Содержимое поста')),
+                ('excerpt', models.TextField(blank=True, help_text='Краткое описание статьи для карточек и превью', max_length=500, verbose_name='Краткое описание')),
+                ('image', models.ImageField(blank=True, null=True, upload_to='blog_images/', verbose_name='Изображение (превью)')),
+                ('image_alt', models.CharField(blank=True, help_text='Описание изображения для SEO и доступности', max_length=200, verbose_name='Альтернативный текст изображения')),
+                ('published_date', models.DateTimeField(auto_now_add=True, verbose_name='Дата публикации')),
+                ('is_published', models.BooleanField(default=True, verbose_name='Опубликовано')),
+                ('views_count', models.PositiveIntegerField(default=0, verbose_name='Просмотры')),
+                ('reading_time_minutes', models.CharField(blank=True, help_text="Например: '5 минут', 'Ну около 8 минут', 'Примерно 10 минут'. Оставьте пустым для автоматического расчета.", max_length=100, verbose_name='Время чтения')),
+                ('show_breadcrumbs', models.BooleanField(default=True, help_text='Включить/выключить отображение хлебных крошек на этой странице', verbose_name='Показывать хлебные крошки')),
+                ('custom_breadcrumbs', models.JSONField(blank=True, default=list, help_text='Оставьте пустым для автоматических крошек. Формат: [{"title": "Название", "url": "/url/"}]', verbose_name='Пользовательские хлебные крошки')),
+                ('author', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Автор (User)')),
+            ],
+            options={
+                'verbose_name': 'Пост в блоге',
+                'verbose_name_plural': 'Посты в блоге',
+                'ordering': ['-published_date'],
+            },
+        ),
+    ]
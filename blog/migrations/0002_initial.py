@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('blog', '0001_initial'),
+        ('main', '0003_site_models'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='blog_author',
+            field=models.ForeignKey(blank=True, help_text='Выберите автора из списка авторов блога', null=True, on_delete=django.db.models.deletion.SET_NULL, to='main.author', verbose_name='Автор статьи'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='category',
+            field=models.ForeignKey(blank=True, help_text='Выберите категорию для статьи', null=True, on_delete=django.db.models.deletion.SET_NULL, to='blog.category', verbose_name='Категория'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:12
+
+from django.db import migrations, models
+
+from blog.models import reading_time_minutes
+
+
+def fill_reading_time(apps, schema_editor):
+    """Время чтения существующих статей (новые считает Post.save)"""
+    Post = apps.get_model('blog', 'Post')
+    changed = []
+    for post in Post.objects.only('pk', 'content', 'reading_time_minutes').iterator(chunk_size=500):
+        post.reading_time = reading_time_minutes(post.content, post.reading_time_minutes)
+        changed.append(post)
+        if len(changed) >= 500:
+            Post.objects.bulk_update(changed, ['reading_time'])
+            changed = []
+    Post.objects.bulk_update(changed, ['reading_time'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Время чтения, мин'),
+        ),
+        migrations.RunPython(fill_reading_time, migrations.RunPython.noop),
+    ]
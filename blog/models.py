@@ -1,12 +1,25 @@
+import re
+
 from django.db import models
 from django.urls import reverse
 from django.utils import timezone
 from django.contrib.auth.models import User
 from django_ckeditor_5.fields import CKEditor5Field
+from seo.breadcrumbs import BreadcrumbsMixin
 from seo.models import SEOModel
 
 
-class Category(SEOModel):
+def reading_time_minutes(content, reading_time_text=''):
+    """Время чтения в минутах: число из текста ("Ну около 8 минут") или по длине контента"""
+    if reading_time_text:
+        numbers = re.findall(r'\d+', reading_time_text)
+        if numbers:
+            return int(numbers[0])
+    # Автоматический расчет: (длина контента + 500) / 200
+    return max(1, int((len(content or '') + 500) / 200))
+
+
+class Category(BreadcrumbsMixin, SEOModel):
     """Модель для категорий статей блога"""
     name = models.CharField(max_length=100, verbose_name="Название категории")
     slug = models.SlugField(unique=True, max_length=100, verbose_name="URL-идентификатор")
@@ -18,6 +31,8 @@ class Category(SEOModel):
         help_text="Например: #007bff для синего цвета"
     )
     order = models.IntegerField(default=100, verbose_name="Порядок отображения")
+    # Число опубликованных статей, поддерживается сигналами (main/counters.py)
+    published_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Опубликовано статей")
     is_active = models.BooleanField(default=True, verbose_name="Активна")
     
     # Хлебные крошки
@@ -34,6 +49,8 @@ class Category(SEOModel):
         help_text="Оставьте пустым для автоматических крошек. Формат: [{\"title\": \"Название\", \"url\": \"/url/\"}]"
     )
 
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлено")
+
     class Meta:
         verbose_name = "Категория блога"
         verbose_name_plural = "Категории блога"
@@ -45,8 +62,8 @@ class Category(SEOModel):
     def get_absolute_url(self):
         return reverse('blog:category_posts', kwargs={'slug': self.slug})
     
-    def get_breadcrumbs(self):
-        """Возвращает хлебные крошки для категории блога"""
+    def build_breadcrumbs(self):
+        """Собирает хлебные крошки для категории блога"""
         if not self.show_breadcrumbs:
             return []
         
@@ -66,7 +83,7 @@ class Category(SEOModel):
         return breadcrumbs
 
 
-class Post(SEOModel):
+class Post(BreadcrumbsMixin, SEOModel):
     """Модель для записей в блоге"""
     title = models.CharField(max_length=200, verbose_name="Заголовок")
     slug = models.SlugField(unique=True, max_length=200, verbose_name="URL-идентификатор")
@@ -84,6 +101,8 @@ class Post(SEOModel):
         verbose_name="Время чтения",
         help_text="Например: '5 минут', 'Ну около 8 минут', 'Примерно 10 минут'. Оставьте пустым для автоматического расчета."
     )
+    # Числовое время чтения для статистики автора (main/author_stats.py), считается в save()
+    reading_time = models.PositiveIntegerField(default=0, editable=False, verbose_name="Время чтения, мин")
     author = models.ForeignKey(
         User,
         on_delete=models.SET_NULL, # Если пользователь удаляется, поле автора остается NULL
@@ -121,7 +140,8 @@ class Post(SEOModel):
         verbose_name="Пользовательские хлебные крошки",
         help_text="Оставьте пустым для автоматических крошек. Формат: [{\"title\": \"Название\", \"url\": \"/url/\"}]"
     )
-    
+
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлено")
 
     class Meta:
         verbose_name = "Пост в блоге"
@@ -130,6 +150,13 @@ class Post(SEOModel):
 
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        self.reading_time = self.compute_reading_time()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'content', 'reading_time_minutes'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'reading_time'}
+        super().save(*args, **kwargs)
     
     def get_author(self):
         """Возвращает автора статьи (приоритет у blog_author)"""
@@ -158,8 +185,12 @@ class Post(SEOModel):
             # Fallback для постов без категории (не должно быть, но на всякий случай)
             return reverse('blog:post_detail_legacy', kwargs={'slug': self.slug})
     
-    def get_breadcrumbs(self, city=None):
-        """Возвращает хлебные крошки для статьи блога"""
+    # Связи и город для кэшируемых крошек (seo/breadcrumbs.py)
+    breadcrumb_parents = ('category',)
+    breadcrumbs_by_city = True
+
+    def build_breadcrumbs(self, city=None):
+        """Собирает хлебные крошки для статьи блога"""
         if not self.show_breadcrumbs:
             return []
         
@@ -202,6 +233,10 @@ class Post(SEOModel):
         """Возвращает альтернативный текст изображения или заголовок по умолчанию"""
         return self.image_alt or self.title
     
+    def compute_reading_time(self):
+        """Время чтения в минутах: число из reading_time_minutes или автоматический расчет"""
+        return reading_time_minutes(self.content, self.reading_time_minutes)
+
     def get_reading_time(self):
         """Возвращает время чтения.
         Если указано вручную - возвращает текст как есть, иначе вычисляет автоматически и добавляет 'минут'."""
@@ -214,19 +249,6 @@ class Post(SEOModel):
     
     def get_related_posts(self, limit=3):
         """Возвращает случайные связанные статьи для блока 'Вам может понравиться'"""
-        from random import sample
-        
-        # Получаем все опубликованные статьи кроме текущей
-        all_posts = Post.objects.filter(
-            is_published=True
-        ).exclude(pk=self.pk)
-        
-        # Если статей меньше лимита, возвращаем все доступные
-        if all_posts.count() <= limit:
-            return list(all_posts)
-        
-        # Получаем случайные статьи
-        posts_list = list(all_posts)
-        random_posts = sample(posts_list, limit)
-        
-        return random_posts
+        # Соседи посчитаны заранее (main/related.py), здесь только случайный выбор из пула
+        from main.related import get_related
+        return get_related(self, limit=limit)
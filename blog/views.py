@@ -2,16 +2,37 @@ from django.shortcuts import render, get_object_or_404
 from .models import Post
 from .models import Category
 from django.core.paginator import Paginator
-from django.db.models import F, Q
 from django.views.decorators.cache import never_cache  # cache_page ОТКЛЮЧЕН
+from main.http_cache import public_page, last_updated
+from main.instrumentation import query_budget
+from main.search import search_ids
+from main.view_counters import apply_pending_views, get_views_count, record_view
 
 
-# @cache_page(300)  # КЭШИРОВАНИЕ ОТКЛЮЧЕНО
+def blog_last_modified(request, *args, **kwargs):
+	"""Дата изменения страниц блога (для ETag / Last-Modified)"""
+	return last_updated(Post, Category)
+
+
+def post_viewed(request, category_slug=None, post_slug=None, slug=None):
+	"""Учет просмотра статьи, когда страница отдана из кэша (main/page_cache.py)"""
+	post_pk = Post.objects.filter(slug=post_slug or slug).values_list('pk', flat=True).first()
+	if post_pk is None:
+		return
+	session_key = f"viewed_post_{post_pk}"
+	if not request.session.get(session_key):
+		record_view(Post, post_pk)
+		request.session[session_key] = True
+
+
+@public_page(last_modified=blog_last_modified, query=('page',))
+@query_budget(12)
 def post_list(request):
-	posts_list = Post.objects.filter(is_published=True).order_by('-published_date')
+	posts_list = Post.objects.filter(is_published=True).select_related('category').order_by('-published_date')
 	paginator = Paginator(posts_list, 9)
 	page_number = request.GET.get('page')
 	page_obj = paginator.get_page(page_number)
+	page_obj.object_list = apply_pending_views(page_obj)
 	
 	# Получаем все активные категории для фильтрации
 	categories = Category.objects.filter(is_active=True).order_by('order', 'name')
@@ -26,18 +47,20 @@ def post_list(request):
 	})
 
 
-# @cache_page(300)  # КЭШИРОВАНИЕ ОТКЛЮЧЕНО
+@public_page(last_modified=blog_last_modified, query=('page',))
+@query_budget(13)
 def category_posts(request, slug):
 	"""Отображение статей конкретной категории"""
 	category = get_object_or_404(Category, slug=slug, is_active=True)
 	posts_list = Post.objects.filter(
 		is_published=True, 
 		category=category
-	).order_by('-published_date')
+	).select_related('category').order_by('-published_date')
 	
 	paginator = Paginator(posts_list, 9)
 	page_number = request.GET.get('page')
 	page_obj = paginator.get_page(page_number)
+	page_obj.object_list = apply_pending_views(page_obj)
 	
 	# Получаем все активные категории для фильтрации
 	categories = Category.objects.filter(is_active=True).order_by('order', 'name')
@@ -52,25 +75,23 @@ def category_posts(request, slug):
 	})
 
 
-@never_cache
+@public_page(last_modified=blog_last_modified, query=('q', 'page'))
+@query_budget(10)
 def search_posts(request):
 	"""Поиск по статьям блога"""
 	query = request.GET.get('q', '').strip()
-	posts_list = Post.objects.filter(is_published=True)
+	posts_list = Post.objects.filter(is_published=True).select_related('category').order_by('-published_date')
 	
-	if query:
-		# Поиск по заголовку, содержимому и названию категории
-		posts_list = posts_list.filter(
-			Q(title__icontains=query) |
-			Q(content__icontains=query) |
-			Q(category__name__icontains=query)
-		).distinct()
-	
-	posts_list = posts_list.order_by('-published_date')
-	
-	paginator = Paginator(posts_list, 9)
 	page_number = request.GET.get('page')
-	page_obj = paginator.get_page(page_number)
+	if query:
+		# Полнотекстовый поиск (main/search.py): все найденные ID по убыванию
+		# релевантности, из БД загружаются только статьи текущей страницы
+		page_obj = Paginator(search_ids(query, 'blog.post'), 9).get_page(page_number)
+		posts = posts_list.in_bulk(page_obj.object_list)
+		page_obj.object_list = [posts[pk] for pk in page_obj.object_list if pk in posts]
+	else:
+		page_obj = Paginator(posts_list, 9).get_page(page_number)
+	page_obj.object_list = apply_pending_views(page_obj)
 	
 	# Получаем все активные категории для фильтрации
 	categories = Category.objects.filter(is_active=True).order_by('order', 'name')
@@ -88,7 +109,8 @@ def search_posts(request):
 	})
 
 
-@never_cache
+@public_page(last_modified=blog_last_modified, on_hit=post_viewed)
+@query_budget(13)
 def post_detail(request, category_slug, post_slug):
 	# Получаем категорию для проверки
 	category = get_object_or_404(Category, slug=category_slug, is_active=True)
@@ -96,9 +118,9 @@ def post_detail(request, category_slug, post_slug):
 	post = get_object_or_404(Post, slug=post_slug, category=category)
 	session_key = f"viewed_post_{post.pk}"
 	if not request.session.get(session_key):
-		Post.objects.filter(pk=post.pk).update(views_count=F('views_count') + 1)
-		post.refresh_from_db(fields=['views_count'])
+		record_view(Post, post.pk)
 		request.session[session_key] = True
+	post.views_count = get_views_count(post)
 	# Получаем связанные статьи для блока "Вам может понравиться"
 	related_posts = post.get_related_posts(limit=3)
 	
@@ -111,10 +133,10 @@ def post_detail(request, category_slug, post_slug):
 	})
 
 
+@public_page(last_modified=blog_last_modified, on_hit=post_viewed)
 def post_detail_legacy(request, slug):
 	"""Старый URL для обратной совместимости - делает редирект на новый URL или отображает пост"""
 	from django.shortcuts import redirect
-	from django.db.models import F
 	
 	post = get_object_or_404(Post, slug=slug)
 	
@@ -122,9 +144,9 @@ def post_detail_legacy(request, slug):
 	if not post.category:
 		session_key = f"viewed_post_{post.pk}"
 		if not request.session.get(session_key):
-			Post.objects.filter(pk=post.pk).update(views_count=F('views_count') + 1)
-			post.refresh_from_db(fields=['views_count'])
+			record_view(Post, post.pk)
 			request.session[session_key] = True
+		post.views_count = get_views_count(post)
 		
 		# Получаем связанные статьи для блока "Вам может понравиться"
 		related_posts = post.get_related_posts(limit=3)
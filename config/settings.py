@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 from dotenv import load_dotenv
 from django.templatetags.static import static
 from django.urls import reverse_lazy
@@ -58,17 +59,49 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'main.middleware.RedirectMiddleware',  # Редиректы до разрешения URL и сессий
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'main.middleware.GeoLocationMiddleware',  # Город по IP (main/geoip.py), после сессий
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'main.middleware.NoCacheMiddleware',  # Отключаем кэширование
-   #  'main.middleware.RedirectMiddleware',  # Редиректы должны быть рано в цепочке
-   # 'main.middleware.GeoLocationMiddleware',
+    'main.middleware.ConditionalGetMiddleware',  # ETag / Last-Modified и ответы 304
+    'main.middleware.PageCacheMiddleware',  # Кэш страниц для анонимных посетителей
+    'main.middleware.PageDependencyMiddleware',  # Граф зависимостей закэшированных страниц
+    'main.middleware.InstrumentationMiddleware',  # Server-Timing и метрики запроса, должен быть последним
 ]
 
+# Метрики запросов (main/instrumentation.py). Заголовок Server-Timing раскрывает
+# время SQL и число запросов, поэтому по умолчанию только при DEBUG
+SERVER_TIMING = os.getenv('SERVER_TIMING', str(DEBUG)).lower() in ('1', 'true', 'yes')
+# Превышение @query_budget вызывает исключение (для тестов и manage.py bench)
+QUERY_BUDGET_STRICT = os.getenv('QUERY_BUDGET_STRICT', 'False').lower() in ('1', 'true', 'yes')
+
+# Уровень лога метрик; manage.py test пишет только превышения бюджета
+TESTING = sys.argv[1:2] == ['test']
+PERFORMANCE_LOG_LEVEL = os.getenv('PERFORMANCE_LOG_LEVEL', 'INFO' if DEBUG and not TESTING else 'WARNING')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        # Одна JSON-строка на запрос (INFO, по умолчанию только при DEBUG),
+        # превышения бюджета запросов — warning
+        'main.performance': {
+            'handlers': ['console'],
+            'level': PERFORMANCE_LOG_LEVEL,
+            'propagate': False,
+        },
+    },
+}
+
 # Отключаем кэширование для всех ответов Django
 CACHE_MIDDLEWARE_SECONDS = 0
 CACHE_MIDDLEWARE_KEY_PREFIX = ''
@@ -109,31 +142,79 @@ DATABASES = {
     }
 }
 
-# КЭШИРОВАНИЕ ОТКЛЮЧЕНО ДЛЯ РАЗРАБОТКИ
-# CACHES = {
-#     "default": {
-#         "BACKEND": "django_redis.cache.RedisCache",
-#         "LOCATION": "redis://127.0.0.1:6379/1",  # /1 - это номер базы данных в Redis, можно использовать любой
-#         "OPTIONS": {
-#             "CLIENT_CLASS": "django_redis.client.DefaultClient",
-#         }
-#     }
-# }
-
-# Используем dummy кэш (никакого кэширования)
-CACHES = {
-    'default': {
+# Кэширование (двухуровневое, см. main/cache.py)
+# - 'local'   — кэш в памяти процесса (LRU с ограничением размера и TTL),
+#               у каждого воркера gunicorn свой;
+# - 'default' — общий кэш для всех воркеров: Redis, если задан REDIS_URL,
+#               иначе файловый кэш (или БД / dummy через CACHE_BACKEND).
+#
+# Переменные окружения:
+#   CACHE_BACKEND            redis | file | db | locmem | dummy
+#   REDIS_URL                например redis://127.0.0.1:6379/1
+#   CACHE_DIR                каталог файлового кэша
+#   CACHE_TIMEOUT            TTL общего кэша в секундах
+#   LOCAL_CACHE_MAX_ENTRIES  максимум ключей в памяти процесса
+#   LOCAL_CACHE_TIMEOUT      TTL кэша в памяти процесса в секундах
+#   PAGE_CACHE_TIMEOUT       TTL кэша готовых страниц в секундах
+#
+# Отложенный учет просмотров (main/view_counters.py) работает только с Redis:
+# с другими бэкендами просмотры пишутся в БД сразу.
+REDIS_URL = os.getenv('REDIS_URL', '')
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'redis' if REDIS_URL else 'file').lower()
+CACHE_TIMEOUT = int(os.getenv('CACHE_TIMEOUT', 60 * 60))
+CACHE_KEY_PREFIX = 'seo-agency'
+
+if CACHE_BACKEND == 'redis':
+    # Встроенный бэкенд Django, требует пакет redis
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL or 'redis://127.0.0.1:6379/1',
+    }
+elif CACHE_BACKEND == 'db':
+    # Перед использованием: python manage.py createcachetable
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+    }
+elif CACHE_BACKEND == 'locmem':
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'shared',
+    }
+elif CACHE_BACKEND == 'dummy':
+    # Никакого кэширования
+    SHARED_CACHE = {
         'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
     }
-}
-
-
-
-
-
-
+else:
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_DIR', str(BASE_DIR / 'cache')),
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
 
+CACHES = {
+    'default': {
+        **SHARED_CACHE,
+        'TIMEOUT': CACHE_TIMEOUT,
+        'KEY_PREFIX': CACHE_KEY_PREFIX,
+    },
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'local',
+        'TIMEOUT': int(os.getenv('LOCAL_CACHE_TIMEOUT', 60)),
+        'KEY_PREFIX': CACHE_KEY_PREFIX,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('LOCAL_CACHE_MAX_ENTRIES', 1000)),
+        },
+    },
+}
 
+# Кэш готовых страниц (main/page_cache.py). TTL ограничивает устаревание
+# блоков, которые не привязаны к сигналам (например, случайные похожие статьи)
+PAGE_CACHE_TIMEOUT = int(os.getenv('PAGE_CACHE_TIMEOUT', 60 * 10))
 
 
 # Password validation
@@ -186,6 +267,20 @@ MEDIA_URL = '/media/'
 # Путь в файловой системе, где будут храниться загруженные файлы
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Загрузки хранятся по хэшу содержимого, одинаковые файлы — один раз (main/storage.py)
+STORAGES = {
+    'default': {'BACKEND': 'main.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# Готовые sitemap*.xml и robots.txt для nginx (python manage.py publish_seo_files)
+SEO_FILES_ROOT = Path(os.getenv('SEO_FILES_ROOT', str(BASE_DIR / 'seofiles')))
+# Адрес сайта для ссылок в этих файлах; по умолчанию https://<первый из ALLOWED_HOSTS>
+SITE_URL = os.getenv('SITE_URL', f'https://{ALLOWED_HOSTS[0]}' if ALLOWED_HOSTS else '').rstrip('/')
+
+# Готовые HTML-файлы региональных страниц для поисковых роботов (python manage.py prerender_regional)
+PRERENDER_ROOT = Path(os.getenv('PRERENDER_ROOT', str(BASE_DIR / 'prerendered')))
+
 # CKEditor 5 settings
 customColorPalette = [
     {
@@ -281,9 +376,10 @@ CKEDITOR_5_CONFIGS = {
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Настройки для геолокации
-# IPAPI_KEY = 'your_api_key_here'  # Получить на https://ipapi.co/api/
-# Без ключа: 1000 запросов/день, только HTTP
-# С ключом: больше запросов, HTTPS, больше данных
+# Локальная база IP -> город (python manage.py build_geoip dbip-city-lite.csv.gz)
+GEOIP_DB_PATH = Path(os.getenv('GEOIP_DB_PATH', str(BASE_DIR / 'geoip' / 'cities.bin')))
+# IP для проверки определения города при DEBUG с localhost
+GEOIP_DEBUG_IP = os.getenv('GEOIP_DEBUG_IP', '')
 
 # Настройки Django Unfold 
 # Настройки Django Unfold
@@ -28,10 +28,19 @@ echo "=== Настройка прав доступа ==="
 # Создаем директории если не существуют
 sudo mkdir -p /home/dmitriy/Музыка/seo-agency-cursor-2/seo-agency/staticfiles
 sudo mkdir -p /home/dmitriy/Музыка/seo-agency-cursor-2/seo-agency/media
+sudo mkdir -p /home/dmitriy/Музыка/seo-agency-cursor-2/seo-agency/cache
+sudo mkdir -p /home/dmitriy/Музыка/seo-agency-cursor-2/seo-agency/seofiles
+sudo mkdir -p /home/dmitriy/Музыка/seo-agency-cursor-2/seo-agency/prerendered
 
 # Устанавливаем права
 sudo chown -R www-data:www-data /home/dmitriy/Музыка/seo-agency-cursor-2/seo-agency/media
 sudo chmod -R 755 /home/dmitriy/Музыка/seo-agency-cursor-2/seo-agency/media
+# Файловый кэш, общий для всех воркеров gunicorn (если не используется Redis)
+sudo chown -R www-data:www-data /home/dmitriy/Музыка/seo-agency-cursor-2/seo-agency/cache
+# Готовые sitemap.xml и robots.txt, их отдает nginx
+sudo chown -R www-data:www-data /home/dmitriy/Музыка/seo-agency-cursor-2/seo-agency/seofiles
+# Готовые HTML региональных страниц для поисковых роботов, их отдает nginx
+sudo chown -R www-data:www-data /home/dmitriy/Музыка/seo-agency-cursor-2/seo-agency/prerendered
 
 echo "=== Установка Python зависимостей ==="
 cd /home/dmitriy/Музыка/seo-agency-cursor-2/seo-agency
@@ -49,8 +58,26 @@ echo "\\q"
 
 echo "=== Настройка systemd сервиса ==="
 sudo cp deploy/seo-agency.service /etc/systemd/system/
+# Перенос просмотров статей из кэша в БД раз в минуту
+sudo cp deploy/seo-agency-counters.service deploy/seo-agency-counters.timer /etc/systemd/system/
+# Пересчет похожих статей, услуг и проектов раз в час
+sudo cp deploy/seo-agency-related.service deploy/seo-agency-related.timer /etc/systemd/system/
+# Перезапись измененных sitemap.xml и robots.txt раз в минуту
+sudo cp deploy/seo-agency-seofiles.service deploy/seo-agency-seofiles.timer /etc/systemd/system/
+# Адаптивные копии новых изображений (WebP/JPEG по ширинам) раз в минуту
+sudo cp deploy/seo-agency-images.service deploy/seo-agency-images.timer /etc/systemd/system/
+# Удаление загруженных файлов, на которые больше нет ссылок, раз в сутки
+sudo cp deploy/seo-agency-gc-media.service deploy/seo-agency-gc-media.timer /etc/systemd/system/
+# Рендер измененных региональных страниц в HTML-файлы раз в 5 минут
+sudo cp deploy/seo-agency-prerender.service deploy/seo-agency-prerender.timer /etc/systemd/system/
 sudo systemctl daemon-reload
 sudo systemctl enable seo-agency
+sudo systemctl enable seo-agency-counters.timer
+sudo systemctl enable seo-agency-related.timer
+sudo systemctl enable seo-agency-seofiles.timer
+sudo systemctl enable seo-agency-images.timer
+sudo systemctl enable seo-agency-gc-media.timer
+sudo systemctl enable seo-agency-prerender.timer
 
 echo "=== Настройка Nginx ==="
 sudo cp deploy/nginx-seo-agency.conf /etc/nginx/sites-available/seo-agency
@@ -60,6 +87,12 @@ sudo nginx -t
 
 echo "=== Запуск сервисов ==="
 sudo systemctl start seo-agency
+sudo systemctl start seo-agency-counters.timer
+sudo systemctl start seo-agency-related.timer
+sudo systemctl start seo-agency-seofiles.timer
+sudo systemctl start seo-agency-images.timer
+sudo systemctl start seo-agency-gc-media.timer
+sudo systemctl start seo-agency-prerender.timer
 sudo systemctl restart nginx
 
 echo "=== Проверка статуса ==="
@@ -69,6 +102,14 @@ sudo systemctl status nginx --no-pager
 echo "=== Готово! ==="
 echo "1. Отредактируйте /etc/nginx/sites-available/seo-agency - замените your-domain.com на ваш домен"
 echo "2. Выполните миграции: python manage.py migrate"
+echo "   и посчитайте похожие материалы: python manage.py rebuild_related"
+echo "   и постройте поисковый индекс: python manage.py rebuild_search_index"
+echo "   и запишите sitemap/robots.txt: SITE_URL=https://your-domain.com python manage.py publish_seo_files"
+echo "   и создайте копии загруженных изображений: python manage.py process_images --all"
+echo "   и постройте базу geo-IP (https://db-ip.com/db/download/ip-to-city-lite):"
+echo "   python manage.py build_geoip dbip-city-lite-YYYY-MM.csv.gz"
+echo "   и перенесите старые загрузки в хранилище по хэшу: python manage.py gc_media --adopt"
+echo "   и отрендерите региональные страницы: python manage.py prerender_regional --workers 4"
 echo "3. Создайте суперпользователя: python manage.py createsuperuser"
 echo "4. Соберите статику: python manage.py collectstatic --noinput"
 echo "5. Для SSL: sudo certbot --nginx -d your-domain.com -d www.your-domain.com"
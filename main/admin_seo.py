@@ -270,12 +270,13 @@ class ServiceCategoryAdmin(SEOAdminMixin, SEOPreviewMixin, SEOValidationMixin, a
     )
 
     def get_service_count(self, obj):
-        count = obj.services.count()
+        count = obj.published_count
         if count > 0:
             url = reverse('admin:main_service_changelist') + f'?category__id__exact={obj.id}'
             return format_html('<a href="{}">{} услуг</a>', url, count)
         return "0 услуг"
     get_service_count.short_description = 'Услуги'
+    get_service_count.admin_order_field = 'published_count'
 
 @admin.register(Service)
 class ServiceAdmin(SEOAdminMixin, SEOPreviewMixin, SEOValidationMixin, CustomHeadScriptsMixin, admin.ModelAdmin):
@@ -515,12 +516,13 @@ class PortfolioCategoryAdmin(SEOAdminMixin, CustomHeadScriptsMixin, admin.ModelA
     
     def portfolio_items_count(self, obj):
         """Показывает количество проектов в категории"""
-        count = obj.portfolioitem_set.filter(is_published=True).count()
+        count = obj.published_count
         if count > 0:
             url = reverse('admin:main_portfolioitem_changelist') + f'?category__id__exact={obj.id}'
             return format_html('<a href="{}">{} проектов</a>', url, count)
         return '0 проектов'
     portfolio_items_count.short_description = 'Количество проектов'
+    portfolio_items_count.admin_order_field = 'published_count'
 
     def get_queryset(self, request):
         """Оптимизируем запросы"""
@@ -701,12 +703,13 @@ class FAQCategoryAdmin(SEOAdminMixin, CustomHeadScriptsMixin, admin.ModelAdmin):
     
     def faq_items_count(self, obj):
         """Показывает количество вопросов в категории"""
-        count = obj.faq_items.filter(is_published=True).count()
+        count = obj.published_count
         if count > 0:
             url = reverse('admin:main_faqitem_changelist') + f'?category__id__exact={obj.id}'
             return format_html('<a href="{}">{} вопросов</a>', url, count)
         return '0 вопросов'
     faq_items_count.short_description = 'Количество вопросов'
+    faq_items_count.admin_order_field = 'published_count'
     
     def get_queryset(self, request):
         """Оптимизируем запросы"""
@@ -769,12 +772,13 @@ class GlossaryCategoryAdmin(SEOAdminMixin, CustomHeadScriptsMixin, admin.ModelAd
     
     def glossary_terms_count(self, obj):
         """Показывает количество терминов в категории"""
-        count = obj.glossary_terms.filter(is_published=True).count()
+        count = obj.published_count
         if count > 0:
             url = reverse('admin:main_glossaryterm_changelist') + f'?category__id__exact={obj.id}'
             return format_html('<a href="{}">{} терминов</a>', url, count)
         return '0 терминов'
     glossary_terms_count.short_description = 'Количество терминов'
+    glossary_terms_count.admin_order_field = 'published_count'
 
     def get_queryset(self, request):
         """Оптимизируем запросы"""
@@ -861,13 +865,13 @@ class AuthorAdmin(admin.ModelAdmin):
     
     def posts_count(self, obj):
         """Показывает количество статей автора"""
-        from blog.models import Post
-        count = Post.objects.filter(blog_author=obj, is_published=True).count()
+        count = obj.published_count
         if count > 0:
             url = reverse('admin:blog_post_changelist') + f'?blog_author__id__exact={obj.id}'
             return format_html('<a href="{}">{} статей</a>', url, count)
         return '0 статей'
     posts_count.short_description = 'Количество статей'
+    posts_count.admin_order_field = 'published_count'
     
     def get_queryset(self, request):
         """Оптимизируем запросы"""
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main'
+
+    def ready(self):
+        # Подключаем обработчики сигналов (сброс кэшей при изменении контента)
+        from . import signals  # noqa: F401
+        # Время рендера шаблонов для Server-Timing
+        from .instrumentation import install_template_timing
+        install_template_timing()
+        # Граф зависимостей страниц: учет загруженных строк
+        from .dependencies import install_dependency_tracking
+        install_dependency_tracking()
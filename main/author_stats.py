@@ -0,0 +1,75 @@
+# main/author_stats.py - Статистика автора одним сгруппированным запросом
+#
+# Число статей, суммарное время чтения (числовое поле Post.reading_time,
+# считается в Post.save), даты первой и последней публикации и число статей
+# по категориям собираются одним GROUP BY по категориям и кэшируются.
+#
+# Ключ кэша содержит версию статистики. Сигналы (main/signals.py) увеличивают
+# ее при сохранении и удалении статей и категорий блога, поэтому страница
+# автора строится за постоянное число запросов при любом числе статей.
+
+from collections import namedtuple
+
+from django.db.models import Count, Max, Min, Sum
+from django.urls import reverse
+
+from .cache import bump_version, get_version, local_cache, shared_cache
+
+AUTHOR_STATS_VERSION_KEY = 'author_stats:version'
+AUTHOR_STATS_CACHE_TIMEOUT = 60 * 60 * 24
+
+CategoryCount = namedtuple('CategoryCount', 'name slug url count')
+AuthorStats = namedtuple('AuthorStats', 'total_posts reading_time first_published last_published categories')
+
+
+def invalidate_author_stats():
+    """Сбрасывает статистику всех авторов"""
+    bump_version(AUTHOR_STATS_VERSION_KEY)
+
+
+def build_author_stats(posts):
+    """Статистика по queryset опубликованных статей автора (один запрос)"""
+    rows = list(
+        posts.order_by()
+        .values('category__name', 'category__slug')
+        .annotate(
+            count=Count('id'),
+            reading_time=Sum('reading_time'),
+            first_published=Min('published_date'),
+            last_published=Max('published_date'),
+        )
+    )
+    categories = tuple(
+        CategoryCount(
+            row['category__name'], row['category__slug'],
+            reverse('blog:category_posts', kwargs={'slug': row['category__slug']}), row['count'],
+        )
+        for row in sorted(rows, key=lambda row: (-row['count'], row['category__name'] or ''))
+        if row['category__slug']
+    )
+    return AuthorStats(
+        total_posts=sum(row['count'] for row in rows),
+        reading_time=sum(row['reading_time'] or 0 for row in rows),
+        first_published=min((row['first_published'] for row in rows), default=None),
+        last_published=max((row['last_published'] for row in rows), default=None),
+        categories=categories,
+    )
+
+
+def get_author_stats(author_key, posts):
+    """
+    Статистика автора из кэша; author_key — username автора
+    (или 'user-<id>' для пользователя без профиля Author)
+    """
+    version = get_version(AUTHOR_STATS_VERSION_KEY)
+    if version is None:
+        return build_author_stats(posts)
+    key = f'author_stats:{version}:{author_key}'
+    stats = local_cache().get(key)
+    if stats is None:
+        stats = shared_cache().get(key)
+        if stats is None:
+            stats = build_author_stats(posts)
+            shared_cache().set(key, stats, AUTHOR_STATS_CACHE_TIMEOUT)
+        local_cache().set(key, stats)
+    return stats
@@ -0,0 +1,375 @@
+# main/bench.py - Нагрузочный прогон всех маршрутов сайта (manage.py bench)
+#
+# Прогон идет во временной тестовой БД (как у manage.py test) с
+# воспроизводимым набором данных и кэшами в памяти, поэтому результаты
+# разных коммитов можно сравнивать между собой.
+#
+# Для каждого маршрута из BENCH_URLCONFS:
+#   - холодный запрос (страницы нет в кэше): SQL-запросы, пик выделенной памяти
+#     (tracemalloc), размер ответа, статус;
+#   - серия теплых запросов: p50/p95/p99 времени ответа и SQL-запросы.
+# Метрики SQL берутся из InstrumentationMiddleware (request.metrics).
+#
+# Результат — JSON (save_results), сравнение с прошлым прогоном — compare().
+
+import gc
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+from collections import namedtuple
+from importlib import import_module
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .seeding import WORDS, article_html
+
+# Модули URL, маршруты которых замеряются
+BENCH_URLCONFS = ('main.urls', 'blog.urls', 'services.urls', 'pages.urls', 'seo_management.urls')
+
+RESULTS_FORMAT = 1
+
+# Параметры строки запроса для страниц поиска
+ROUTE_QUERY = {
+    'main:search': {'q': 'SEO'},
+    'blog:search': {'q': 'SEO'},
+    'main:glossary_autocomplete': {'q': 'Ин'},
+}
+
+# Кэши на время прогона: в памяти, изолированы от боевых
+BENCH_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'bench-shared',
+        'TIMEOUT': None,
+    },
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'bench-local',
+        'TIMEOUT': 60,
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
+
+Route = namedtuple('Route', 'name url')
+RouteResult = namedtuple(
+    'RouteResult',
+    'name url status size cold_ms cold_queries memory_kb p50_ms p95_ms p99_ms queries query_budget',
+)
+
+
+# --- Данные ---
+
+def seed_bench_data(seed=42):
+    """Воспроизводимый набор данных: по несколько объектов каждого типа"""
+    from blog.models import Category, Post
+    from main.models import (
+        Author, City, FAQCategory, FAQItem, GlossaryCategory, GlossaryTerm, PortfolioCategory,
+        PortfolioItem, RegionalPostAdaptation, Service, ServiceCategory,
+    )
+    from pages.models import SimplePage
+
+    rnd = random.Random(seed)
+
+    cities = [
+        City.objects.create(name=name, slug=slug, region=region)
+        for name, slug, region in (
+            ('Москва', 'moscow', 'Москва'),
+            ('Пермь', 'perm', 'Пермский край'),
+            ('Казань', 'kazan', 'Республика Татарстан'),
+        )
+    ]
+
+    for number in range(2):
+        category = ServiceCategory.objects.create(
+            title=f'Категория услуг {number + 1}', slug=f'service-category-{number + 1}', order=number,
+        )
+        for index in range(6):
+            Service.objects.create(
+                category=category, title=f'Услуга {number + 1}.{index + 1}',
+                slug=f'service-{number + 1}-{index + 1}', order=index,
+                short_description='Комплексное продвижение сайта',
+                content=article_html(rnd, 6),
+            )
+
+    author = Author.objects.create(
+        first_name='Иван', last_name='Петров', username='ivan-petrov',
+        bio='SEO-специалист', position='Руководитель отдела SEO',
+    )
+    posts = []
+    for number in range(3):
+        category = Category.objects.create(name=f'Рубрика {number + 1}', slug=f'category-{number + 1}')
+        for index in range(12):
+            posts.append(Post.objects.create(
+                category=category, blog_author=author,
+                title=f'Статья {number + 1}.{index + 1}: {rnd.choice(WORDS)}',
+                slug=f'post-{number + 1}-{index + 1}',
+                excerpt='Краткое описание статьи',
+                content=article_html(rnd, rnd.randint(8, 20)),
+            ))
+    for post in posts[:6]:
+        for city in cities:
+            RegionalPostAdaptation.objects.create(post=post, city=city)
+
+    for number in range(2):
+        category = PortfolioCategory.objects.create(name=f'Проекты {number + 1}', slug=f'portfolio-{number + 1}')
+        for index in range(4):
+            PortfolioItem.objects.create(
+                category=category, title=f'Проект {number + 1}.{index + 1}',
+                slug=f'project-{number + 1}-{index + 1}',
+                short_description='Рост трафика', full_description=article_html(rnd, 4),
+                main_image='portfolio_images/bench.jpg', technologies=['Django'],
+            )
+
+    for number in range(2):
+        category = FAQCategory.objects.create(name=f'Вопросы {number + 1}', slug=f'faq-{number + 1}')
+        for index in range(5):
+            FAQItem.objects.create(
+                category=category, question=f'Вопрос {number + 1}.{index + 1}?',
+                slug=f'question-{number + 1}-{index + 1}', answer=article_html(rnd, 2),
+            )
+
+    category = GlossaryCategory.objects.create(name='Термины', slug='terms')
+    for index, word in enumerate(sorted(WORDS[:14])):
+        GlossaryTerm.objects.create(
+            category=category, term=word.capitalize(), slug=f'term-{index + 1}', definition=article_html(rnd, 1),
+        )
+
+    SimplePage.objects.create(title='О компании', slug='about', content=article_html(rnd, 3), show_in_header=True)
+
+
+# --- Маршруты ---
+
+def _first(model, *related):
+    return model.objects.select_related(*related).order_by('pk').first()
+
+
+def _route_kwargs():
+    """{'namespace:name': kwargs} — параметры маршрутов из данных в БД"""
+    from blog.models import Category, Post
+    from main.models import (
+        Author, City, FAQItem, GlossaryTerm, PortfolioItem, RegionalPostAdaptation, Service,
+    )
+    from pages.models import SimplePage
+
+    city = _first(City)
+    service = _first(Service, 'category')
+    post = _first(Post, 'category')
+    adaptation = _first(RegionalPostAdaptation, 'city', 'post')
+    project = _first(PortfolioItem, 'category')
+    faq = _first(FAQItem, 'category')
+    term = _first(GlossaryTerm, 'category')
+    page = _first(SimplePage)
+    author = _first(Author)
+    blog_category = _first(Category)
+
+    kwargs = {}
+    if city:
+        kwargs['main:city_detail'] = {'slug': city.slug}
+        kwargs['main:set_city'] = {'slug': city.slug}
+        if service:
+            kwargs['main:city_service_detail'] = {'city_slug': city.slug, 'service_slug': service.slug}
+            kwargs['main:city_category_detail'] = {'city_slug': city.slug, 'category_slug': service.category.slug}
+    if adaptation:
+        kwargs['main:city_post_detail'] = {'city_slug': adaptation.city.slug, 'post_slug': adaptation.post.slug}
+    if project:
+        kwargs['main:portfolio_detail'] = {'category_slug': project.category.slug, 'project_slug': project.slug}
+        kwargs['main:portfolio_category'] = {'slug': project.category.slug}
+        kwargs['main:portfolio_detail_legacy'] = {'slug': project.slug}
+    if faq:
+        kwargs['main:faq_category'] = {'slug': faq.category.slug}
+        kwargs['main:faq_item'] = {'category_slug': faq.category.slug, 'item_slug': faq.slug}
+    if term:
+        kwargs['main:glossary_category'] = {'slug': term.category.slug}
+        kwargs['main:glossary_term'] = {'category_slug': term.category.slug, 'term_slug': term.slug}
+    if author:
+        kwargs['main:author_detail'] = {'slug': author.username}
+    if post:
+        kwargs['blog:post_detail'] = {'category_slug': post.category.slug, 'post_slug': post.slug}
+        kwargs['blog:post_detail_legacy'] = {'slug': post.slug}
+        kwargs['main:post_views'] = {'pk': post.pk}
+    if blog_category:
+        kwargs['blog:category_posts'] = {'slug': blog_category.slug}
+    if service:
+        kwargs['services:service_detail'] = {'category_slug': service.category.slug, 'service_slug': service.slug}
+        kwargs['services:service_category'] = {'slug': service.category.slug}
+        kwargs['services:service_detail_legacy'] = {'slug': service.slug}
+    if page:
+        kwargs['pages:detail'] = {'slug': page.slug}
+    kwargs['seo_management:sitemap_section'] = {'section': 'blog', 'page': 1}
+    return kwargs
+
+
+def collect_routes():
+    """
+    Все именованные маршруты BENCH_URLCONFS.
+    Возвращает (маршруты, имена маршрутов, для которых нет данных).
+    """
+    from urllib.parse import urlencode
+
+    known_kwargs = _route_kwargs()
+    routes, skipped = [], []
+    for urlconf in BENCH_URLCONFS:
+        module = import_module(urlconf)
+        for pattern in module.urlpatterns:
+            if not pattern.name:
+                continue
+            name = f'{module.app_name}:{pattern.name}'
+            params = pattern.pattern.converters
+            if params and name not in known_kwargs:
+                skipped.append(name)
+                continue
+            url = reverse(name, kwargs=known_kwargs.get(name) if params else None)
+            if name in ROUTE_QUERY:
+                url = f'{url}?{urlencode(ROUTE_QUERY[name])}'
+            routes.append(Route(name, url))
+    return routes, skipped
+
+
+# --- Замеры ---
+
+def percentile(values, percent):
+    """Перцентиль (ближайший ранг) отсортированного списка"""
+    if not values:
+        return None
+    rank = max(int(round(percent / 100 * len(values) + 0.5)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+def _request(client, url):
+    start = time.perf_counter()
+    response = client.get(url)
+    # Потоковый ответ (шарды sitemap) учитываем целиком
+    if getattr(response, 'streaming', False):
+        size = sum(len(chunk) for chunk in response.streaming_content)
+    else:
+        size = len(response.content)
+    elapsed = (time.perf_counter() - start) * 1000
+    metrics = getattr(response.wsgi_request, 'metrics', None)
+    return response, elapsed, metrics, size
+
+
+def bench_route(client, route, iterations):
+    # Холодный запрос: страницы еще нет в кэше, замер памяти
+    gc.collect()
+    tracemalloc.start()
+    try:
+        response, cold_ms, metrics, size = _request(client, route.url)
+        _, memory_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    cold_queries = metrics.queries if metrics else None
+    budget = metrics.budget if metrics else None
+
+    # Теплые запросы: страница в кэше (если view кэшируется)
+    timings, queries = [], []
+    for _ in range(iterations):
+        _, elapsed, metrics, _ = _request(client, route.url)
+        timings.append(elapsed)
+        if metrics:
+            queries.append(metrics.queries)
+    timings.sort()
+
+    return RouteResult(
+        name=route.name,
+        url=route.url,
+        status=response.status_code,
+        size=size,
+        cold_ms=round(cold_ms, 2),
+        cold_queries=cold_queries,
+        memory_kb=round(memory_peak / 1024, 1),
+        p50_ms=round(percentile(timings, 50), 2),
+        p95_ms=round(percentile(timings, 95), 2),
+        p99_ms=round(percentile(timings, 99), 2),
+        queries=max(queries) if queries else None,
+        query_budget=budget,
+    )
+
+
+def run_bench(routes, iterations=50):
+    """Замеряет маршруты; вызывать внутри тестовой БД с данными"""
+    # Кэши в памяти, хост тест-клиента разрешен, без редиректа на HTTPS
+    with override_settings(
+        CACHES=BENCH_CACHES,
+        ALLOWED_HOSTS=['testserver'],
+        SECURE_SSL_REDIRECT=False,
+        QUERY_BUDGET_STRICT=False,
+        DEBUG=False,
+    ):
+        client = Client()
+        # Общие блоки (меню, настройки сайта) прогреваем заранее: бюджеты
+        # @query_budget считаются для страницы, которой нет в кэше, при
+        # уже закэшированных общих блоках — как на работающем сайте
+        clear_caches()
+        client.get(reverse('main:home'))
+        return [bench_route(client, route, iterations) for route in routes]
+
+
+# --- Результаты ---
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def make_results(results, iterations, seed):
+    return {
+        'format': RESULTS_FORMAT,
+        'created_at': timezone.now().isoformat(),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'database': settings.DATABASES['default']['ENGINE'].rsplit('.', 1)[-1],
+        'iterations': iterations,
+        'seed': seed,
+        'routes': {result.name: result._asdict() for result in results},
+    }
+
+
+def save_results(data, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(current, baseline, threshold=0.2, min_ms=2.0):
+    """
+    Регрессии относительно прошлого прогона: список строк.
+    Время (p95) — рост больше threshold и больше min_ms (шум на быстрых страницах),
+    SQL-запросы — любой рост, размер ответа — рост больше threshold.
+    """
+    regressions = []
+    old_routes = baseline.get('routes', {})
+    for name, new in current['routes'].items():
+        old = old_routes.get(name)
+        if not old:
+            continue
+        if old['p95_ms'] and new['p95_ms'] > old['p95_ms'] * (1 + threshold) and new['p95_ms'] - old['p95_ms'] > min_ms:
+            regressions.append(f'{name}: p95 {old["p95_ms"]} → {new["p95_ms"]} мс')
+        for field in ('cold_queries', 'queries'):
+            if old[field] is not None and new[field] is not None and new[field] > old[field]:
+                regressions.append(f'{name}: {field} {old[field]} → {new[field]}')
+        if old['size'] and new['size'] > old['size'] * (1 + threshold):
+            regressions.append(f'{name}: размер {old["size"]} → {new["size"]} байт')
+        if new['status'] != old['status']:
+            regressions.append(f'{name}: статус {old["status"]} → {new["status"]}')
+    return regressions
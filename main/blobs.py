@@ -0,0 +1,246 @@
+# main/blobs.py - Учет ссылок на файлы blobs/ и сборка мусора
+#
+# Ссылкой на файл считается:
+# - значение ImageField и элемент галереи (поля из main/images.get_image_sources);
+# - путь blobs/... в HTML полей CKEditor (картинки, загруженные в редакторе).
+#
+# Сигналы (main/signals.py) меняют MediaBlob.ref_count при сохранении и
+# удалении объектов. Обновления в обход сигналов (bulk_create, queryset.update)
+# выравнивает manage.py gc_media: он пересчитывает ссылки, затем удаляет файлы
+# без ссылок старше льготного периода (файл загружается раньше, чем
+# сохраняется объект, который на него ссылается).
+#
+# manage.py gc_media --adopt переносит старые файлы (service_images/...) в
+# blobs/, переписывает ссылки и удаляет копии, на которые больше никто не ссылается.
+
+import os
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from django_ckeditor_5.fields import CKEditor5Field
+
+from .images import delete_derivatives, enqueue_images, get_image_sources, image_names, source_name
+from .storage import BLOB_RE, BLOBS_DIR, is_blob
+
+# Сколько хранить файл без ссылок (загружен, но объект еще не сохранен)
+GC_GRACE = timedelta(days=1)
+
+
+def get_blob_fields():
+    """{модель: (поля с файлами, HTML-поля CKEditor)}"""
+    file_fields = get_image_sources()
+    result = {}
+    for model in apps.get_models():
+        text_fields = tuple(f.name for f in model._meta.get_fields() if isinstance(f, CKEditor5Field))
+        if text_fields or model in file_fields:
+            result[model] = (file_fields.get(model, ()), text_fields)
+    return result
+
+
+def _field_blobs(value):
+    items = value if isinstance(value, list) else [value]
+    return [name for name in map(source_name, items) if is_blob(name)]
+
+
+def blob_refs(instance, fields):
+    """Counter {имя файла: число ссылок} одного объекта"""
+    file_fields, text_fields = fields
+    refs = Counter()
+    for field in file_fields:
+        refs.update(_field_blobs(getattr(instance, field)))
+    for field in text_fields:
+        refs.update(BLOB_RE.findall(getattr(instance, field) or ''))
+    return refs
+
+
+def change_refs(before, after):
+    """Применяет разницу ссылок до и после изменения объекта"""
+    from .models import MediaBlob
+
+    deltas = Counter(after)
+    deltas.subtract(before)
+    for name, delta in deltas.items():
+        if delta:
+            MediaBlob.objects.filter(name=name).update(ref_count=Greatest(F('ref_count') + delta, 0))
+
+
+def register_blob(name, size):
+    """
+    Запись о загруженном файле; повторная загрузка продлевает льготный период.
+    Вызывается до проверки файла на диске: UPDATE ждет блокировку строки,
+    которую держит collect_garbage, и после удаления строки создает новую.
+    """
+    from .models import MediaBlob
+
+    if not MediaBlob.objects.filter(name=name).update(created_at=timezone.now()):
+        MediaBlob.objects.get_or_create(name=name, defaults={'size': size})
+
+
+def count_references():
+    refs = Counter()
+    for model, (file_fields, text_fields) in get_blob_fields().items():
+        rows = model._default_manager.all()
+        if not file_fields:
+            condition = Q()
+            for field in text_fields:
+                condition |= Q(**{f'{field}__contains': f'{BLOBS_DIR}/'})
+            rows = rows.filter(condition)
+        for instance in rows.only('pk', *file_fields, *text_fields).iterator():
+            refs.update(blob_refs(instance, (file_fields, text_fields)))
+    return refs
+
+
+def reconcile_blobs():
+    """Пересчитывает ref_count; возвращает число исправленных записей"""
+    from .models import MediaBlob
+
+    refs = count_references()
+    stale = []
+    for blob in MediaBlob.objects.only('pk', 'name', 'ref_count').iterator():
+        actual = refs.get(blob.name, 0)
+        if blob.ref_count != actual:
+            blob.ref_count = actual
+            stale.append(blob)
+    MediaBlob.objects.bulk_update(stale, ['ref_count'], batch_size=500)
+    return len(stale)
+
+
+def _files_on_disk():
+    root = default_storage.path(BLOBS_DIR)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d != 'tmp']
+        for filename in filenames:
+            name = os.path.relpath(os.path.join(dirpath, filename), default_storage.path('')).replace(os.sep, '/')
+            if is_blob(name):
+                yield name
+
+
+def register_untracked():
+    """Файлы в blobs/ без записи MediaBlob (например, после восстановления из копии)"""
+    from .models import MediaBlob
+
+    known = set(MediaBlob.objects.values_list('name', flat=True))
+    new = [
+        MediaBlob(name=name, size=default_storage.size(name))
+        for name in _files_on_disk() if name not in known
+    ]
+    MediaBlob.objects.bulk_create(new, batch_size=500, ignore_conflicts=True)
+    return len(new)
+
+
+def _remove_stale_tmp(cutoff):
+    tmp_dir = default_storage.path(f'{BLOBS_DIR}/tmp')
+    if not os.path.isdir(tmp_dir):
+        return
+    for entry in os.scandir(tmp_dir):
+        if entry.is_file() and entry.stat().st_mtime < cutoff.timestamp():
+            os.remove(entry.path)
+
+
+def collect_garbage(grace=GC_GRACE, dry_run=False):
+    """Удаляет файлы без ссылок старше grace. Возвращает (файлов, байт)"""
+    from .models import MediaBlob
+
+    reconcile_blobs()
+    register_untracked()
+    reconcile_blobs()
+
+    cutoff = timezone.now() - grace
+    orphans = list(MediaBlob.objects.filter(ref_count=0, created_at__lt=cutoff))
+    if dry_run:
+        return len(orphans), sum(blob.size for blob in orphans)
+
+    removed = freed = 0
+    for blob in orphans:
+        # Ссылка или повторная загрузка того же файла (register_blob) могли
+        # появиться после пересчета: условие проверяет сам DELETE, а блокировка
+        # удаленной строки держится, пока не удален файл — register_blob ждет
+        # конца транзакции и создает строку заново
+        with transaction.atomic():
+            deleted, _ = MediaBlob.objects.filter(pk=blob.pk, ref_count=0, created_at__lt=cutoff).delete()
+            if not deleted:
+                continue
+            default_storage.delete_blob(blob.name)
+        delete_derivatives(blob.name)
+        removed += 1
+        freed += blob.size
+    _remove_stale_tmp(cutoff)
+    return removed, freed
+
+
+def _referenced_in_text(name):
+    for model, (_, text_fields) in get_blob_fields().items():
+        condition = Q()
+        for field in text_fields:
+            condition |= Q(**{f'{field}__contains': name})
+        if text_fields and model._default_manager.filter(condition).exists():
+            return True
+    return False
+
+
+def _legacy_names(instance, fields):
+    return [
+        name for name in image_names(instance, fields)
+        if not is_blob(name) and default_storage.exists(name)
+    ]
+
+
+def _adopted_value(value, adopted):
+    """Значение поля с путями старых файлов, замененными на blobs/..."""
+    if isinstance(value, list):
+        # Галерея хранит пути или URL: сохраняем форму записи
+        return [
+            item.replace(source_name(item), adopted[source_name(item)])
+            if isinstance(item, str) and source_name(item) in adopted else item
+            for item in value
+        ]
+    return adopted.get(source_name(value), value)
+
+
+def adopt_legacy(dry_run=False):
+    """
+    Переносит файлы полей вне blobs/ в blobs/ и переписывает ссылки.
+    Возвращает (старых файлов, удалено, освобождено байт)
+    """
+    adopted = {}
+    for model, fields in get_image_sources().items():
+        for instance in model._default_manager.only('pk', *fields).iterator():
+            legacy = [name for name in _legacy_names(instance, fields) if name not in adopted]
+            for name in legacy:
+                if dry_run:
+                    adopted[name] = None
+                    continue
+                with default_storage.open(name, 'rb') as f:
+                    adopted[name] = default_storage.save(name, f)
+            if dry_run:
+                continue
+
+            changes = {}
+            for field in fields:
+                value = getattr(instance, field)
+                new_value = _adopted_value(value, adopted)
+                if new_value != value:
+                    changes[field] = new_value
+            if changes:
+                # Без save(): не меняем updated_at и не сбрасываем кэши контента
+                model._default_manager.filter(pk=instance.pk).update(**changes)
+
+    removed = freed = 0
+    for old_name, new_name in adopted.items():
+        if _referenced_in_text(old_name):
+            continue
+        removed += 1
+        freed += default_storage.size(old_name)
+        if not dry_run:
+            default_storage.delete(old_name)
+            delete_derivatives(old_name)
+            enqueue_images([new_name])
+    if not dry_run:
+        reconcile_blobs()
+    return len(adopted), removed, freed
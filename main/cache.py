@@ -0,0 +1,216 @@
+# main/cache.py - Двухуровневый кэш: память процесса + общий кэш
+#
+# Уровни настраиваются в settings.CACHES:
+#   'local'   — LRU в памяти процесса (у каждого воркера свой, короткий TTL);
+#   'default' — общий кэш для всех воркеров (Redis / файлы / БД).
+#
+# Использование во views и шаблонных тегах:
+#   from main.cache import get_or_set
+#   data = get_or_set('glossary:index', build_index, timeout=3600)
+#
+# Ключи с versioned=True включают версию контента, поэтому после сохранения
+# в админке все воркеры сразу перестают видеть старые значения.
+#
+# У отдельных данных (справочник городов, редиректы, глоссарий, разделы
+# sitemap) свои версии: get_version / bump_version, а объекты, собранные из БД
+# целиком, хранит VersionedSnapshot:
+#   directory = VersionedSnapshot('cities', build_city_directory, timeout=3600)
+#   directory.get()         # объект процесса, пока версия не изменилась
+#   directory.invalidate()  # из сигналов
+
+import time
+
+from django.core.cache import caches
+from django.utils import timezone
+
+from .instrumentation import count_cache
+
+# Ключ версии контента в общем кэше. Версия увеличивается сигналами
+# при каждом сохранении/удалении контента в админке.
+CONTENT_VERSION_KEY = 'content:version'
+# Время последнего изменения контента (для заголовка Last-Modified)
+CONTENT_MODIFIED_KEY = 'content:modified'
+
+# Маркер закэшированного None, чтобы отличать его от промаха
+_NONE = '__cache_none__'
+_MISSING = object()
+
+
+def local_cache():
+    """Кэш в памяти текущего процесса"""
+    return caches['local']
+
+
+def shared_cache():
+    """Общий кэш для всех воркеров"""
+    return caches['default']
+
+
+def _initial_version():
+    # Начальная версия берется из времени, чтобы после очистки кэша
+    # она не совпала со старой версией, закэшированной в процессах
+    return int(time.time() * 1000)
+
+
+def get_version(key):
+    """
+    Возвращает версию из общего кэша (создает ее при первом чтении).
+    Возвращает None, если общий кэш ничего не хранит (DummyCache) —
+    в этом случае процессный кэш использовать нельзя.
+    """
+    cache = shared_cache()
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    """Увеличивает версию, делая устаревшими зависящие от нее ключи"""
+    cache = shared_cache()
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Ключа нет в кэше (кэш был очищен или ещё не инициализирован)
+        version = _initial_version()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def get_content_version():
+    """Возвращает текущую версию контента или None, если общий кэш отключен"""
+    return get_version(CONTENT_VERSION_KEY)
+
+
+def get_content_modified():
+    """Возвращает время последнего изменения контента или None, если оно неизвестно"""
+    return shared_cache().get(CONTENT_MODIFIED_KEY)
+
+
+def bump_content_version():
+    """Увеличивает версию контента, делая устаревшими все версионные ключи"""
+    shared_cache().set(CONTENT_MODIFIED_KEY, timezone.now(), timeout=None)
+    return bump_version(CONTENT_VERSION_KEY)
+
+
+def make_key(key, versioned=True):
+    """
+    Возвращает полный ключ кэша. Для версионных ключей добавляет версию контента.
+    Возвращает None, если версионный ключ построить нельзя (общий кэш отключен).
+    """
+    if not versioned:
+        return key
+    version = get_content_version()
+    if version is None:
+        return None
+    return f'{key}:v{version}'
+
+
+def cache_get(key, default=None, versioned=True):
+    """Читает значение: сначала из памяти процесса, затем из общего кэша"""
+    full_key = make_key(key, versioned)
+    if full_key is None:
+        return default
+
+    value = local_cache().get(full_key, _MISSING)
+    if value is _MISSING:
+        value = shared_cache().get(full_key, _MISSING)
+        if value is _MISSING:
+            count_cache(hit=False)
+            return default
+        local_cache().set(full_key, value)
+    count_cache(hit=True)
+    return None if value == _NONE else value
+
+
+def cache_set(key, value, timeout=None, versioned=True):
+    """Записывает значение в оба уровня кэша"""
+    full_key = make_key(key, versioned)
+    if full_key is None:
+        return
+    stored = _NONE if value is None else value
+    if timeout is None:
+        shared_cache().set(full_key, stored)
+    else:
+        shared_cache().set(full_key, stored, timeout)
+    local_cache().set(full_key, stored)
+
+
+def cache_delete(key, versioned=True):
+    """
+    Удаляет значение из общего кэша и из памяти текущего процесса.
+    В других воркерах значение доживет до истечения LOCAL_CACHE_TIMEOUT,
+    поэтому для данных, которые должны обновляться сразу, используйте версионные ключи.
+    """
+    full_key = make_key(key, versioned)
+    if full_key is None:
+        return
+    shared_cache().delete(full_key)
+    local_cache().delete(full_key)
+
+
+def get_or_set(key, builder, timeout=None, versioned=True):
+    """
+    Возвращает значение из кэша или вычисляет его через builder() и кэширует.
+    Если общий кэш отключен, просто вызывает builder().
+    """
+    full_key = make_key(key, versioned)
+    if full_key is None:
+        return builder()
+
+    value = local_cache().get(full_key, _MISSING)
+    if value is _MISSING:
+        value = shared_cache().get(full_key, _MISSING)
+        count_cache(hit=value is not _MISSING)
+        if value is _MISSING:
+            value = builder()
+            value = _NONE if value is None else value
+            if timeout is None:
+                shared_cache().set(full_key, value)
+            else:
+                shared_cache().set(full_key, value, timeout)
+        local_cache().set(full_key, value)
+    else:
+        count_cache(hit=True)
+    return None if value == _NONE else value
+
+
+class VersionedSnapshot:
+    """
+    Объект, который целиком строится из БД (справочник, индекс, таблица)
+    и хранится в памяти процесса. Пока версия name не изменилась, get()
+    возвращает объект процесса; новую версию первый воркер строит через
+    builder() и кладет в общий кэш для остальных. Если общий кэш отключен,
+    изменения не отследить — объект строится на каждый вызов.
+    """
+
+    def __init__(self, name, builder, timeout=None):
+        self.name = name
+        self.version_key = f'{name}:version'
+        self.builder = builder
+        self.timeout = timeout
+        # Объект текущего процесса: (версия, объект)
+        self._current = (None, None)
+
+    def get(self):
+        version = get_version(self.version_key)
+        if version is None:
+            return self.builder()
+
+        current_version, value = self._current
+        if value is not None and current_version == version:
+            return value
+
+        cache = shared_cache()
+        key = f'{self.name}:snapshot:{version}'
+        value = cache.get(key)
+        if value is None:
+            value = self.builder()
+            cache.set(key, value, self.timeout)
+        self._current = (version, value)
+        return value
+
+    def invalidate(self):
+        """Увеличивает версию: все процессы перестроят объект при следующем обращении"""
+        bump_version(self.version_key)
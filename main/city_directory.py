@@ -0,0 +1,254 @@
+# main/city_directory.py - Справочник городов в памяти процесса
+#
+# Все города загружаются одним запросом на версию справочника (версию
+# увеличивают сигналы при сохранении и удалении City). Для каждого города
+# в словарь "нормализованное написание -> slug" попадают:
+#   - название и slug, английское название, транслитерация;
+#   - форма в предложном падеже ("в Перми" -> "перми");
+#   - разговорные сокращения и частые варианты (COMMON_ALIASES: "питер", "екб").
+# Нормализация (fold) переводит кириллицу в латиницу и сглаживает
+# различия транслитераций (kh/h, ts/c, удвоенные буквы), поэтому
+# "Нижний Новгород", "Nizhny Novgorod" и "nizhniy novgorod" дают один ключ.
+#
+# Точный поиск — один словарь, O(1). Опечатки ищутся по индексу удалений
+# (все ключи без одной буквы): кандидаты за O(длины слова), затем проверка
+# расстоянием Дамерау-Левенштейна. Неоднозначный результат не возвращается.
+#
+#   directory = get_city_directory()
+#   directory.resolve('Санкт Питербург')   # -> CityEntry(slug='saint-petersburg', ...)
+#   directory.prepositional('Пермь')        # -> 'в Перми'
+
+import re
+from collections import defaultdict, namedtuple
+
+from .cache import VersionedSnapshot
+
+CITY_DIRECTORY_TIMEOUT = 60 * 60 * 24
+
+CityEntry = namedtuple('CityEntry', 'pk name slug region is_active prepositional')
+
+# Английские названия (API, базы geo-IP), если не совпадают с slug
+ENGLISH_NAMES = {
+    'Москва': ('Moscow',),
+    'Санкт-Петербург': ('Saint Petersburg', 'St. Petersburg', 'St Petersburg'),
+    'Нижний Новгород': ('Nizhny Novgorod', 'Nizhniy Novgorod'),
+    'Екатеринбург': ('Yekaterinburg', 'Ekaterinburg'),
+    'Ростов-на-Дону': ('Rostov-on-Don', 'Rostov-na-Donu'),
+    'Челябинск': ('Chelyabinsk',),
+    'Алматы': ('Almaty', 'Alma-Ata'),
+    'Астана': ('Astana', 'Nur-Sultan'),
+}
+
+# Разговорные и устаревшие названия
+COMMON_ALIASES = {
+    'Москва': ('мск', 'msk'),
+    'Санкт-Петербург': ('питер', 'спб', 'петербург', 'ленинград', 'spb', 'piter'),
+    'Екатеринбург': ('екб', 'ёбург', 'ekb', 'свердловск'),
+    'Новосибирск': ('нск', 'новосиб'),
+    'Нижний Новгород': ('нижний', 'нн', 'горький'),
+    'Ростов-на-Дону': ('ростов',),
+    'Самара': ('куйбышев',),
+    'Волгоград': ('сталинград',),
+    'Пермь': ('perm',),
+    'Алматы': ('алма-ата',),
+}
+
+# Предложный падеж для названий, которые не склоняются по общим правилам
+PREPOSITIONAL_FORMS = {
+    'Москва': 'в Москве',
+    'Санкт-Петербург': 'в Санкт-Петербурге',
+    'Нижний Новгород': 'в Нижнем Новгороде',
+    'Ростов-на-Дону': 'в Ростове-на-Дону',
+    'Великий Новгород': 'в Великом Новгороде',
+    'Петропавловск-Камчатский': 'в Петропавловске-Камчатском',
+    'Южно-Сахалинск': 'в Южно-Сахалинске',
+    'Комсомольск-на-Амуре': 'в Комсомольске-на-Амуре',
+    'Сергиев Посад': 'в Сергиевом Посаде',
+    'Казань': 'в Казани',
+    'Пермь': 'в Перми',
+    'Тверь': 'в Твери',
+    'Рязань': 'в Рязани',
+    'Астрахань': 'в Астрахани',
+    'Алматы': 'в Алматы',
+    'Химки': 'в Химках',
+    'Мытищи': 'в Мытищах',
+    'Люберцы': 'в Люберцах',
+    'Железнодорожный': 'в Железнодорожном',
+}
+
+# Окончание -> окончание в предложном падеже (от длинных к коротким)
+PREPOSITIONAL_ENDINGS = (
+    ('ий', 'ом'), ('ый', 'ом'), ('ая', 'ой'),
+    ('ь', 'е'), ('а', 'е'), ('я', 'е'),
+)
+
+TRANSLIT = dict(zip(
+    'абвгдеёжзийклмнопрстуфхцчшщъыьэюя',
+    ['a', 'b', 'v', 'g', 'd', 'e', 'e', 'zh', 'z', 'i', 'y', 'k', 'l', 'm', 'n', 'o', 'p',
+     'r', 's', 't', 'u', 'f', 'kh', 'ts', 'ch', 'sh', 'shch', '', 'y', '', 'e', 'yu', 'ya'],
+))
+# Разные системы транслитерации -> одно написание (порядок важен)
+LATIN_VARIANTS = (
+    ('shch', 'sh'), ('sch', 'sh'), ('kh', 'h'), ('ts', 'c'), ('tz', 'c'), ('ph', 'f'),
+    ('w', 'v'), ('x', 'ks'), ('j', 'y'), ('iy', 'y'), ('ck', 'k'),
+)
+PREPOSITION_RE = re.compile(r'^(?:в|во|г\.?|город|in|city of)\s+', re.IGNORECASE)
+NON_WORD_RE = re.compile(r'[^a-z0-9]')
+DOUBLE_RE = re.compile(r'(.)\1+')
+CONSONANTS = set('бвгджзйклмнпрстфхцчшщ')
+
+# Опечатки: не больше 1 при длине ключа от 5, не больше 2 — от 9
+FUZZY_MIN_LENGTH = 5
+FUZZY_TWO_ERRORS_LENGTH = 9
+
+
+def fold(name):
+    """Ключ для сравнения названий: латиница без пробелов, дефисов и удвоений"""
+    value = PREPOSITION_RE.sub('', (name or '').strip().lower().replace('ё', 'е'))
+    value = ''.join(TRANSLIT.get(char, char) for char in value)
+    value = NON_WORD_RE.sub('', value)
+    for variant, canonical in LATIN_VARIANTS:
+        value = value.replace(variant, canonical)
+    value = DOUBLE_RE.sub(r'\1', value)
+    if value.startswith('ye'):
+        value = value[1:]
+    return value
+
+
+def prepositional_form(name):
+    """Название в предложном падеже с предлогом: 'в Перми', 'во Владимире'"""
+    name = (name or '').strip()
+    if not name:
+        return name
+    if name in PREPOSITIONAL_FORMS:
+        return PREPOSITIONAL_FORMS[name]
+
+    lower = name.lower()
+    form = None
+    for ending, replacement in PREPOSITIONAL_ENDINGS:
+        if lower.endswith(ending):
+            form = name[:-len(ending)] + replacement
+            break
+    if form is None:
+        # Несклоняемые (-о, -и, -ы, -у) оставляем, к согласной добавляем -е
+        form = name if lower[-1] in 'оиыуэю' else f'{name}е'
+
+    # "во Владимире", "во Фрязине": перед в/ф + согласная
+    preposition = 'во' if lower[0] in 'вф' and len(lower) > 1 and lower[1] in CONSONANTS else 'в'
+    return f'{preposition} {form}'
+
+
+def _deletions(key):
+    return {key[:i] + key[i + 1:] for i in range(len(key))}
+
+
+def _distance(a, b, limit):
+    """Расстояние Дамерау-Левенштейна (перестановка соседних букв — одна ошибка)"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class CityDirectory:
+    """Неизменяемый справочник городов (строится целиком, заменяется новой версией)"""
+
+    def __init__(self, entries):
+        self.entries = tuple(entries)
+        self.by_slug = {entry.slug: entry for entry in self.entries}
+        self.by_name = {entry.name: entry for entry in self.entries}
+
+        aliases = defaultdict(set)
+        # Активные города добавляются первыми и важнее неактивных
+        for entry in sorted(self.entries, key=lambda entry: not entry.is_active):
+            names = {entry.name, entry.slug, entry.slug.replace('-', ' ')}
+            names.update(ENGLISH_NAMES.get(entry.name, ()))
+            names.update(COMMON_ALIASES.get(entry.name, ()))
+            names.add(PREPOSITION_RE.sub('', entry.prepositional))
+            for name in names:
+                key = fold(name)
+                if key:
+                    aliases[key].add(entry.slug)
+        self.exact = {key: frozenset(slugs) for key, slugs in aliases.items()}
+
+        deletions = defaultdict(set)
+        for key in self.exact:
+            if len(key) >= FUZZY_MIN_LENGTH:
+                for deletion in _deletions(key):
+                    deletions[deletion].add(key)
+        self.deletions = {key: frozenset(keys) for key, keys in deletions.items()}
+
+    def _pick(self, slugs, active_only):
+        entries = [self.by_slug[slug] for slug in slugs]
+        if active_only:
+            entries = [entry for entry in entries if entry.is_active]
+        # Один ключ у нескольких городов (одноименные) — не угадываем
+        return entries[0] if len(entries) == 1 else None
+
+    def _fuzzy(self, key, active_only):
+        if len(key) < FUZZY_MIN_LENGTH - 1:
+            return None
+        candidates = set(self.deletions.get(key, ()))  # пропущена буква
+        for deletion in _deletions(key):
+            if deletion in self.exact:  # лишняя буква
+                candidates.add(deletion)
+            candidates.update(self.deletions.get(deletion, ()))  # замена, перестановка
+        # Короткие ключи ("омск") совпадают только точно, в том числе с лишней буквой ("томск")
+        candidates = {candidate for candidate in candidates if len(candidate) >= FUZZY_MIN_LENGTH}
+
+        limit = 2 if len(key) >= FUZZY_TWO_ERRORS_LENGTH else 1
+        best, best_distance = set(), limit + 1
+        for candidate in candidates:
+            distance = _distance(key, candidate, limit)
+            if distance < best_distance:
+                best, best_distance = set(self.exact[candidate]), distance
+            elif distance == best_distance:
+                best |= self.exact[candidate]
+        return self._pick(best, active_only) if best_distance <= limit else None
+
+    def resolve(self, name, fuzzy=True, active_only=True):
+        """CityEntry по названию, slug, английскому названию или падежной форме; None — не найден"""
+        key = fold(name)
+        if not key:
+            return None
+        slugs = self.exact.get(key)
+        if slugs:
+            return self._pick(slugs, active_only)
+        return self._fuzzy(key, active_only) if fuzzy else None
+
+    def get(self, slug, active_only=True):
+        entry = self.by_slug.get(slug)
+        if entry is None or (active_only and not entry.is_active):
+            return None
+        return entry
+
+    def prepositional(self, name):
+        """Предложный падеж: из карточки города (поле name_prepositional) или по правилам"""
+        entry = self.by_name.get((name or '').strip())
+        return entry.prepositional if entry else prepositional_form(name)
+
+
+def build_city_directory():
+    """Загружает города из БД (один запрос)"""
+    from .models import City
+
+    return CityDirectory(
+        CityEntry(pk, name, slug, region, is_active, name_prepositional or prepositional_form(name))
+        for pk, name, slug, region, is_active, name_prepositional in City.objects.order_by('order', 'name').values_list(
+            'pk', 'name', 'slug', 'region', 'is_active', 'name_prepositional'
+        )
+    )
+
+
+# Справочник в памяти процесса: один запрос на версию (версию увеличивают сигналы)
+_directory = VersionedSnapshot('cities', build_city_directory, CITY_DIRECTORY_TIMEOUT)
+get_city_directory = _directory.get
+invalidate_city_directory = _directory.invalidate
@@ -1,39 +1,89 @@
 # main/context_processors.py
 
+from collections import namedtuple
+
+from .cache import get_or_set
 from .models import ServiceCategory, City, PortfolioCategory, Service
 from pages.models import SimplePage
 from blog.models import Category as BlogCategory
 
+# Компактные неизменяемые записи для меню (вместо объектов моделей)
+MenuService = namedtuple('MenuService', 'title slug is_published category_slug category_title')
+MenuServiceCategory = namedtuple('MenuServiceCategory', 'title slug services')
+MenuCategory = namedtuple('MenuCategory', 'name slug color url')
+MenuPage = namedtuple('MenuPage', 'title slug url')
+MenuCity = namedtuple('MenuCity', 'name slug region')
+MenuSnapshot = namedtuple(
+    'MenuSnapshot',
+    'service_categories services blog_categories portfolio_categories header_pages footer_pages cities'
+)
+
+MENU_CACHE_KEY = 'menu:snapshot'
+MENU_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def build_menu_snapshot():
+    """Собирает снимок меню из БД (несколько запросов, выполняется один раз на версию контента)"""
+    categories = {
+        category.pk: (category.title, category.slug, [])
+        for category in ServiceCategory.objects.order_by('order', 'title').only('title', 'slug')
+    }
+    services = []
+    for service in Service.objects.select_related('category').order_by('order', 'title').only(
+        'title', 'slug', 'is_published', 'category__title', 'category__slug'
+    ):
+        item = MenuService(service.title, service.slug, service.is_published,
+                           service.category.slug, service.category.title)
+        categories[service.category_id][2].append(item)
+        if service.is_published:
+            services.append(item)
+    # Услуги для футера упорядочены как раньше: по порядку категории, затем услуги
+    category_order = {slug: index for index, (_, slug, _) in enumerate(categories.values())}
+    services.sort(key=lambda item: category_order[item.category_slug])
+
+    pages = list(SimplePage.objects.filter(is_published=True).order_by('order'))
+
+    return MenuSnapshot(
+        service_categories=tuple(
+            MenuServiceCategory(title, slug, tuple(items)) for title, slug, items in categories.values()
+        ),
+        services=tuple(services),
+        blog_categories=tuple(
+            MenuCategory(c.name, c.slug, c.color, c.get_absolute_url())
+            for c in BlogCategory.objects.filter(is_active=True).order_by('order')
+        ),
+        portfolio_categories=tuple(
+            MenuCategory(c.name, c.slug, c.color, c.get_absolute_url())
+            for c in PortfolioCategory.objects.filter(is_active=True).order_by('order')
+        ),
+        header_pages=tuple(MenuPage(p.title, p.slug, p.get_absolute_url()) for p in pages if p.show_in_header),
+        footer_pages=tuple(MenuPage(p.title, p.slug, p.get_absolute_url()) for p in pages if p.show_in_footer),
+        cities=tuple(
+            MenuCity(c.name, c.slug, c.region)
+            for c in City.objects.filter(is_active=True).order_by('order')
+        ),
+    )
+
+
+def get_menu_snapshot():
+    """
+    Возвращает снимок меню: из памяти процесса, затем из общего кэша,
+    и только при смене версии контента собирает его заново.
+    """
+    return get_or_set(MENU_CACHE_KEY, build_menu_snapshot, timeout=MENU_CACHE_TIMEOUT)
+
+
 def services_menu(request):
     """Возвращает категории услуг для использования в базовом шаблоне (меню)"""
-    
-    # Получаем свежие данные из БД без кэширования
-    categories = ServiceCategory.objects.all().order_by('order').prefetch_related('services')
-    # Получаем все опубликованные услуги для футера
-    services = Service.objects.filter(is_published=True).select_related('category').order_by('category__order', 'order')
-    blog_categories = BlogCategory.objects.filter(is_active=True).order_by('order').prefetch_related('post_set')
-    portfolio_categories = PortfolioCategory.objects.filter(is_active=True).order_by('order').prefetch_related('portfolioitem_set')
-    header_pages = SimplePage.objects.filter(is_published=True, show_in_header=True).order_by('order')
-    footer_pages = SimplePage.objects.filter(is_published=True, show_in_footer=True).order_by('order')
-    # Показываем все активные города (упорядочены)
-    cities = City.objects.filter(is_active=True).order_by('order')
-    
-    # Определяем текущий город пользователя
-    current_city = None
-    user_city_slug = request.session.get('user_city')
-    if user_city_slug:
-        try:
-            current_city = City.objects.get(slug=user_city_slug, is_active=True)
-        except City.DoesNotExist:
-            pass
-
+    menu = get_menu_snapshot()
+    # Город посетителя в меню отмечает скрипт (cookie user_city, GeoLocationMiddleware):
+    # страница одинакова для всех городов и кэшируется одним вариантом
     return {
-        'service_categories_menu': categories,
-        'services_menu': services,  # Добавляем услуги для футера
-        'blog_categories_menu': blog_categories,
-        'portfolio_categories_menu': portfolio_categories,
-        'header_pages': header_pages,
-        'footer_pages': footer_pages,
-        'cities_menu': cities,
-        'current_city': current_city,
-    }
\ No newline at end of file
+        'service_categories_menu': menu.service_categories,
+        'services_menu': menu.services,  # Добавляем услуги для футера
+        'blog_categories_menu': menu.blog_categories,
+        'portfolio_categories_menu': menu.portfolio_categories,
+        'header_pages': menu.header_pages,
+        'footer_pages': menu.footer_pages,
+        'cities_menu': menu.cities,
+    }
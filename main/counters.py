@@ -0,0 +1,77 @@
+# main/counters.py - Счетчики опубликованных объектов (published_count)
+#
+# Категории услуг, блога, портфолио, FAQ, глоссария и авторы хранят число
+# опубликованных дочерних объектов в колонке published_count. Админка и
+# HTML-карта сайта читают колонку вместо COUNT на каждую строку.
+#
+# Сигналы (main/signals.py) пересчитывают счетчик родителя, когда у объекта
+# меняется родитель или is_published, и при удалении. Пересчет — один
+# UPDATE с подзапросом COUNT, поэтому повторная обработка не вносит ошибку.
+# Массовые операции в обход сигналов (bulk_create в seed_scale, правка в БД)
+# выравнивает manage.py reconcile_counters. Начальные значения заполняет
+# миграция main/0018_fill_published_count.
+
+from collections import namedtuple
+
+from django.apps import apps as global_apps
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+# child — дочерняя модель, field — ForeignKey на родителя
+CounterSpec = namedtuple('CounterSpec', 'child field')
+
+
+def get_counter_specs(apps=global_apps):
+    """apps — реестр моделей; в миграции передается исторический (RunPython)"""
+    post = apps.get_model('blog', 'Post')
+    return (
+        CounterSpec(apps.get_model('main', 'Service'), 'category'),
+        CounterSpec(post, 'category'),
+        CounterSpec(post, 'blog_author'),
+        CounterSpec(apps.get_model('main', 'PortfolioItem'), 'category'),
+        CounterSpec(apps.get_model('main', 'FAQItem'), 'category'),
+        CounterSpec(apps.get_model('main', 'GlossaryTerm'), 'category'),
+    )
+
+
+def parent_model(spec):
+    return spec.child._meta.get_field(spec.field).related_model
+
+
+def counter_state(instance, spec):
+    """(id родителя, опубликован ли) — от этого зависит счетчик"""
+    return getattr(instance, f'{spec.field}_id'), instance.is_published
+
+
+def _published_count(spec):
+    """Подзапрос: число опубликованных дочерних объектов родителя"""
+    children = (
+        spec.child._default_manager.filter(**{spec.field: OuterRef('pk'), 'is_published': True})
+        .order_by()
+        .values(spec.field)
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    return Coalesce(Subquery(children, output_field=IntegerField()), Value(0))
+
+
+def recount(spec, parent_ids):
+    """Пересчитывает счетчики указанных родителей (один UPDATE)"""
+    parent_ids = {pk for pk in parent_ids if pk is not None}
+    if parent_ids:
+        parent_model(spec)._default_manager.filter(pk__in=parent_ids).update(published_count=_published_count(spec))
+
+
+def reconcile(spec):
+    """Исправляет расхождения у всех родителей; возвращает число исправленных"""
+    parents = parent_model(spec)._default_manager.annotate(actual=_published_count(spec))
+    stale = list(parents.exclude(published_count=F('actual')).values_list('pk', flat=True))
+    recount(spec, stale)
+    return len(stale)
+
+
+def reconcile_all(apps=global_apps):
+    return {
+        f'{parent_model(spec)._meta.label_lower} ← {spec.child._meta.label_lower}.{spec.field}': reconcile(spec)
+        for spec in get_counter_specs(apps)
+    }
@@ -0,0 +1,301 @@
+# main/dependencies.py - Граф зависимостей страниц от строк БД
+#
+# Пока рендерится публичная страница (PageDependencyMiddleware для кэша
+# страниц, main/prerender.py для готовых файлов), трекер записывает, что
+# она прочитала через ORM, включая контекст-процессоры:
+#   (модель, pk)     — каждую загруженную из БД строку (сигнал post_init);
+#   (модель, 'list') — каждую выборку из таблицы модели, кроме выборки строк
+#                      по уникальным полям (pk, slug, unique_together):
+#                      страница зависит от состава списка;
+#   (модель, '*')    — вместо отдельных pk, если строк одной модели больше
+#                      MAX_OBJECTS_PER_MODEL.
+# Обратный индекс объект -> пути страниц хранится в PageDependency.
+#
+# При сохранении и удалении объекта (main/signals.py) сбрасываются только
+# страницы, которые от него зависят:
+#   - изменение строки — (модель, pk) и (модель, '*');
+#   - создание, удаление и изменение полей, по которым строят списки
+#     (флаги, даты, порядок, slug, связи), — еще и (модель, 'list').
+# Сброс идет через invalidate_urls (кэш страниц, ETag и готовые файлы), записи
+# сброшенных страниц удаляются — следующий рендер запишет их заново.
+# В запросе сохранения сбрасывается не больше PURGE_SYNC_LIMIT страниц,
+# остальные ставятся в очередь (PagePurge): их дочищает
+#   python manage.py process_page_purges
+# раз в минуту (deploy/seo-agency-counters.service, вместе со счетчиками).
+#
+# Данные из общего кэша (снимок меню, индексы) трекер не видит: их по-прежнему
+# сбрасывает версия контента (main/cache.bump_content_version).
+
+import contextvars
+import hashlib
+import re
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.apps import apps
+from django.db import connections, models, transaction
+from django.db.models.signals import post_init
+
+from .cache import shared_cache
+from .page_cache import get_path_generation, invalidate_urls
+
+current_tracker = contextvars.ContextVar('page_dependencies', default=None)
+
+LIST = 'list'
+ANY = '*'
+MAX_OBJECTS_PER_MODEL = 50
+DEPENDENCIES_CACHE_TIMEOUT = 60 * 60 * 24
+PURGE_BATCH_SIZE = 500
+# Сколько страниц сбрасывать сразу при сохранении объекта (остальные — в фоне)
+PURGE_SYNC_LIMIT = 200
+
+# Служебные модели: не выводятся на страницах или меняются в обход сигналов
+UNTRACKED_APPS = {'admin', 'auth', 'contenttypes', 'sessions'}
+# ImageDerivative читается шаблонами через кэш (main/images.py), страницы сбрасывает process_images
+UNTRACKED_MODELS = {
+    'main.contactrequest', 'main.searchdocument', 'main.mediablob', 'main.pagedependency', 'main.imagederivative',
+    'main.pagepurge',
+}
+
+TABLE_RE = re.compile(r'\b(?:FROM|JOIN)\s+"?(\w+)"?', re.IGNORECASE)
+
+
+def is_tracked(model):
+    meta = model._meta
+    return meta.app_label not in UNTRACKED_APPS and meta.label_lower not in UNTRACKED_MODELS
+
+
+def tracked_models():
+    return [model for model in apps.get_models() if is_tracked(model)]
+
+
+def list_fields(model):
+    """
+    Поля, от которых зависит состав списков: все, кроме текста, файлов
+    и автоматических дат изменения
+    """
+    fields = []
+    for field in model._meta.concrete_fields:
+        if field.primary_key or getattr(field, 'auto_now', False):
+            continue
+        # CKEditor5Field и подобные наследуют Field напрямую: смотрим на тип в БД
+        if field.get_internal_type() in ('TextField', 'FileField', 'ImageField', 'JSONField'):
+            continue
+        if (
+            isinstance(field, models.CharField)
+            and not isinstance(field, models.SlugField)
+            and not field.choices
+            and not field.unique
+        ):
+            continue
+        fields.append(field)
+    return fields
+
+
+def unique_column_sets(model):
+    """Наборы колонок, однозначно задающие строку: unique-поля и unique_together"""
+    meta = model._meta
+    sets = [{field.column} for field in meta.concrete_fields if field.unique]
+    for names in meta.unique_together:
+        sets.append({meta.get_field(name).column for name in names})
+    for constraint in meta.constraints:
+        if isinstance(constraint, models.UniqueConstraint) and constraint.fields and constraint.condition is None:
+            sets.append({meta.get_field(name).column for name in constraint.fields})
+    return sets
+
+
+class TableInfo:
+    """Модель таблицы и наборы ее уникальных колонок"""
+
+    def __init__(self, model):
+        self.label = model._meta.concrete_model._meta.label_lower
+        self.unique_sets = unique_column_sets(model)
+        self.pinned_re = re.compile(r'"%s"\."(\w+)" (?:= %%s|IN \()' % re.escape(model._meta.db_table))
+
+    def is_lookup(self, sql):
+        """Выборка строк по значениям уникального набора колонок (pk, slug, unique_together)"""
+        if ' OR ' in sql:
+            return False
+        pinned = set(self.pinned_re.findall(sql))
+        return any(columns <= pinned for columns in self.unique_sets)
+
+
+_tables = None
+_labels = None
+
+
+def get_tables():
+    """{таблица: TableInfo} для отслеживаемых моделей, включая таблицы many-to-many"""
+    global _tables
+    if _tables is None:
+        _tables = {
+            model._meta.db_table: TableInfo(model)
+            for model in apps.get_models(include_auto_created=True)
+            if is_tracked(model)
+        }
+    return _tables
+
+
+def _tracked_label(model):
+    global _labels
+    if _labels is None:
+        _labels = {model: model._meta.concrete_model._meta.label_lower for model in tracked_models()}
+    return _labels.get(model)
+
+
+class DependencyTracker:
+    """Зависимости одной страницы"""
+
+    def __init__(self, active=True):
+        # Неактивный трекер ничего не записывает (middleware включает его перед view)
+        self.active = active
+        self.objects = defaultdict(set)
+        self.lists = set()
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        if self.active and sql.lstrip()[:6].upper() == 'SELECT':
+            self.read_sql(sql)
+        return execute(sql, params, many, context)
+
+    def read_sql(self, sql):
+        tables = get_tables()
+        names = TABLE_RE.findall(sql)
+        if not names:
+            return
+        primary = tables.get(names[0])
+        if primary is not None and primary.is_lookup(sql):
+            # Строки по pk/slug: связанные таблицы в такой выборке — select_related
+            return
+        for name in names:
+            info = tables.get(name)
+            if info is not None:
+                self.lists.add(info.label)
+
+    def dependencies(self):
+        """Множество (модель, ключ)"""
+        result = {(label, LIST) for label in self.lists}
+        for label, pks in self.objects.items():
+            if len(pks) > MAX_OBJECTS_PER_MODEL:
+                result.add((label, ANY))
+            else:
+                result.update((label, str(pk)) for pk in pks)
+        return result
+
+
+def object_loaded(sender, instance, **kwargs):
+    tracker = current_tracker.get()
+    if tracker is None or not tracker.active or instance.pk is None:
+        return
+    label = _tracked_label(sender)
+    if label is not None:
+        tracker.objects[label].add(instance.pk)
+
+
+def install_dependency_tracking():
+    """Подключает учет загруженных строк (вызывается из MainConfig.ready)"""
+    post_init.connect(object_loaded, dispatch_uid='page_dependencies')
+
+
+@contextmanager
+def track_dependencies(active=True):
+    """Собирает зависимости рендера внутри блока with"""
+    tracker = DependencyTracker(active)
+    token = current_tracker.set(tracker)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(tracker.execute_wrapper))
+            yield tracker
+    finally:
+        current_tracker.reset(token)
+
+
+def _hash(value):
+    return hashlib.md5(value.encode('utf-8'), usedforsecurity=False).hexdigest()
+
+
+def record_dependencies(path, dependencies):
+    """Сохраняет зависимости страницы (варианты страницы дополняют друг друга)"""
+    from .models import PageDependency
+
+    if not dependencies:
+        return
+    # Тот же набор для того же поколения страницы уже записан
+    digest = _hash('|'.join(sorted(f'{label}:{key}' for label, key in dependencies)))
+    marker = f'deps:{_hash(path)}:{get_path_generation(path)}:{digest}'
+    if not shared_cache().add(marker, 1, DEPENDENCIES_CACHE_TIMEOUT):
+        return
+    PageDependency.objects.bulk_create(
+        [PageDependency(path=path, model_label=label, key=key) for label, key in dependencies],
+        batch_size=PURGE_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def object_keys(instance, list_changed=False):
+    """Ключи графа, которые затрагивает изменение объекта"""
+    label = instance._meta.concrete_model._meta.label_lower
+    keys = [(label, str(instance.pk)), (label, ANY)]
+    if list_changed:
+        keys.append((label, LIST))
+    return keys
+
+
+def list_values(instance):
+    return {field.attname: getattr(instance, field.attname) for field in list_fields(type(instance))}
+
+
+def purge_paths(paths):
+    """Сбрасывает страницы и удаляет их записи в графе"""
+    from .models import PageDependency
+
+    paths = sorted(paths)
+    # Сначала удаляем записи, потом меняем поколение: рендер после сброса запишет их заново
+    for start in range(0, len(paths), PURGE_BATCH_SIZE):
+        PageDependency.objects.filter(path__in=paths[start:start + PURGE_BATCH_SIZE]).delete()
+    invalidate_urls(paths)
+
+
+def purge_dependents(keys):
+    """
+    Сбрасывает страницы, зависящие от ключей (модель, ключ): первые
+    PURGE_SYNC_LIMIT сразу, остальные ставит в очередь. Возвращает все пути
+    """
+    from .models import PageDependency, PagePurge
+
+    by_label = defaultdict(list)
+    for label, key in keys:
+        by_label[label].append(key)
+    paths = set()
+    for label, label_keys in by_label.items():
+        paths.update(
+            PageDependency.objects.filter(model_label=label, key__in=label_keys).values_list('path', flat=True)
+        )
+    if not paths:
+        return []
+
+    paths = sorted(paths)
+    purge_paths(paths[:PURGE_SYNC_LIMIT])
+    if len(paths) > PURGE_SYNC_LIMIT:
+        PagePurge.objects.bulk_create(
+            [PagePurge(path=path) for path in paths[PURGE_SYNC_LIMIT:]],
+            batch_size=PURGE_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+    return paths
+
+
+def process_page_purges():
+    """Сбрасывает страницы из очереди пачками. Возвращает число страниц"""
+    from .models import PagePurge
+
+    purged = 0
+    while True:
+        batch = list(PagePurge.objects.order_by('pk').values_list('pk', 'path')[:PURGE_BATCH_SIZE])
+        if not batch:
+            return purged
+        # Сначала забираем пути из очереди: повторная постановка во время сброса не потеряется
+        with transaction.atomic():
+            PagePurge.objects.filter(pk__in=[pk for pk, _ in batch]).delete()
+            purge_paths(path for _, path in batch)
+        purged += len(batch)
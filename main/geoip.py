@@ -0,0 +1,177 @@
+# main/geoip.py - Определение города по IP без внешних сервисов
+#
+# manage.py build_geoip преобразует CSV "начало диапазона, конец, ..., город"
+# (например, DB-IP IP to City Lite) в компактный двоичный файл:
+#   заголовок  MAGIC, число диапазонов n, число городов m
+#   starts     uint32[n]  — начала диапазонов IPv4, по возрастанию
+#   ends       uint32[n]  — концы диапазонов
+#   cities     uint16[n]  — номер города в таблице slug
+#   таблица    m строк slug городов сайта (UTF-8, через \n)
+# В файл попадают только диапазоны городов сайта (City), соседние диапазоны
+# одного города склеиваются.
+#
+# Файл отображается в память (mmap) только для чтения: все воркеры gunicorn
+# используют одни и те же страницы page cache. Поиск — bisect по starts,
+# без запросов к БД и сети. Новый файл подхватывается без перезапуска
+# (проверка mtime не чаще раза в GEOIP_RECHECK_SECONDS).
+
+import ipaddress
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_right
+
+from django.conf import settings
+
+MAGIC = b'SEOGEO1\0'
+HEADER = struct.Struct('<8sII')
+GEOIP_RECHECK_SECONDS = 60
+
+
+def ip_to_int(value):
+    """Целое число для IPv4-адреса (строка или число) или None"""
+    value = (value or '').strip()
+    if value.isdigit():
+        number = int(value)
+        return number if number < 2 ** 32 else None
+    try:
+        address = ipaddress.ip_address(value)
+    except ValueError:
+        return None
+    if address.version == 6:
+        # IPv4, упакованный в IPv6 (::ffff:1.2.3.4)
+        address = address.ipv4_mapped
+        if address is None:
+            return None
+    return int(address)
+
+
+def _little_endian(values):
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_database(path, ranges, slugs):
+    """
+    Записывает файл атомарно. ranges — (start, end, номер slug) по
+    возрастанию start без пересечений.
+    """
+    starts, ends, cities = array('I'), array('I'), array('H')
+    for start, end, city in ranges:
+        starts.append(start)
+        ends.append(end)
+        cities.append(city)
+
+    tmp_path = f'{path}.tmp'
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(starts), len(slugs)))
+        f.write(_little_endian(starts))
+        f.write(_little_endian(ends))
+        f.write(_little_endian(cities))
+        f.write('\n'.join(slugs).encode('utf-8'))
+    os.replace(tmp_path, path)
+
+
+def build_ranges(rows, resolve):
+    """
+    rows — (начало, конец, город) из CSV; resolve(город) -> slug или None.
+    Возвращает (диапазоны для write_database, таблица slug)
+    """
+    slugs, slug_index, ranges = [], {}, []
+    for start, end, city_name in rows:
+        slug = resolve(city_name)
+        start, end = ip_to_int(start), ip_to_int(end)
+        # Строки IPv6 и города не из списка сайта пропускаются
+        if slug is None or start is None or end is None or end < start:
+            continue
+        if slug not in slug_index:
+            slug_index[slug] = len(slugs)
+            slugs.append(slug)
+        ranges.append((start, end, slug_index[slug]))
+
+    ranges.sort()
+    merged = []
+    for start, end, city in ranges:
+        if merged and start <= merged[-1][1]:
+            # Пересечение диапазонов: оставляем первый
+            if end <= merged[-1][1]:
+                continue
+            start = merged[-1][1] + 1
+        if merged and merged[-1][2] == city and start == merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], end, city)
+        else:
+            merged.append((start, end, city))
+    return merged, slugs
+
+
+class GeoIPDatabase:
+    """Файл базы, отображенный в память"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.stat = os.fstat(f.fileno())
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count, city_count = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f'{path}: не файл build_geoip')
+        if sys.byteorder != 'little':
+            raise ValueError('Файл build_geoip рассчитан на little-endian')
+
+        view = memoryview(self._mmap)
+        offset = HEADER.size
+        self.starts = view[offset:offset + 4 * count].cast('I')
+        offset += 4 * count
+        self.ends = view[offset:offset + 4 * count].cast('I')
+        offset += 4 * count
+        self.cities = view[offset:offset + 2 * count].cast('H')
+        offset += 2 * count
+        self.slugs = bytes(view[offset:]).decode('utf-8').split('\n') if city_count else []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def lookup(self, ip):
+        """slug города или None"""
+        number = ip_to_int(ip)
+        if number is None:
+            return None
+        i = bisect_right(self.starts, number) - 1
+        if i < 0 or number > self.ends[i]:
+            return None
+        return self.slugs[self.cities[i]]
+
+
+# База текущего процесса и время последней проверки файла
+_database = None
+_checked_at = None
+
+
+def get_database():
+    """База из GEOIP_DB_PATH или None, если файл не создан"""
+    global _database, _checked_at
+    now = time.monotonic()
+    if _checked_at is not None and now - _checked_at < GEOIP_RECHECK_SECONDS:
+        return _database
+    _checked_at = now
+
+    path = getattr(settings, 'GEOIP_DB_PATH', None)
+    try:
+        stat = os.stat(path) if path else None
+    except FileNotFoundError:
+        stat = None
+    if stat is None:
+        _database = None
+    elif _database is None or (stat.st_ino, stat.st_mtime_ns) != (_database.stat.st_ino, _database.stat.st_mtime_ns):
+        _database = GeoIPDatabase(path)
+    return _database
+
+
+def lookup_city(ip):
+    database = get_database()
+    return database.lookup(ip) if database is not None else None
@@ -0,0 +1,207 @@
+# main/glossary_index.py - Индекс глоссария в памяти процесса
+#
+# Все опубликованные термины загружаются один раз на версию глоссария
+# (версия увеличивается сигналами при сохранении/удалении термина или категории).
+# Индекс содержит:
+#   - термины, отсортированные по алфавиту, и ключи для бинарного поиска по префиксу;
+#   - корзины по первой букве (фильтр по алфавиту);
+#   - обратный индекс основа слова → термины (русский и английский стемминг).
+#
+# Фильтры страницы глоссария, поиск и автодополнение работают без запросов к БД:
+#   index = get_glossary_index()
+#   index.filter(alphabet='ru', query='ссылки')
+#   index.autocomplete('инд')
+
+import re
+from bisect import bisect_left
+from collections import defaultdict, namedtuple
+
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .cache import VersionedSnapshot
+
+GLOSSARY_INDEX_TIMEOUT = 60 * 60 * 24
+
+# Сколько слов определения хранить для карточек (в шаблоне — truncatewords:30);
+# поиск идет по полному тексту определения
+DEFINITION_WORDS = 40
+
+GlossaryCategoryEntry = namedtuple('GlossaryCategoryEntry', 'pk name slug description order')
+GlossaryEntry = namedtuple('GlossaryEntry', 'pk term slug definition category')
+
+WORD_RE = re.compile(r'[a-zа-яё0-9]+')
+RU_LETTER_RE = re.compile(r'[а-яё]')
+EN_LETTER_RE = re.compile(r'[a-z]')
+
+# Окончания для упрощенного стемминга (от длинных к коротким)
+RU_ENDINGS = sorted([
+    'иями', 'ями', 'ами', 'иях', 'ях', 'ах', 'ией', 'ей', 'ой', 'ий', 'ый', 'ая', 'яя',
+    'ое', 'ее', 'ые', 'ие', 'ого', 'его', 'ому', 'ему', 'ыми', 'ими', 'ых', 'их', 'ую', 'юю',
+    'ом', 'ем', 'ам', 'ям', 'ов', 'ев', 'ия', 'ию', 'ии', 'ть', 'ться', 'ется', 'ются',
+    'ает', 'ают', 'ует', 'уют', 'ить', 'ать', 'ять', 'ение', 'ения', 'ению', 'ением', 'ость',
+    'ости', 'остью', 'а', 'я', 'о', 'е', 'ы', 'и', 'у', 'ю', 'ь', 'й',
+], key=len, reverse=True)
+EN_ENDINGS = ['ings', 'ing', 'ies', 'ed', 'es', 's']
+MIN_STEM = 3
+
+
+def stem(word):
+    """Упрощенный стемминг: отбрасывает типичное окончание, оставляя основу не короче 3 букв"""
+    word = word.lower().replace('ё', 'е')
+    endings = RU_ENDINGS if RU_LETTER_RE.search(word) else EN_ENDINGS
+    for ending in endings:
+        if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM:
+            return word[:-len(ending)]
+    return word
+
+
+def tokenize(text):
+    """Основы слов текста"""
+    return [stem(word) for word in WORD_RE.findall((text or '').lower())]
+
+
+def _first_letter(term):
+    return term[:1].upper().replace('Ё', 'Е')
+
+
+class GlossaryIndex:
+    """
+    Неизменяемый индекс глоссария (строится целиком, заменяется новой версией).
+    texts — {pk: полный текст определения} для поиска; без него ищется по entry.definition.
+    """
+
+    def __init__(self, categories, terms, texts=None):
+        self.built_at = timezone.now()
+        self.categories = tuple(categories)
+        self.category_by_slug = {category.slug: category for category in self.categories}
+
+        category_order = {category.pk: category.order for category in self.categories}
+        # Алфавитный порядок и порядок "категория, затем термин" — как на страницах раньше
+        self.terms = tuple(sorted(terms, key=lambda entry: entry.term.lower()))
+        self.keys = [entry.term.lower() for entry in self.terms]
+        self.grouped = tuple(sorted(
+            range(len(self.terms)),
+            key=lambda i: (category_order[self.terms[i].category.pk], self.keys[i]),
+        ))
+
+        letters = defaultdict(list)
+        postings = defaultdict(set)
+        for i, entry in enumerate(self.terms):
+            letters[_first_letter(entry.term)].append(i)
+            text = entry.definition if texts is None else texts.get(entry.pk, entry.definition)
+            for token in tokenize(entry.term) + tokenize(text):
+                postings[token].add(i)
+        self.letters = {letter: frozenset(items) for letter, items in letters.items()}
+        self.postings = {token: frozenset(items) for token, items in postings.items()}
+        self.tokens = sorted(self.postings)
+
+    def _alphabet(self, alphabet):
+        if not alphabet or alphabet == 'all':
+            return None
+        if alphabet in ('ru', 'en'):
+            pattern = RU_LETTER_RE if alphabet == 'ru' else EN_LETTER_RE
+            return frozenset(
+                i for letter, items in self.letters.items()
+                if pattern.match(letter.lower()) for i in items
+            )
+        return self.letters.get(_first_letter(alphabet), frozenset())
+
+    def _prefix_tokens(self, prefix):
+        start = bisect_left(self.tokens, prefix)
+        result = set()
+        for token in self.tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            result |= self.postings[token]
+        return result
+
+    def _search(self, query):
+        """Термины, содержащие все слова запроса (последнее слово — как префикс)"""
+        words = WORD_RE.findall(query.lower())
+        if not words:
+            return None
+        found = None
+        for position, word in enumerate(words):
+            matches = set(self.postings.get(stem(word), ()))
+            if position == len(words) - 1:
+                matches |= self._prefix_tokens(word.replace('ё', 'е'))
+            found = matches if found is None else found & matches
+            if not found:
+                return frozenset()
+        return frozenset(found)
+
+    def filter(self, category_slug=None, alphabet=None, query=None, grouped=False):
+        """Термины с учетом категории, буквы/алфавита и поискового запроса"""
+        selected = None
+        for subset in (self._alphabet(alphabet), self._search(query or '')):
+            if subset is not None:
+                selected = subset if selected is None else selected & subset
+
+        order = self.grouped if grouped else range(len(self.terms))
+        result = []
+        for i in order:
+            if selected is not None and i not in selected:
+                continue
+            entry = self.terms[i]
+            if category_slug and entry.category.slug != category_slug:
+                continue
+            result.append(entry)
+        return result
+
+    def group_by_category(self, entries):
+        """{категория: [термины]} в порядке категорий"""
+        groups = {}
+        for entry in entries:
+            groups.setdefault(entry.category, []).append(entry)
+        return groups
+
+    def autocomplete(self, prefix, limit=10):
+        """Сначала термины, начинающиеся с prefix, затем термины со словом на prefix"""
+        prefix = (prefix or '').strip().lower()
+        if not prefix:
+            return []
+
+        result = []
+        start = bisect_left(self.keys, prefix)
+        for i in range(start, len(self.keys)):
+            if not self.keys[i].startswith(prefix) or len(result) >= limit:
+                break
+            result.append(i)
+
+        if len(result) < limit:
+            seen = set(result)
+            for i in sorted(self._search(prefix) or (), key=lambda i: self.keys[i]):
+                if i not in seen:
+                    result.append(i)
+                    if len(result) >= limit:
+                        break
+        return [self.terms[i] for i in result]
+
+
+def build_glossary_index():
+    """Загружает опубликованные термины из БД (два запроса)"""
+    from .models import GlossaryCategory, GlossaryTerm
+
+    categories = {
+        category.pk: GlossaryCategoryEntry(category.pk, category.name, category.slug,
+                                           category.description, category.order)
+        for category in GlossaryCategory.objects.filter(is_active=True).order_by('order', 'name')
+    }
+    terms = []
+    texts = {}
+    for term in GlossaryTerm.objects.filter(is_published=True, category_id__in=list(categories)).only(
+        'term', 'slug', 'definition', 'category_id'
+    ):
+        text = strip_tags(term.definition)
+        # В записи только начало определения для карточки, в поиск — весь текст
+        definition = ' '.join(text.split()[:DEFINITION_WORDS])
+        terms.append(GlossaryEntry(term.pk, term.term, term.slug, definition, categories[term.category_id]))
+        texts[term.pk] = text
+    return GlossaryIndex(categories.values(), terms, texts)
+
+
+# Индекс в памяти процесса: два запроса на версию (версию увеличивают сигналы)
+_index = VersionedSnapshot('glossary', build_glossary_index, GLOSSARY_INDEX_TIMEOUT)
+get_glossary_index = _index.get
+invalidate_glossary_index = _index.invalidate
@@ -0,0 +1,72 @@
+# main/head_scripts.py - Скомпилированный реестр кастомных скриптов для <head>
+#
+# Все активные CustomHeadScript читаются одним запросом на версию контента
+# (CustomHeadScript сбрасывает версию через сигналы, как модели меню)
+# и раскладываются по ключам (page_type, page_slug):
+#   ('', '')           — скрипты для всех страниц;
+#   (page_type, '')    — для всех страниц типа (+ общие);
+#   (page_type, slug)  — для конкретной страницы (+ общие и для типа).
+# Значение — {позиция: готовый HTML}, поэтому шаблону нужен один поиск по словарю:
+#   {% get_head_scripts page_type page_slug as head_scripts %}
+#   {{ head_scripts.early }}
+
+from .cache import get_or_set
+
+HEAD_SCRIPTS_CACHE_KEY = 'head_scripts:registry'
+HEAD_SCRIPTS_CACHE_TIMEOUT = 60 * 60 * 24
+
+ANY = ''
+
+
+def _join(scripts):
+    """{позиция: HTML} из скриптов, уже отсортированных по order и name"""
+    positions = {}
+    for position, html in scripts:
+        positions.setdefault(position, []).append(html)
+    return {position: '\n'.join(parts) for position, parts in positions.items()}
+
+
+def build_head_scripts_registry():
+    """Собирает реестр из БД (один запрос)"""
+    from .models import CustomHeadScript
+
+    # Порядок скриптов внутри позиции — общий (order, name), как раньше
+    scripts = list(
+        CustomHeadScript.objects.filter(is_active=True).order_by('order', 'name').values_list(
+            'page_type', 'page_slug', 'position', 'html_content'
+        )
+    )
+
+    keys = {(ANY, ANY)}
+    for page_type, page_slug, _, _ in scripts:
+        if page_type:
+            keys.add((page_type, ANY))
+            if page_slug:
+                keys.add((page_type, page_slug))
+
+    registry = {}
+    for key_type, key_slug in keys:
+        # Те же условия, что в CustomHeadScript.should_display_on_page
+        matched = [
+            (position, html)
+            for page_type, page_slug, position, html in scripts
+            if not page_type or (page_type == key_type and (not page_slug or page_slug == key_slug))
+        ]
+        registry[(key_type, key_slug)] = _join(matched)
+    return registry
+
+
+def get_head_scripts_registry():
+    return get_or_set(HEAD_SCRIPTS_CACHE_KEY, build_head_scripts_registry, timeout=HEAD_SCRIPTS_CACHE_TIMEOUT)
+
+
+def get_head_scripts(page_type, page_slug=None):
+    """{позиция: HTML} для страницы; ключи без скриптов отсутствуют"""
+    registry = get_head_scripts_registry()
+    page_type = page_type or ANY
+    page_slug = page_slug or ANY
+    return (
+        registry.get((page_type, page_slug))
+        or registry.get((page_type, ANY))
+        or registry[(ANY, ANY)]
+    )
@@ -0,0 +1,99 @@
+# main/http_cache.py - Политики HTTP-кэширования страниц (ETag / Last-Modified)
+#
+# Использование во views:
+#
+#   @public_page(last_modified=city_last_modified)
+#   def city_detail(request, slug): ...
+#
+#   @private_page
+#   def contacts(request): ...
+#
+# Для публичных страниц main.middleware.ConditionalGetMiddleware до вызова view
+# вычисляет ETag и Last-Modified и при совпадении отвечает 304 без рендера шаблона.
+# Публичные страницы анонимных посетителей дополнительно кэшируются целиком
+# (main.middleware.PageCacheMiddleware, main/page_cache.py).
+# Страницы с формами и сообщениями (private) никогда не кэшируются.
+
+import hashlib
+
+from django.db.models import Max
+
+from .cache import get_content_modified, get_content_version
+from .page_cache import get_page_generation
+
+PUBLIC = 'public'
+PRIVATE = 'private'
+
+
+def public_page(last_modified=None, on_hit=None, query=()):
+    """
+    Помечает view как публичную страницу с условными GET-запросами.
+    last_modified(request, *args, **kwargs) возвращает datetime изменения
+    объекта(ов), из которых построена страница, или None.
+    on_hit(request, *args, **kwargs) вызывается вместо view, когда страница
+    отдана из кэша (main/page_cache.py), например для учета просмотров.
+    query — GET-параметры, которые читает view; запросы с другими
+    параметрами (utm-метки и т.п.) идут мимо кэша страниц.
+    """
+    def decorator(view_func):
+        view_func.cache_policy = PUBLIC
+        view_func.last_modified_func = last_modified
+        view_func.page_cache_hit_func = on_hit
+        view_func.page_cache_query = frozenset(query)
+        return view_func
+    return decorator
+
+
+def private_page(view_func):
+    """Помечает view как страницу сессии/формы: no-store, без ETag"""
+    view_func.cache_policy = PRIVATE
+    view_func.last_modified_func = None
+    return view_func
+
+
+def last_updated(*querysets, field='updated_at'):
+    """
+    Возвращает максимальное значение поля (по умолчанию updated_at)
+    по нескольким querysets или моделям. Один агрегатный запрос на queryset.
+    """
+    values = []
+    for qs in querysets:
+        if hasattr(qs, '_default_manager'):
+            qs = qs._default_manager.all()
+        values.append(qs.aggregate(value=Max(field))['value'])
+    return latest(*values)
+
+
+def latest(*values):
+    """Возвращает самую позднюю из дат, пропуская None"""
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+def get_page_validators(request, view_func, view_args, view_kwargs):
+    """
+    Возвращает (etag, last_modified) для публичной страницы
+    или None, если страницу нельзя проверить условным запросом.
+    """
+    version = get_content_version()
+    if version is None:
+        # Общий кэш отключен: изменения меню/футера отследить нельзя
+        return None
+
+    last_modified_func = getattr(view_func, 'last_modified_func', None)
+    page_modified = last_modified_func(request, *view_args, **view_kwargs) if last_modified_func else None
+    # Страница зависит и от общего макета (меню, футер), поэтому учитываем время изменения контента
+    last_modified = latest(page_modified, get_content_modified())
+
+    # Слабый ETag: путь с параметрами, версия контента, поколение страницы
+    # (точечный сброс, main/page_cache.invalidate_urls) и время изменения.
+    # Тело с тем же ETag побайтно может отличаться (CSRF-токен, случайные блоки),
+    # поэтому валидатор слабый (W/)
+    parts = [
+        request.get_full_path(),
+        str(version),
+        str(get_page_generation(request)),
+        last_modified.isoformat() if last_modified else '',
+    ]
+    etag = 'W/"%s"' % hashlib.md5('|'.join(parts).encode('utf-8'), usedforsecurity=False).hexdigest()
+    return etag, last_modified
@@ -0,0 +1,277 @@
+# main/images.py - Адаптивные копии загруженных изображений
+#
+# При сохранении статьи, услуги, проекта, автора, сотрудника или отзыва
+# сигнал ставит его изображения в очередь (ImageDerivative со статусом pending).
+# Команда process_images (deploy/seo-agency-images.timer, раз в минуту)
+# уменьшает их Pillow до ширин IMAGE_WIDTHS в WebP и JPEG (PNG, если есть
+# прозрачность) и записывает исходные размеры.
+#
+# Шаблоны выводят картинку тегом:
+#   {% load custom_filters %}
+#   {% responsive_image project.main_image project.get_main_image_alt sizes="(max-width: 768px) 100vw, 33vw" %}
+# Тег строит <picture> с srcset/sizes, width/height (без сдвига верстки)
+# и loading="lazy". Пока копий нет, выводится исходный файл, как раньше.
+# Одинаковые загрузки хранятся одним файлом blobs/... (main/storage.py),
+# поэтому копии у них тоже общие.
+#
+# Сведения о копиях хранятся в общем кэше отдельно для каждого исходника
+# (images:info:<хэш пути>): тег читает только свои ключи. Обработав
+# изображение, process_images обновляет его ключ и сбрасывает страницы
+# объектов, которые его выводят (граф зависимостей, main/dependencies.py),
+# — они перерисуются уже с srcset.
+
+import hashlib
+import io
+from collections import namedtuple
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import models
+from django.db.models import Q
+from django.db.models.fields.files import FieldFile
+
+from .cache import _MISSING, _NONE, shared_cache
+from .dependencies import object_keys, purge_dependents
+
+# Ширины копий; копии шире исходника не создаются
+IMAGE_WIDTHS = (320, 480, 768, 1024, 1440, 1920)
+# Ширина для src (браузеры без srcset)
+DEFAULT_WIDTH = 768
+DERIVATIVES_DIR = 'derivatives'
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+# Копии пишутся под своими именами, в обход хранилища по хэшу (main/storage.py)
+derivative_storage = FileSystemStorage()
+
+IMAGE_INFO_CACHE_TIMEOUT = 60 * 60 * 24
+
+ImageInfo = namedtuple('ImageInfo', 'width height widths fallback')
+
+
+def get_image_sources():
+    """{модель: поля с изображениями} — ImageField или JSON-список путей"""
+    from blog.models import Post
+
+    from .models import Author, PortfolioItem, Service, TeamMember, Testimonial
+
+    return {
+        Post: ('image',),
+        Service: ('image',),
+        PortfolioItem: ('main_image', 'gallery_images'),
+        Author: ('photo',),
+        TeamMember: ('photo',),
+        Testimonial: ('photo',),
+    }
+
+
+def source_name(value):
+    """Путь файла в хранилище из FieldFile, пути или URL в MEDIA_URL"""
+    if isinstance(value, FieldFile):
+        return value.name or ''
+    if not isinstance(value, str):
+        return ''
+    if value.startswith(settings.MEDIA_URL):
+        value = value[len(settings.MEDIA_URL):]
+    return value.lstrip('/')
+
+
+def image_names(instance, fields):
+    names = []
+    for field in fields:
+        value = getattr(instance, field)
+        for item in value if isinstance(value, list) else [value]:
+            name = source_name(item)
+            if name:
+                names.append(name)
+    return names
+
+
+def enqueue_images(names):
+    """Ставит в очередь изображения, для которых еще нет записи"""
+    from .models import ImageDerivative
+
+    names = set(names)
+    if not names:
+        return 0
+    known = set(ImageDerivative.objects.filter(source__in=names).values_list('source', flat=True))
+    new = [ImageDerivative(source=name) for name in sorted(names - known)]
+    ImageDerivative.objects.bulk_create(new, ignore_conflicts=True)
+    return len(new)
+
+
+def enqueue_all():
+    """Ставит в очередь изображения всех объектов (первый запуск)"""
+    queued = 0
+    for model, fields in get_image_sources().items():
+        for instance in model._default_manager.only('pk', *fields).iterator():
+            queued += enqueue_images(image_names(instance, fields))
+    return queued
+
+
+def image_owners(names):
+    """Объекты, которые выводят хотя бы одно из изображений names"""
+    names = set(names)
+    for model, fields in get_image_sources().items():
+        query = Q()
+        for field in fields:
+            if isinstance(model._meta.get_field(field), models.JSONField):
+                # Галерея — JSON-список путей: ищем подстрокой и проверяем ниже
+                for name in names:
+                    query |= Q(**{f'{field}__icontains': name})
+            else:
+                query |= Q(**{f'{field}__in': names})
+        for instance in model._default_manager.filter(query).only('pk', *fields).iterator():
+            if names.intersection(image_names(instance, fields)):
+                yield instance
+
+
+def derivative_name(source, width, ext):
+    """derivatives/<папка исходника>/<имя>-<хэш пути>-<ширина>.<ext>"""
+    path = PurePosixPath(source)
+    digest = hashlib.md5(source.encode('utf-8'), usedforsecurity=False).hexdigest()[:8]
+    return str(PurePosixPath(DERIVATIVES_DIR) / path.parent / f'{path.stem}-{digest}-{width}.{ext}')
+
+
+def derivative_widths(width):
+    widths = [bucket for bucket in IMAGE_WIDTHS if bucket < width]
+    if width <= IMAGE_WIDTHS[-1]:
+        widths.append(width)
+    return widths
+
+
+def _save(name, image, format, **options):
+    buffer = io.BytesIO()
+    image.save(buffer, format=format, **options)
+    # Имена детерминированы: перезаписываем, а не получаем name_AbC123.webp
+    if derivative_storage.exists(name):
+        derivative_storage.delete(name)
+    derivative_storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def delete_derivatives(source):
+    """Удаляет копии изображения и запись о них (исходник удален или перенесен)"""
+    from .models import ImageDerivative
+
+    derivative = ImageDerivative.objects.filter(source=source).first()
+    if derivative is None:
+        return
+    for width in derivative.widths:
+        for ext in ('webp', derivative.fallback):
+            derivative_storage.delete(derivative_name(source, width, ext))
+    derivative.delete()
+    shared_cache().delete(_info_key(source))
+
+
+def render_derivatives(derivative):
+    """Создает копии одного изображения и заполняет размеры"""
+    from PIL import Image, ImageOps
+
+    with default_storage.open(derivative.source, 'rb') as f:
+        image = Image.open(f)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    width, height = image.size
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    fallback = 'png' if has_alpha else 'jpg'
+
+    widths = derivative_widths(width)
+    for target in widths:
+        resized = image if target == width else image.resize(
+            (target, max(1, round(height * target / width))), Image.LANCZOS
+        )
+        _save(derivative_name(derivative.source, target, 'webp'), resized, 'WEBP', quality=WEBP_QUALITY, method=4)
+        if has_alpha:
+            _save(derivative_name(derivative.source, target, 'png'), resized, 'PNG', optimize=True)
+        else:
+            _save(
+                derivative_name(derivative.source, target, 'jpg'), resized, 'JPEG',
+                quality=JPEG_QUALITY, optimize=True, progressive=True,
+            )
+
+    derivative.width = width
+    derivative.height = height
+    derivative.widths = widths
+    derivative.fallback = fallback
+    derivative.status = derivative.READY
+    derivative.error = ''
+
+
+def process_pending(limit=None, retry_failed=False):
+    """Обрабатывает очередь. Возвращает (готово, ошибок)"""
+    from PIL import Image, UnidentifiedImageError
+
+    from .models import ImageDerivative
+
+    statuses = [ImageDerivative.PENDING] + ([ImageDerivative.FAILED] if retry_failed else [])
+    queue = ImageDerivative.objects.filter(status__in=statuses).order_by('pk')
+    if limit:
+        queue = queue[:limit]
+
+    ready = failed = 0
+    rendered = []
+    for derivative in queue:
+        try:
+            render_derivatives(derivative)
+            ready += 1
+            rendered.append(derivative.source)
+        except (OSError, ValueError, UnidentifiedImageError, Image.DecompressionBombError) as exc:
+            # DecompressionBombError: размер в пикселях больше Image.MAX_IMAGE_PIXELS * 2
+            derivative.status = ImageDerivative.FAILED
+            derivative.error = str(exc)
+            failed += 1
+        derivative.save()
+        _store_info(derivative)
+
+    if rendered:
+        # Страницы с этими изображениями перерисуются с srcset
+        purge_dependents({key for owner in image_owners(rendered) for key in object_keys(owner)})
+    return ready, failed
+
+
+# --- Для шаблонов ---
+
+def _info_key(source):
+    return 'images:info:' + hashlib.md5(source.encode('utf-8'), usedforsecurity=False).hexdigest()
+
+
+def _derivative_info(derivative):
+    if derivative is None or derivative.status != derivative.READY:
+        return None
+    return ImageInfo(derivative.width, derivative.height, tuple(derivative.widths), derivative.fallback)
+
+
+def _store_info(derivative):
+    info = _derivative_info(derivative)
+    shared_cache().set(_info_key(derivative.source), _NONE if info is None else info, IMAGE_INFO_CACHE_TIMEOUT)
+
+
+def get_image_info(image):
+    """ImageInfo изображения или None, если копий пока нет"""
+    from .models import ImageDerivative
+
+    name = source_name(image)
+    if not name:
+        return None
+    # Только общий кэш: после обработки изображения все воркеры сразу видят копии
+    key = _info_key(name)
+    info = shared_cache().get(key, _MISSING)
+    if info is _MISSING:
+        info = _derivative_info(ImageDerivative.objects.filter(source=name).first())
+        shared_cache().set(key, _NONE if info is None else info, IMAGE_INFO_CACHE_TIMEOUT)
+    return None if info == _NONE else info
+
+
+def srcset(source, info, ext):
+    return ', '.join(
+        f'{derivative_storage.url(derivative_name(source, width, ext))} {width}w' for width in info.widths
+    )
+
+
+def default_src(source, info):
+    width = next((width for width in info.widths if width >= DEFAULT_WIDTH), info.widths[-1])
+    return derivative_storage.url(derivative_name(source, width, info.fallback))
@@ -0,0 +1,124 @@
+# main/instrumentation.py - Метрики запроса: SQL, шаблоны, кэш, время view
+#
+# main.middleware.InstrumentationMiddleware (последним в MIDDLEWARE) на время
+# запроса собирает:
+#   - число и время SQL-запросов (connection.execute_wrapper);
+#   - время рендера шаблонов (обертка над Template.render бэкенда Django);
+#   - попадания и промахи кэша (main/cache.py, main/page_cache.py);
+#   - время view и общее время обработки.
+# Метрики уходят в заголовок Server-Timing и в лог 'main.performance'
+# одной JSON-строкой на запрос (уровень INFO: по умолчанию пишется только
+# при DEBUG, см. PERFORMANCE_LOG_LEVEL в settings).
+#
+# Бюджет запросов к БД для view:
+#
+#   @query_budget(6)
+#   def city_detail(request, slug): ...
+#
+# Превышение пишется в лог как warning, а при QUERY_BUDGET_STRICT = True
+# (тесты, manage.py bench) — вызывает QueryBudgetExceeded.
+
+import contextvars
+import time
+
+current_metrics = contextvars.ContextVar('request_metrics', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """View выполнила больше SQL-запросов, чем указано в @query_budget"""
+
+
+def query_budget(max_queries):
+    """Задает максимальное число SQL-запросов для view (вместе с рендером шаблона)"""
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+    return decorator
+
+
+class RequestMetrics:
+    """Счетчики одного запроса"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.query_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.view_name = None
+        self.view_started = None
+        self.view_time = 0.0
+        self.budget = None
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_time += time.perf_counter() - start
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self):
+        """Значение заголовка Server-Timing (длительности в миллисекундах)"""
+        return ', '.join([
+            f'db;dur={self.query_time * 1000:.1f};desc="{self.queries} queries"',
+            f'tpl;dur={self.template_time * 1000:.1f}',
+            f'cache;desc="hit={self.cache_hits} miss={self.cache_misses}"',
+            f'view;dur={self.view_time * 1000:.1f}',
+            f'total;dur={self.total_time * 1000:.1f}',
+        ])
+
+    def as_dict(self):
+        return {
+            'view': self.view_name,
+            'queries': self.queries,
+            'query_ms': round(self.query_time * 1000, 1),
+            'template_ms': round(self.template_time * 1000, 1),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'view_ms': round(self.view_time * 1000, 1),
+            'total_ms': round(self.total_time * 1000, 1),
+            'query_budget': self.budget,
+        }
+
+
+def count_cache(hit):
+    """Учитывает обращение к кэшу в метриках текущего запроса"""
+    metrics = current_metrics.get()
+    if metrics is not None:
+        if hit:
+            metrics.cache_hits += 1
+        else:
+            metrics.cache_misses += 1
+
+
+def install_template_timing():
+    """Оборачивает Template.render бэкенда Django для учета времени рендера"""
+    from django.template.backends.django import Template
+
+    if getattr(Template.render, 'instrumented', False):
+        return
+    original_render = Template.render
+
+    def render(self, context=None, request=None):
+        metrics = current_metrics.get()
+        if metrics is None:
+            return original_render(self, context, request)
+        # Вложенный render_to_string уже учтен во внешнем рендере
+        metrics.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return original_render(self, context, request)
+        finally:
+            metrics.template_depth -= 1
+            if not metrics.template_depth:
+                metrics.template_time += time.perf_counter() - start
+
+    render.instrumented = True
+    Template.render = render
@@ -0,0 +1,83 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from main.bench import (
+    collect_routes, compare, load_results, make_results, run_bench, save_results, seed_bench_data,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет все маршруты main, blog, services, pages и seo_management '
+        '(p50/p95/p99, SQL-запросы, память, размер ответа) во временной тестовой БД'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help='Теплых запросов на маршрут (по умолчанию 50)')
+        parser.add_argument('--seed', type=int, default=42, help='Seed генератора данных')
+        parser.add_argument('--route', action='append', default=[], help='Замерить только маршруты, содержащие подстроку (можно несколько)')
+        parser.add_argument('--output', help='Сохранить результаты в JSON-файл')
+        parser.add_argument('--compare', help='JSON прошлого прогона: показать регрессии')
+        parser.add_argument('--threshold', type=float, default=0.2, help='Допустимый рост p95 и размера ответа (0.2 = 20%%)')
+        parser.add_argument('--min-ms', type=float, default=2.0, help='Рост p95 меньше этого значения (мс) считается шумом')
+        parser.add_argument('--fail-on-regression', action='store_true', help='Завершиться с ошибкой при регрессиях или превышении @query_budget')
+        parser.add_argument('--keepdb', action='store_true', help='Не удалять тестовую БД после прогона')
+
+    def handle(self, *args, **options):
+        baseline = load_results(options['compare']) if options['compare'] else None
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False, keepdb=options['keepdb'])
+        try:
+            # С --keepdb данные уже могут быть в БД
+            if not options['keepdb'] or not self._has_data():
+                seed_bench_data(options['seed'])
+            routes, skipped = collect_routes()
+            if options['route']:
+                routes = [route for route in routes if any(part in route.name for part in options['route'])]
+            for name in skipped:
+                self.stdout.write(self.style.WARNING(f'⚠️ {name}: нет данных для параметров, пропущен'))
+            results = run_bench(routes, options['iterations'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+
+        self._print_table(results)
+        data = make_results(results, options['iterations'], options['seed'])
+        if options['output']:
+            save_results(data, options['output'])
+            self.stdout.write(self.style.SUCCESS(f'✅ Результаты сохранены в {options["output"]}'))
+
+        problems = [
+            f'{result.name}: {result.cold_queries} SQL-запросов при бюджете {result.query_budget}'
+            for result in results
+            if result.query_budget is not None and result.cold_queries is not None
+            and result.cold_queries > result.query_budget
+        ]
+        problems += [f'{result.name}: статус {result.status}' for result in results if result.status >= 500]
+        if baseline is not None:
+            regressions = compare(data, baseline, options['threshold'], options['min_ms'])
+            if regressions:
+                self.stdout.write(self.style.WARNING(f'Регрессии относительно {options["compare"]}:'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'✅ Регрессий относительно {options["compare"]} нет'))
+            problems += regressions
+        for problem in problems:
+            self.stdout.write(self.style.ERROR(f'❌ {problem}'))
+        if problems and options['fail_on_regression']:
+            raise CommandError(f'Проблем: {len(problems)}')
+
+    def _has_data(self):
+        from blog.models import Post
+        return Post.objects.exists()
+
+    def _print_table(self, results):
+        header = f'{"маршрут":<36} {"код":>4} {"p50":>8} {"p95":>8} {"p99":>8} {"холод":>8} {"SQL":>7} {"КБ пам.":>8} {"размер":>8}'
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for result in results:
+            budget = f'/{result.query_budget}' if result.query_budget is not None else ''
+            queries = f'{result.cold_queries}{budget}' if result.cold_queries is not None else '-'
+            self.stdout.write(
+                f'{result.name:<36} {result.status:>4} {result.p50_ms:>8.2f} {result.p95_ms:>8.2f} '
+                f'{result.p99_ms:>8.2f} {result.cold_ms:>8.2f} {queries:>7} {result.memory_kb:>8.1f} {result.size:>8}'
+            )
@@ -0,0 +1,67 @@
+import csv
+import gzip
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main.city_directory import get_city_directory
+from main.geoip import GeoIPDatabase, build_ranges, write_database
+
+
+def city_resolver():
+    """Функция название города из CSV -> slug активного города сайта"""
+    directory = get_city_directory()
+    resolved = {}
+
+    def resolve(city_name):
+        # Без поиска опечаток: "Tomsk" не должен стать "Omsk"
+        if city_name not in resolved:
+            entry = directory.resolve(city_name, fuzzy=False)
+            resolved[city_name] = entry.slug if entry else None
+        return resolved[city_name]
+    return resolve
+
+
+class Command(BaseCommand):
+    help = (
+        'Строит локальную базу IP -> город (GEOIP_DB_PATH) из CSV с диапазонами IPv4, '
+        'например DB-IP IP to City Lite (можно .csv.gz)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', help='CSV-файл: начало диапазона, конец, ..., город')
+        parser.add_argument('--output', default=str(settings.GEOIP_DB_PATH), help='Куда записать базу')
+        parser.add_argument('--start-column', type=int, default=0, help='Колонка начала диапазона')
+        parser.add_argument('--end-column', type=int, default=1, help='Колонка конца диапазона')
+        parser.add_argument('--city-column', type=int, default=5, help='Колонка города (DB-IP Lite: 5)')
+        parser.add_argument('--country-column', type=int, default=3, help='Колонка кода страны (DB-IP Lite: 3)')
+        parser.add_argument('--country', default='RU', help='Только эта страна (пусто — все)')
+
+    def handle(self, *args, **options):
+        path = options['csv_path']
+        opener = gzip.open if path.endswith('.gz') else open
+        start_col, end_col, city_col = options['start_column'], options['end_column'], options['city_column']
+        country_col, country = options['country_column'], options['country']
+
+        def rows(reader):
+            for row in reader:
+                if len(row) <= max(start_col, end_col, city_col):
+                    continue
+                if country and (len(row) <= country_col or row[country_col] != country):
+                    continue
+                yield row[start_col], row[end_col], row[city_col]
+
+        try:
+            with opener(path, 'rt', encoding='utf-8', newline='') as f:
+                ranges, slugs = build_ranges(rows(csv.reader(f)), city_resolver())
+        except OSError as exc:
+            raise CommandError(f'Не удалось прочитать {path}: {exc}')
+
+        write_database(options['output'], ranges, slugs)
+        # Проверяем, что файл читается; воркеры подхватят его в течение минуты
+        GeoIPDatabase(options['output'])
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ База geo-IP: {len(ranges)} диапазонов, городов: {len(slugs)} → {options["output"]}'
+        ))
+        if not slugs:
+            self.stdout.write(self.style.WARNING('⚠️ Ни один город из CSV не совпал с городами сайта'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from main.view_counters import flush_view_counters
+
+
+class Command(BaseCommand):
+    help = 'Переносит накопленные в кэше просмотры статей в БД'
+
+    def handle(self, *args, **options):
+        result = flush_view_counters()
+
+        if not result:
+            self.stdout.write(
+                self.style.WARNING('⚠️ Общий кэш не на Redis, просмотры пишутся в БД сразу')
+            )
+            return
+
+        for label, updated in result.items():
+            self.stdout.write(
+                self.style.SUCCESS(f'✅ {label}: обновлено записей: {updated}')
+            )
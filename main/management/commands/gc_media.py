@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from main.blobs import GC_GRACE, adopt_legacy, collect_garbage
+
+
+def _megabytes(size):
+    return f'{size / 1024 / 1024:.1f} МБ'
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает ссылки на файлы blobs/ и удаляет файлы без ссылок; '
+        'с --adopt сначала переносит старые загрузки в blobs/'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours', type=float, default=GC_GRACE.total_seconds() / 3600,
+            help='Не удалять файлы моложе N часов (по умолчанию 24)',
+        )
+        parser.add_argument('--adopt', action='store_true', help='Перенести файлы вне blobs/ и убрать дубликаты')
+        parser.add_argument('--dry-run', action='store_true', help='Только показать, что будет удалено')
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+
+        if options['adopt']:
+            adopted, removed, freed = adopt_legacy(dry_run=dry_run)
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ Старых файлов: {adopted}, удалено копий: {removed} ({_megabytes(freed)})'
+            ))
+
+        removed, freed = collect_garbage(grace=timedelta(hours=options['grace_hours']), dry_run=dry_run)
+        prefix = 'Будет удалено' if dry_run else 'Удалено'
+        self.stdout.write(self.style.SUCCESS(f'✅ {prefix} файлов без ссылок: {removed} ({_megabytes(freed)})'))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from main.prerender import KINDS, get_prerender_root, prerender_regional
+
+
+class Command(BaseCommand):
+    help = 'Рендерит региональные страницы (город, услуги и категории в городе, адаптированные статьи) в HTML-файлы с .gz для nginx'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help='Число процессов (по умолчанию по числу CPU)')
+        parser.add_argument('--city', action='append', dest='cities', help='Только этот город (slug), можно несколько')
+        parser.add_argument(
+            '--kind', action='append', dest='kinds', choices=KINDS,
+            help='Только страницы этого вида, можно несколько',
+        )
+        parser.add_argument('--force', action='store_true', help='Перерендерить все страницы и удалить файлы страниц, которых больше нет')
+
+    def handle(self, *args, **options):
+        stats = prerender_regional(
+            kinds=tuple(options['kinds'] or KINDS),
+            cities=options['cities'],
+            workers=options['workers'],
+            force=options['force'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {get_prerender_root()}: записано {stats['written']}, без изменений {stats['unchanged']}"
+        ))
+        if stats['removed'] or stats['pruned']:
+            self.stdout.write(f"Удалено страниц: {stats['removed'] + stats['pruned']}")
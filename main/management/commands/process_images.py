@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from main.images import enqueue_all, process_pending
+
+
+class Command(BaseCommand):
+    help = 'Создает адаптивные копии изображений (WebP и JPEG/PNG по ширинам) из очереди'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Сначала поставить в очередь изображения всех объектов')
+        parser.add_argument('--retry-failed', action='store_true', help='Повторить изображения с ошибкой')
+        parser.add_argument('--limit', type=int, help='Обработать не больше N изображений')
+
+    def handle(self, *args, **options):
+        if options['all']:
+            queued = enqueue_all()
+            self.stdout.write(f'В очередь добавлено: {queued}')
+
+        ready, failed = process_pending(limit=options['limit'], retry_failed=options['retry_failed'])
+        self.stdout.write(self.style.SUCCESS(f'✅ Обработано изображений: {ready}'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'⚠️ С ошибкой: {failed} (см. ImageDerivative.error)'))
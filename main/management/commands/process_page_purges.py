@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from main.dependencies import process_page_purges
+
+
+class Command(BaseCommand):
+    help = 'Сбрасывает кэш страниц из очереди крупных сбросов (граф зависимостей)'
+
+    def handle(self, *args, **options):
+        purged = process_page_purges()
+        self.stdout.write(self.style.SUCCESS(f'✅ Сброшено страниц: {purged}'))
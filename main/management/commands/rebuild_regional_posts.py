@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from main.regional_posts import rebuild_regional_posts, refresh_pending_regional_posts
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает готовые региональные статьи (таблица RegionalPostPage)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pending', action='store_true',
+            help='Только строки, ждущие пересчета после изменения города или категории',
+        )
+
+    def handle(self, *args, **options):
+        count = refresh_pending_regional_posts() if options['pending'] else rebuild_regional_posts()
+        self.stdout.write(self.style.SUCCESS(f'✅ Региональных статей: {count}'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from main.related import SPECS, rebuild_all, rebuild_related
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает похожие статьи, услуги и проекты (таблица RelatedItem)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            choices=sorted(SPECS),
+            help='Пересчитать только одну модель (например, blog.post)',
+        )
+
+    def handle(self, *args, **options):
+        if options['model']:
+            result = {options['model']: rebuild_related(options['model'])}
+        else:
+            result = rebuild_all()
+
+        for model_label, count in result.items():
+            self.stdout.write(
+                self.style.SUCCESS(f'✅ {model_label}: записей о соседях: {count}')
+            )
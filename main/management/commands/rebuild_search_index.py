@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from main.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает поисковый индекс (статьи, услуги, портфолио, FAQ, глоссарий)'
+
+    def handle(self, *args, **options):
+        result = rebuild_index()
+
+        for model_label, count in result.items():
+            self.stdout.write(
+                self.style.SUCCESS(f'✅ {model_label}: документов: {count}')
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f'Всего документов: {sum(result.values())}')
+        )
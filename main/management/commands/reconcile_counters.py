@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from main.counters import reconcile_all
+
+
+class Command(BaseCommand):
+    help = 'Сверяет и исправляет счетчики опубликованных объектов (published_count) у категорий и авторов'
+
+    def handle(self, *args, **options):
+        for counter, fixed in reconcile_all().items():
+            self.stdout.write(
+                self.style.SUCCESS(f'✅ {counter}: исправлено счетчиков: {fixed}')
+            )
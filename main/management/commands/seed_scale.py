@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from main.counters import reconcile_all
+from main.seeding import DEFAULT_COUNTS, SeedCounts, clear_seeded, invalidate_after_seed, seed_scale
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует данные production-объема (города, услуги, статьи, адаптации, портфолио, '
+        'FAQ, глоссарий, редиректы) пачками bulk_create; результат определяется --seed'
+    )
+
+    def add_arguments(self, parser):
+        for field in SeedCounts._fields:
+            parser.add_argument(
+                f'--{field.replace("_", "-")}', type=int, default=getattr(DEFAULT_COUNTS, field),
+                help=f'Количество (по умолчанию {getattr(DEFAULT_COUNTS, field)})',
+            )
+        parser.add_argument('--seed', type=int, default=42, help='Seed генератора (по умолчанию 42)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Размер пачки bulk_create')
+        parser.add_argument('--clear', action='store_true', help='Удалить данные прошлой генерации перед созданием')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            for label, count in clear_seeded().items():
+                if count:
+                    self.stdout.write(f'Удалено {label}: {count}')
+
+        counts = SeedCounts(**{field: options[field] for field in SeedCounts._fields})
+        started = time.monotonic()
+
+        def progress(label, count):
+            self.stdout.write(
+                self.style.SUCCESS(f'✅ {label}: {count} ({time.monotonic() - started:.1f} с)')
+            )
+
+        seed_scale(counts, seed=options['seed'], batch_size=options['batch_size'], progress=progress)
+        # bulk_create не вызывает сигналы: счетчики и кэши выравниваем сами
+        reconcile_all()
+        invalidate_after_seed()
+        self.stdout.write(
+            'Сигналы при генерации не срабатывают: запустите rebuild_search_index и rebuild_related'
+        )
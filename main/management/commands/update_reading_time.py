@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from main.author_stats import invalidate_author_stats
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает числовое время чтения статей (Post.reading_time) для статистики авторов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Размер пачки bulk_update')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        changed = []
+        updated = 0
+        posts = Post.objects.only('pk', 'content', 'reading_time_minutes', 'reading_time')
+        for post in posts.iterator(chunk_size=batch_size):
+            reading_time = post.compute_reading_time()
+            if post.reading_time != reading_time:
+                post.reading_time = reading_time
+                changed.append(post)
+            if len(changed) >= batch_size:
+                Post.objects.bulk_update(changed, ['reading_time'])
+                updated += len(changed)
+                changed = []
+        if changed:
+            Post.objects.bulk_update(changed, ['reading_time'])
+            updated += len(changed)
+
+        invalidate_author_stats()
+        self.stdout.write(self.style.SUCCESS(f'✅ Обновлено статей: {updated}'))
@@ -1,18 +1,254 @@
+import json
+import logging
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponsePermanentRedirect, HttpResponseRedirect
+from django.utils.cache import add_never_cache_headers, get_conditional_response, patch_cache_control
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import http_date
+
+from .dependencies import current_tracker, record_dependencies, track_dependencies
+from .http_cache import PRIVATE, PUBLIC, get_page_validators
+from .instrumentation import QueryBudgetExceeded, RequestMetrics, current_metrics
+from .page_cache import get_cached_page, is_cacheable_query, store_page
+from .utils import get_city_by_ip, get_client_ip, get_user_city
+from seo_management.redirects import get_redirect_table
+
+# Город посетителя для скрипта меню (main/static/js/base.js)
+CITY_COOKIE_NAME = 'user_city'
+CITY_COOKIE_AGE = 60 * 60 * 24 * 30
+
+
+class RedirectMiddleware:
+    """
+    Редиректы 301/302 из seo_management.Redirect до разрешения URL.
+
+    Таблица редиректов скомпилирована в памяти процесса
+    (seo_management/redirects.py), поэтому запрос стоит O(длины пути)
+    и не обращается к БД. Стоит сразу после SecurityMiddleware.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        target = get_redirect_table().match(request.path)
+        # Защита от петли: редирект на тот же путь не выполняется
+        if target is not None and target.new_path.rstrip('/') != request.path.rstrip('/'):
+            url = target.new_path
+            if not url.startswith(('http://', 'https://')):
+                url = request.build_absolute_uri(url)
+            response_class = HttpResponsePermanentRedirect if target.permanent else HttpResponseRedirect
+            return response_class(url)
+        return self.get_response(request)
+
+
+class GeoLocationMiddleware:
+    """
+    Определяет город посетителя по IP (локальная база main/geoip.py,
+    поиск за микросекунды без сети) и кладет slug в request.geo_city.
+
+    Город, выбранный вручную (user_city в сессии), важнее. Сессия не
+    создается, поэтому поисковые роботы не плодят записи сессий.
+
+    Страницы от города не зависят (один вариант в кэше страниц): город
+    передается в cookie user_city, по нему скрипт отмечает город в меню.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.geo_city = None
+        if not request.session.get('user_city'):
+            request.geo_city = get_city_by_ip(get_client_ip(request))
+        response = self.get_response(request)
 
+        city = get_user_city(request)
+        if city and request.COOKIES.get(CITY_COOKIE_NAME) != city:
+            response.set_cookie(CITY_COOKIE_NAME, city, max_age=CITY_COOKIE_AGE, samesite='Lax')
+        return response
 
-class NoCacheMiddleware(MiddlewareMixin):
+
+class ConditionalGetMiddleware(MiddlewareMixin):
     """
-    Middleware для отключения кэширования на всех страницах
+    Middleware для условных GET-запросов (If-None-Match / If-Modified-Since).
+
+    Для публичных страниц (@public_page) вычисляет слабый ETag и Last-Modified
+    по дате изменения объекта страницы ещё до вызова view и при совпадении
+    сразу отвечает 304 — шаблон не рендерится.
+    Страницы сессий и форм (@private_page) получают no-store.
     """
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        policy = getattr(view_func, 'cache_policy', None)
+        request.cache_policy = policy
+        request.page_validators = None
+
+        if policy != PUBLIC or request.method not in ('GET', 'HEAD'):
+            return None
+
+        validators = get_page_validators(request, view_func, view_args, view_kwargs)
+        if validators is None:
+            return None
+        request.page_validators = validators
+
+        etag, last_modified = validators
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if response is not None:
+            # 304 Not Modified (или 412 для небезопасных предусловий)
+            self._add_validators(response, validators)
+            patch_cache_control(response, no_cache=True)
+        return response
+
     def process_response(self, request, response):
-        # Отключаем кэширование для всех ответов
-        response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        response['Pragma'] = 'no-cache'
-        response['Expires'] = '0'
-        
-        # Дополнительные заголовки для отключения кэширования
-        response['Last-Modified'] = 'Thu, 01 Jan 1970 00:00:00 GMT'
-        response['ETag'] = ''
-        
-        return response
\ No newline at end of file
+        policy = getattr(request, 'cache_policy', None)
+
+        if policy == PRIVATE:
+            add_never_cache_headers(response)
+        elif policy == PUBLIC and getattr(request, 'page_validators', None) and response.status_code == 200:
+            self._add_validators(response, request.page_validators)
+            # Браузер может хранить страницу, но обязан перепроверять её у сервера
+            patch_cache_control(response, no_cache=True)
+        elif not response.has_header('Cache-Control'):
+            patch_cache_control(response, no_cache=True)
+
+        return response
+
+    def _add_validators(self, response, validators):
+        etag, last_modified = validators
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+
+
+class PageCacheMiddleware(MiddlewareMixin):
+    """
+    Кэш готовых страниц для анонимных посетителей.
+
+    Работает только для публичных страниц (@public_page) и GET/HEAD-запросов.
+    Должен стоять после ConditionalGetMiddleware: сначала проверяется 304,
+    затем страница отдается из кэша без вызова view.
+    Сбрасывается сигналами по URL изменённых объектов (main/signals.py).
+    """
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.page_cache_store = False
+
+        if not self._is_cacheable(request, view_func):
+            return None
+
+        response = get_cached_page(request)
+        if response is None:
+            request.page_cache_store = True
+            return None
+
+        on_hit = getattr(view_func, 'page_cache_hit_func', None)
+        if on_hit:
+            on_hit(request, *view_args, **view_kwargs)
+        return response
+
+    def process_response(self, request, response):
+        if (
+            getattr(request, 'page_cache_store', False)
+            and response.status_code == 200
+            and not response.streaming
+        ):
+            store_page(request, response)
+        return response
+
+    def _is_cacheable(self, request, view_func):
+        if getattr(view_func, 'cache_policy', None) != PUBLIC:
+            return False
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        if not is_cacheable_query(request, getattr(view_func, 'page_cache_query', ())):
+            return False
+        user = getattr(request, 'user', None)
+        return not (user and user.is_authenticated)
+
+
+class PageDependencyMiddleware:
+    """
+    Граф зависимостей страниц (main/dependencies.py): записывает строки и
+    списки моделей, прочитанные при рендере страницы, которую
+    PageCacheMiddleware сохраняет в кэш.
+
+    Стоит сразу после PageCacheMiddleware: учитывает view и рендер шаблона
+    с контекст-процессорами, но не запросы ETag / Last-Modified и сессии.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method not in ('GET', 'HEAD'):
+            return self.get_response(request)
+
+        with track_dependencies(active=False) as tracker:
+            response = self.get_response(request)
+        if getattr(request, 'page_cache_store', False) and response.status_code == 200:
+            record_dependencies(request.path, tracker.dependencies())
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        tracker = current_tracker.get()
+        if tracker is not None and getattr(request, 'page_cache_store', False):
+            tracker.active = True
+        return None
+
+
+performance_logger = logging.getLogger('main.performance')
+
+
+class InstrumentationMiddleware:
+    """
+    Метрики запроса (main/instrumentation.py): SQL, шаблоны, кэш, время view.
+
+    Стоит последним в MIDDLEWARE, поэтому измеряет view, рендер шаблона и
+    проверки кэша страниц, но не сохранение сессии и прочие внешние middleware.
+    Добавляет заголовок Server-Timing (settings.SERVER_TIMING), пишет строку в лог 'main.performance'
+    и проверяет бюджет запросов (@query_budget).
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        # Для manage.py bench: метрики доступны через response.wsgi_request
+        request.metrics = metrics
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics.execute_wrapper))
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+
+        if metrics.view_started is not None:
+            metrics.view_time = metrics.total_time - metrics.view_started
+        if getattr(settings, 'SERVER_TIMING', False):
+            response['Server-Timing'] = metrics.server_timing()
+
+        data = metrics.as_dict()
+        data.update(method=request.method, path=request.path, status=response.status_code)
+        over_budget = metrics.budget is not None and metrics.queries > metrics.budget
+        if over_budget:
+            performance_logger.warning(json.dumps({**data, 'event': 'query_budget_exceeded'}, ensure_ascii=False))
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(
+                    f'{metrics.view_name}: {metrics.queries} SQL-запросов при бюджете {metrics.budget}'
+                )
+        else:
+            performance_logger.info(json.dumps(data, ensure_ascii=False))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = current_metrics.get()
+        if metrics is not None:
+            metrics.view_name = f'{view_func.__module__}.{view_func.__name__}'
+            metrics.view_started = metrics.total_time
+            metrics.budget = getattr(view_func, 'query_budget', None)
+        return None
@@ -0,0 +1,412 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:12
+
+import django.db.models.deletion
+import django_ckeditor_5.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+        ('main', '0002_contactrequest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Author',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_name', models.CharField(max_length=100, verbose_name='Имя')),
+                ('last_name', models.CharField(max_length=100, verbose_name='Фамилия')),
+                ('username', models.CharField(default='', help_text='Уникальное имя для URL (например: vitaliy-isakov)', max_length=200, unique=True, verbose_name='Имя пользователя')),
+                ('bio', models.TextField(help_text='Подробная информация об авторе', verbose_name='Биография')),
+                ('photo', models.ImageField(blank=True, null=True, upload_to='author_photos/', verbose_name='Фото')),
+                ('photo_alt', models.CharField(blank=True, help_text='Описание фото для SEO и доступности', max_length=200, verbose_name='Альтернативный текст фото')),
+                ('position', models.CharField(max_length=150, verbose_name='Должность')),
+                ('experience', models.CharField(blank=True, max_length=200, verbose_name='Опыт работы')),
+                ('specializations', models.TextField(blank=True, help_text='Области экспертизы автора', verbose_name='Специализации')),
+                ('social_links', models.JSONField(blank=True, default=dict, help_text='JSON с ссылками на соцсети', verbose_name='Социальные сети')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Активен')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата обновления')),
+            ],
+            options={
+                'verbose_name': 'Автор',
+                'verbose_name_plural': 'Авторы',
+                'ordering': ['last_name', 'first_name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='City',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seo_title', models.CharField(blank=True, help_text='Рекомендуется 50-60 символов. Если не указан, будет использован обычный заголовок.', max_length=60, null=True, verbose_name='SEO заголовок (title)')),
+                ('seo_description', models.TextField(blank=True, help_text='Рекомендуется 150-160 символов. Краткое описание страницы для поисковых систем.', max_length=160, null=True, verbose_name='SEO описание (description)')),
+                ('seo_index', models.BooleanField(default=True, help_text='Разрешить поисковым системам индексировать эту страницу', verbose_name='Индексировать страницу')),
+                ('seo_canonical', models.URLField(blank=True, help_text='Укажите канонический URL, если страница доступна по нескольким адресам', max_length=500, null=True, verbose_name='Канонический URL')),
+                ('name', models.CharField(max_length=100, verbose_name='Название города')),
+                ('slug', models.SlugField(max_length=100, unique=True, verbose_name='URL-идентификатор')),
+                ('region', models.CharField(max_length=100, verbose_name='Регион/Область')),
+                ('is_active', models.BooleanField(default=True, help_text='Показывать город на сайте', verbose_name='Активен')),
+                ('order', models.IntegerField(default=100, verbose_name='Порядок отображения')),
+                ('local_title', models.CharField(blank=True, help_text="Например: 'SEO продвижение в Москве'", max_length=200, verbose_name='Локальный заголовок')),
+                ('local_description', models.TextField(blank=True, help_text='Краткое описание услуг в этом городе', max_length=500, verbose_name='Локальное описание')),
+                ('name_prepositional', models.CharField(blank=True, help_text="Например: 'в Казани', 'в Москве', 'в Санкт-Петербурге'", max_length=100, verbose_name='Название в предложном падеже')),
+                ('show_breadcrumbs', models.BooleanField(default=True, help_text='Включить/выключить отображение хлебных крошек на этой странице', verbose_name='Показывать хлебные крошки')),
+                ('custom_breadcrumbs', models.JSONField(blank=True, default=list, help_text='Оставьте пустым для автоматических крошек. Формат: [{"title": "Название", "url": "/url/"}]', verbose_name='Пользовательские хлебные крошки')),
+            ],
+            options={
+                'verbose_name': 'Город',
+                'verbose_name_plural': 'Города',
+                'ordering': ['order', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CustomHeadScript',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Описательное название для идентификации скрипта', max_length=25000, verbose_name='Название')),
+                ('content_type', models.CharField(choices=[('script', 'JavaScript скрипт'), ('meta', 'Meta теги'), ('link', 'Link теги'), ('style', 'CSS стили'), ('other', 'Другой HTML')], default='script', max_length=20, verbose_name='Тип контента')),
+                ('html_content', models.TextField(help_text='HTML код для вставки в head (без тегов <head> и </head>)', verbose_name='HTML код')),
+                ('page_type', models.CharField(blank=True, help_text='Оставьте пустым для всех страниц, или укажите: home, city_detail, city_list, service_detail, post_detail, portfolio_detail, portfolio_list', max_length=50, verbose_name='Тип страницы')),
+                ('page_slug', models.CharField(blank=True, help_text='Оставьте пустым для всех страниц этого типа, или укажите конкретный slug', max_length=200, verbose_name='Slug страницы')),
+                ('position', models.CharField(choices=[('very_early', 'Очень рано (после charset и viewport)'), ('early', 'Рано (после базовых meta)'), ('middle', 'В середине (после SEO meta)'), ('late', 'Поздно (перед CSS)'), ('very_late', 'Очень поздно (перед закрытием head)')], default='middle', help_text='Выберите, где в head должен быть размещен скрипт', max_length=20, verbose_name='Позиция в head')),
+                ('is_active', models.BooleanField(default=True, help_text='Включить/выключить скрипт', verbose_name='Активен')),
+                ('order', models.IntegerField(default=100, help_text='Порядок отображения (меньше = выше)', verbose_name='Порядок')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'Кастомный скрипт/тег',
+                'verbose_name_plural': 'Кастомные скрипты/теги',
+                'ordering': ['order', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='FAQCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seo_title', models.CharField(blank=True, help_text='Рекомендуется 50-60 символов. Если не указан, будет использован обычный заголовок.', max_length=60, null=True, verbose_name='SEO заголовок (title)')),
+                ('seo_description', models.TextField(blank=True, help_text='Рекомендуется 150-160 символов. Краткое описание страницы для поисковых систем.', max_length=160, null=True, verbose_name='SEO описание (description)')),
+                ('seo_index', models.BooleanField(default=True, help_text='Разрешить поисковым системам индексировать эту страницу', verbose_name='Индексировать страницу')),
+                ('seo_canonical', models.URLField(blank=True, help_text='Укажите канонический URL, если страница доступна по нескольким адресам', max_length=500, null=True, verbose_name='Канонический URL')),
+                ('name', models.CharField(max_length=100, verbose_name='Название категории')),
+                ('slug', models.SlugField(max_length=100, unique=True, verbose_name='URL-идентификатор')),
+                ('description', models.TextField(blank=True, help_text='Краткое описание категории вопросов', max_length=300, verbose_name='Описание категории')),
+                ('order', models.IntegerField(default=100, verbose_name='Порядок отображения')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Активна')),
+                ('show_breadcrumbs', models.BooleanField(default=True, help_text='Включить/выключить отображение хлебных крошек на этой странице', verbose_name='Показывать хлебные крошки')),
+                ('custom_breadcrumbs', models.JSONField(blank=True, default=list, help_text='Оставьте пустым для автоматических крошек. Формат: [{"title": "Название", "url": "/url/"}]', verbose_name='Пользовательские хлебные крошки')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'Категория FAQ',
+                'verbose_name_plural': 'Категории FAQ',
+                'ordering': ['order', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='FAQItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seo_title', models.CharField(blank=True, help_text='Рекомендуется 50-60 символов. Если не указан, будет использован обычный заголовок.', max_length=60, null=True, verbose_name='SEO заголовок (title)')),
+                ('seo_description', models.TextField(blank=True, help_text='Рекомендуется 150-160 символов. Краткое описание страницы для поисковых систем.', max_length=160, null=True, verbose_name='SEO описание (description)')),
+                ('seo_index', models.BooleanField(default=True, help_text='Разрешить поисковым системам индексировать эту страницу', verbose_name='Индексировать страницу')),
+                ('seo_canonical', models.URLField(blank=True, help_text='Укажите канонический URL, если страница доступна по нескольким адресам', max_length=500, null=True, verbose_name='Канонический URL')),
+                ('question', models.CharField(max_length=300, verbose_name='Вопрос')),
+                ('slug', models.SlugField(max_length=300, verbose_name='URL-идентификатор')),
+                ('answer', django_ckeditor_5.fields.CKEditor5Field(verbose_name='Ответ')),
+                ('order', models.IntegerField(default=100, verbose_name='Порядок отображения')),
+                ('is_published', models.BooleanField(default=True, verbose_name='Опубликовано')),
+                ('show_breadcrumbs', models.BooleanField(default=True, help_text='Включить/выключить отображение хлебных крошек на этой странице', verbose_name='Показывать хлебные крошки')),
+                ('custom_breadcrumbs', models.JSONField(blank=True, default=list, help_text='Оставьте пустым для автоматических крошек. Формат: [{"title": "Название", "url": "/url/"}]', verbose_name='Пользовательские хлебные крошки')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='faq_items', to='main.faqcategory', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'Вопрос-ответ',
+                'verbose_name_plural': 'Вопросы-ответы',
+                'ordering': ['order', 'question'],
+            },
+        ),
+        migrations.CreateModel(
+            name='GlossaryCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seo_title', models.CharField(blank=True, help_text='Рекомендуется 50-60 символов. Если не указан, будет использован обычный заголовок.', max_length=60, null=True, verbose_name='SEO заголовок (title)')),
+                ('seo_description', models.TextField(blank=True, help_text='Рекомендуется 150-160 символов. Краткое описание страницы для поисковых систем.', max_length=160, null=True, verbose_name='SEO описание (description)')),
+                ('seo_index', models.BooleanField(default=True, help_text='Разрешить поисковым системам индексировать эту страницу', verbose_name='Индексировать страницу')),
+                ('seo_canonical', models.URLField(blank=True, help_text='Укажите канонический URL, если страница доступна по нескольким адресам', max_length=500, null=True, verbose_name='Канонический URL')),
+                ('name', models.CharField(max_length=100, verbose_name='Название категории')),
+                ('slug', models.SlugField(max_length=100, unique=True, verbose_name='URL-идентификатор')),
+                ('description', models.TextField(blank=True, help_text='Краткое описание категории терминов', max_length=300, verbose_name='Описание категории')),
+                ('order', models.IntegerField(default=100, verbose_name='Порядок отображения')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Активна')),
+                ('show_breadcrumbs', models.BooleanField(default=True, help_text='Включить/выключить отображение хлебных крошек на этой странице', verbose_name='Показывать хлебные крошки')),
+                ('custom_breadcrumbs', models.JSONField(blank=True, default=list, help_text='Оставьте пустым для автоматических крошек. Формат: [{"title": "Название", "url": "/url/"}]', verbose_name='Пользовательские хлебные крошки')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'Категория глоссария',
+                'verbose_name_plural': 'Категории глоссария',
+                'ordering': ['order', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='GlossaryTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seo_title', models.CharField(blank=True, help_text='Рекомендуется 50-60 символов. Если не указан, будет использован обычный заголовок.', max_length=60, null=True, verbose_name='SEO заголовок (title)')),
+                ('seo_description', models.TextField(blank=True, help_text='Рекомендуется 150-160 символов. Краткое описание страницы для поисковых систем.', max_length=160, null=True, verbose_name='SEO описание (description)')),
+                ('seo_index', models.BooleanField(default=True, help_text='Разрешить поисковым системам индексировать эту страницу', verbose_name='Индексировать страницу')),
+                ('seo_canonical', models.URLField(blank=True, help_text='Укажите канонический URL, если страница доступна по нескольким адресам', max_length=500, null=True, verbose_name='Канонический URL')),
+                ('term', models.CharField(max_length=200, verbose_name='Термин')),
+                ('slug', models.SlugField(max_length=200, verbose_name='URL-идентификатор')),
+                ('definition', django_ckeditor_5.fields.CKEditor5Field(verbose_name='Определение')),
+                ('order', models.IntegerField(default=100, verbose_name='Порядок отображения')),
+                ('is_published', models.BooleanField(default=True, verbose_name='Опубликовано')),
+                ('show_breadcrumbs', models.BooleanField(default=True, help_text='Включить/выключить отображение хлебных крошек на этой странице', verbose_name='Показывать хлебные крошки')),
+                ('custom_breadcrumbs', models.JSONField(blank=True, default=list, help_text='Оставьте пустым для автоматических крошек. Формат: [{"title": "Название", "url": "/url/"}]', verbose_name='Пользовательские хлебные крошки')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='glossary_terms', to='main.glossarycategory', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'Термин глоссария',
+                'verbose_name_plural': 'Термины глоссария',
+                'ordering': ['order', 'term'],
+            },
+        ),
+        migrations.CreateModel(
+            name='HomePage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seo_title', models.CharField(blank=True, help_text='Рекомендуется 50-60 символов. Если не указан, будет использован обычный заголовок.', max_length=60, null=True, verbose_name='SEO заголовок (title)')),
+                ('seo_description', models.TextField(blank=True, help_text='Рекомендуется 150-160 символов. Краткое описание страницы для поисковых систем.', max_length=160, null=True, verbose_name='SEO описание (description)')),
+                ('seo_index', models.BooleanField(default=True, help_text='Разрешить поисковым системам индексировать эту страницу', verbose_name='Индексировать страницу')),
+                ('seo_canonical', models.URLField(blank=True, help_text='Укажите канонический URL, если страница доступна по нескольким адресам', max_length=500, null=True, verbose_name='Канонический URL')),
+                ('hero_title', models.CharField(default='Комплексное продвижение бизнеса', max_length=200, verbose_name='Главный заголовок')),
+                ('hero_subtitle', models.TextField(default='SEO, контекстная реклама, создание сайтов. Увеличиваем трафик и продажи для вашего бизнеса.', verbose_name='Подзаголовок')),
+                ('hero_button_text', models.CharField(default='Получить консультацию', max_length=100, verbose_name='Текст кнопки')),
+                ('services_title', models.CharField(default='Наши услуги', max_length=200, verbose_name='Заголовок блока услуг')),
+                ('services_subtitle', models.TextField(default='Комплексные решения для продвижения вашего бизнеса в интернете', verbose_name='Подзаголовок блока услуг')),
+                ('team_title', models.CharField(default='Наша команда', max_length=200, verbose_name='Заголовок блока команды')),
+                ('team_subtitle', models.TextField(default='Профессионалы с многолетним опытом работы в digital-маркетинге', verbose_name='Подзаголовок блока команды')),
+                ('testimonials_title', models.CharField(default='Отзывы клиентов', max_length=200, verbose_name='Заголовок блока отзывов')),
+                ('testimonials_subtitle', models.TextField(default='Что говорят о нас наши клиенты', verbose_name='Подзаголовок блока отзывов')),
+                ('is_active', models.BooleanField(default=True, help_text='Включить/выключить главную страницу', verbose_name='Активна')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'Главная страница',
+                'verbose_name_plural': 'Главная страница',
+            },
+        ),
+        migrations.CreateModel(
+            name='PortfolioCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seo_title', models.CharField(blank=True, help_text='Рекомендуется 50-60 символов. Если не указан, будет использован обычный заголовок.', max_length=60, null=True, verbose_name='SEO заголовок (title)')),
+                ('seo_description', models.TextField(blank=True, help_text='Рекомендуется 150-160 символов. Краткое описание страницы для поисковых систем.', max_length=160, null=True, verbose_name='SEO описание (description)')),
+                ('seo_index', models.BooleanField(default=True, help_text='Разрешить поисковым системам индексировать эту страницу', verbose_name='Индексировать страницу')),
+                ('seo_canonical', models.URLField(blank=True, help_text='Укажите канонический URL, если страница доступна по нескольким адресам', max_length=500, null=True, verbose_name='Канонический URL')),
+                ('name', models.CharField(max_length=100, verbose_name='Название категории')),
+                ('slug', models.SlugField(max_length=100, unique=True, verbose_name='URL-идентификатор')),
+                ('description', models.TextField(blank=True, verbose_name='Описание категории')),
+                ('color', models.CharField(default='#007bff', help_text='Например: #007bff для синего цвета', max_length=7, verbose_name='Цвет категории (HEX)')),
+                ('order', models.IntegerField(default=100, verbose_name='Порядок отображения')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Активна')),
+                ('show_breadcrumbs', models.BooleanField(default=True, help_text='Включить/выключить отображение хлебных крошек на этой странице', verbose_name='Показывать хлебные крошки')),
+                ('custom_breadcrumbs', models.JSONField(blank=True, default=list, help_text='Оставьте пустым для автоматических крошек. Формат: [{"title": "Название", "url": "/url/"}]', verbose_name='Пользовательские хлебные крошки')),
+            ],
+            options={
+                'verbose_name': 'Категория портфолио',
+                'verbose_name_plural': 'Категории портфолио',
+                'ordering': ['order', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PortfolioItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seo_title', models.CharField(blank=True, help_text='Рекомендуется 50-60 символов. Если не указан, будет использован обычный заголовок.', max_length=60, null=True, verbose_name='SEO заголовок (title)')),
+                ('seo_description', models.TextField(blank=True, help_text='Рекомендуется 150-160 символов. Краткое описание страницы для поисковых систем.', max_length=160, null=True, verbose_name='SEO описание (description)')),
+                ('seo_index', models.BooleanField(default=True, help_text='Разрешить поисковым системам индексировать эту страницу', verbose_name='Индексировать страницу')),
+                ('seo_canonical', models.URLField(blank=True, help_text='Укажите канонический URL, если страница доступна по нескольким адресам', max_length=500, null=True, verbose_name='Канонический URL')),
+                ('title', models.CharField(max_length=200, verbose_name='Название проекта')),
+                ('slug', models.SlugField(max_length=200, unique=True, verbose_name='URL-идентификатор')),
+                ('short_description', models.TextField(max_length=300, verbose_name='Краткое описание')),
+                ('full_description', django_ckeditor_5.fields.CKEditor5Field(verbose_name='Подробное описание проекта')),
+                ('main_image', models.ImageField(help_text='Основное изображение проекта (рекомендуемый размер: 800x600px)', upload_to='portfolio_images/', verbose_name='Главное изображение')),
+                ('main_image_alt', models.CharField(blank=True, help_text='Описание изображения для SEO и доступности', max_length=200, verbose_name='Alt-текст для главного изображения')),
+                ('gallery_images', models.JSONField(blank=True, default=list, help_text='Список путей к дополнительным изображениям проекта', verbose_name='Галерея изображений')),
+                ('client_name', models.CharField(blank=True, help_text='Название компании или имя клиента', max_length=150, verbose_name='Название клиента/компании')),
+                ('project_type', models.CharField(choices=[('seo', 'SEO-продвижение'), ('context', 'Контекстная реклама'), ('smm', 'SMM'), ('design', 'Дизайн'), ('development', 'Разработка'), ('complex', 'Комплексное продвижение')], default='seo', max_length=100, verbose_name='Тип проекта')),
+                ('results', models.JSONField(blank=True, default=list, help_text='Список достигнутых результатов. Формат: [{"metric": "Показатель", "value": "Значение", "description": "Описание"}]', verbose_name='Результаты проекта')),
+                ('technologies', models.JSONField(blank=True, default=list, help_text='Список технологий и инструментов. Формат: ["Технология 1", "Технология 2"]', verbose_name='Использованные технологии')),
+                ('project_url', models.URLField(blank=True, help_text='Ссылка на готовый проект или сайт', verbose_name='Ссылка на проект')),
+                ('cooperation_start', models.CharField(blank=True, default='', help_text="Например: 'Январь 2024' или 'Март 2023'", max_length=100, verbose_name='Начало сотрудничества')),
+                ('cooperation_end', models.CharField(blank=True, default='', help_text="Например: 'Декабрь 2024' или 'Сотрудничество продолжается'", max_length=100, verbose_name='Конец сотрудничества')),
+                ('order', models.IntegerField(default=100, verbose_name='Порядок отображения')),
+                ('is_published', models.BooleanField(default=True, verbose_name='Опубликовано')),
+                ('is_featured', models.BooleanField(default=False, help_text='Показывать в блоке рекомендуемых проектов', verbose_name='Рекомендуемый проект')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата обновления')),
+                ('show_breadcrumbs', models.BooleanField(default=True, help_text='Включить/выключить отображение хлебных крошек на этой странице', verbose_name='Показывать хлебные крошки')),
+                ('custom_breadcrumbs', models.JSONField(blank=True, default=list, help_text='Оставьте пустым для автоматических крошек. Формат: [{"title": "Название", "url": "/url/"}]', verbose_name='Пользовательские хлебные крошки')),
+                ('category', models.ForeignKey(blank=True, help_text='Выберите категорию для проекта', null=True, on_delete=django.db.models.deletion.SET_NULL, to='main.portfoliocategory', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'Работа в портфолио',
+                'verbose_name_plural': 'Портфолио',
+                'ordering': ['order', '-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RegionalPostAdaptation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seo_title', models.CharField(blank=True, help_text='Рекомендуется 50-60 символов. Если не указан, будет использован обычный заголовок.', max_length=60, null=True, verbose_name='SEO заголовок (title)')),
+                ('seo_description', models.TextField(blank=True, help_text='Рекомендуется 150-160 символов. Краткое описание страницы для поисковых систем.', max_length=160, null=True, verbose_name='SEO описание (description)')),
+                ('seo_index', models.BooleanField(default=True, help_text='Разрешить поисковым системам индексировать эту страницу', verbose_name='Индексировать страницу')),
+                ('seo_canonical', models.URLField(blank=True, help_text='Укажите канонический URL, если страница доступна по нескольким адресам', max_length=500, null=True, verbose_name='Канонический URL')),
+                ('title', models.CharField(blank=True, help_text='Оставьте пустым, чтобы использовать базовый заголовок + город', max_length=200, verbose_name='Региональный заголовок')),
+                ('content', django_ckeditor_5.fields.CKEditor5Field(blank=True, help_text='Оставьте пустым, чтобы использовать базовое содержимое', verbose_name='Региональное содержимое')),
+                ('description', models.TextField(blank=True, help_text='Оставьте пустым, чтобы использовать базовое описание + город', max_length=300, verbose_name='Региональное описание')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Активна')),
+                ('views_count', models.PositiveIntegerField(default=0, help_text='Количество просмотров региональной версии статьи', verbose_name='Просмотры')),
+                ('show_breadcrumbs', models.BooleanField(default=True, help_text='Включить/выключить отображение хлебных крошек на этой странице', verbose_name='Показывать хлебные крошки')),
+                ('custom_breadcrumbs', models.JSONField(blank=True, default=list, help_text='Оставьте пустым для автоматических крошек. Формат: [{"title": "Название", "url": "/url/"}]', verbose_name='Пользовательские хлебные крошки')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+                ('city', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='main.city', verbose_name='Город')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='regional_adaptations', to='blog.post', verbose_name='Базовая статья')),
+            ],
+            options={
+                'verbose_name': 'Региональная адаптация статьи',
+                'verbose_name_plural': 'Региональные адаптации статей',
+                'ordering': ['city__name', 'post__title'],
+                'unique_together': {('post', 'city')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TeamMember',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=120, verbose_name='Имя')),
+                ('role', models.CharField(max_length=150, verbose_name='Должность')),
+                ('photo', models.ImageField(blank=True, null=True, upload_to='team_photos/', verbose_name='Фото')),
+                ('photo_alt', models.CharField(blank=True, help_text='Описание фото для SEO и доступности', max_length=200, verbose_name='Альтернативный текст фото')),
+                ('bio', models.TextField(blank=True, verbose_name='Короткое описание')),
+                ('order', models.IntegerField(default=100, verbose_name='Порядок отображения')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Показывать')),
+            ],
+            options={
+                'verbose_name': 'Член команды',
+                'verbose_name_plural': 'Команда',
+                'ordering': ['order', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Testimonial',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('author_name', models.CharField(max_length=120, verbose_name='Имя автора')),
+                ('author_title', models.CharField(blank=True, max_length=160, verbose_name='Должность/Компания')),
+                ('photo', models.ImageField(blank=True, null=True, upload_to='testimonial_photos/', verbose_name='Аватар')),
+                ('photo_alt', models.CharField(blank=True, help_text='Описание аватара для SEO и доступности', max_length=200, verbose_name='Альтернативный текст аватара')),
+                ('content', models.TextField(verbose_name='Текст отзыва')),
+                ('rating', models.PositiveSmallIntegerField(default=5, verbose_name='Оценка (1-5)')),
+                ('order', models.IntegerField(default=100, verbose_name='Порядок отображения')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Показывать')),
+            ],
+            options={
+                'verbose_name': 'Отзыв',
+                'verbose_name_plural': 'Отзывы',
+                'ordering': ['order', '-id'],
+            },
+        ),
+        migrations.DeleteModel(
+            name='Post',
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='custom_breadcrumbs',
+            field=models.JSONField(blank=True, default=list, help_text='Оставьте пустым для автоматических крошек. Формат: [{"title": "Название", "url": "/url/"}]', verbose_name='Пользовательские хлебные крошки'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='image',
+            field=models.ImageField(blank=True, help_text='Рекомендуемый размер: 400x300px', null=True, upload_to='service_images/', verbose_name='Изображение услуги'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='image_alt',
+            field=models.CharField(blank=True, help_text='Описание изображения для SEO и доступности', max_length=200, verbose_name='Alt-текст для изображения'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='is_published',
+            field=models.BooleanField(default=True, verbose_name='Опубликовано'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='seo_canonical',
+            field=models.URLField(blank=True, help_text='Укажите канонический URL, если страница доступна по нескольким адресам', max_length=500, null=True, verbose_name='Канонический URL'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='seo_description',
+            field=models.TextField(blank=True, help_text='Рекомендуется 150-160 символов. Краткое описание страницы для поисковых систем.', max_length=160, null=True, verbose_name='SEO описание (description)'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='seo_index',
+            field=models.BooleanField(default=True, help_text='Разрешить поисковым системам индексировать эту страницу', verbose_name='Индексировать страницу'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='seo_title',
+            field=models.CharField(blank=True, help_text='Рекомендуется 50-60 символов. Если не указан, будет использован обычный заголовок.', max_length=60, null=True, verbose_name='SEO заголовок (title)'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='show_breadcrumbs',
+            field=models.BooleanField(default=True, help_text='Включить/выключить отображение хлебных крошек на этой странице', verbose_name='Показывать хлебные крошки'),
+        ),
+        migrations.AddField(
+            model_name='servicecategory',
+            name='custom_breadcrumbs',
+            field=models.JSONField(blank=True, default=list, help_text='Оставьте пустым для автоматических крошек. Формат: [{"title": "Название", "url": "/url/"}]', verbose_name='Пользовательские хлебные крошки'),
+        ),
+        migrations.AddField(
+            model_name='servicecategory',
+            name='seo_canonical',
+            field=models.URLField(blank=True, help_text='Укажите канонический URL, если страница доступна по нескольким адресам', max_length=500, null=True, verbose_name='Канонический URL'),
+        ),
+        migrations.AddField(
+            model_name='servicecategory',
+            name='seo_description',
+            field=models.TextField(blank=True, help_text='Рекомендуется 150-160 символов. Краткое описание страницы для поисковых систем.', max_length=160, null=True, verbose_name='SEO описание (description)'),
+        ),
+        migrations.AddField(
+            model_name='servicecategory',
+            name='seo_index',
+            field=models.BooleanField(default=True, help_text='Разрешить поисковым системам индексировать эту страницу', verbose_name='Индексировать страницу'),
+        ),
+        migrations.AddField(
+            model_name='servicecategory',
+            name='seo_title',
+            field=models.CharField(blank=True, help_text='Рекомендуется 50-60 символов. Если не указан, будет использован обычный заголовок.', max_length=60, null=True, verbose_name='SEO заголовок (title)'),
+        ),
+        migrations.AddField(
+            model_name='servicecategory',
+            name='show_breadcrumbs',
+            field=models.BooleanField(default=True, help_text='Включить/выключить отображение хлебных крошек на этой странице', verbose_name='Показывать хлебные крошки'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(help_text='Например: blog.post', max_length=50, verbose_name='Модель')),
+                ('object_id', models.PositiveIntegerField(verbose_name='ID объекта')),
+                ('related_id', models.PositiveIntegerField(verbose_name='ID связанного объекта')),
+                ('score', models.FloatField(default=0, verbose_name='Близость')),
+            ],
+            options={
+                'verbose_name': 'Связанный объект',
+                'verbose_name_plural': 'Связанные объекты',
+                'indexes': [models.Index(fields=['model_label', 'object_id', '-score'], name='related_item_lookup')],
+                'unique_together': {('model_label', 'object_id', 'related_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_searchdocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='published_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Опубликовано статей'),
+        ),
+        migrations.AddField(
+            model_name='faqcategory',
+            name='published_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Опубликовано вопросов'),
+        ),
+        migrations.AddField(
+            model_name='glossarycategory',
+            name='published_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Опубликовано терминов'),
+        ),
+        migrations.AddField(
+            model_name='portfoliocategory',
+            name='published_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Опубликовано проектов'),
+        ),
+        migrations.AddField(
+            model_name='servicecategory',
+            name='published_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Опубликовано услуг'),
+        ),
+    ]
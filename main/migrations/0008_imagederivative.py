@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_published_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageDerivative',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(help_text='Путь в MEDIA_ROOT', max_length=255, unique=True, verbose_name='Исходный файл')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('ready', 'Готово'), ('failed', 'Ошибка')], db_index=True, default='pending', max_length=10, verbose_name='Статус')),
+                ('width', models.PositiveIntegerField(blank=True, null=True, verbose_name='Ширина')),
+                ('height', models.PositiveIntegerField(blank=True, null=True, verbose_name='Высота')),
+                ('widths', models.JSONField(blank=True, default=list, verbose_name='Ширины копий')),
+                ('fallback', models.CharField(blank=True, help_text='jpg или png (с прозрачностью)', max_length=4, verbose_name='Формат для старых браузеров')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'Копии изображения',
+                'verbose_name_plural': 'Копии изображений',
+            },
+        ),
+    ]
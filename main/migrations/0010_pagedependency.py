@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_mediablob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageDependency',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=500, verbose_name='Путь страницы')),
+                ('model_label', models.CharField(help_text='Например: blog.post', max_length=50, verbose_name='Модель')),
+                ('key', models.CharField(help_text='pk объекта, list (состав списка) или * (любой объект)', max_length=40, verbose_name='Ключ')),
+            ],
+            options={
+                'verbose_name': 'Зависимость страницы',
+                'verbose_name_plural': 'Зависимости страниц',
+                'indexes': [models.Index(fields=['model_label', 'key'], name='page_dependency_lookup')],
+                'unique_together': {('path', 'model_label', 'key')},
+            },
+        ),
+    ]
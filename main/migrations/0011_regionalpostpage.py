@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_published_count'),
+        ('main', '0010_pagedependency'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegionalPostPage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seo_title', models.CharField(blank=True, help_text='Рекомендуется 50-60 символов. Если не указан, будет использован обычный заголовок.', max_length=60, null=True, verbose_name='SEO заголовок (title)')),
+                ('seo_description', models.TextField(blank=True, help_text='Рекомендуется 150-160 символов. Краткое описание страницы для поисковых систем.', max_length=160, null=True, verbose_name='SEO описание (description)')),
+                ('seo_index', models.BooleanField(default=True, help_text='Разрешить поисковым системам индексировать эту страницу', verbose_name='Индексировать страницу')),
+                ('seo_canonical', models.URLField(blank=True, help_text='Укажите канонический URL, если страница доступна по нескольким адресам', max_length=500, null=True, verbose_name='Канонический URL')),
+                ('city_slug', models.SlugField(db_index=False, max_length=100, verbose_name='Slug города')),
+                ('post_slug', models.SlugField(db_index=False, max_length=200, verbose_name='Slug статьи')),
+                ('is_published', models.BooleanField(default=True, help_text='Статья опубликована и адаптация активна', verbose_name='Опубликована')),
+                ('title', models.CharField(max_length=300, verbose_name='Заголовок')),
+                ('description', models.TextField(blank=True, verbose_name='Описание')),
+                ('content', models.TextField(blank=True, verbose_name='Содержимое')),
+                ('breadcrumbs_json_ld', models.TextField(blank=True, verbose_name='BreadcrumbList JSON-LD')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+                ('adaptation', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='page', to='main.regionalpostadaptation', verbose_name='Региональная адаптация')),
+                ('city', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='main.city', verbose_name='Город')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.post', verbose_name='Базовая статья')),
+            ],
+            options={
+                'verbose_name': 'Готовая региональная статья',
+                'verbose_name_plural': 'Готовые региональные статьи',
+                'unique_together': {('city_slug', 'post_slug')},
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Индекс полнотекстового поиска (main/search.py) под конкретную БД:
+#   PostgreSQL — GIN-индекс по SearchDocument.search_vector;
+#   SQLite     — виртуальная таблица FTS5 и триггеры синхронизации с SearchDocument
+#                (если SQLite собран без FTS5, поиск работает через icontains).
+# Схема модели не меняется, поэтому операции — только SQL.
+
+from django.db import migrations
+
+SOURCE = 'main_searchdocument'
+FTS = 'main_searchdocument_fts'
+
+
+def _has_fts5(cursor):
+    cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+    return bool(cursor.fetchone()[0])
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS search_document_vector ON {SOURCE} USING gin (search_vector)'
+        )
+    elif connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            if not _has_fts5(cursor):
+                return
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS} USING fts5("
+            f"title, body, content='{SOURCE}', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS}_ai AFTER INSERT ON {SOURCE} BEGIN "
+            f"INSERT INTO {FTS}(rowid, title, body) VALUES (new.id, new.title, new.body); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS}_ad AFTER DELETE ON {SOURCE} BEGIN "
+            f"INSERT INTO {FTS}({FTS}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS}_au AFTER UPDATE ON {SOURCE} BEGIN "
+            f"INSERT INTO {FTS}({FTS}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+            f"INSERT INTO {FTS}(rowid, title, body) VALUES (new.id, new.title, new.body); END"
+        )
+        schema_editor.execute(f"INSERT INTO {FTS}({FTS}) VALUES ('rebuild')")
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS search_document_vector')
+    elif connection.vendor == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {FTS}_{suffix}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0011_regionalpostpage'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
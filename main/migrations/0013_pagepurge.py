@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0012_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PagePurge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=500, unique=True, verbose_name='Путь страницы')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Поставлена в очередь')),
+            ],
+            options={
+                'verbose_name': 'Страница в очереди сброса',
+                'verbose_name_plural': 'Страницы в очереди сброса',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0013_pagepurge'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='regionalpostpage',
+            name='needs_refresh',
+            field=models.BooleanField(db_index=True, default=False, help_text='Город или категория изменены, строку пересчитает фоновая команда', verbose_name='Ждет пересчета'),
+        ),
+    ]
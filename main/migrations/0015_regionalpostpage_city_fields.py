@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:32
+
+from django.db import migrations, models
+
+from main.city_directory import prepositional_form
+
+
+def fill_city_fields(apps, schema_editor):
+    # Поля города у существующих строк (новые заполняет main/regional_posts.build_page)
+    City = apps.get_model('main', 'City')
+    RegionalPostPage = apps.get_model('main', 'RegionalPostPage')
+    for city in City.objects.all().iterator():
+        pages = RegionalPostPage.objects.filter(city_id=city.pk)
+        pages.update(
+            city_name=city.name,
+            city_name_prepositional=city.name_prepositional or prepositional_form(city.name),
+            city_local_description=city.local_description,
+        )
+        if not city.is_active:
+            pages.update(is_published=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0014_regionalpostpage_needs_refresh'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='regionalpostpage',
+            name='city_local_description',
+            field=models.TextField(blank=True, verbose_name='Локальное описание города'),
+        ),
+        migrations.AddField(
+            model_name='regionalpostpage',
+            name='city_name',
+            field=models.CharField(blank=True, max_length=100, verbose_name='Название города'),
+        ),
+        migrations.AddField(
+            model_name='regionalpostpage',
+            name='city_name_prepositional',
+            field=models.CharField(blank=True, max_length=120, verbose_name='Город в предложном падеже'),
+        ),
+        migrations.AlterField(
+            model_name='regionalpostpage',
+            name='is_published',
+            field=models.BooleanField(default=True, help_text='Статья опубликована, адаптация и город активны', verbose_name='Опубликована'),
+        ),
+        migrations.RunPython(fill_city_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0015_regionalpostpage_city_fields'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='relateditem',
+            name='object_id',
+            field=models.PositiveBigIntegerField(verbose_name='ID объекта'),
+        ),
+        migrations.AlterField(
+            model_name='relateditem',
+            name='related_id',
+            field=models.PositiveBigIntegerField(verbose_name='ID связанного объекта'),
+        ),
+    ]
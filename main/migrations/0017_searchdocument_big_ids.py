@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:52
+#
+# SQLite меняет тип столбца пересозданием таблицы, при этом триггеры FTS5
+# (0012_search_index) удаляются вместе со старой таблицей: пересоздаем их.
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+search_index = import_module('main.migrations.0012_search_index')
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        search_index.drop_search_index(apps, schema_editor)
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        search_index.create_search_index(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0016_relateditem_big_ids'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_fts, create_fts),
+        migrations.AlterField(
+            model_name='searchdocument',
+            name='object_id',
+            field=models.PositiveBigIntegerField(verbose_name='ID объекта'),
+        ),
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,22 @@
+# Счетчики published_count (main/0007, blog/0005) для уже существующих
+# объектов: без пересчета они оставались нулевыми до reconcile_counters.
+
+from django.db import migrations
+
+from main.counters import reconcile_all
+
+
+def fill_published_count(apps, schema_editor):
+    reconcile_all(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0017_searchdocument_big_ids'),
+        ('blog', '0005_published_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_published_count, migrations.RunPython.noop),
+    ]
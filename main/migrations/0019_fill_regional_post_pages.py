@@ -0,0 +1,21 @@
+# Готовые региональные статьи (main/0011) для уже существующих адаптаций:
+# без них страницы отдавали базовую статью до rebuild_regional_posts.
+
+from django.db import migrations
+
+from main.regional_posts import fill_regional_posts
+
+
+def fill_regional_post_pages(apps, schema_editor):
+    fill_regional_posts(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0018_fill_published_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_regional_post_pages, migrations.RunPython.noop),
+    ]
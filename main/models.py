@@ -1,13 +1,16 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.urls import reverse
 from django_ckeditor_5.fields import CKEditor5Field
 from django.utils import timezone
+from django.utils.safestring import mark_safe
 from django.contrib.auth.models import User
+from seo.breadcrumbs import BreadcrumbsMixin
 from seo.models import SEOModel
 
 # --- Модели для Регионального SEO ---
 
-class City(SEOModel):
+class City(BreadcrumbsMixin, SEOModel):
     """Модель для городов-миллионников для регионального SEO"""
     name = models.CharField(max_length=100, verbose_name="Название города")
     slug = models.SlugField(unique=True, max_length=100, verbose_name="URL-идентификатор")
@@ -51,6 +54,8 @@ class City(SEOModel):
         help_text="Оставьте пустым для автоматических крошек. Формат: [{\"title\": \"Название\", \"url\": \"/url/\"}]"
     )
 
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлено")
+
     class Meta:
         verbose_name = "Город"
         verbose_name_plural = "Города"
@@ -63,8 +68,8 @@ class City(SEOModel):
         from django.urls import reverse
         return reverse('main:city_detail', kwargs={'slug': self.slug})
     
-    def get_breadcrumbs(self):
-        """Возвращает хлебные крошки для города"""
+    def build_breadcrumbs(self):
+        """Собирает хлебные крошки для города"""
         if not self.show_breadcrumbs:
             return []
         
@@ -92,30 +97,8 @@ class City(SEOModel):
         if self.name_prepositional:
             return self.name_prepositional
         
-        # Автоматическое склонение для некоторых городов
-        city_declensions = {
-            'Казань': 'в Казани',
-            'Москва': 'в Москве',
-            'Санкт-Петербург': 'в Санкт-Петербурге',
-            'Новосибирск': 'в Новосибирске',
-            'Екатеринбург': 'в Екатеринбурге',
-            'Нижний Новгород': 'в Нижнем Новгороде',
-            'Самара': 'в Самаре',
-            'Омск': 'в Омске',
-            'Ростов-на-Дону': 'в Ростове-на-Дону',
-            'Уфа': 'в Уфе',
-            'Красноярск': 'в Красноярске',
-            'Воронеж': 'в Воронеже',
-            'Пермь': 'в Перми',
-            'Волгоград': 'в Волгограде',
-            'Челябинск': 'в Челябинске',
-            'Минск': 'в Минске',
-            'Алматы': 'в Алматы',
-            'Астана': 'в Астане',
-            'Ташкент': 'в Ташкенте',
-        }
-        
-        return city_declensions.get(self.name, f"в {self.name}")
+        from .city_directory import prepositional_form
+        return prepositional_form(self.name)
 
 # --- Модель для главной страницы ---
 
@@ -313,12 +296,14 @@ class CustomHeadScript(models.Model):
 
 # --- Модели для Услуг (для хедера и футера) ---
 
-class ServiceCategory(SEOModel):
+class ServiceCategory(BreadcrumbsMixin, SEOModel):
     """Модель для разделов услуг (например, 'SEO-продвижение', 'Контекстная реклама')"""
     title = models.CharField(max_length=100, verbose_name="Название раздела")
     # Используем slug для создания ЧПУ-ссылок
     slug = models.SlugField(unique=True, max_length=100, verbose_name="URL-идентификатор")
     order = models.IntegerField(default=100, verbose_name="Порядок отображения")
+    # Число опубликованных услуг, поддерживается сигналами (main/counters.py)
+    published_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Опубликовано услуг")
     
     # Хлебные крошки
     show_breadcrumbs = models.BooleanField(
@@ -334,6 +319,8 @@ class ServiceCategory(SEOModel):
         help_text="Оставьте пустым для автоматических крошек. Формат: [{\"title\": \"Название\", \"url\": \"/url/\"}]"
     )
 
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлено")
+
     class Meta:
         verbose_name = "Раздел услуг"
         verbose_name_plural = "Разделы услуг"
@@ -347,8 +334,11 @@ class ServiceCategory(SEOModel):
         from django.urls import reverse
         return reverse('services:service_category', kwargs={'slug': self.slug})
     
-    def get_breadcrumbs(self, city=None):
-        """Возвращает хлебные крошки для категории услуг"""
+    # Связи и город для кэшируемых крошек (seo/breadcrumbs.py)
+    breadcrumbs_by_city = True
+
+    def build_breadcrumbs(self, city=None):
+        """Собирает хлебные крошки для категории услуг"""
         if not self.show_breadcrumbs:
             return []
         
@@ -380,7 +370,7 @@ class ServiceCategory(SEOModel):
         return breadcrumbs
 
 
-class Service(SEOModel):
+class Service(BreadcrumbsMixin, SEOModel):
     """Модель для конкретных услуг внутри раздела"""
     category = models.ForeignKey(
         ServiceCategory,
@@ -423,6 +413,8 @@ class Service(SEOModel):
         help_text="Оставьте пустым для автоматических крошек. Формат: [{\"title\": \"Название\", \"url\": \"/url/\"}]"
     )
 
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлено")
+
     class Meta:
         verbose_name = "Услуга"
         verbose_name_plural = "Услуги"
@@ -445,8 +437,12 @@ class Service(SEOModel):
             return self.image_alt
         return f"Изображение услуги {self.title}"
     
-    def get_breadcrumbs(self, city=None):
-        """Возвращает хлебные крошки для услуги"""
+    # Связи и город для кэшируемых крошек (seo/breadcrumbs.py)
+    breadcrumb_parents = ('category',)
+    breadcrumbs_by_city = True
+
+    def build_breadcrumbs(self, city=None):
+        """Собирает хлебные крошки для услуги"""
         if not self.show_breadcrumbs:
             return []
         
@@ -489,23 +485,9 @@ class Service(SEOModel):
     
     def get_related_services(self, limit=3):
         """Возвращает случайные услуги для блока 'Еще услуги'"""
-        from django.db.models import Q
-        from random import sample
-        
-        # Получаем все опубликованные услуги кроме текущей
-        all_services = Service.objects.filter(
-            is_published=True
-        ).exclude(pk=self.pk)
-        
-        # Если услуг меньше лимита, возвращаем все доступные
-        if all_services.count() <= limit:
-            return list(all_services)
-        
-        # Получаем случайные услуги
-        services_list = list(all_services)
-        random_services = sample(services_list, limit)
-        
-        return random_services
+        # Соседи посчитаны заранее (main/related.py), здесь только случайный выбор из пула
+        from main.related import get_related
+        return get_related(self, limit=limit)
 
 
 
@@ -564,6 +546,8 @@ class Author(models.Model):
     specializations = models.TextField(blank=True, verbose_name="Специализации", help_text="Области экспертизы автора")
     social_links = models.JSONField(default=dict, blank=True, verbose_name="Социальные сети", help_text="JSON с ссылками на соцсети")
     is_active = models.BooleanField(default=True, verbose_name="Активен")
+    # Число опубликованных статей, поддерживается сигналами (main/counters.py)
+    published_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Опубликовано статей")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Дата обновления")
 
@@ -615,7 +599,7 @@ class Testimonial(models.Model):
 
 # --- Модели для Портфолио ---
 
-class PortfolioCategory(SEOModel):
+class PortfolioCategory(BreadcrumbsMixin, SEOModel):
     """Модель для категорий портфолио"""
     name = models.CharField(max_length=100, verbose_name="Название категории")
     slug = models.SlugField(unique=True, max_length=100, verbose_name="URL-идентификатор")
@@ -627,6 +611,8 @@ class PortfolioCategory(SEOModel):
         help_text="Например: #007bff для синего цвета"
     )
     order = models.IntegerField(default=100, verbose_name="Порядок отображения")
+    # Число опубликованных проектов, поддерживается сигналами (main/counters.py)
+    published_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Опубликовано проектов")
     is_active = models.BooleanField(default=True, verbose_name="Активна")
     
     # Хлебные крошки
@@ -643,6 +629,8 @@ class PortfolioCategory(SEOModel):
         help_text="Оставьте пустым для автоматических крошек. Формат: [{\"title\": \"Название\", \"url\": \"/url/\"}]"
     )
 
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлено")
+
     class Meta:
         verbose_name = "Категория портфолио"
         verbose_name_plural = "Категории портфолио"
@@ -654,8 +642,8 @@ class PortfolioCategory(SEOModel):
     def get_absolute_url(self):
         return reverse('main:portfolio_category', kwargs={'slug': self.slug})
     
-    def get_breadcrumbs(self):
-        """Возвращает хлебные крошки для категории портфолио"""
+    def build_breadcrumbs(self):
+        """Собирает хлебные крошки для категории портфолио"""
         if not self.show_breadcrumbs:
             return []
         
@@ -675,7 +663,7 @@ class PortfolioCategory(SEOModel):
         return breadcrumbs
 
 
-class PortfolioItem(SEOModel):
+class PortfolioItem(BreadcrumbsMixin, SEOModel):
     """Модель для работ в портфолио"""
     category = models.ForeignKey(
         PortfolioCategory,
@@ -817,8 +805,11 @@ class PortfolioItem(SEOModel):
             return self.main_image_alt
         return f"Изображение проекта {self.title}"
     
-    def get_breadcrumbs(self):
-        """Возвращает хлебные крошки для проекта портфолио"""
+    # Связи и город для кэшируемых крошек (seo/breadcrumbs.py)
+    breadcrumb_parents = ('category',)
+
+    def build_breadcrumbs(self):
+        """Собирает хлебные крошки для проекта портфолио"""
         if not self.show_breadcrumbs:
             return []
         
@@ -887,25 +878,12 @@ class PortfolioItem(SEOModel):
     
     def get_related_projects(self, limit=3):
         """Возвращает случайные связанные проекты для блока 'Еще проекты'"""
-        from random import sample
-        
-        # Получаем все опубликованные проекты кроме текущего
-        all_projects = PortfolioItem.objects.filter(
-            is_published=True
-        ).exclude(pk=self.pk)
-        
-        # Если проектов меньше лимита, возвращаем все доступные
-        if all_projects.count() <= limit:
-            return list(all_projects)
-        
-        # Получаем случайные проекты
-        projects_list = list(all_projects)
-        random_projects = sample(projects_list, limit)
-        
-        return random_projects
+        # Соседи посчитаны заранее (main/related.py), здесь только случайный выбор из пула
+        from main.related import get_related
+        return get_related(self, limit=limit)
 
 
-class RegionalPostAdaptation(SEOModel):
+class RegionalPostAdaptation(BreadcrumbsMixin, SEOModel):
     """Модель для региональных адаптаций статей"""
     post = models.ForeignKey(
         'blog.Post',
@@ -1003,8 +981,11 @@ class RegionalPostAdaptation(SEOModel):
             'post_slug': self.post.slug
         })
     
-    def get_breadcrumbs(self):
-        """Возвращает хлебные крошки для региональной адаптации"""
+    # Связи и город для кэшируемых крошек (seo/breadcrumbs.py)
+    breadcrumb_parents = ('city', 'post__category')
+
+    def build_breadcrumbs(self):
+        """Собирает хлебные крошки для региональной адаптации"""
         if not self.show_breadcrumbs:
             return []
         
@@ -1035,9 +1016,70 @@ class RegionalPostAdaptation(SEOModel):
         return breadcrumbs
 
 
+class RegionalPostPage(SEOModel):
+    """
+    Готовая региональная статья: заголовок, описание, контент, SEO-поля и
+    крошки адаптации с уже подставленными данными базовой статьи и города.
+    Пересчитывается сигналами при изменении адаптации, статьи или города
+    (см. main/regional_posts.py); страница статьи в городе читает одну строку.
+    """
+    adaptation = models.OneToOneField(
+        RegionalPostAdaptation,
+        on_delete=models.CASCADE,
+        related_name='page',
+        verbose_name="Региональная адаптация"
+    )
+    post = models.ForeignKey('blog.Post', on_delete=models.CASCADE, related_name='+', verbose_name="Базовая статья")
+    city = models.ForeignKey(City, on_delete=models.CASCADE, related_name='+', verbose_name="Город")
+    # Slug из URL страницы: поиск по уникальному индексу без JOIN
+    city_slug = models.SlugField(max_length=100, db_index=False, verbose_name="Slug города")
+    post_slug = models.SlugField(max_length=200, db_index=False, verbose_name="Slug статьи")
+    is_published = models.BooleanField(default=True, verbose_name="Опубликована", help_text="Статья опубликована, адаптация и город активны")
+    # Поля города для страницы: она не загружает City отдельным запросом
+    city_name = models.CharField(max_length=100, blank=True, verbose_name="Название города")
+    city_name_prepositional = models.CharField(max_length=120, blank=True, verbose_name="Город в предложном падеже")
+    city_local_description = models.TextField(blank=True, verbose_name="Локальное описание города")
+    title = models.CharField(max_length=300, verbose_name="Заголовок")
+    description = models.TextField(blank=True, verbose_name="Описание")
+    content = models.TextField(blank=True, verbose_name="Содержимое")
+    breadcrumbs_json_ld = models.TextField(blank=True, verbose_name="BreadcrumbList JSON-LD")
+    needs_refresh = models.BooleanField(default=False, db_index=True, verbose_name="Ждет пересчета", help_text="Город или категория изменены, строку пересчитает фоновая команда")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлено")
+
+    class Meta:
+        verbose_name = "Готовая региональная статья"
+        verbose_name_plural = "Готовые региональные статьи"
+        unique_together = ['city_slug', 'post_slug']
+
+    def __str__(self):
+        return self.title
+
+    def get_absolute_url(self):
+        return reverse('main:city_post_detail', kwargs={'city_slug': self.city_slug, 'post_slug': self.post_slug})
+
+    def get_breadcrumbs_json_ld(self, city=None):
+        """BreadcrumbList JSON-LD, собранный при пересчете строки"""
+        return mark_safe(self.breadcrumbs_json_ld)
+
+    def get_related_posts(self, limit=3):
+        """Похожие статьи базовой статьи (загружает ее только при обращении)"""
+        return self.post.get_related_posts(limit=limit)
+
+    def get_city(self):
+        """Город страницы из сохраненных полей (несохраняемый объект, без запроса к БД)"""
+        return City(
+            pk=self.city_id,
+            name=self.city_name,
+            slug=self.city_slug,
+            name_prepositional=self.city_name_prepositional,
+            local_description=self.city_local_description,
+            is_active=True,
+        )
+
+
 # --- Модели для Глоссария ---
 
-class GlossaryCategory(SEOModel):
+class GlossaryCategory(BreadcrumbsMixin, SEOModel):
     """Модель для категорий глоссария"""
     name = models.CharField(max_length=100, verbose_name="Название категории")
     slug = models.SlugField(unique=True, max_length=100, verbose_name="URL-идентификатор")
@@ -1048,6 +1090,8 @@ class GlossaryCategory(SEOModel):
         help_text="Краткое описание категории терминов"
     )
     order = models.IntegerField(default=100, verbose_name="Порядок отображения")
+    # Число опубликованных терминов, поддерживается сигналами (main/counters.py)
+    published_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Опубликовано терминов")
     is_active = models.BooleanField(default=True, verbose_name="Активна")
 
     # Хлебные крошки
@@ -1079,8 +1123,8 @@ class GlossaryCategory(SEOModel):
         from django.urls import reverse
         return reverse('main:glossary_category', kwargs={'slug': self.slug})
 
-    def get_breadcrumbs(self):
-        """Возвращает хлебные крошки для категории глоссария"""
+    def build_breadcrumbs(self):
+        """Собирает хлебные крошки для категории глоссария"""
         if not self.show_breadcrumbs:
             return []
 
@@ -1098,7 +1142,7 @@ class GlossaryCategory(SEOModel):
         return breadcrumbs
 
 
-class GlossaryTerm(SEOModel):
+class GlossaryTerm(BreadcrumbsMixin, SEOModel):
     """Модель для терминов глоссария"""
     category = models.ForeignKey(
         GlossaryCategory,
@@ -1141,8 +1185,11 @@ class GlossaryTerm(SEOModel):
         from django.urls import reverse
         return reverse('main:glossary_term', kwargs={'category_slug': self.category.slug, 'term_slug': self.slug})
 
-    def get_breadcrumbs(self):
-        """Возвращает хлебные крошки для термина глоссария"""
+    # Связи и город для кэшируемых крошек (seo/breadcrumbs.py)
+    breadcrumb_parents = ('category',)
+
+    def build_breadcrumbs(self):
+        """Собирает хлебные крошки для термина глоссария"""
         if not self.show_breadcrumbs:
             return []
 
@@ -1166,7 +1213,7 @@ class GlossaryTerm(SEOModel):
 
 # --- Модели для FAQ (Вопрос-Ответ) ---
 
-class FAQCategory(SEOModel):
+class FAQCategory(BreadcrumbsMixin, SEOModel):
     """Модель для категорий вопросов-ответов"""
     name = models.CharField(max_length=100, verbose_name="Название категории")
     slug = models.SlugField(unique=True, max_length=100, verbose_name="URL-идентификатор")
@@ -1177,6 +1224,8 @@ class FAQCategory(SEOModel):
         help_text="Краткое описание категории вопросов"
     )
     order = models.IntegerField(default=100, verbose_name="Порядок отображения")
+    # Число опубликованных вопросов, поддерживается сигналами (main/counters.py)
+    published_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Опубликовано вопросов")
     is_active = models.BooleanField(default=True, verbose_name="Активна")
     
     # Хлебные крошки
@@ -1208,8 +1257,8 @@ class FAQCategory(SEOModel):
         from django.urls import reverse
         return reverse('main:faq_category', kwargs={'slug': self.slug})
     
-    def get_breadcrumbs(self):
-        """Возвращает хлебные крошки для категории FAQ"""
+    def build_breadcrumbs(self):
+        """Собирает хлебные крошки для категории FAQ"""
         if not self.show_breadcrumbs:
             return []
         
@@ -1227,7 +1276,7 @@ class FAQCategory(SEOModel):
         return breadcrumbs
 
 
-class FAQItem(SEOModel):
+class FAQItem(BreadcrumbsMixin, SEOModel):
     """Модель для вопросов-ответов"""
     category = models.ForeignKey(
         FAQCategory,
@@ -1271,8 +1320,11 @@ class FAQItem(SEOModel):
         from django.urls import reverse
         return reverse('main:faq_item', kwargs={'category_slug': self.category.slug, 'item_slug': self.slug})
     
-    def get_breadcrumbs(self):
-        """Возвращает хлебные крошки для вопроса-ответа"""
+    # Связи и город для кэшируемых крошек (seo/breadcrumbs.py)
+    breadcrumb_parents = ('category',)
+
+    def build_breadcrumbs(self):
+        """Собирает хлебные крошки для вопроса-ответа"""
         if not self.show_breadcrumbs:
             return []
         
@@ -1291,4 +1343,138 @@ class FAQItem(SEOModel):
             "url": self.get_absolute_url()
         })
         
-        return breadcrumbs
\ No newline at end of file
+        return breadcrumbs
+
+class RelatedItem(models.Model):
+    """
+    Таблица соседей для блоков "Вам может понравиться" / "Еще услуги" / "Еще проекты".
+    Пересчитывается командой rebuild_related (см. main/related.py).
+    """
+    model_label = models.CharField(max_length=50, verbose_name="Модель", help_text="Например: blog.post")
+    object_id = models.PositiveBigIntegerField(verbose_name="ID объекта")
+    related_id = models.PositiveBigIntegerField(verbose_name="ID связанного объекта")
+    score = models.FloatField(default=0, verbose_name="Близость")
+
+    class Meta:
+        verbose_name = "Связанный объект"
+        verbose_name_plural = "Связанные объекты"
+        unique_together = ['model_label', 'object_id', 'related_id']
+        indexes = [
+            models.Index(fields=['model_label', 'object_id', '-score'], name='related_item_lookup'),
+        ]
+
+    def __str__(self):
+        return f"{self.model_label}: {self.object_id} → {self.related_id}"
+
+
+class SearchDocument(models.Model):
+    """
+    Поисковый документ: очищенный от HTML текст статьи, услуги, проекта,
+    вопроса FAQ или термина глоссария. Обновляется сигналами (см. main/search.py).
+    """
+    model_label = models.CharField(max_length=50, verbose_name="Модель", help_text="Например: blog.post")
+    object_id = models.PositiveBigIntegerField(verbose_name="ID объекта")
+    title = models.CharField(max_length=300, verbose_name="Заголовок")
+    body = models.TextField(blank=True, verbose_name="Текст")
+    url = models.CharField(max_length=500, verbose_name="URL")
+    # Заполняется только на PostgreSQL (на SQLite используется таблица FTS5)
+    search_vector = SearchVectorField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлено")
+
+    class Meta:
+        verbose_name = "Поисковый документ"
+        verbose_name_plural = "Поисковые документы"
+        unique_together = ['model_label', 'object_id']
+        # GIN-индекс (PostgreSQL) и таблица FTS5 (SQLite) создаются
+        # миграцией 0012_search_index только для своей БД
+
+    def __str__(self):
+        return f"{self.model_label}: {self.title}"
+
+
+class ImageDerivative(models.Model):
+    """
+    Уменьшенные копии загруженного изображения (WebP + JPEG/PNG по ширинам)
+    и его исходные размеры. Создаются командой process_images (см. main/images.py).
+    """
+    PENDING = 'pending'
+    READY = 'ready'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'В очереди'),
+        (READY, 'Готово'),
+        (FAILED, 'Ошибка'),
+    ]
+
+    source = models.CharField(max_length=255, unique=True, verbose_name="Исходный файл", help_text="Путь в MEDIA_ROOT")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, db_index=True, verbose_name="Статус")
+    width = models.PositiveIntegerField(null=True, blank=True, verbose_name="Ширина")
+    height = models.PositiveIntegerField(null=True, blank=True, verbose_name="Высота")
+    widths = models.JSONField(default=list, blank=True, verbose_name="Ширины копий")
+    fallback = models.CharField(max_length=4, blank=True, verbose_name="Формат для старых браузеров", help_text="jpg или png (с прозрачностью)")
+    error = models.TextField(blank=True, verbose_name="Ошибка")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлено")
+
+    class Meta:
+        verbose_name = "Копии изображения"
+        verbose_name_plural = "Копии изображений"
+
+    def __str__(self):
+        return f"{self.source} ({self.get_status_display()})"
+
+
+class MediaBlob(models.Model):
+    """
+    Уникальный загруженный файл в blobs/ (имя — SHA-256 содержимого) и число
+    ссылок на него из полей моделей. См. main/storage.py и main/blobs.py.
+    """
+    name = models.CharField(max_length=255, unique=True, verbose_name="Файл", help_text="Путь в MEDIA_ROOT")
+    size = models.BigIntegerField(default=0, verbose_name="Размер, байт")
+    # Поддерживается сигналами; manage.py gc_media пересчитывает и удаляет файлы без ссылок
+    ref_count = models.PositiveIntegerField(default=0, db_index=True, verbose_name="Ссылок")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Загружен")
+
+    class Meta:
+        verbose_name = "Файл медиатеки"
+        verbose_name_plural = "Файлы медиатеки"
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count})"
+
+
+class PageDependency(models.Model):
+    """
+    Обратный индекс графа зависимостей: какие страницы прочитали объект
+    (или список объектов) модели. Заполняется при рендере страниц,
+    используется для точечного сброса кэша (см. main/dependencies.py).
+    """
+    path = models.CharField(max_length=500, verbose_name="Путь страницы")
+    model_label = models.CharField(max_length=50, verbose_name="Модель", help_text="Например: blog.post")
+    key = models.CharField(max_length=40, verbose_name="Ключ", help_text="pk объекта, list (состав списка) или * (любой объект)")
+
+    class Meta:
+        verbose_name = "Зависимость страницы"
+        verbose_name_plural = "Зависимости страниц"
+        unique_together = ['path', 'model_label', 'key']
+        indexes = [
+            models.Index(fields=['model_label', 'key'], name='page_dependency_lookup'),
+        ]
+
+    def __str__(self):
+        return f"{self.path} ← {self.model_label}:{self.key}"
+
+
+class PagePurge(models.Model):
+    """
+    Страница в очереди сброса: крупный сброс из purge_dependents не выполняется
+    в запросе сохранения, остаток дочищает фоновая команда (main/dependencies.py).
+    """
+    path = models.CharField(max_length=500, unique=True, verbose_name="Путь страницы")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Поставлена в очередь")
+
+    class Meta:
+        verbose_name = "Страница в очереди сброса"
+        verbose_name_plural = "Страницы в очереди сброса"
+
+    def __str__(self):
+        return self.path
@@ -0,0 +1,119 @@
+# main/page_cache.py - Кэш готовых страниц для анонимных посетителей
+#
+# Страницы, помеченные @public_page (main/http_cache.py), после первого рендера
+# сохраняются в общем кэше в сжатом виде. Ключ строится из пути и GET-параметров.
+# Город посетителя в ключ не входит: страницы от него не зависят, а выбранный
+# город в меню отмечает скрипт по cookie (main.middleware.GeoLocationMiddleware).
+# Кэшируются только запросы с параметрами, которые читает view
+# (@public_page(query=...)): остальные (utm-метки, мусор) идут мимо кэша.
+#
+# Инвалидация:
+#   - точечно по URL: invalidate_urls(['/blog/...']) увеличивает поколение пути,
+#     все варианты страницы (query string) сразу становятся недействительными;
+#   - целиком: смена версии контента (меню, футер) — ключи версионные.
+# invalidate_urls также удаляет готовые HTML-файлы этих страниц (main/prerender.py).
+
+import hashlib
+import re
+import zlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+
+from .cache import bump_version, make_key, shared_cache
+from .instrumentation import count_cache
+
+PAGE_CACHE_TIMEOUT = getattr(settings, 'PAGE_CACHE_TIMEOUT', 60 * 10)
+
+# CSRF-токен в закэшированной странице заменяется заглушкой
+# и подставляется заново для каждого посетителя
+CSRF_PLACEHOLDER = b'__page_cache_csrf_token__'
+CSRF_TOKEN_RE = re.compile(rb'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+
+
+def _hash(value):
+    return hashlib.md5(value.encode('utf-8'), usedforsecurity=False).hexdigest()
+
+
+def _generation_key(path):
+    return f'page:gen:{_hash(path)}'
+
+
+def get_path_generation(path):
+    """Поколение страницы: меняется при каждом invalidate_urls"""
+    return shared_cache().get(_generation_key(path), 0)
+
+
+def get_page_generation(request):
+    # Нужно и для ETag, и для ключа кэша: читаем один раз за запрос
+    if not hasattr(request, '_page_generation'):
+        request._page_generation = get_path_generation(request.path)
+    return request._page_generation
+
+
+def is_cacheable_query(request, allowed):
+    """Строка запроса содержит только параметры из allowed"""
+    return all(name in allowed for name in request.GET)
+
+
+def get_page_key(request):
+    """Возвращает ключ кэша страницы или None, если кэш недоступен"""
+    path = request.path
+    generation = get_page_generation(request)
+    # Порядок параметров в URL не создает новых вариантов
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    variant = '|'.join([path, query])
+    return make_key(f'page:{_hash(path)}:{generation}:{_hash(variant)}')
+
+
+def get_cached_page(request):
+    """Возвращает закэшированный ответ для запроса или None"""
+    key = get_page_key(request)
+    if key is None:
+        return None
+    entry = shared_cache().get(key)
+    count_cache(hit=entry is not None)
+    if entry is None:
+        return None
+
+    body = zlib.decompress(entry['body'])
+    if CSRF_PLACEHOLDER in body:
+        body = body.replace(CSRF_PLACEHOLDER, get_token(request).encode('ascii'))
+
+    response = HttpResponse(body, content_type=entry['content_type'])
+    for header, value in entry['headers'].items():
+        response[header] = value
+    return response
+
+
+def store_page(request, response):
+    """Сохраняет отрендеренную страницу в кэше (сжатой, без CSRF-токена)"""
+    key = get_page_key(request)
+    if key is None:
+        return
+    body = CSRF_TOKEN_RE.sub(rb'\1' + CSRF_PLACEHOLDER + rb'\2', response.content)
+    entry = {
+        'body': zlib.compress(body, 6),
+        'content_type': response['Content-Type'],
+        'headers': {
+            header: response[header]
+            for header in ('ETag', 'Last-Modified', 'Content-Language')
+            if response.has_header(header)
+        },
+    }
+    shared_cache().set(key, entry, PAGE_CACHE_TIMEOUT)
+
+
+def invalidate_urls(urls):
+    """Сбрасывает кэш страниц по списку URL (все варианты query string)"""
+    for url in set(urls):
+        if url:
+            # Новое поколение берется из времени, если старое вытеснено из кэша
+            bump_version(_generation_key(url.split('?', 1)[0]))
+
+    # Готовые файлы региональных страниц (main/prerender.py)
+    from .prerender import remove_prerendered
+
+    remove_prerendered(urls)
@@ -0,0 +1,282 @@
+# main/prerender.py - Готовые HTML-файлы региональных страниц
+#
+# manage.py prerender_regional рендерит региональные страницы, на которые
+# ведут ссылки сайта и sitemap: страницу города, город × услуга, город ×
+# категория и статьи с региональной адаптацией (RegionalPostPage) — не каждую
+# статью в каждом городе. Файлы пишутся в PRERENDER_ROOT:
+#   cities/<город>/index.html
+#   cities/<город>/services/<услуга>/index.html
+#   cities/<город>/category/<категория>/index.html
+#   cities/<город>/blog/<статья>/index.html
+# вместе с .gz-копиями (запись атомарная, seo_management/publish.write_atomic).
+#
+# Страницы рендерятся теми же view, что и обычные запросы, от имени анонимного
+# посетителя без города. Рендер идет в пуле процессов: URL делятся на пачки,
+# каждый воркер открывает свое соединение с БД.
+#
+# nginx отдает файлы только поисковым роботам без cookie и query string
+# (deploy/nginx-seo-agency.conf): в файле нет CSRF-токена для формы заявки,
+# просмотры статей по файлам не учитываются. Остальные запросы идут в Django.
+#
+# Актуальность: при рендере записывается граф зависимостей страницы
+# (main/dependencies.py), включая меню и <head> (они берутся из кэша, трекер
+# их не видит — см. layout_dependencies). invalidate_urls (main/page_cache.py)
+# удаляет файлы измененных и удаленных страниц, nginx отдает их через Django,
+# а запуск рендерит только страницы без файла. --force перерендеривает все
+# и удаляет файлы страниц, которых нет в матрице.
+
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from importlib import import_module
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import connections
+from django.http import Http404
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from seo_management.publish import get_site_url, write_atomic
+
+from .dependencies import ANY, record_dependencies, track_dependencies
+from .page_cache import CSRF_TOKEN_RE
+
+INDEX_NAME = 'index.html'
+KINDS = ('city', 'service', 'category', 'post')
+BATCH_SIZE = 200
+# Каталог вида страницы -> ключ матрицы (см. main/urls.py)
+KIND_DIRS = {'services': 'service', 'category': 'category', 'blog': 'post'}
+
+
+def get_prerender_root():
+    return Path(settings.PRERENDER_ROOT)
+
+
+def file_for_url(root, url):
+    """Путь к index.html для URL страницы"""
+    return Path(root) / url.split('?', 1)[0].strip('/') / INDEX_NAME
+
+
+def load_matrix(cities=None):
+    """
+    Slug городов, услуг и категорий, из которых строится матрица страниц,
+    и статьи с региональной адаптацией: {'post': {город: [статьи]}}
+    """
+    from .models import City, RegionalPostPage, Service, ServiceCategory
+
+    city_slugs = City.objects.filter(is_active=True).order_by('order', 'name')
+    pages = RegionalPostPage.objects.filter(is_published=True, city__is_active=True).order_by('-post__published_date')
+    if cities:
+        city_slugs = city_slugs.filter(slug__in=cities)
+        pages = pages.filter(city_slug__in=cities)
+    posts = {}
+    for city_slug, post_slug in pages.values_list('city_slug', 'post_slug'):
+        posts.setdefault(city_slug, []).append(post_slug)
+    return {
+        'city': list(city_slugs.values_list('slug', flat=True)),
+        'service': list(Service.objects.filter(is_published=True).order_by('order').values_list('slug', flat=True)),
+        'category': list(ServiceCategory.objects.order_by('pk').values_list('slug', flat=True)),
+        'post': posts,
+    }
+
+
+def iter_urls(matrix, kinds=KINDS):
+    """URL региональных страниц: по городу подряд, от страницы города к статьям"""
+    for city in matrix['city']:
+        if 'city' in kinds:
+            yield reverse('main:city_detail', kwargs={'slug': city})
+        if 'service' in kinds:
+            for slug in matrix['service']:
+                yield reverse('main:city_service_detail', kwargs={'city_slug': city, 'service_slug': slug})
+        if 'category' in kinds:
+            for slug in matrix['category']:
+                yield reverse('main:city_category_detail', kwargs={'city_slug': city, 'category_slug': slug})
+        if 'post' in kinds:
+            for slug in matrix['post'].get(city, ()):
+                yield reverse('main:city_post_detail', kwargs={'city_slug': city, 'post_slug': slug})
+
+
+def layout_dependencies():
+    """
+    Меню, <head> и настройки крошек страница берет из кэша: трекер их не видит,
+    поэтому файл зависит от любого изменения этих моделей
+    """
+    from seo.models import Breadcrumb
+
+    from .signals import MENU_MODELS
+
+    return {(model._meta.label_lower, ANY) for model in MENU_MODELS + (Breadcrumb,)}
+
+
+def render_page(url, site_url):
+    """HTML страницы (bytes) или None, если страница не отдает 200"""
+    parts = urlsplit(site_url)
+    request = RequestFactory().get(url, HTTP_HOST=parts.netloc, secure=parts.scheme == 'https')
+    # Анонимный посетитель без города: сессия в памяти и никогда не сохраняется
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+    request.user = AnonymousUser()
+    request.geo_city = None
+    request.is_prerender = True
+
+    match = resolve(request.path_info)
+    request.resolver_match = match
+    try:
+        with track_dependencies() as tracker:
+            response = match.func(request, *match.args, **match.kwargs)
+    except Http404:
+        return None
+    if response.status_code != 200:
+        return None
+    # Файл удалится через invalidate_urls при изменении прочитанных строк
+    record_dependencies(request.path, tracker.dependencies() | layout_dependencies())
+    # Токен формы из файла все равно не прошел бы проверку: не раздаем его
+    return CSRF_TOKEN_RE.sub(rb'\1\2', response.content)
+
+
+def _remove(path):
+    for name in (path, Path(f'{path}.gz')):
+        try:
+            os.unlink(name)
+        except FileNotFoundError:
+            pass
+
+
+def write_page(root, url, site_url):
+    """Рендерит страницу в файл. Возвращает 'written', 'unchanged' или 'removed'"""
+    path = file_for_url(root, url)
+    content = render_page(url, site_url)
+    if content is None:
+        _remove(path)
+        return 'removed'
+    try:
+        if path.read_bytes() == content and Path(f'{path}.gz').exists():
+            # Не трогаем файл: mtime (и ETag nginx) остаются прежними
+            return 'unchanged'
+    except FileNotFoundError:
+        pass
+    write_atomic(path, [content.decode('utf-8')])
+    return 'written'
+
+
+def _init_worker():
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        # Запуск через spawn/forkserver: процесс начинается без Django
+        django.setup()
+
+
+def _render_batch(root, urls, site_url):
+    stats = dict.fromkeys(('written', 'unchanged', 'removed'), 0)
+    for url in urls:
+        stats[write_page(root, url, site_url)] += 1
+    return stats
+
+
+def _add_stats(stats, futures):
+    for future in futures:
+        for key, value in future.result().items():
+            stats[key] += value
+
+
+def _batches(urls, size):
+    batch = []
+    for url in urls:
+        batch.append(url)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def remove_prerendered(urls):
+    """Удаляет файлы страниц: nginx будет отдавать их через Django до следующего запуска"""
+    root = get_prerender_root()
+    if not root.is_dir():
+        return
+    for url in set(urls):
+        if url:
+            _remove(file_for_url(root, url))
+
+
+def _in_matrix(parts, matrix):
+    if not parts or parts[0] not in matrix['city']:
+        return False
+    if len(parts) == 1:
+        return True
+    if len(parts) != 3 or parts[1] not in KIND_DIRS:
+        return False
+    kind = KIND_DIRS[parts[1]]
+    slugs = matrix['post'].get(parts[0], ()) if kind == 'post' else matrix[kind]
+    return parts[2] in slugs
+
+
+def prune(root, matrix):
+    """Удаляет файлы страниц, которых нет в матрице. Возвращает число удаленных"""
+    matrix = {
+        'city': set(matrix['city']),
+        'service': set(matrix['service']),
+        'category': set(matrix['category']),
+        'post': {city: set(slugs) for city, slugs in matrix['post'].items()},
+    }
+    cities_dir = Path(root) / 'cities'
+    removed = 0
+    for dirpath, dirnames, filenames in os.walk(cities_dir, topdown=False):
+        parts = Path(dirpath).relative_to(cities_dir).parts
+        if INDEX_NAME in filenames and not _in_matrix(parts, matrix):
+            _remove(Path(dirpath) / INDEX_NAME)
+            removed += 1
+        if parts:
+            try:
+                os.rmdir(dirpath)
+            except OSError:
+                # В каталоге остались файлы или вложенные страницы
+                pass
+    return removed
+
+
+def prerender_regional(kinds=KINDS, cities=None, workers=None, force=False, batch_size=BATCH_SIZE):
+    """
+    Рендерит региональные страницы в PRERENDER_ROOT.
+    Без force рендерит только страницы без файла (новые и удаленные
+    invalidate_urls). Возвращает словарь счетчиков.
+    """
+    site_url = get_site_url()
+    root = get_prerender_root()
+    root.mkdir(parents=True, exist_ok=True)
+
+    matrix = load_matrix(cities)
+    todo = iter_urls(matrix, kinds)
+    if not force:
+        todo = (url for url in todo if not file_for_url(root, url).exists())
+
+    stats = dict.fromkeys(('written', 'unchanged', 'removed', 'pruned'), 0)
+    workers = workers or os.cpu_count() or 1
+    if workers > 1:
+        # Открытые соединения не должны достаться дочерним процессам
+        connections.close_all()
+        context = multiprocessing.get_context('fork') if hasattr(os, 'fork') else None
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker) as pool:
+            pending = set()
+            for batch in _batches(todo, batch_size):
+                # Пачки отправляются по мере готовности: матрица не держится в памяти целиком
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    _add_stats(stats, done)
+                pending.add(pool.submit(_render_batch, root, batch, site_url))
+            _add_stats(stats, wait(pending).done)
+    else:
+        for batch in _batches(todo, batch_size):
+            for key, value in _render_batch(root, batch, site_url).items():
+                stats[key] += value
+
+    # Файлы удаленных страниц убирает invalidate_urls; полный прогон по всей
+    # матрице дополнительно удаляет файлы, оставшиеся от прежней матрицы
+    if force and not cities and tuple(kinds) == KINDS:
+        stats['pruned'] = prune(root, matrix)
+    return stats
@@ -0,0 +1,188 @@
+# main/regional_posts.py - Готовые региональные статьи
+#
+# Для каждой адаптации статьи (RegionalPostAdaptation) хранится строка
+# RegionalPostPage с уже разрешенными заголовком, описанием, контентом,
+# SEO-полями и крошками: пустые поля адаптации заменены данными базовой
+# статьи и города. Страница /cities/<город>/blog/<статья>/ читает одну строку
+# по уникальному индексу (city_slug, post_slug); если адаптации нет,
+# отдается базовая статья.
+#
+# Строки пересчитываются сигналами (main/signals.py) при сохранении адаптации,
+# статьи, ее категории (крошки) и города; удаляются каскадно вместе с
+# адаптацией. После пересчета сбрасываются страницы старых и новых адресов.
+# У города и категории адаптаций может быть много: сразу пересчитываются первые
+# REFRESH_SYNC_LIMIT, остальные помечаются needs_refresh, их пересчитывает
+#   python manage.py rebuild_regional_posts --pending
+# раз в минуту (deploy/seo-agency-counters.service, вместе со счетчиками).
+# manage.py rebuild_regional_posts пересчитывает все строки. Для адаптаций,
+# созданных до появления таблицы, строки строит миграция main/0019.
+
+from django.apps import apps as global_apps
+from django.urls import reverse
+
+from seo.breadcrumbs import make_trail
+
+from .cache import bump_content_version
+from .page_cache import invalidate_urls
+
+BATCH_SIZE = 500
+# Сколько адаптаций города или категории пересчитывать при сохранении (остальные — в фоне)
+REFRESH_SYNC_LIMIT = 100
+
+# Поля, которые обновляет пересчет существующей строки
+PAGE_FIELDS = (
+    'post', 'city', 'city_slug', 'post_slug', 'is_published', 'city_name', 'city_name_prepositional',
+    'city_local_description', 'title', 'description', 'content',
+    'breadcrumbs_json_ld', 'seo_title', 'seo_description', 'seo_index', 'seo_canonical', 'needs_refresh',
+)
+
+
+def page_url(city_slug, post_slug):
+    return reverse('main:city_post_detail', kwargs={'city_slug': city_slug, 'post_slug': post_slug})
+
+
+def build_page(adaptation):
+    """RegionalPostPage для адаптации (post__category и city должны быть загружены)"""
+    from .models import RegionalPostPage
+
+    post, city = adaptation.post, adaptation.city
+    description = adaptation.get_description()
+    return RegionalPostPage(
+        adaptation=adaptation,
+        post=post,
+        city=city,
+        city_slug=city.slug,
+        post_slug=post.slug,
+        is_published=post.is_published and adaptation.is_active and city.is_active,
+        city_name=city.name,
+        city_name_prepositional=city.get_name_prepositional(),
+        city_local_description=city.local_description,
+        title=adaptation.get_title(),
+        description=description,
+        content=adaptation.get_content(),
+        breadcrumbs_json_ld=make_trail(adaptation.build_breadcrumbs()).json_ld,
+        # Пустой seo_title: SEOModel.get_seo_title вернет региональный заголовок
+        seo_title=adaptation.seo_title,
+        seo_description=adaptation.seo_description or description,
+        seo_index=adaptation.seo_index and post.seo_index,
+        seo_canonical=adaptation.seo_canonical,
+        needs_refresh=False,
+    )
+
+
+def _write(adaptations, urls):
+    from .models import RegionalPostPage
+
+    # Адреса до пересчета: slug статьи или города мог измениться
+    urls.update(
+        page_url(city_slug, post_slug)
+        for city_slug, post_slug in RegionalPostPage.objects.filter(
+            adaptation__in=[adaptation.pk for adaptation in adaptations]
+        ).values_list('city_slug', 'post_slug')
+    )
+    pages = [build_page(adaptation) for adaptation in adaptations]
+    urls.update(page_url(page.city_slug, page.post_slug) for page in pages)
+    RegionalPostPage.objects.bulk_create(
+        pages, update_conflicts=True, unique_fields=['adaptation'], update_fields=PAGE_FIELDS,
+    )
+    return len(pages)
+
+
+def refresh_regional_posts(adaptations, invalidate=True):
+    """
+    Пересчитывает строки для queryset адаптаций. Возвращает число строк.
+    invalidate=False — не сбрасывать кэш страниц по адресам (при полном пересчете).
+    """
+    adaptations = adaptations.select_related('post__category', 'city').order_by('pk')
+    urls = set()
+    count = 0
+    batch = []
+    for adaptation in adaptations.iterator(chunk_size=BATCH_SIZE):
+        batch.append(adaptation)
+        if len(batch) == BATCH_SIZE:
+            count += _write(batch, urls)
+            batch = []
+    if batch:
+        count += _write(batch, urls)
+    if invalidate and urls:
+        invalidate_urls(urls)
+    return count
+
+
+def schedule_regional_posts(adaptations):
+    """
+    Пересчитывает первые REFRESH_SYNC_LIMIT адаптаций queryset, остальные
+    помечает для фонового пересчета. Возвращает число пересчитанных строк.
+    """
+    from .models import RegionalPostAdaptation, RegionalPostPage
+
+    pks = list(adaptations.order_by('pk').values_list('pk', flat=True)[:REFRESH_SYNC_LIMIT + 1])
+    if len(pks) > REFRESH_SYNC_LIMIT:
+        RegionalPostPage.objects.filter(adaptation__in=adaptations).update(needs_refresh=True)
+    return refresh_regional_posts(RegionalPostAdaptation.objects.filter(pk__in=pks[:REFRESH_SYNC_LIMIT]))
+
+
+def refresh_pending_regional_posts():
+    """Пересчитывает строки, помеченные needs_refresh, пачками. Возвращает число строк"""
+    from .models import RegionalPostAdaptation, RegionalPostPage
+
+    count = 0
+    while True:
+        pks = list(
+            RegionalPostPage.objects.filter(needs_refresh=True).order_by('pk').values_list(
+                'adaptation_id', flat=True
+            )[:BATCH_SIZE]
+        )
+        if not pks:
+            return count
+        count += refresh_regional_posts(RegionalPostAdaptation.objects.filter(pk__in=pks))
+
+
+def rebuild_regional_posts():
+    """Пересчитывает все строки; страницы сбрасываются сменой версии контента"""
+    from .models import RegionalPostAdaptation
+
+    count = refresh_regional_posts(RegionalPostAdaptation.objects.all(), invalidate=False)
+    bump_content_version()
+    return count
+
+
+def _copy(model, instance):
+    """Экземпляр model с полями instance (историческая модель <-> текущая)"""
+    attnames = {field.attname for field in model._meta.concrete_fields}
+    return model(**{
+        field.attname: getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields if field.attname in attnames
+    })
+
+
+def fill_regional_posts(apps):
+    """
+    Строит строки для адаптаций без строки в миграции: исторические объекты
+    копируются в текущие модели ради build_page, результат пишется через
+    историческую модель. Возвращает число строк.
+    """
+    Adaptation = apps.get_model('main', 'RegionalPostAdaptation')
+    Page = apps.get_model('main', 'RegionalPostPage')
+    LiveAdaptation = global_apps.get_model('main', 'RegionalPostAdaptation')
+    LivePost = global_apps.get_model('blog', 'Post')
+    LiveCity = global_apps.get_model('main', 'City')
+    LiveCategory = global_apps.get_model('blog', 'Category')
+
+    adaptations = Adaptation.objects.filter(page__isnull=True).select_related(
+        'post__category', 'city'
+    ).order_by('pk')
+    count = 0
+    pages = []
+    for adaptation in adaptations.iterator(chunk_size=BATCH_SIZE):
+        live = _copy(LiveAdaptation, adaptation)
+        live.post = _copy(LivePost, adaptation.post)
+        live.post.category = _copy(LiveCategory, adaptation.post.category) if adaptation.post.category else None
+        live.city = _copy(LiveCity, adaptation.city)
+        pages.append(_copy(Page, build_page(live)))
+        if len(pages) == BATCH_SIZE:
+            count += len(Page.objects.bulk_create(pages, ignore_conflicts=True))
+            pages = []
+    if pages:
+        count += len(Page.objects.bulk_create(pages, ignore_conflicts=True))
+    return count
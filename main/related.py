@@ -0,0 +1,224 @@
+# main/related.py - Похожие статьи, услуги и проекты
+#
+# Соседи каждого объекта заранее считаются и хранятся в таблице RelatedItem:
+#
+#   python manage.py rebuild_related
+#
+# (по расписанию — deploy/seo-agency-related.timer). Близость складывается из
+# похожести текста (TF-IDF, косинус) и общих признаков: категория, тип проекта,
+# технологии. На странице из сохраненного пула соседей случайно выбирается
+# limit объектов — два запроса к БД при любом размере каталога.
+
+import heapq
+import math
+import random
+import re
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.utils.html import strip_tags
+
+from .models import RelatedItem
+
+# Сколько соседей хранить на объект (из них на странице выбирается limit)
+POOL_SIZE = 9
+# Сколько самых весомых слов текста учитывать
+MAX_TERMS = 40
+# Слова из большего числа документов (или из половины каталога) не учитываются:
+# они почти ничего не различают, а обход их списков документов квадратичен
+MAX_DOCUMENT_FREQUENCY = 200
+# Сколько объектов той же категории / типа добавлять в кандидаты без общих слов
+MAX_GROUP_CANDIDATES = 50
+
+# Вес совпадения признаков относительно похожести текста (0..1)
+FEATURE_WEIGHTS = {
+    'category': 0.5,
+    'project_type': 0.3,
+    'technologies': 0.5,
+}
+
+WORD_RE = re.compile(r'[a-zа-яё0-9]+')
+
+# Служебные слова длиннее трех букв (в форме после урезания до 6 букв)
+STOP_WORDS = frozenset({
+    'более', 'будет', 'быть', 'вами', 'ваша', 'ваше', 'ваши', 'вашег', 'весь', 'всег', 'всегда', 'всех',
+    'даже', 'если', 'есть', 'еще', 'ещё', 'зачем', 'здесь', 'каждо', 'какие', 'какой', 'когда', 'котор',
+    'кроме', 'лучше', 'между', 'менее', 'много', 'может', 'можно', 'нужно', 'очень', 'перед', 'после',
+    'потом', 'почем', 'поэто', 'сейча', 'самый', 'свой', 'своих', 'себя', 'также', 'тако', 'такой',
+    'такие', 'только', 'тольк', 'чтобы', 'через', 'этих', 'этим', 'этой', 'этом', 'этот', 'этого',
+    'about', 'also', 'from', 'have', 'that', 'their', 'there', 'these', 'they', 'this', 'what',
+    'when', 'which', 'will', 'with', 'your',
+})
+
+
+def _post_spec():
+    from blog.models import Post
+    return (
+        Post.objects.filter(is_published=True).order_by('-published_date'),
+        lambda post: (post.title, post.excerpt, post.content),
+        lambda post: {'category': post.category_id},
+    )
+
+
+def _service_spec():
+    from .models import Service
+    return (
+        Service.objects.filter(is_published=True).order_by('order'),
+        lambda service: (service.title, service.short_description, service.content),
+        lambda service: {'category': service.category_id},
+    )
+
+
+def _portfolio_spec():
+    from .models import PortfolioItem
+    return (
+        PortfolioItem.objects.filter(is_published=True).order_by('order', '-created_at'),
+        lambda item: (item.title, item.short_description, item.full_description),
+        lambda item: {
+            'category': item.category_id,
+            'project_type': item.project_type,
+            'technologies': frozenset(str(tech).lower() for tech in item.technologies or []),
+        },
+    )
+
+
+SPECS = {
+    'blog.post': _post_spec,
+    'main.service': _service_spec,
+    'main.portfolioitem': _portfolio_spec,
+}
+
+
+def _terms(texts):
+    """Слова текста, урезанные до 6 букв (грубый стемминг для русского)"""
+    text = strip_tags(' '.join(text or '' for text in texts)).lower()
+    stems = (word[:6] for word in WORD_RE.findall(text) if len(word) > 3)
+    return Counter(stem for stem in stems if stem not in STOP_WORDS)
+
+
+def _text_vectors(documents):
+    """TF-IDF векторы {pk: {term: weight}}, нормированные по длине"""
+    document_frequency = Counter()
+    for terms in documents.values():
+        document_frequency.update(terms.keys())
+
+    total = len(documents)
+    max_frequency = min(MAX_DOCUMENT_FREQUENCY, total // 2)
+    vectors = {}
+    for pk, terms in documents.items():
+        weights = {
+            term: count * math.log(total / document_frequency[term])
+            for term, count in terms.items()
+            if document_frequency[term] <= max_frequency
+        }
+        top = heapq.nlargest(MAX_TERMS, weights.items(), key=lambda item: item[1])
+        norm = math.sqrt(sum(weight * weight for _, weight in top)) or 1
+        vectors[pk] = {term: weight / norm for term, weight in top if weight > 0}
+    return vectors
+
+
+def _feature_score(features, other):
+    score = 0
+    for name, weight in FEATURE_WEIGHTS.items():
+        value, other_value = features.get(name), other.get(name)
+        if not value or not other_value:
+            continue
+        if isinstance(value, frozenset):
+            score += weight * len(value & other_value) / len(value | other_value)
+        elif value == other_value:
+            score += weight
+    return score
+
+
+def compute_neighbours(objects, text_func, features_func, pool_size=POOL_SIZE):
+    """Возвращает {pk: [(related_pk, score), ...]} для списка объектов"""
+    order = [obj.pk for obj in objects]
+    vectors = _text_vectors({obj.pk: _terms(text_func(obj)) for obj in objects})
+    features = {obj.pk: features_func(obj) for obj in objects}
+
+    postings = defaultdict(list)
+    for pk, vector in vectors.items():
+        for term, weight in vector.items():
+            postings[term].append((pk, weight))
+
+    groups = defaultdict(list)
+    positions = {}
+    for pk, values in features.items():
+        for name, value in values.items():
+            if value and not isinstance(value, frozenset):
+                positions[(pk, name)] = len(groups[(name, value)])
+                groups[(name, value)].append(pk)
+
+    neighbours = {}
+    for pk in order:
+        scores = defaultdict(float)
+        for term, weight in vectors[pk].items():
+            for other, other_weight in postings[term]:
+                scores[other] += weight * other_weight
+        # Кандидаты с той же категорией / типом, даже без общих слов:
+        # соседи по порядку каталога, не больше MAX_GROUP_CANDIDATES
+        for name, value in features[pk].items():
+            if value and not isinstance(value, frozenset):
+                start = max(0, positions[(pk, name)] - MAX_GROUP_CANDIDATES // 2)
+                for other in groups[(name, value)][start:start + MAX_GROUP_CANDIDATES + 1]:
+                    scores.setdefault(other, 0.0)
+        scores.pop(pk, None)
+
+        for other in scores:
+            scores[other] += _feature_score(features[pk], features[other])
+        best = heapq.nlargest(pool_size, scores.items(), key=lambda item: item[1])
+
+        # Если похожих мало, добиваем пул первыми объектами каталога
+        chosen = {other for other, _ in best}
+        for other in order:
+            if len(best) >= pool_size:
+                break
+            if other != pk and other not in chosen:
+                best.append((other, 0.0))
+                chosen.add(other)
+        neighbours[pk] = best
+    return neighbours
+
+
+def rebuild_related(model_label):
+    """Пересчитывает таблицу соседей для модели. Возвращает число записей"""
+    queryset, text_func, features_func = SPECS[model_label]()
+    neighbours = compute_neighbours(list(queryset), text_func, features_func)
+
+    rows = [
+        RelatedItem(model_label=model_label, object_id=pk, related_id=other, score=score)
+        for pk, items in neighbours.items()
+        for other, score in items
+    ]
+    with transaction.atomic():
+        RelatedItem.objects.filter(model_label=model_label).delete()
+        RelatedItem.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def rebuild_all():
+    """Пересчитывает соседей для всех моделей. Возвращает {модель: записей}"""
+    return {model_label: rebuild_related(model_label) for model_label in SPECS}
+
+
+def get_related(obj, limit=3, queryset=None):
+    """
+    Возвращает до limit случайных объектов из пула соседей obj.
+    Пока таблица не пересчитана (новый объект), отдает последние опубликованные.
+    """
+    model = type(obj)
+    if queryset is None:
+        # Ссылка карточки строится через категорию (у всех моделей SPECS)
+        queryset = model.objects.filter(is_published=True).select_related('category')
+
+    pool = list(
+        RelatedItem.objects.filter(model_label=model._meta.label_lower, object_id=obj.pk)
+        .order_by('-score')
+        .values_list('related_id', flat=True)[:POOL_SIZE]
+    )
+    if not pool:
+        return list(queryset.exclude(pk=obj.pk).order_by('-pk')[:limit])
+
+    chosen = random.sample(pool, min(limit, len(pool)))
+    objects = {item.pk: item for item in queryset.filter(pk__in=chosen)}
+    return [objects[pk] for pk in chosen if pk in objects]
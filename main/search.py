@@ -0,0 +1,375 @@
+# main/search.py - Полнотекстовый поиск по сайту
+#
+# Все материалы (статьи, услуги, проекты, FAQ, глоссарий) индексируются
+# в одну таблицу SearchDocument — текст без HTML. Документы обновляются
+# сигналами при сохранении/удалении (main/signals.py) и пересобираются целиком:
+#
+#   python manage.py rebuild_search_index
+#
+# Движок зависит от БД:
+#   PostgreSQL — tsvector с русской конфигурацией и GIN-индекс, ранжирование ts_rank;
+#   SQLite     — виртуальная таблица FTS5 (bm25), для локальной разработки;
+#   прочие     — icontains по таблице документов.
+# GIN-индекс и таблица FTS5 создаются миграцией main/0012_search_index.
+#
+# Использование:
+#   hits = search('продвижение сайта')                    # все типы, по релевантности
+#   qs.filter(pk__in=search_filter('ссылки', 'main.faqitem'))  # фильтр queryset подзапросом
+#   ids = search_ids('ссылки', 'blog.post')               # все ID по релевантности
+#   highlight(hits[:10], query)                           # подсветка <mark> для страницы
+
+import re
+from collections import namedtuple
+from html import unescape
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape, strip_tags
+from django.utils.safestring import mark_safe
+
+from .models import SearchDocument
+
+# Максимум результатов страницы поиска (search_ids и search_filter не ограничены)
+MAX_RESULTS = 200
+
+SearchSource = namedtuple('SearchSource', 'type_name queryset text')
+SearchHit = namedtuple('SearchHit', 'model_label object_id title url type_name rank')
+
+# Маркеры подсветки (символы из области частного использования Unicode,
+# в тексте не встречаются) — заменяются на <mark> после экранирования
+START_SEL = '\ue000'
+STOP_SEL = '\ue001'
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+SPACES_RE = re.compile(r'\s+')
+
+
+def _posts():
+    from blog.models import Post
+    return Post.objects.filter(is_published=True).select_related('category')
+
+
+def _services():
+    from .models import Service
+    return Service.objects.filter(is_published=True).select_related('category')
+
+
+def _portfolio():
+    from .models import PortfolioItem
+    return PortfolioItem.objects.filter(is_published=True).select_related('category')
+
+
+def _faq():
+    from .models import FAQItem
+    return FAQItem.objects.filter(is_published=True, category__is_active=True).select_related('category')
+
+
+def _glossary():
+    from .models import GlossaryTerm
+    return GlossaryTerm.objects.filter(is_published=True, category__is_active=True).select_related('category')
+
+
+SOURCES = {
+    'blog.post': SearchSource(
+        'Блог', _posts,
+        lambda post: (post.title, [post.excerpt, post.content, post.category.name if post.category else '']),
+    ),
+    'main.service': SearchSource(
+        'Услуги', _services, lambda service: (service.title, [service.short_description, service.content])
+    ),
+    'main.portfolioitem': SearchSource(
+        'Портфолио', _portfolio,
+        lambda item: (item.title, [item.client_name, item.short_description, item.full_description]),
+    ),
+    'main.faqitem': SearchSource('FAQ', _faq, lambda item: (item.question, [item.answer])),
+    'main.glossaryterm': SearchSource('Глоссарий', _glossary, lambda term: (term.term, [term.definition])),
+}
+
+
+def _plain_text(parts):
+    text = unescape(strip_tags(' '.join(part or '' for part in parts)))
+    return SPACES_RE.sub(' ', text).strip()
+
+
+def _marked(text):
+    """Экранирует текст и превращает маркеры подсветки в <mark>"""
+    text = escape(text or '')
+    return mark_safe(text.replace(START_SEL, '<mark>').replace(STOP_SEL, '</mark>'))
+
+
+# --- Движки ---
+
+class PostgresBackend:
+    """tsvector (русская конфигурация) + GIN-индекс"""
+    config = 'russian'
+
+    def _vector(self):
+        return (
+            SearchVector('title', weight='A', config=self.config)
+            + SearchVector('body', weight='B', config=self.config)
+        )
+
+    def _query(self, query):
+        return SearchQuery(query, config=self.config, search_type='websearch')
+
+    def _documents(self, query, model_label):
+        documents = SearchDocument.objects.filter(search_vector=self._query(query))
+        if model_label:
+            documents = documents.filter(model_label=model_label)
+        return documents
+
+    def update(self, pks=None):
+        documents = SearchDocument.objects.all()
+        if pks is not None:
+            documents = documents.filter(pk__in=pks)
+        documents.update(search_vector=self._vector())
+
+    def search(self, query, model_label, limit):
+        documents = self._documents(query, model_label).annotate(
+            rank=SearchRank(F('search_vector'), self._query(query))
+        ).order_by('-rank').values_list('pk', 'rank')
+        return list(documents[:limit])
+
+    def filter_ids(self, query, model_label):
+        return self._documents(query, model_label).values('object_id')
+
+    def highlight(self, query, pks):
+        search_query = self._query(query)
+        options = {'config': self.config, 'start_sel': START_SEL, 'stop_sel': STOP_SEL}
+        rows = SearchDocument.objects.filter(pk__in=pks).annotate(
+            title_marked=SearchHeadline('title', search_query, highlight_all=True, **options),
+            snippet=SearchHeadline('body', search_query, max_words=35, min_words=15, **options),
+        ).values_list('pk', 'title_marked', 'snippet')
+        return {pk: (title, snippet) for pk, title, snippet in rows}
+
+
+class SqliteBackend:
+    """Виртуальная таблица FTS5, синхронизируется с SearchDocument триггерами"""
+    table = 'main_searchdocument_fts'
+
+    def update(self, pks=None):
+        # Таблица FTS5 обновляется триггерами
+        pass
+
+    def _match(self, query):
+        # Каждое слово — префиксный запрос по основе (грубо отбрасываем окончание)
+        terms = []
+        for word in WORD_RE.findall(query.lower()):
+            stem = word[:max(3, len(word) - 2)] if len(word) > 4 else word
+            terms.append('"%s"*' % stem.replace('"', ''))
+        return ' '.join(terms)
+
+    def search(self, query, model_label, limit):
+        match = self._match(query)
+        if not match:
+            return []
+        sql = (
+            f"SELECT f.rowid, bm25({self.table}, 10.0, 1.0) AS score FROM {self.table} f "
+            f"JOIN {SearchDocument._meta.db_table} d ON d.id = f.rowid WHERE {self.table} MATCH %s"
+        )
+        params = [match]
+        if model_label:
+            sql += " AND d.model_label = %s"
+            params.append(model_label)
+        with connection.cursor() as cursor:
+            # LIMIT -1 в SQLite — без ограничения
+            cursor.execute(sql + " ORDER BY score LIMIT %s", params + [-1 if limit is None else limit])
+            # bm25 тем лучше, чем меньше; переводим в привычный "больше — лучше"
+            return [(pk, -score) for pk, score in cursor.fetchall()]
+
+    def filter_ids(self, query, model_label):
+        match = self._match(query)
+        if not match:
+            return SearchDocument.objects.none().values('object_id')
+        return RawSQL(
+            f"SELECT d.object_id FROM {self.table} f JOIN {SearchDocument._meta.db_table} d "
+            f"ON d.id = f.rowid WHERE {self.table} MATCH %s AND d.model_label = %s",
+            [match, model_label],
+        )
+
+    def highlight(self, query, pks):
+        match = self._match(query)
+        if not match or not pks:
+            return {}
+        placeholders = ', '.join(['%s'] * len(pks))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, highlight({self.table}, 0, %s, %s), "
+                f"snippet({self.table}, 1, %s, %s, '…', 30) FROM {self.table} "
+                f"WHERE {self.table} MATCH %s AND rowid IN ({placeholders})",
+                [START_SEL, STOP_SEL, START_SEL, STOP_SEL, match, *pks],
+            )
+            return {pk: (title, snippet) for pk, title, snippet in cursor.fetchall()}
+
+
+class SimpleBackend:
+    """Запасной вариант для остальных БД: icontains по таблице документов"""
+
+    def update(self, pks=None):
+        pass
+
+    def _documents(self, query, model_label):
+        words = WORD_RE.findall(query)
+        if not words:
+            return SearchDocument.objects.none()
+        condition = Q()
+        for word in words:
+            condition &= Q(title__icontains=word) | Q(body__icontains=word)
+        documents = SearchDocument.objects.filter(condition)
+        if model_label:
+            documents = documents.filter(model_label=model_label)
+        return documents
+
+    def search(self, query, model_label, limit):
+        documents = self._documents(query, model_label).annotate(
+            rank=Case(When(title__icontains=query, then=Value(1)), default=Value(0), output_field=IntegerField())
+        ).order_by('-rank', 'title').values_list('pk', 'rank')
+        return list(documents[:limit])
+
+    def filter_ids(self, query, model_label):
+        return self._documents(query, model_label).values('object_id')
+
+    def highlight(self, query, pks):
+        return {}
+
+
+_backend = None
+
+
+def get_backend():
+    """Возвращает движок поиска для текущей БД"""
+    global _backend
+    if _backend is None:
+        if connection.vendor == 'postgresql':
+            _backend = PostgresBackend()
+        elif connection.vendor == 'sqlite' and _has_fts_table():
+            _backend = SqliteBackend()
+        else:
+            _backend = SimpleBackend()
+    return _backend
+
+
+def _has_fts_table():
+    # Таблицы нет, если SQLite собран без FTS5 (см. миграцию 0012_search_index)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=%s", [SqliteBackend.table]
+        )
+        return cursor.fetchone() is not None
+
+
+# --- Индексация ---
+
+def _document_fields(source, obj):
+    title, parts = source.text(obj)
+    return {
+        'title': (title or '')[:300],
+        'body': _plain_text(parts),
+        'url': obj.get_absolute_url(),
+    }
+
+
+def index_object(obj):
+    """Добавляет/обновляет документ объекта или удаляет его, если объект скрыт"""
+    model_label = obj._meta.label_lower
+    source = SOURCES.get(model_label)
+    if source is None:
+        return
+
+    visible = source.queryset().filter(pk=obj.pk).first()
+    if visible is None:
+        SearchDocument.objects.filter(model_label=model_label, object_id=obj.pk).delete()
+        return
+    obj = visible
+
+    backend = get_backend()
+    document, _ = SearchDocument.objects.update_or_create(
+        model_label=model_label, object_id=obj.pk, defaults=_document_fields(source, obj)
+    )
+    backend.update([document.pk])
+
+
+def remove_object(obj):
+    """Удаляет документ объекта из индекса"""
+    SearchDocument.objects.filter(model_label=obj._meta.label_lower, object_id=obj.pk).delete()
+
+
+def rebuild_index():
+    """Пересобирает индекс целиком. Возвращает {модель: документов}"""
+    backend = get_backend()
+    result = {}
+    with transaction.atomic():
+        SearchDocument.objects.all().delete()
+        for model_label, source in SOURCES.items():
+            documents = [
+                SearchDocument(model_label=model_label, object_id=obj.pk, **_document_fields(source, obj))
+                for obj in source.queryset().iterator(chunk_size=500)
+            ]
+            SearchDocument.objects.bulk_create(documents, batch_size=500)
+            result[model_label] = len(documents)
+        backend.update()
+    return result
+
+
+# --- Поиск ---
+
+def search(query, model_label=None, limit=MAX_RESULTS):
+    """Возвращает список SearchHit, отсортированный по релевантности"""
+    query = (query or '').strip()
+    if not query:
+        return []
+    ranked = get_backend().search(query, model_label, limit)
+    documents = SearchDocument.objects.only('model_label', 'object_id', 'title', 'url').in_bulk(
+        [pk for pk, _ in ranked]
+    )
+    return [
+        SearchHit(document.model_label, document.object_id, document.title, document.url,
+                  SOURCES[document.model_label].type_name, rank)
+        for document, rank in ((documents.get(pk), rank) for pk, rank in ranked)
+        if document is not None and document.model_label in SOURCES
+    ]
+
+
+def search_ids(query, model_label, limit=None):
+    """ID объектов модели, найденных по запросу (по убыванию релевантности, по умолчанию все)"""
+    return [hit.object_id for hit in search(query, model_label, limit)]
+
+
+def search_filter(query, model_label):
+    """
+    Подзапрос ID объектов модели, найденных по запросу, для
+    queryset.filter(pk__in=...): фильтрация целиком в БД, без ограничения числа
+    """
+    return get_backend().filter_ids((query or '').strip(), model_label)
+
+
+def highlight(hits, query):
+    """
+    Возвращает список словарей для шаблона: hit, title и snippet с <mark>.
+    Вызывается только для текущей страницы результатов.
+    """
+    documents = {
+        (document.model_label, document.object_id): document
+        for document in SearchDocument.objects.filter(
+            model_label__in={hit.model_label for hit in hits},
+            object_id__in={hit.object_id for hit in hits},
+        ).only('pk', 'model_label', 'object_id', 'body')
+    }
+    marked = get_backend().highlight(
+        query, [documents[key].pk for key in ((hit.model_label, hit.object_id) for hit in hits) if key in documents]
+    )
+
+    results = []
+    for hit in hits:
+        document = documents.get((hit.model_label, hit.object_id))
+        title, snippet = marked.get(document.pk, (None, None)) if document else (None, None)
+        if not snippet and document:
+            snippet = document.body[:200] + ('…' if len(document.body) > 200 else '')
+        results.append({
+            'hit': hit,
+            'title': _marked(title or hit.title),
+            'snippet': _marked(snippet),
+        })
+    return results
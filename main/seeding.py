@@ -0,0 +1,313 @@
+# main/seeding.py - Генератор данных production-объема (manage.py seed_scale)
+#
+# Объекты создаются пачками через bulk_create, без save() и сигналов,
+# поэтому 500 городов × 200 услуг × 20 000 статей загружаются за минуты.
+# Данные полностью определяются seed: одинаковые параметры дают одинаковые
+# заголовки, тексты, связи и адаптации.
+#
+# У всех созданных объектов slug начинается с SEED_PREFIX — по нему
+# clear_seeded() удаляет прошлую генерацию, не трогая настоящий контент.
+#
+# Так как сигналы не срабатывают, после генерации seed_scale сбрасывает
+# версии кэшей (контент, sitemap, крошки). Поисковый индекс и похожие
+# материалы пересчитываются отдельно: rebuild_search_index, rebuild_related.
+
+import random
+from collections import namedtuple
+from itertools import islice
+
+from django.db import transaction
+
+SEED_PREFIX = 'seed-'
+
+SeedCounts = namedtuple(
+    'SeedCounts',
+    'cities service_categories services post_categories posts authors adaptations '
+    'portfolio_categories portfolio faq_categories faq glossary_categories glossary redirects',
+)
+
+# Объемы по умолчанию — порядок данных работающего сайта
+DEFAULT_COUNTS = SeedCounts(
+    cities=500,
+    service_categories=20,
+    services=200,
+    post_categories=30,
+    posts=20000,
+    authors=20,
+    adaptations=50000,
+    portfolio_categories=10,
+    portfolio=500,
+    faq_categories=20,
+    faq=1000,
+    glossary_categories=20,
+    glossary=2000,
+    redirects=5000,
+)
+
+WORDS = (
+    'продвижение', 'сайт', 'поисковая', 'оптимизация', 'трафик', 'семантическое', 'ядро',
+    'конверсия', 'ссылки', 'индексация', 'аудит', 'контент', 'региональное', 'выдача',
+    'запросы', 'позиции', 'реклама', 'аналитика', 'метрика', 'страница', 'скорость',
+    'мобильная', 'версия', 'структура', 'перелинковка', 'заголовки', 'сниппет', 'клиенты',
+)
+
+CITY_NAMES = (
+    ('Москва', 'Москва'), ('Санкт-Петербург', 'Ленинградская область'),
+    ('Новосибирск', 'Новосибирская область'), ('Екатеринбург', 'Свердловская область'),
+    ('Казань', 'Республика Татарстан'), ('Нижний Новгород', 'Нижегородская область'),
+    ('Челябинск', 'Челябинская область'), ('Самара', 'Самарская область'),
+    ('Омск', 'Омская область'), ('Ростов-на-Дону', 'Ростовская область'),
+    ('Уфа', 'Республика Башкортостан'), ('Красноярск', 'Красноярский край'),
+    ('Воронеж', 'Воронежская область'), ('Пермь', 'Пермский край'),
+    ('Волгоград', 'Волгоградская область'), ('Краснодар', 'Краснодарский край'),
+    ('Саратов', 'Саратовская область'), ('Тюмень', 'Тюменская область'),
+    ('Тольятти', 'Самарская область'), ('Ижевск', 'Удмуртская Республика'),
+)
+
+
+def sentence(rnd, min_words=6, max_words=14):
+    words = [rnd.choice(WORDS) for _ in range(rnd.randint(min_words, max_words))]
+    return ' '.join(words).capitalize() + '.'
+
+
+def article_html(rnd, paragraphs):
+    """Текст в разметке CKEditor 5: заголовки, абзацы, выделения, ссылки, списки, цитаты, таблицы"""
+    parts = []
+    for number in range(paragraphs):
+        if number % 4 == 0:
+            parts.append(f'<h2>{sentence(rnd, 2, 5)[:-1]}</h2>')
+        text = ' '.join(sentence(rnd) for _ in range(rnd.randint(3, 7)))
+        words = text.split(' ')
+        position = rnd.randrange(len(words))
+        words[position] = f'<strong>{words[position]}</strong>'
+        if number % 3 == 1:
+            position = rnd.randrange(len(words))
+            words[position] = f'<a href="/blog/">{words[position]}</a>'
+        parts.append(f'<p>{" ".join(words)}</p>')
+        if number % 5 == 2:
+            items = ''.join(f'<li>{sentence(rnd, 2, 6)}</li>' for _ in range(rnd.randint(3, 6)))
+            parts.append(f'<ul>{items}</ul>')
+        if number % 7 == 3:
+            parts.append(f'<blockquote><p>{sentence(rnd)}</p></blockquote>')
+        if number % 11 == 5:
+            rows = ''.join(
+                f'<tr><td>{rnd.choice(WORDS)}</td><td>{rnd.randint(1, 500)}%</td></tr>' for _ in range(4)
+            )
+            parts.append(f'<figure class="table"><table><tbody>{rows}</tbody></table></figure>')
+    return '\n'.join(parts)
+
+
+def _bulk_create(model, objects, batch_size):
+    """Создает объекты из итератора пачками, не держа их все в памяти"""
+    objects = iter(objects)
+    created = 0
+    while True:
+        batch = list(islice(objects, batch_size))
+        if not batch:
+            return created
+        model.objects.bulk_create(batch, batch_size=batch_size)
+        created += len(batch)
+
+
+def _seeded_pks(model):
+    # pk после bulk_create возвращают не все СУБД, поэтому перечитываем
+    return list(model.objects.filter(slug__startswith=SEED_PREFIX).order_by('pk').values_list('pk', flat=True))
+
+
+def _seeded_models():
+    from blog.models import Category, Post
+    from main.models import (
+        City, FAQCategory, FAQItem, GlossaryCategory, GlossaryTerm, PortfolioCategory,
+        PortfolioItem, Service, ServiceCategory,
+    )
+
+    # Порядок удаления: сначала зависимые
+    return (
+        Post, Category, Service, ServiceCategory, PortfolioItem, PortfolioCategory,
+        FAQItem, FAQCategory, GlossaryTerm, GlossaryCategory, City,
+    )
+
+
+def clear_seeded():
+    """Удаляет объекты прошлой генерации (slug с SEED_PREFIX)"""
+    from main.models import Author
+    from seo_management.models import Redirect
+
+    deleted = {}
+    with transaction.atomic():
+        for model in _seeded_models():
+            deleted[model._meta.label_lower] = model.objects.filter(slug__startswith=SEED_PREFIX).delete()[0]
+        deleted['main.author'] = Author.objects.filter(username__startswith=SEED_PREFIX).delete()[0]
+        deleted['seo_management.redirect'] = Redirect.objects.filter(old_path__startswith=f'/{SEED_PREFIX}').delete()[0]
+    return deleted
+
+
+def seed_scale(counts=DEFAULT_COUNTS, seed=42, batch_size=1000, progress=None):
+    """
+    Создает данные в объемах counts. Возвращает {label модели: создано}.
+    progress(label, count) вызывается после каждой модели.
+    """
+    from blog.models import Category, Post
+    from main.models import (
+        Author, City, FAQCategory, FAQItem, GlossaryCategory, GlossaryTerm, PortfolioCategory,
+        PortfolioItem, RegionalPostAdaptation, Service, ServiceCategory,
+    )
+    from seo_management.models import Redirect
+
+    rnd = random.Random(seed)
+    result = {}
+
+    def create(model, objects):
+        label = model._meta.label_lower
+        result[label] = _bulk_create(model, objects, batch_size)
+        if progress:
+            progress(label, result[label])
+
+    with transaction.atomic():
+        def cities():
+            for index in range(counts.cities):
+                name, region = CITY_NAMES[index % len(CITY_NAMES)]
+                if index >= len(CITY_NAMES):
+                    name = f'{name} {index // len(CITY_NAMES) + 1}'
+                yield City(
+                    name=name, slug=f'{SEED_PREFIX}city-{index + 1}', region=region, order=index,
+                    local_description=sentence(rnd),
+                )
+        create(City, cities())
+        city_pks = _seeded_pks(City)
+
+        create(ServiceCategory, (
+            ServiceCategory(
+                title=f'Категория услуг {index + 1}', slug=f'{SEED_PREFIX}service-category-{index + 1}', order=index,
+            )
+            for index in range(counts.service_categories)
+        ))
+        service_category_pks = _seeded_pks(ServiceCategory)
+        create(Service, (
+            Service(
+                category_id=service_category_pks[index % len(service_category_pks)],
+                title=f'{sentence(rnd, 2, 4)[:-1]} {index + 1}', slug=f'{SEED_PREFIX}service-{index + 1}',
+                short_description=sentence(rnd), content=article_html(rnd, rnd.randint(6, 14)), order=index,
+            )
+            for index in range(counts.services if service_category_pks else 0)
+        ))
+
+        create(Author, (
+            Author(
+                first_name=f'Автор {index + 1}', last_name='Тестовый', username=f'{SEED_PREFIX}author-{index + 1}',
+                bio=sentence(rnd), position='SEO-специалист',
+            )
+            for index in range(counts.authors)
+        ))
+        author_pks = list(
+            Author.objects.filter(username__startswith=SEED_PREFIX).order_by('pk').values_list('pk', flat=True)
+        )
+        create(Category, (
+            Category(name=f'Рубрика {index + 1}', slug=f'{SEED_PREFIX}category-{index + 1}', order=index)
+            for index in range(counts.post_categories)
+        ))
+        post_category_pks = _seeded_pks(Category)
+        def posts():
+            for index in range(counts.posts if post_category_pks else 0):
+                post = Post(
+                    category_id=rnd.choice(post_category_pks),
+                    blog_author_id=rnd.choice(author_pks) if author_pks else None,
+                    title=f'{sentence(rnd, 4, 9)[:-1]} {index + 1}', slug=f'{SEED_PREFIX}post-{index + 1}',
+                    excerpt=sentence(rnd, 15, 30), content=article_html(rnd, rnd.randint(8, 30)),
+                    views_count=rnd.randint(0, 5000),
+                )
+                # Обычно считается в Post.save()
+                post.reading_time = post.compute_reading_time()
+                yield post
+        create(Post, posts())
+        post_pks = _seeded_pks(Post)
+
+        # Случайные пары (статья, город) без повторов и без построения всех пар
+        pairs = len(post_pks) * len(city_pks)
+        chosen = sorted(rnd.sample(range(pairs), min(counts.adaptations, pairs)))
+        create(RegionalPostAdaptation, (
+            RegionalPostAdaptation(
+                post_id=post_pks[pair // len(city_pks)], city_id=city_pks[pair % len(city_pks)],
+                content=f'<p>{sentence(rnd)}</p>' if pair % 3 == 0 else '',
+            )
+            for pair in chosen
+        ))
+
+        create(PortfolioCategory, (
+            PortfolioCategory(name=f'Проекты {index + 1}', slug=f'{SEED_PREFIX}portfolio-category-{index + 1}', order=index)
+            for index in range(counts.portfolio_categories)
+        ))
+        portfolio_category_pks = _seeded_pks(PortfolioCategory)
+        project_types = ('seo', 'context', 'smm', 'design', 'development', 'complex')
+        create(PortfolioItem, (
+            PortfolioItem(
+                category_id=rnd.choice(portfolio_category_pks),
+                title=f'Проект {index + 1}: {sentence(rnd, 2, 4)[:-1]}', slug=f'{SEED_PREFIX}project-{index + 1}',
+                short_description=sentence(rnd), full_description=article_html(rnd, rnd.randint(3, 8)),
+                main_image='portfolio_images/seed.jpg', project_type=rnd.choice(project_types),
+                technologies=rnd.sample(['Django', 'Яндекс.Метрика', 'Google Analytics', 'Тильда', '1С-Битрикс'], 2),
+                is_featured=index % 10 == 0, order=index,
+            )
+            for index in range(counts.portfolio if portfolio_category_pks else 0)
+        ))
+
+        create(FAQCategory, (
+            FAQCategory(name=f'Вопросы {index + 1}', slug=f'{SEED_PREFIX}faq-category-{index + 1}', order=index)
+            for index in range(counts.faq_categories)
+        ))
+        faq_category_pks = _seeded_pks(FAQCategory)
+        create(FAQItem, (
+            FAQItem(
+                category_id=rnd.choice(faq_category_pks),
+                question=f'{sentence(rnd, 4, 10)[:-1]}?', slug=f'{SEED_PREFIX}question-{index + 1}',
+                answer=article_html(rnd, rnd.randint(1, 3)), order=index,
+            )
+            for index in range(counts.faq if faq_category_pks else 0)
+        ))
+
+        create(GlossaryCategory, (
+            GlossaryCategory(name=f'Термины {index + 1}', slug=f'{SEED_PREFIX}glossary-category-{index + 1}', order=index)
+            for index in range(counts.glossary_categories)
+        ))
+        glossary_category_pks = _seeded_pks(GlossaryCategory)
+        create(GlossaryTerm, (
+            GlossaryTerm(
+                category_id=rnd.choice(glossary_category_pks),
+                term=f'{rnd.choice(WORDS).capitalize()} {rnd.choice(WORDS)} {index + 1}',
+                slug=f'{SEED_PREFIX}term-{index + 1}', definition=article_html(rnd, 1),
+            )
+            for index in range(counts.glossary if glossary_category_pks else 0)
+        ))
+
+        # Редиректы со старых адресов статей: часть без учета регистра и по префиксу
+        create(Redirect, (
+            Redirect(
+                old_path=f'/{SEED_PREFIX}old/{index + 1}/', new_path=f'/blog/{SEED_PREFIX}post-{index % max(counts.posts, 1) + 1}/',
+                redirect_type='301' if index % 5 else '302',
+                match_exact=index % 4 != 0, case_sensitive=index % 3 != 0,
+            )
+            for index in range(counts.redirects)
+        ))
+
+    return result
+
+
+def invalidate_after_seed():
+    """Сбрасывает кэши, которые обычно сбрасывают сигналы при сохранении"""
+    from seo.breadcrumbs import invalidate_breadcrumbs
+    from seo_management.redirects import invalidate_redirects
+    from seo_management.sitemaps import SECTION_NAMES, invalidate_sections
+
+    from .cache import bump_content_version
+    from .city_directory import invalidate_city_directory
+    from .glossary_index import invalidate_glossary_index
+    from .regional_posts import rebuild_regional_posts
+
+    # Адаптации создаются bulk_create: готовые региональные статьи строим здесь
+    rebuild_regional_posts()
+    bump_content_version()
+    invalidate_sections(*SECTION_NAMES)
+    invalidate_breadcrumbs()
+    invalidate_glossary_index()
+    invalidate_redirects()
+    invalidate_city_directory()
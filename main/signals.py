@@ -0,0 +1,449 @@
+# main/signals.py
+
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_save
+from django.urls import reverse
+
+from .author_stats import invalidate_author_stats
+from .cache import bump_content_version
+from .city_directory import invalidate_city_directory
+from .counters import counter_state, get_counter_specs, recount
+from .dependencies import LIST, list_values, object_keys, purge_dependents, tracked_models
+from .page_cache import invalidate_urls
+from .regional_posts import refresh_regional_posts, schedule_regional_posts
+from .search import index_object, remove_object
+from .glossary_index import invalidate_glossary_index
+from .blobs import blob_refs, change_refs, get_blob_fields
+from .images import enqueue_images, get_image_sources, image_names
+from .models import (
+    ServiceCategory, Service, PortfolioCategory, PortfolioItem, City, RegionalPostAdaptation,
+    FAQCategory, FAQItem, GlossaryCategory, GlossaryTerm, Author, HomePage, CustomHeadScript,
+)
+from pages.models import SimplePage
+from blog.models import Category as BlogCategory, Post
+from seo_management.models import Redirect, SitemapSettings, RobotsTxtSettings
+from seo_management.redirects import invalidate_redirects
+from seo_management.sitemaps import SECTION_NAMES, invalidate_sections
+from seo.breadcrumbs import breadcrumb_state, invalidate_breadcrumbs
+from seo.models import Breadcrumb
+
+
+# Модели, из которых собирается меню сайта (см. context_processors.services_menu)
+# и <head> всех страниц (main/head_scripts.py)
+MENU_MODELS = (ServiceCategory, Service, BlogCategory, PortfolioCategory, SimplePage, City, CustomHeadScript)
+
+# Остальной контент: изменения видны по updated_at, а удаление строки по датам
+# не отследить — поэтому при удалении тоже сбрасываем версию контента
+CONTENT_MODELS = (Post, PortfolioItem, RegionalPostAdaptation, FAQCategory, FAQItem,
+                  GlossaryCategory, GlossaryTerm, Author)
+
+
+def menu_content_changed(sender, **kwargs):
+    """Сбрасывает снимок меню при изменении контента в админке"""
+    bump_content_version()
+
+
+def content_deleted(sender, **kwargs):
+    """Сбрасывает версию контента при удалении объекта"""
+    bump_content_version()
+
+
+for model in MENU_MODELS:
+    post_save.connect(menu_content_changed, sender=model, dispatch_uid=f'menu_save_{model._meta.label_lower}')
+    post_delete.connect(menu_content_changed, sender=model, dispatch_uid=f'menu_delete_{model._meta.label_lower}')
+
+for model in CONTENT_MODELS:
+    post_delete.connect(content_deleted, sender=model, dispatch_uid=f'content_delete_{model._meta.label_lower}')
+
+
+# --- Объект до сохранения ---
+# Обработчикам ниже нужны прежние значения полей (URL, крошки, счетчики,
+# ссылки на файлы, состав списков): строка загружается один раз, в instance._old.
+
+def load_old_instance(sender, instance, raw=False, **kwargs):
+    """Загружает сохраненную версию объекта (None — объект новый)"""
+    instance._old = None
+    if raw or instance.pk is None:
+        return
+    instance._old = sender._default_manager.filter(pk=instance.pk).first()
+
+
+def old_instance(instance):
+    return getattr(instance, '_old', None)
+
+
+# Все модели, обработчики которых читают instance._old (см. ниже)
+for model in tracked_models():
+    pre_save.connect(load_old_instance, sender=model, dispatch_uid=f'old_instance_{model._meta.label_lower}')
+
+
+# --- Точечный сброс кэша страниц (main/page_cache.py) ---
+# Для каждой модели — список URL страниц, на которых виден объект, даже если
+# страница еще не попала в граф зависимостей (main/dependencies.py, ниже).
+# Меню-модели здесь не нужны: они меняют версию контента и сбрасывают все страницы.
+
+def post_page_urls(post):
+    urls = [
+        post.get_absolute_url(),
+        reverse('blog:post_detail_legacy', kwargs={'slug': post.slug}),
+        reverse('blog:post_list'),
+        reverse('blog:search'),
+        reverse('main:sitemap'),
+    ]
+    if post.category_id:
+        urls.append(post.category.get_absolute_url())
+    if post.blog_author_id:
+        urls.append(post.blog_author.get_absolute_url())
+    if post.author_id:
+        urls.append(reverse('main:author_detail', kwargs={'slug': f'user-{post.author_id}'}))
+    # Страницы городов и региональные версии статьи сбрасывает граф зависимостей
+    return urls
+
+
+def adaptation_page_urls(adaptation):
+    return [adaptation.get_absolute_url()]
+
+
+def portfolio_item_page_urls(item):
+    urls = [
+        item.get_absolute_url(),
+        reverse('main:portfolio_detail_legacy', kwargs={'slug': item.slug}),
+        reverse('main:portfolio_list'),
+    ]
+    if item.category_id:
+        urls.append(item.category.get_absolute_url())
+    return urls
+
+
+def faq_category_page_urls(category):
+    urls = [category.get_absolute_url(), reverse('main:faq_list'), reverse('main:sitemap')]
+    urls.extend(item.get_absolute_url() for item in category.faq_items.all())
+    return urls
+
+
+def faq_item_page_urls(item):
+    return [item.get_absolute_url(), item.category.get_absolute_url(), reverse('main:faq_list'), reverse('main:sitemap')]
+
+
+def glossary_category_page_urls(category):
+    urls = [category.get_absolute_url(), reverse('main:glossary_list'), reverse('main:glossary_autocomplete')]
+    urls.extend(term.get_absolute_url() for term in category.glossary_terms.all())
+    return urls
+
+
+def glossary_term_page_urls(term):
+    return [
+        term.get_absolute_url(),
+        term.category.get_absolute_url(),
+        reverse('main:glossary_list'),
+        reverse('main:glossary_autocomplete'),
+    ]
+
+
+def author_page_urls(author):
+    # Страницы статей с карточкой автора сбрасывает граф зависимостей
+    return [author.get_absolute_url()]
+
+
+PAGE_URLS = {
+    Post: post_page_urls,
+    RegionalPostAdaptation: adaptation_page_urls,
+    PortfolioItem: portfolio_item_page_urls,
+    FAQCategory: faq_category_page_urls,
+    FAQItem: faq_item_page_urls,
+    GlossaryCategory: glossary_category_page_urls,
+    GlossaryTerm: glossary_term_page_urls,
+    Author: author_page_urls,
+}
+
+
+def page_content_saved(sender, instance, raw=False, **kwargs):
+    """Сбрасывает кэш страниц, на которых виден сохраненный объект (и прежние URL: slug, категория)"""
+    if raw:
+        return
+    old = old_instance(instance)
+    urls = PAGE_URLS[sender](old) if old else []
+    # Результаты поиска по сайту зависят от любого материала
+    invalidate_urls(urls + PAGE_URLS[sender](instance) + [reverse('main:search')])
+
+
+for model in PAGE_URLS:
+    post_save.connect(page_content_saved, sender=model, dispatch_uid=f'page_save_{model._meta.label_lower}')
+
+
+# --- Поисковый индекс (main/search.py) ---
+
+SEARCH_MODELS = (Post, Service, PortfolioItem, FAQItem, GlossaryTerm)
+
+# Категории: их slug входит в URL, а видимость влияет на выдачу дочерних объектов
+SEARCH_PARENTS = {
+    BlogCategory: 'post_set',
+    ServiceCategory: 'services',
+    PortfolioCategory: 'portfolioitem_set',
+    FAQCategory: 'faq_items',
+    GlossaryCategory: 'glossary_terms',
+}
+
+# Поля категории, от которых зависят документы (URL, видимость, текст статьи)
+SEARCH_PARENT_FIELDS = ('slug', 'name', 'is_active')
+
+
+def search_content_saved(sender, instance, raw=False, **kwargs):
+    """Обновляет поисковый документ объекта"""
+    if raw:
+        return
+    index_object(instance)
+
+
+def search_content_deleted(sender, instance, **kwargs):
+    """Удаляет объект из поискового индекса"""
+    remove_object(instance)
+
+
+def search_parent_saved(sender, instance, raw=False, **kwargs):
+    """Переиндексирует объекты категории, если изменились URL, видимость или название"""
+    if raw:
+        return
+    old = old_instance(instance)
+    if old is not None and all(
+        getattr(old, field, None) == getattr(instance, field, None) for field in SEARCH_PARENT_FIELDS
+    ):
+        return
+    for child in getattr(instance, SEARCH_PARENTS[sender]).all():
+        index_object(child)
+
+
+for model in SEARCH_MODELS:
+    post_save.connect(search_content_saved, sender=model, dispatch_uid=f'search_save_{model._meta.label_lower}')
+    post_delete.connect(search_content_deleted, sender=model, dispatch_uid=f'search_delete_{model._meta.label_lower}')
+
+for model in SEARCH_PARENTS:
+    post_save.connect(search_parent_saved, sender=model, dispatch_uid=f'search_parent_{model._meta.label_lower}')
+
+
+# --- Индекс глоссария (main/glossary_index.py) ---
+
+def glossary_changed(sender, **kwargs):
+    """Перестраивает индекс глоссария при изменении термина или категории"""
+    invalidate_glossary_index()
+
+
+for model in (GlossaryCategory, GlossaryTerm):
+    post_save.connect(glossary_changed, sender=model, dispatch_uid=f'glossary_save_{model._meta.label_lower}')
+    post_delete.connect(glossary_changed, sender=model, dispatch_uid=f'glossary_delete_{model._meta.label_lower}')
+
+
+# --- Шарды sitemap.xml и robots.txt (seo_management/sitemaps.py, publish.py) ---
+# Раздел 'static' содержит страницы-списки, их lastmod зависит от содержимого
+
+SITEMAP_SECTIONS = {
+    HomePage: ('static',),
+    Post: ('static', 'blog', 'city-posts'),
+    BlogCategory: ('static', 'blog'),
+    Service: ('static', 'services', 'city-services'),
+    ServiceCategory: ('static', 'services', 'city-categories'),
+    City: ('static', 'cities', 'city-services', 'city-categories', 'city-posts'),
+    RegionalPostAdaptation: ('city-posts',),
+    PortfolioCategory: ('portfolio',),
+    PortfolioItem: ('static', 'portfolio'),
+    FAQCategory: ('faq',),
+    FAQItem: ('static', 'faq'),
+    GlossaryCategory: ('glossary',),
+    GlossaryTerm: ('static', 'glossary'),
+    SimplePage: ('pages',),
+    SitemapSettings: SECTION_NAMES,
+    RobotsTxtSettings: ('robots',),
+}
+
+
+def sitemap_content_changed(sender, **kwargs):
+    """Сбрасывает кэш шардов sitemap (и готовые файлы), в которые входит объект"""
+    invalidate_sections(*SITEMAP_SECTIONS[sender])
+
+
+for model in SITEMAP_SECTIONS:
+    post_save.connect(sitemap_content_changed, sender=model, dispatch_uid=f'sitemap_save_{model._meta.label_lower}')
+    post_delete.connect(sitemap_content_changed, sender=model, dispatch_uid=f'sitemap_delete_{model._meta.label_lower}')
+
+
+# --- Справочник городов (main/city_directory.py) ---
+
+def cities_changed(sender, **kwargs):
+    invalidate_city_directory()
+
+
+post_save.connect(cities_changed, sender=City, dispatch_uid='cities_save_main.city')
+post_delete.connect(cities_changed, sender=City, dispatch_uid='cities_delete_main.city')
+
+
+# --- Редиректы (seo_management/redirects.py) ---
+
+def redirects_changed(sender, **kwargs):
+    invalidate_redirects()
+
+
+post_save.connect(redirects_changed, sender=Redirect, dispatch_uid='redirects_save_seo_management.redirect')
+post_delete.connect(redirects_changed, sender=Redirect, dispatch_uid='redirects_delete_seo_management.redirect')
+
+
+# --- Хлебные крошки (seo/breadcrumbs.py) ---
+# Цепочки сбрасываются, только если изменились поля, которые в них видны
+
+BREADCRUMB_MODELS = (City, ServiceCategory, Service, PortfolioCategory, PortfolioItem, RegionalPostAdaptation,
+                     GlossaryCategory, GlossaryTerm, FAQCategory, FAQItem, BlogCategory, Post, SimplePage)
+
+
+def breadcrumb_source_saved(sender, instance, created=False, raw=False, **kwargs):
+    """Сбрасывает цепочки, если у объекта (возможно, предка) сменились заголовок, slug или родитель"""
+    if raw or created:
+        return
+    old = old_instance(instance)
+    if old is None or breadcrumb_state(old) != breadcrumb_state(instance):
+        invalidate_breadcrumbs()
+
+
+def breadcrumbs_changed(sender, **kwargs):
+    invalidate_breadcrumbs()
+
+
+for model in BREADCRUMB_MODELS:
+    label = model._meta.label_lower
+    post_save.connect(breadcrumb_source_saved, sender=model, dispatch_uid=f'breadcrumbs_save_{label}')
+    post_delete.connect(breadcrumbs_changed, sender=model, dispatch_uid=f'breadcrumbs_delete_{label}')
+
+post_save.connect(breadcrumbs_changed, sender=Breadcrumb, dispatch_uid='breadcrumbs_save_seo.breadcrumb')
+post_delete.connect(breadcrumbs_changed, sender=Breadcrumb, dispatch_uid='breadcrumbs_delete_seo.breadcrumb')
+
+
+# --- Статистика авторов (main/author_stats.py) ---
+
+def author_stats_changed(sender, **kwargs):
+    invalidate_author_stats()
+
+
+for model in (Post, BlogCategory):
+    label = model._meta.label_lower
+    post_save.connect(author_stats_changed, sender=model, dispatch_uid=f'author_stats_save_{label}')
+    post_delete.connect(author_stats_changed, sender=model, dispatch_uid=f'author_stats_delete_{label}')
+
+
+# --- Счетчики опубликованных объектов (main/counters.py) ---
+
+def _counter_handlers(spec):
+    label = f'{spec.child._meta.label_lower}_{spec.field}'
+
+    def counter_source_saved(sender, instance, raw=False, **kwargs):
+        if raw:
+            return
+        old = old_instance(instance)
+        before = counter_state(old, spec) if old else None
+        after = counter_state(instance, spec)
+        if before != after:
+            recount(spec, {before[0] if before else None, after[0]})
+
+    def counter_source_deleted(sender, instance, **kwargs):
+        recount(spec, {counter_state(instance, spec)[0]})
+
+    post_save.connect(counter_source_saved, sender=spec.child, weak=False, dispatch_uid=f'counter_save_{label}')
+    post_delete.connect(counter_source_deleted, sender=spec.child, weak=False, dispatch_uid=f'counter_delete_{label}')
+
+
+for spec in get_counter_specs():
+    _counter_handlers(spec)
+
+
+# --- Адаптивные копии изображений (main/images.py) ---
+
+def image_source_saved(sender, instance, raw=False, **kwargs):
+    """Ставит новые изображения объекта в очередь process_images"""
+    if raw:
+        return
+    enqueue_images(image_names(instance, get_image_sources()[sender]))
+
+
+for model in get_image_sources():
+    post_save.connect(image_source_saved, sender=model, dispatch_uid=f'images_save_{model._meta.label_lower}')
+
+
+# --- Ссылки на файлы blobs/ (main/blobs.py) ---
+
+def _blob_handlers(model, fields):
+    label = model._meta.label_lower
+
+    def blob_source_saved(sender, instance, raw=False, **kwargs):
+        if raw:
+            return
+        old = old_instance(instance)
+        change_refs(blob_refs(old, fields) if old else {}, blob_refs(instance, fields))
+
+    def blob_source_deleted(sender, instance, **kwargs):
+        change_refs(blob_refs(instance, fields), {})
+
+    post_save.connect(blob_source_saved, sender=model, weak=False, dispatch_uid=f'blobs_save_{label}')
+    post_delete.connect(blob_source_deleted, sender=model, weak=False, dispatch_uid=f'blobs_delete_{label}')
+
+
+for model, fields in get_blob_fields().items():
+    _blob_handlers(model, fields)
+
+
+# --- Граф зависимостей страниц (main/dependencies.py) ---
+
+def dependencies_saved(sender, instance, created=False, raw=False, **kwargs):
+    """Сбрасывает страницы, прочитавшие объект (и списки, если изменился состав)"""
+    if raw:
+        return
+    old = old_instance(instance)
+    list_changed = created or old is None or list_values(old) != list_values(instance)
+    purge_dependents(object_keys(instance, list_changed))
+
+
+def dependencies_deleted(sender, instance, **kwargs):
+    purge_dependents(object_keys(instance, list_changed=True))
+
+
+def dependencies_m2m_changed(sender, instance, action, **kwargs):
+    """Связи many-to-many: страницы объекта и списки по таблице связей"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    purge_dependents(object_keys(instance) + [(sender._meta.label_lower, LIST)])
+
+
+for model in tracked_models():
+    label = model._meta.label_lower
+    post_save.connect(dependencies_saved, sender=model, dispatch_uid=f'dependencies_save_{label}')
+    post_delete.connect(dependencies_deleted, sender=model, dispatch_uid=f'dependencies_delete_{label}')
+    for field in model._meta.local_many_to_many:
+        through = field.remote_field.through
+        m2m_changed.connect(
+            dependencies_m2m_changed, sender=through,
+            dispatch_uid=f'dependencies_m2m_{through._meta.label_lower}',
+        )
+
+
+# --- Готовые региональные статьи (main/regional_posts.py) ---
+
+REGIONAL_POST_SOURCES = {
+    RegionalPostAdaptation: 'pk',
+    Post: 'post',
+    BlogCategory: 'post__category',
+    City: 'city',
+}
+
+
+def regional_post_source_saved(sender, instance, raw=False, **kwargs):
+    """Пересчитывает региональные статьи, собранные из сохраненного объекта"""
+    if raw:
+        return
+    adaptations = RegionalPostAdaptation.objects.filter(**{REGIONAL_POST_SOURCES[sender]: instance.pk})
+    if sender in (City, BlogCategory):
+        # Адаптаций города или категории может быть много: остаток пересчитывается в фоне
+        schedule_regional_posts(adaptations)
+    else:
+        refresh_regional_posts(adaptations)
+
+
+for model in REGIONAL_POST_SOURCES:
+    post_save.connect(
+        regional_post_source_saved, sender=model,
+        dispatch_uid=f'regional_posts_save_{model._meta.label_lower}',
+    )
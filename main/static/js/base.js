@@ -188,6 +188,23 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 })();
 
+// Счетчик просмотров статьи: страница может быть отдана из кэша,
+// поэтому актуальное число подгружается отдельным запросом
+(function() {
+    function loadViews() {
+        document.querySelectorAll('[data-views-url]').forEach(function(el) {
+            fetch(el.dataset.viewsUrl, { headers: { 'Accept': 'application/json' } })
+                .then(r => r.ok ? r.json() : null)
+                .then(data => {
+                    if (data) el.textContent = data.views;
+                })
+                .catch(() => {});
+        });
+    }
+    if (document.readyState === 'loading') document.addEventListener('DOMContentLoaded', loadViews);
+    else loadViews();
+})();
+
 // Back-to-top button logic
 (function() {
     const btn = document.getElementById('back-to-top');
@@ -343,6 +360,15 @@ initProgressBars();
     }
 
     console.log('City selector initialized');
+
+    // Город посетителя (выбранный или по IP) — из cookie, страница в кэше общая для всех
+    const cityCookie = document.cookie.match(/(?:^|; )user_city=([^;]*)/);
+    if (cityCookie) {
+        const citySlug = decodeURIComponent(cityCookie[1]);
+        if (Array.from(citySelect.options).some(option => option.value === citySlug)) {
+            citySelect.value = citySlug;
+        }
+    }
     
     citySelect.addEventListener('change', function() {
         const selectedCitySlug = this.value;
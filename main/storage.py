@@ -0,0 +1,87 @@
+# main/storage.py - Хранилище загрузок с адресацией по содержимому
+#
+# Загруженный файл хэшируется SHA-256 по частям (chunks(), память не зависит
+# от размера) и сохраняется один раз под именем по хэшу:
+#   blobs/ab/cd/abcd...ef.png
+# Повторная загрузка того же файла (в любое поле, под любым именем) не пишет
+# новый файл, а возвращает имя существующего. Двухуровневое разбиение по
+# первым байтам хэша держит каталоги небольшими.
+#
+# Файл сначала пишется во временный в blobs/tmp/ и переносится os.replace,
+# поэтому недописанный файл никогда не виден под итоговым именем.
+#
+# Ссылки на файлы считает main/blobs.py (MediaBlob.ref_count); удаляет
+# файлы без ссылок только manage.py gc_media. Старые файлы (service_images/...)
+# отдаются как раньше.
+
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import PurePosixPath
+
+from django.core.files.storage import FileSystemStorage
+
+BLOBS_DIR = 'blobs'
+BLOB_RE = re.compile(r'blobs/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(?:\.[0-9a-z]+)?')
+
+
+def blob_name(digest, ext=''):
+    return f'{BLOBS_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{ext}'
+
+
+def is_blob(name):
+    return bool(name) and BLOB_RE.fullmatch(name) is not None
+
+
+def blob_extension(name):
+    ext = PurePosixPath(name).suffix.lower()
+    return ext if re.fullmatch(r'\.[0-9a-z]{1,10}', ext) else ''
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage, в котором одинаковые файлы хранятся один раз"""
+
+    def get_available_name(self, name, max_length=None):
+        # Итоговое имя определяет хэш в _save, суффиксы _AbC123 не нужны
+        return name
+
+    def _save(self, name, content):
+        from .blobs import register_blob
+
+        tmp_dir = self.path(f'{BLOBS_DIR}/tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir, suffix='.part')
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+
+            name = blob_name(digest.hexdigest(), blob_extension(name))
+            # Запись до проверки файла: сборка мусора не удалит файл между
+            # проверкой и сохранением ссылки (см. blobs.register_blob)
+            register_blob(name, size)
+            full_path = self.path(name)
+            if os.path.exists(full_path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                os.chmod(tmp_path, self.file_permissions_mode or 0o644)
+                os.replace(tmp_path, full_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return name
+
+    def delete(self, name):
+        # Файл может использоваться другими объектами: удаляет только gc_media
+        if not is_blob(name):
+            super().delete(name)
+
+    def delete_blob(self, name):
+        super().delete(name)
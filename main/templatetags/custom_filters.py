@@ -66,27 +66,16 @@ def get_category_breadcrumbs(category, city=None):
     return category.get_breadcrumbs(city)
 
 @register.simple_tag
-def get_custom_head_scripts(page_type, page_slug=None, position=None):
+def get_head_scripts(page_type, page_slug=None):
     """
-    Получает кастомные скрипты и HTML-теги для head.
-    Использование: 
-    - {% get_custom_head_scripts 'home' %} - все скрипты
-    - {% get_custom_head_scripts 'city_detail' 'moscow' %} - для конкретной страницы
-    - {% get_custom_head_scripts 'home' '' 'early' %} - только для определенной позиции
+    Возвращает готовый HTML кастомных скриптов по позициям из скомпилированного реестра.
+    Использование:
+    - {% get_head_scripts page_type page_slug as head_scripts %}
+    - {{ head_scripts.early|safe }}
     """
-    from main.models import CustomHeadScript
-    
-    scripts = CustomHeadScript.objects.filter(is_active=True).order_by('order', 'name')
-    
-    # Фильтруем по типу страницы и slug
-    filtered_scripts = []
-    for script in scripts:
-        if script.should_display_on_page(page_type, page_slug):
-            # Если указана позиция, фильтруем по ней
-            if position is None or script.position == position:
-                filtered_scripts.append(script)
-    
-    return filtered_scripts
+    from main.head_scripts import get_head_scripts as get_registry_scripts
+
+    return get_registry_scripts(page_type, page_slug)
 
 @register.simple_tag
 def get_head_content_preview(page_type, page_slug=None):
@@ -119,6 +108,39 @@ def get_head_content_preview(page_type, page_slug=None):
     
     return positions
 
+@register.simple_tag
+def responsive_image(image, alt='', sizes='100vw', css_class='', style='', loading='lazy'):
+    """
+    Выводит изображение с адаптивными копиями (main/images.py): <picture> с WebP и
+    JPEG/PNG srcset, sizes, width/height. Пока копий нет — исходный файл.
+    Использование: {% responsive_image post.image post.title sizes="(max-width: 768px) 100vw, 33vw" %}
+    """
+    from django.core.files.storage import default_storage
+    from django.utils.html import format_html
+
+    from main.images import default_src, get_image_info, source_name, srcset
+
+    source = source_name(image)
+    if not source:
+        return ''
+    info = get_image_info(source)
+    if info is None:
+        url = default_storage.url(source)
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" style="{}" loading="{}" decoding="async">',
+            url, alt, css_class, style, loading,
+        )
+    return format_html(
+        '<picture style="display: contents">'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}" style="{}" loading="{}" decoding="async">'
+        '</picture>',
+        srcset(source, info, 'webp'), sizes,
+        default_src(source, info), srcset(source, info, info.fallback), sizes,
+        # width/height задают пропорции; height: auto, чтобы атрибут не фиксировал высоту
+        info.width, info.height, alt, css_class, f'height: auto; {style}', loading,
+    )
+
 # Регистрируем фильтр в глобальном регистре для совместимости с Django Unfold
 @global_register.filter
 def length_is(value, arg):
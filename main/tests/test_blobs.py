@@ -0,0 +1,97 @@
+# main/tests/test_blobs.py - Хранилище по хэшу содержимого и сборка мусора
+
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from blog.models import Category, Post
+from main.bench import BENCH_CACHES
+from main.blobs import collect_garbage
+from main.models import Author, MediaBlob
+
+MEDIA_ROOT = tempfile.mkdtemp(prefix='test-media-')
+
+
+@override_settings(CACHES=BENCH_CACHES, MEDIA_ROOT=MEDIA_ROOT)
+class BlobStorageTest(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def save(self, content, name='photo.jpg'):
+        return default_storage.save(f'author_photos/{name}', ContentFile(content))
+
+    def ref_count(self, name):
+        return MediaBlob.objects.get(name=name).ref_count
+
+    def age(self, name, days=2):
+        MediaBlob.objects.filter(name=name).update(created_at=timezone.now() - timedelta(days=days))
+
+    def test_deduplication(self):
+        first = self.save(b'same content', 'a.jpg')
+        second = self.save(b'same content', 'b.JPG')
+        self.assertEqual(first, second)
+        self.assertRegex(first, r'^blobs/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$')
+        self.assertEqual(MediaBlob.objects.filter(name=first).count(), 1)
+        self.assertNotEqual(self.save(b'other content'), first)
+
+    def test_ref_count(self):
+        name = self.save(b'photo')
+        other = self.save(b'other photo')
+        author = Author.objects.create(first_name='Иван', last_name='Петров', username='ivan', photo=name)
+        self.assertEqual(self.ref_count(name), 1)
+
+        author.photo = other
+        author.save()
+        self.assertEqual((self.ref_count(name), self.ref_count(other)), (0, 1))
+
+        category = Category.objects.create(name='Рубрика', slug='category')
+        post = Post.objects.create(
+            category=category, title='Статья', slug='post', content=f'<img src="/media/{name}">',
+        )
+        self.assertEqual(self.ref_count(name), 1)
+        post.delete()
+        author.delete()
+        self.assertEqual((self.ref_count(name), self.ref_count(other)), (0, 0))
+
+    def test_collect_garbage(self):
+        orphan = self.save(b'orphan')
+        recent = self.save(b'recent')
+        used = self.save(b'used')
+        Author.objects.create(first_name='Иван', last_name='Петров', username='ivan', photo=used)
+        self.age(orphan)
+        self.age(used)
+
+        self.assertEqual(collect_garbage(dry_run=True)[0], 1)
+        self.assertTrue(default_storage.exists(orphan))
+
+        self.assertEqual(collect_garbage(), (1, len(b'orphan')))
+        self.assertFalse(default_storage.exists(orphan))
+        self.assertFalse(MediaBlob.objects.filter(name=orphan).exists())
+        self.assertTrue(default_storage.exists(recent))
+        self.assertTrue(default_storage.exists(used))
+
+    def test_reupload_keeps_file(self):
+        name = self.save(b'content')
+        self.age(name)
+        # Тот же файл загружен снова до сборки мусора: льготный период заново
+        self.save(b'content')
+        self.assertEqual(collect_garbage(), (0, 0))
+        self.assertTrue(default_storage.exists(name))
+
+    def test_reupload_after_collect(self):
+        name = self.save(b'content')
+        self.age(name)
+        collect_garbage()
+        # Строка удалена вместе с файлом: новая загрузка создает обе заново
+        self.assertEqual(self.save(b'content'), name)
+        self.assertTrue(MediaBlob.objects.filter(name=name).exists())
+        self.assertTrue(os.path.exists(default_storage.path(name)))
@@ -0,0 +1,77 @@
+# main/tests/test_city_directory.py - Справочник городов в памяти процесса
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from main.bench import BENCH_CACHES, clear_caches
+from main.city_directory import CityDirectory, CityEntry, get_city_directory, prepositional_form
+from main.models import City
+
+
+def _entry(pk, name, slug, is_active=True):
+    return CityEntry(pk, name, slug, '', is_active, prepositional_form(name))
+
+
+class CityDirectoryTest(SimpleTestCase):
+
+    def setUp(self):
+        self.directory = CityDirectory([
+            _entry(1, 'Москва', 'moscow'),
+            _entry(2, 'Пермь', 'perm'),
+            _entry(3, 'Омск', 'omsk'),
+            _entry(4, 'Нижний Новгород', 'nizhny-novgorod'),
+            _entry(5, 'Санкт-Петербург', 'saint-petersburg'),
+            _entry(6, 'Владимир', 'vladimir', is_active=False),
+        ])
+
+    def resolve(self, name, **kwargs):
+        entry = self.directory.resolve(name, **kwargs)
+        return entry.slug if entry else None
+
+    def test_exact(self):
+        self.assertEqual(self.resolve('Москва'), 'moscow')
+        self.assertEqual(self.resolve('moscow'), 'moscow')
+        self.assertEqual(self.resolve('в Перми'), 'perm')
+        self.assertEqual(self.resolve('Nizhniy Novgorod'), 'nizhny-novgorod')
+        self.assertEqual(self.resolve('питер'), 'saint-petersburg')
+
+    def test_fuzzy(self):
+        self.assertEqual(self.resolve('Моксва'), 'moscow')
+        self.assertEqual(self.resolve('Санкт Питербург'), 'saint-petersburg')
+        self.assertIsNone(self.resolve('Моксва', fuzzy=False))
+        self.assertIsNone(self.resolve('Лондон'))
+
+    def test_short_names_match_exactly(self):
+        # Томск — другой город, а не опечатка в "Омск"
+        self.assertEqual(self.resolve('Омск'), 'omsk')
+        self.assertIsNone(self.resolve('Томск'))
+        self.assertIsNone(self.resolve('Омкс'))
+
+    def test_inactive(self):
+        self.assertIsNone(self.resolve('Владимир'))
+        self.assertEqual(self.resolve('Владимир', active_only=False), 'vladimir')
+        self.assertIsNone(self.directory.get('vladimir'))
+
+    def test_prepositional(self):
+        self.assertEqual(self.directory.prepositional('Пермь'), 'в Перми')
+        self.assertEqual(self.directory.prepositional('Владимир'), 'во Владимире')
+        self.assertEqual(prepositional_form('Сочи'), 'в Сочи')
+
+
+@override_settings(CACHES=BENCH_CACHES)
+class CityDirectorySnapshotTest(TestCase):
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+
+    def test_invalidated_by_signals(self):
+        city = City.objects.create(name='Пермь', slug='perm')
+        self.assertEqual(get_city_directory().resolve('в Перми').slug, 'perm')
+        with self.assertNumQueries(0):
+            get_city_directory()
+
+        city.is_active = False
+        city.save()
+        self.assertIsNone(get_city_directory().resolve('Пермь'))
+        city.delete()
+        self.assertIsNone(get_city_directory().get('perm', active_only=False))
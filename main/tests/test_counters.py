@@ -0,0 +1,62 @@
+# main/tests/test_counters.py - Счетчики опубликованных объектов (published_count)
+
+from django.test import TestCase, override_settings
+
+from blog.models import Category, Post
+from main.bench import BENCH_CACHES
+from main.counters import reconcile_all
+from main.models import Author
+
+
+@override_settings(CACHES=BENCH_CACHES)
+class PublishedCountTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = Category.objects.create(name='Первая', slug='first')
+        cls.second = Category.objects.create(name='Вторая', slug='second')
+        cls.author = Author.objects.create(first_name='Иван', last_name='Петров', username='ivan')
+
+    def counts(self):
+        return [
+            Category.objects.get(pk=self.first.pk).published_count,
+            Category.objects.get(pk=self.second.pk).published_count,
+            Author.objects.get(pk=self.author.pk).published_count,
+        ]
+
+    def create_post(self, slug, **kwargs):
+        return Post.objects.create(
+            category=self.first, blog_author=self.author, title=slug, slug=slug, content='', **kwargs
+        )
+
+    def test_signals(self):
+        post = self.create_post('post')
+        self.create_post('draft', is_published=False)
+        self.assertEqual(self.counts(), [1, 0, 1])
+
+        post.category = self.second
+        post.save()
+        self.assertEqual(self.counts(), [0, 1, 1])
+
+        post.is_published = False
+        post.save()
+        self.assertEqual(self.counts(), [0, 0, 0])
+
+        post.is_published = True
+        post.save()
+        post.delete()
+        self.assertEqual(self.counts(), [0, 0, 0])
+
+    def test_reconcile(self):
+        self.create_post('post')
+        # Изменения в обход сигналов
+        Category.objects.update(published_count=7)
+        Post.objects.bulk_create([
+            Post(category=self.second, blog_author=self.author, title='Пакет', slug='bulk', content=''),
+        ])
+
+        fixed = reconcile_all()
+        self.assertEqual(fixed['blog.category ← blog.post.category'], 2)
+        self.assertEqual(fixed['main.author ← blog.post.blog_author'], 1)
+        self.assertEqual(self.counts(), [1, 1, 2])
+        self.assertEqual(sum(reconcile_all().values()), 0)
@@ -0,0 +1,87 @@
+# main/tests/test_dependencies.py - Граф зависимостей страниц и точечный сброс
+
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from blog.models import Category, Post
+from main.bench import BENCH_CACHES, clear_caches
+from main.dependencies import ANY, LIST, process_page_purges, purge_dependents, record_dependencies
+from main.models import City, FAQCategory, PageDependency, PagePurge
+from main.page_cache import get_path_generation
+
+
+@override_settings(CACHES=BENCH_CACHES, ALLOWED_HOSTS=['testserver'], SECURE_SSL_REDIRECT=False)
+class DependencyPurgeTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Рубрика', slug='category')
+        cls.post = Post.objects.create(category=cls.category, title='Статья', slug='post', content='<p>Текст</p>')
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+
+    def generations(self, *paths):
+        return [get_path_generation(path) for path in paths]
+
+    def test_recorded_on_render(self):
+        city = City.objects.create(name='Пермь', slug='perm')
+        self.client.get('/')
+        self.assertEqual(self.client.get('/cities/perm/').status_code, 200)
+        keys = set(PageDependency.objects.filter(path='/cities/perm/').values_list('model_label', 'key'))
+        self.assertIn(('main.city', str(city.pk)), keys)
+
+        before = self.generations('/cities/perm/')
+        city = City.objects.get(pk=city.pk)
+        city.local_description = 'Новое описание'
+        city.save()
+        self.assertNotEqual(self.generations('/cities/perm/'), before)
+        # Записи сброшенной страницы удалены, следующий рендер запишет их заново
+        self.assertFalse(PageDependency.objects.filter(path='/cities/perm/').exists())
+
+    def test_only_dependents_purged(self):
+        label, pk = 'blog.post', str(self.post.pk)
+        record_dependencies('/post/', {(label, pk)})
+        record_dependencies('/list/', {(label, LIST)})
+        record_dependencies('/faq/', {('main.faqcategory', LIST)})
+        before = self.generations('/post/', '/list/', '/faq/')
+
+        # Изменение текста: страница статьи, но не списки
+        post = Post.objects.get(pk=self.post.pk)
+        post.content = '<p>Другой текст</p>'
+        post.save()
+        after = self.generations('/post/', '/list/', '/faq/')
+        self.assertEqual([old != new for old, new in zip(before, after)], [True, False, False])
+
+        # Новая статья меняет состав списков
+        Post.objects.create(category=self.category, title='Новая', slug='new', content='')
+        self.assertNotEqual(self.generations('/list/'), after[1:2])
+        self.assertEqual(self.generations('/faq/'), after[2:])
+
+        FAQCategory.objects.create(name='Вопросы', slug='faq')
+        self.assertNotEqual(self.generations('/faq/'), after[2:])
+
+    def test_many_rows(self):
+        record_dependencies('/any/', {('blog.post', ANY)})
+        before = self.generations('/any/')
+        self.post.save()
+        self.assertNotEqual(self.generations('/any/'), before)
+
+    @patch('main.dependencies.PURGE_SYNC_LIMIT', 2)
+    def test_background_purge(self):
+        paths = [f'/page-{number}/' for number in range(5)]
+        for path in paths:
+            record_dependencies(path, {('blog.post', str(self.post.pk))})
+        before = self.generations(*paths)
+
+        self.assertEqual(purge_dependents([('blog.post', str(self.post.pk))]), paths)
+        changed = [old != new for old, new in zip(before, self.generations(*paths))]
+        self.assertEqual(changed, [True, True, False, False, False])
+        self.assertEqual(sorted(PagePurge.objects.values_list('path', flat=True)), paths[2:])
+
+        self.assertEqual(process_page_purges(), 3)
+        self.assertFalse(PagePurge.objects.exists())
+        self.assertTrue(all(old != new for old, new in zip(before, self.generations(*paths))))
+        self.assertEqual(process_page_purges(), 0)
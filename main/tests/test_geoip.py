@@ -0,0 +1,71 @@
+# main/tests/test_geoip.py - Определение города по IP (main/geoip.py)
+
+import os
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from main import geoip
+from main.bench import BENCH_CACHES, clear_caches
+from main.models import City
+from main.utils import get_city_by_ip
+
+
+@override_settings(CACHES=BENCH_CACHES, ALLOWED_HOSTS=['testserver'], SECURE_SSL_REDIRECT=False)
+class GeoIPTest(TestCase):
+
+    def setUp(self):
+        City.objects.create(name='Москва', slug='moscow')
+        City.objects.create(name='Пермь', slug='perm', is_active=False)
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'cities.bin')
+        slugs = {'Moscow': 'moscow', 'Perm': 'perm'}
+        ranges, table = geoip.build_ranges([
+            ('1.0.0.0', '1.0.0.255', 'Moscow'),
+            ('1.0.1.0', '1.0.1.255', 'Moscow'),
+            ('2.0.0.0', '2.0.0.255', 'Perm'),
+            ('3.0.0.0', '3.0.0.255', 'London'),
+            ('2001:db8::', '2001:db8::ffff', 'Moscow'),
+        ], slugs.get)
+        geoip.write_database(self.path, ranges, table)
+
+        # Сбрасываем базу процесса, чтобы get_database() прочитал новый файл
+        geoip._database = geoip._checked_at = None
+        self.addCleanup(setattr, geoip, '_checked_at', None)
+        self.addCleanup(setattr, geoip, '_database', None)
+        clear_caches()
+        self.addCleanup(clear_caches)
+
+    def test_database(self):
+        database = geoip.GeoIPDatabase(self.path)
+        # Соседние диапазоны Москвы склеены, Лондона и IPv6 нет
+        self.assertEqual(len(database), 2)
+        self.assertEqual(database.lookup('1.0.1.17'), 'moscow')
+        self.assertEqual(database.lookup('::ffff:1.0.0.1'), 'moscow')
+        self.assertEqual(database.lookup('2.0.0.1'), 'perm')
+        self.assertIsNone(database.lookup('3.0.0.1'))
+        self.assertIsNone(database.lookup('0.0.0.1'))
+        self.assertIsNone(database.lookup('not an ip'))
+
+    def test_get_city_by_ip(self):
+        with override_settings(GEOIP_DB_PATH=self.path):
+            self.assertEqual(get_city_by_ip('1.0.0.1'), 'moscow')
+            # Город отключен после сборки базы
+            self.assertIsNone(get_city_by_ip('2.0.0.1'))
+            self.assertIsNone(get_city_by_ip('3.0.0.1'))
+
+    def test_no_database(self):
+        with override_settings(GEOIP_DB_PATH=os.path.join(os.path.dirname(self.path), 'missing.bin')):
+            self.assertIsNone(get_city_by_ip('1.0.0.1'))
+
+    def test_city_cookie(self):
+        with override_settings(GEOIP_DB_PATH=self.path):
+            response = self.client.get('/robots.txt', REMOTE_ADDR='1.0.0.1')
+            self.assertEqual(response.cookies['user_city'].value, 'moscow')
+            # Cookie уже совпадает — не переустанавливается
+            response = self.client.get('/robots.txt', REMOTE_ADDR='1.0.0.1')
+            self.assertNotIn('user_city', response.cookies)
+            # Сессия не создается
+            self.assertNotIn('sessionid', response.cookies)
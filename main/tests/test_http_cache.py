@@ -0,0 +1,59 @@
+# main/tests/test_http_cache.py - Условные GET-запросы (ETag / Last-Modified, 304)
+
+from django.test import TestCase, override_settings
+
+from main.bench import BENCH_CACHES, clear_caches
+from pages.models import SimplePage
+
+
+@override_settings(CACHES=BENCH_CACHES, ALLOWED_HOSTS=['testserver'], SECURE_SSL_REDIRECT=False)
+class ConditionalGetTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.page = SimplePage.objects.create(title='О компании', slug='about', content='<p>Текст</p>')
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+        # Общие блоки (меню, настройки сайта) прогреты, как на работающем сайте
+        self.client.get('/')
+        self.url = self.page.get_absolute_url()
+
+    def test_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertTrue(response.has_header('Last-Modified'))
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_not_modified(self):
+        response = self.client.get(self.url)
+        for headers in (
+            {'HTTP_IF_NONE_MATCH': response['ETag']},
+            {'HTTP_IF_MODIFIED_SINCE': response['Last-Modified']},
+        ):
+            with self.subTest(headers=headers):
+                not_modified = self.client.get(self.url, **headers)
+                self.assertEqual(not_modified.status_code, 304)
+                self.assertEqual(not_modified.content, b'')
+                # Ответ до вызова view: шаблон не рендерится
+                self.assertEqual(not_modified.templates, [])
+                self.assertEqual(not_modified['ETag'], response['ETag'])
+
+    def test_changed_page(self):
+        etag = self.client.get(self.url)['ETag']
+        self.page.title = 'О нас'
+        self.page.save()
+        self.client.get('/')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertContains(response, 'О нас')
+
+    def test_private_page(self):
+        response = self.client.get('/contacts/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertIn('no-store', response['Cache-Control'])
@@ -0,0 +1,51 @@
+# main/tests/test_page_cache.py - Кэш готовых страниц для анонимных посетителей
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from main.bench import BENCH_CACHES, clear_caches
+from main.page_cache import invalidate_urls
+from pages.models import SimplePage
+
+
+@override_settings(CACHES=BENCH_CACHES, ALLOWED_HOSTS=['testserver'], SECURE_SSL_REDIRECT=False)
+class PageCacheTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.page = SimplePage.objects.create(title='О компании', slug='about', content='<p>Текст</p>')
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+        self.client.get('/')
+        self.url = self.page.get_absolute_url()
+        self.assertContains(self.client.get(self.url), 'О компании')
+        # Изменение в обход сигналов: кэш страницы о нем не знает
+        SimplePage.objects.filter(pk=self.page.pk).update(title='О нас')
+
+    def test_cached(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, 'О компании')
+        # Страница отдана без вызова view
+        self.assertEqual(response.templates, [])
+
+    def test_invalidate_urls(self):
+        invalidate_urls([self.url])
+        self.assertContains(self.client.get(self.url), 'О нас')
+
+    def test_saved_object(self):
+        page = SimplePage.objects.get(pk=self.page.pk)
+        page.save()
+        self.client.get('/')
+        self.assertContains(self.client.get(self.url), 'О нас')
+
+    def test_query_variants(self):
+        # Параметры, которые view не читает, идут мимо кэша
+        self.assertContains(self.client.get(self.url, {'utm_source': 'mail'}), 'О нас')
+        self.assertContains(self.client.get(self.url), 'О компании')
+
+    def test_authenticated(self):
+        user = get_user_model().objects.create_user('editor', password='password')
+        self.client.force_login(user)
+        self.assertContains(self.client.get(self.url), 'О нас')
@@ -0,0 +1,71 @@
+# main/tests/test_regional_posts.py - Готовые региональные статьи (RegionalPostPage)
+
+from django.apps import apps
+from django.test import TestCase, override_settings
+
+from blog.models import Category, Post
+from main.bench import BENCH_CACHES, clear_caches
+from main.models import City, RegionalPostAdaptation, RegionalPostPage
+from main.regional_posts import PAGE_FIELDS, fill_regional_posts, rebuild_regional_posts
+
+
+@override_settings(CACHES=BENCH_CACHES, ALLOWED_HOSTS=['testserver'], SECURE_SSL_REDIRECT=False)
+class RegionalPostPageTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Рубрика', slug='category')
+        cls.post = Post.objects.create(category=cls.category, title='Статья', slug='post', content='<p>Базовый текст</p>')
+        cls.city = City.objects.create(name='Пермь', slug='perm')
+        cls.adaptation = RegionalPostAdaptation.objects.create(
+            post=cls.post, city=cls.city, content='<p>Текст для Перми</p>',
+        )
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+
+    def page(self):
+        return RegionalPostPage.objects.get(adaptation=self.adaptation)
+
+    def test_built_on_save(self):
+        page = self.page()
+        self.assertEqual((page.city_slug, page.post_slug), ('perm', 'post'))
+        self.assertEqual(page.title, 'Статья в Перми')
+        self.assertEqual(page.content, '<p>Текст для Перми</p>')
+        self.assertTrue(page.is_published)
+
+        post = Post.objects.get(pk=self.post.pk)
+        post.title = 'Новая статья'
+        post.save()
+        self.assertEqual(self.page().title, 'Новая статья в Перми')
+
+        adaptation = RegionalPostAdaptation.objects.get(pk=self.adaptation.pk)
+        adaptation.is_active = False
+        adaptation.save()
+        self.assertFalse(self.page().is_published)
+
+    def test_view(self):
+        self.client.get('/')
+        response = self.client.get('/cities/perm/blog/post/')
+        self.assertIsInstance(response.context['post'], RegionalPostPage)
+        self.assertContains(response, '<title>Статья в Перми</title>')
+
+        RegionalPostAdaptation.objects.filter(pk=self.adaptation.pk).delete()
+        clear_caches()
+        self.client.get('/')
+        response = self.client.get('/cities/perm/blog/post/')
+        # Адаптации нет: базовая статья
+        self.assertIsInstance(response.context['post'], Post)
+        self.assertNotContains(response, 'Статья в Перми')
+
+    def test_fill_missing(self):
+        # Строки, как их строит пересчет
+        expected = list(RegionalPostPage.objects.values(*PAGE_FIELDS))
+        RegionalPostPage.objects.all().delete()
+
+        self.assertEqual(fill_regional_posts(apps), 1)
+        self.assertEqual(list(RegionalPostPage.objects.values(*PAGE_FIELDS)), expected)
+        # Существующие строки не трогает
+        self.assertEqual(fill_regional_posts(apps), 0)
+        self.assertEqual(rebuild_regional_posts(), 1)
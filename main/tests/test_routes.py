@@ -0,0 +1,38 @@
+# main/tests/test_routes.py - Все маршруты сайта под строгим бюджетом SQL-запросов
+
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from main.bench import BENCH_CACHES, clear_caches, collect_routes, seed_bench_data
+
+
+@override_settings(
+    CACHES=BENCH_CACHES,
+    ALLOWED_HOSTS=['testserver'],
+    SECURE_SSL_REDIRECT=False,
+    SITE_URL='https://example.com',
+    QUERY_BUDGET_STRICT=True,
+)
+class RoutesQueryBudgetTest(TestCase):
+    """Каждый маршрут отвечает без ошибок и укладывается в @query_budget"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_bench_data()
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+
+    def test_routes(self):
+        routes, skipped = collect_routes()
+        self.assertEqual(skipped, [])
+        client = Client()
+        # Общие блоки прогреты, как в manage.py bench
+        client.get(reverse('main:home'))
+        for route in routes:
+            with self.subTest(route=route.name):
+                # Холодный запрос и запрос из кэша страниц
+                for _ in range(2):
+                    response = client.get(route.url)
+                    self.assertLess(response.status_code, 400, route.url)
@@ -0,0 +1,37 @@
+# main/tests/test_search.py - Поисковый индекс (main/search.py)
+
+from django.test import TestCase, override_settings
+
+from blog.models import Category, Post
+from main.bench import BENCH_CACHES
+from main.models import SearchDocument
+from main.search import search
+
+
+@override_settings(CACHES=BENCH_CACHES)
+class SearchIndexTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Рубрика', slug='category')
+        cls.post = Post.objects.create(
+            category=cls.category, title='Продвижение сайта', slug='post', content='<p>Текст статьи</p>',
+        )
+
+    def document(self):
+        return SearchDocument.objects.get(model_label='blog.post', object_id=self.post.pk)
+
+    def test_indexed_on_save(self):
+        self.assertEqual(self.document().url, self.post.get_absolute_url())
+        self.assertEqual([hit.object_id for hit in search('продвижение')], [self.post.pk])
+
+    def test_parent_unchanged(self):
+        # Сохранение категории без изменений не переиндексирует статьи
+        SearchDocument.objects.filter(pk=self.document().pk).update(url='/stale/')
+        self.category.save()
+        self.assertEqual(self.document().url, '/stale/')
+
+    def test_parent_changed(self):
+        self.category.slug = 'renamed'
+        self.category.save()
+        self.assertEqual(self.document().url, Post.objects.get(pk=self.post.pk).get_absolute_url())
@@ -0,0 +1,46 @@
+# main/tests/test_view_counters.py - Учет просмотров статей
+
+from django.test import Client, TestCase, override_settings
+
+from blog.models import Category, Post
+from main.bench import BENCH_CACHES, clear_caches
+from main.view_counters import apply_pending_views, get_views_count, pending_views, record_view
+
+
+@override_settings(CACHES=BENCH_CACHES, ALLOWED_HOSTS=['testserver'], SECURE_SSL_REDIRECT=False)
+class ViewCountersTest(TestCase):
+    """Без Redis просмотры пишутся в БД сразу"""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name='Рубрика', slug='category')
+        cls.post = Post.objects.create(category=category, title='Статья', slug='post', content='<p>Текст</p>')
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+
+    def test_record_view(self):
+        record_view(Post, self.post.pk)
+        record_view(Post, self.post.pk)
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.views_count, 2)
+        self.assertEqual(get_views_count(post), 2)
+
+    def test_no_pending_views(self):
+        self.assertEqual(pending_views(Post, [self.post.pk]), {})
+        self.assertEqual(apply_pending_views([]), [])
+        with self.assertNumQueries(0):
+            [post] = apply_pending_views([self.post])
+        self.assertEqual(post.views_count, self.post.views_count)
+
+    def test_cached_page_counts_view(self):
+        self.client.get('/')
+        url = self.post.get_absolute_url()
+        visitor = Client()
+        for client in (self.client, self.client, visitor):
+            self.assertEqual(client.get(url).status_code, 200)
+        # Один просмотр за сессию; ответы из кэша страниц учтены on_hit
+        self.assertEqual(Post.objects.get(pk=self.post.pk).views_count, 2)
+        response = self.client.get(f'/views/post/{self.post.pk}/')
+        self.assertEqual(response.json(), {'views': 2})
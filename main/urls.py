@@ -28,6 +28,9 @@ urlpatterns = [
     # --- Карта сайта ---
     path('sitemap/', views.sitemap_page, name='sitemap'),
     
+    # --- Поиск по сайту ---
+    path('search/', views.search, name='search'),
+    
     # --- FAQ (Вопрос-Ответ) ---
     path('faq/', views.faq_list, name='faq_list'),
     path('faq/category/<slug:slug>/', views.faq_category, name='faq_category'),
@@ -35,9 +38,13 @@ urlpatterns = [
     
     # --- Глоссарий ---
     path('glossary/', views.glossary_list, name='glossary_list'),
+    path('glossary/autocomplete/', views.glossary_autocomplete, name='glossary_autocomplete'),
     path('glossary/category/<slug:slug>/', views.glossary_category, name='glossary_category'),
     path('glossary/category/<slug:category_slug>/<slug:term_slug>/', views.glossary_term, name='glossary_term'),
     
+    # --- Счетчик просмотров статьи (JSON) ---
+    path('views/post/<int:pk>/', views.post_views, name='post_views'),
+    
     # --- Авторы ---
     path('author/<slug:slug>/', views.author_detail, name='author_detail'),
 
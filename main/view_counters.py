@@ -0,0 +1,151 @@
+# main/view_counters.py - Отложенный учет просмотров (write-behind)
+#
+# Просмотр не пишет в БД сразу: счетчик увеличивается в Redis (INCR атомарен
+# для всех воркеров), pk объекта попадает в множество измененных, а
+# накопленные приросты раз в минуту переносятся в БД одним UPDATE на пачку:
+#
+#   python manage.py flush_view_counters
+#
+# (по расписанию — deploy/seo-agency-counters.timer). Сброс читает только
+# pk из множества измененных, а не все объекты модели.
+#
+# Нужен общий кэш на Redis (CACHE_BACKEND=redis): в файловом кэше incr — это
+# get + set без блокировки (воркеры теряют просмотры), locmem не виден
+# процессу сброса. С другими бэкендами просмотры пишутся в БД сразу,
+# UPDATE ... F('views_count') + 1.
+#
+# В шаблоне страницы значение из БД плюс еще не записанный прирост:
+#   record_view(Post, post.pk)
+#   post.views_count = get_views_count(post)
+# Страница может быть отдана из кэша (main/page_cache.py), поэтому на странице
+# статьи актуальное число подгружается отдельно (main.views.post_views).
+
+from django.core.cache.backends.redis import RedisCache
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+
+from .cache import shared_cache
+
+# Сколько pk забирать из множества измененных за один UPDATE
+FLUSH_BATCH_SIZE = 1000
+
+
+def _counter_key(model, pk):
+    return f'views:{model._meta.label_lower}:{pk}'
+
+
+def _dirty_key(model):
+    return f'views:dirty:{model._meta.label_lower}'
+
+
+def _counted_models():
+    # Импорт внутри функции: main.models не должен зависеть от blog при загрузке
+    from blog.models import Post
+    from .models import RegionalPostAdaptation
+    return (Post, RegionalPostAdaptation)
+
+
+def get_redis():
+    """Клиент Redis общего кэша или None, если общий кэш не на Redis"""
+    cache = shared_cache()
+    if not isinstance(cache, RedisCache):
+        return None
+    return cache._cache.get_client(write=True)
+
+
+def _add_views(client, model, deltas):
+    """Прибавляет приросты {pk: n} к счетчикам и помечает pk измененными"""
+    cache = shared_cache()
+    pipe = client.pipeline()
+    for pk, delta in deltas.items():
+        pipe.incrby(cache.make_and_validate_key(_counter_key(model, pk)), delta)
+    pipe.sadd(cache.make_and_validate_key(_dirty_key(model)), *deltas)
+    pipe.execute()
+
+
+def record_view(model, pk):
+    """Учитывает один просмотр объекта"""
+    client = get_redis()
+    if client is None:
+        model.objects.filter(pk=pk).update(views_count=F('views_count') + 1)
+        return
+    _add_views(client, model, {pk: 1})
+
+
+def pending_views(model, pks):
+    """Возвращает {pk: прирост} для просмотров, еще не записанных в БД"""
+    if not pks or get_redis() is None:
+        return {}
+    keys = {_counter_key(model, pk): pk for pk in pks}
+    values = shared_cache().get_many(list(keys))
+    return {keys[key]: int(value) for key, value in values.items() if value}
+
+
+def get_views_count(obj):
+    """Количество просмотров объекта с учетом еще не записанных в БД"""
+    return obj.views_count + pending_views(type(obj), [obj.pk]).get(obj.pk, 0)
+
+
+def apply_pending_views(objects):
+    """Добавляет незаписанные просмотры к views_count списка объектов (один запрос к кэшу)"""
+    objects = list(objects)
+    if not objects:
+        return objects
+    pending = pending_views(type(objects[0]), [obj.pk for obj in objects])
+    for obj in objects:
+        obj.views_count += pending.get(obj.pk, 0)
+    return objects
+
+
+def _take_views(client, model, pks):
+    """Забирает приросты из Redis (GET + DEL в одной транзакции): {pk: n}"""
+    cache = shared_cache()
+    pipe = client.pipeline(transaction=True)
+    for pk in pks:
+        key = cache.make_and_validate_key(_counter_key(model, pk))
+        pipe.get(key)
+        pipe.delete(key)
+    values = pipe.execute()[::2]
+    return {pk: int(value) for pk, value in zip(pks, values) if value and int(value)}
+
+
+def flush_model(model):
+    """Переносит накопленные просмотры модели в БД. Возвращает число обновленных строк"""
+    client = get_redis()
+    dirty_key = shared_cache().make_and_validate_key(_dirty_key(model))
+    # Просмотры, пришедшие во время сброса, снова добавят pk в множество:
+    # они останутся до следующего запуска
+    remaining = client.scard(dirty_key)
+    updated = 0
+
+    while remaining > 0:
+        pks = [int(pk) for pk in client.spop(dirty_key, min(FLUSH_BATCH_SIZE, remaining))]
+        if not pks:
+            break
+        remaining -= len(pks)
+        deltas = _take_views(client, model, pks)
+        if not deltas:
+            continue
+
+        try:
+            with transaction.atomic():
+                updated += model.objects.filter(pk__in=deltas).update(
+                    views_count=F('views_count') + Case(
+                        *[When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()],
+                        default=Value(0),
+                        output_field=IntegerField(),
+                    )
+                )
+        except Exception:
+            # Возвращаем прирост в Redis, чтобы не потерять просмотры
+            _add_views(client, model, deltas)
+            raise
+
+    return updated
+
+
+def flush_view_counters():
+    """Переносит накопленные просмотры всех моделей в БД. Возвращает {модель: строк}"""
+    if get_redis() is None:
+        return {}
+    return {model._meta.label: flush_model(model) for model in _counted_models()}
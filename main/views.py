@@ -1,22 +1,130 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.core.paginator import Paginator
-from django.db.models import Count, F, Q, Sum
+from django.db.models import Prefetch, Sum
 from django.db.models.functions import Length
 from django.contrib import messages
 from django.urls import reverse
-import re
+from django.http import Http404, JsonResponse
+import logging
 # from django.core.mail import send_mail # Раскомментировать для отправки реальной почты
 
 # Импорт моделей и формы
-from .models import City, ServiceCategory, Service, ContactRequest, TeamMember, Testimonial, PortfolioItem, PortfolioCategory, HomePage, FAQCategory, FAQItem, GlossaryCategory, GlossaryTerm, Author
+from .models import City, ServiceCategory, Service, ContactRequest, TeamMember, Testimonial, PortfolioItem, PortfolioCategory, HomePage, FAQCategory, FAQItem, GlossaryCategory, GlossaryTerm, Author, RegionalPostAdaptation, RegionalPostPage, SearchDocument
 from blog.models import Post, Category
 from .forms import ContactForm
 from pages.models import SimplePage
 from django.views.decorators.cache import never_cache  # cache_page ОТКЛЮЧЕН
 from django.conf import settings # <<< Импорт settings для времени кэша
+from .http_cache import public_page, private_page, last_updated
+from .author_stats import get_author_stats
+from .instrumentation import query_budget
+from .view_counters import get_views_count, record_view
+from . import search as site_search
+from .glossary_index import get_glossary_index
+from .city_directory import get_city_directory
 
-# --- Главная страница (Landing Page) ---
-@never_cache
+logger = logging.getLogger(__name__)
+
+
+# --- Даты изменения страниц (для ETag / Last-Modified, см. main/http_cache.py) ---
+
+def cities_last_modified(request, *args, **kwargs):
+    return last_updated(City)
+
+
+def city_last_modified(request, slug):
+    return last_updated(City.objects.filter(slug=slug), Service, ServiceCategory, Post)
+
+
+def city_service_last_modified(request, city_slug, service_slug):
+    # Услуга и блок связанных услуг
+    return last_updated(City.objects.filter(slug=city_slug), Service)
+
+
+def city_category_last_modified(request, city_slug, category_slug):
+    return last_updated(
+        City.objects.filter(slug=city_slug),
+        ServiceCategory.objects.filter(slug=category_slug),
+        Service.objects.filter(category__slug=category_slug),
+    )
+
+
+def city_post_last_modified(request, city_slug, post_slug):
+    # Статья, её готовая региональная версия и блок связанных статей
+    return last_updated(
+        City.objects.filter(slug=city_slug),
+        RegionalPostPage.objects.filter(city_slug=city_slug, post_slug=post_slug),
+        Post,
+    )
+
+
+def portfolio_last_modified(request, *args, **kwargs):
+    return last_updated(PortfolioItem, PortfolioCategory)
+
+
+def sitemap_last_modified(request):
+    return last_updated(ServiceCategory, Service, Category, Post, City, FAQCategory, FAQItem)
+
+
+def search_last_modified(request):
+    return last_updated(SearchDocument)
+
+
+def faq_last_modified(request, *args, **kwargs):
+    return last_updated(FAQCategory, FAQItem)
+
+
+def glossary_last_modified(request, *args, **kwargs):
+    return last_updated(GlossaryCategory, GlossaryTerm)
+
+
+def glossary_index_modified(request, *args, **kwargs):
+    # Время построения индекса глоссария: он перестраивается при каждом изменении
+    return get_glossary_index().built_at
+
+
+def author_last_modified(request, slug):
+    return last_updated(Author.objects.filter(username=slug), Post, Category)
+
+
+# --- Учет просмотров для страниц, отданных из кэша (см. main/page_cache.py) ---
+
+def count_regional_view(request, post_pk, adaptation_pk):
+    """Учитывает просмотр статьи и ее адаптации один раз за сессию"""
+    if getattr(request, 'is_prerender', False):
+        # Рендер в файл (main/prerender.py) — не просмотр
+        return
+    for model, pk, prefix in ((Post, post_pk, 'viewed_post'), (RegionalPostAdaptation, adaptation_pk, 'viewed_regional')):
+        session_key = f"{prefix}_{pk}"
+        if pk is not None and not request.session.get(session_key):
+            record_view(model, pk)
+            request.session[session_key] = True
+
+
+def city_post_viewed(request, city_slug, post_slug):
+    page = RegionalPostPage.objects.filter(
+        city_slug=city_slug, post_slug=post_slug, is_published=True
+    ).values_list('post_id', 'adaptation_id').first()
+    if page is None:
+        post_pk = Post.objects.filter(slug=post_slug, is_published=True).values_list('pk', flat=True).first()
+        page = (post_pk, None) if post_pk is not None else None
+    if page is not None:
+        count_regional_view(request, *page)
+
+
+@private_page
+@query_budget(1)
+def post_views(request, pk):
+    """
+    Текущее число просмотров статьи (JSON). Страница статьи может быть
+    отдана из кэша, поэтому счетчик на ней обновляется этим запросом.
+    """
+    post = get_object_or_404(Post.objects.only('pk', 'views_count'), pk=pk, is_published=True)
+    return JsonResponse({'views': get_views_count(post)})
+
+
+@private_page
+@query_budget(10)
 def index(request):
     """
     Главная страница (лендинг). 
@@ -25,14 +133,12 @@ def index(request):
     
     # 1. ОБРАБОТКА ФОРМЫ (POST-запрос)
     if request.method == 'POST':
-        print(f"DEBUG: POST запрос получен. Данные: {request.POST}")
         form = ContactForm(request.POST) 
-        print(f"DEBUG: Форма создана. Валидна: {form.is_valid()}")
         
         if form.is_valid():
             # Сохраняем заявку в базу данных
             contact_request = form.save()
-            print(f"DEBUG: Заявка сохранена с ID: {contact_request.id}")
+            logger.info('Заявка с главной страницы сохранена, id=%s', contact_request.id)
             
             # TODO: Здесь можно добавить логику отправки email уведомления
             
@@ -42,7 +148,7 @@ def index(request):
             return redirect('main:home') 
         else:
             # Если форма невалидна, добавляем сообщение об ошибке
-            print(f"DEBUG: Ошибки формы: {form.errors}")
+            logger.info('Заявка с главной страницы не прошла проверку: %s', form.errors.as_json())
             messages.error(request, f'Пожалуйста, исправьте ошибки в форме: {form.errors}')
             # Форма с ошибками будет передана в контекст ниже
     
@@ -167,10 +273,10 @@ def post_detail(request, slug):
     # Инкремент просмотров один раз на сессию для каждой статьи
     session_key = f"viewed_post_{post.pk}"
     if not request.session.get(session_key):
-        Post.objects.filter(pk=post.pk).update(views_count=F('views_count') + 1)
-        # Обновляем объект в памяти, чтобы в шаблоне было актуальное значение
-        post.refresh_from_db(fields=['views_count'])
+        record_view(Post, post.pk)
         request.session[session_key] = True
+    # Значение из БД плюс еще не записанные просмотры
+    post.views_count = get_views_count(post)
     
     # Можно добавить логику для "Похожих постов" или "Следующий/Предыдущий пост"
     
@@ -184,7 +290,8 @@ def post_detail(request, slug):
 
 # --- Представления для Городов ---
 
-# @cache_page(300)  # КЭШИРОВАНИЕ ОТКЛЮЧЕНО
+@public_page(last_modified=cities_last_modified)
+@query_budget(3)
 def city_list(request):
     """
     Страница со списком всех городов-миллионников.
@@ -201,7 +308,8 @@ def city_list(request):
     return render(request, 'main/city_list_brutal.html', context)
 
 
-@never_cache
+@public_page(last_modified=city_last_modified)
+@query_budget(6)
 def city_detail(request, slug):
     """
     Страница отдельного города с региональной информацией.
@@ -228,7 +336,8 @@ def city_detail(request, slug):
     return render(request, 'main/city_detail_brutal.html', context)
 
 
-@never_cache
+@public_page(last_modified=city_service_last_modified)
+@query_budget(8)
 def city_service_detail(request, city_slug, service_slug):
     """
     Страница услуги в конкретном городе.
@@ -251,7 +360,8 @@ def city_service_detail(request, city_slug, service_slug):
     return render(request, 'main/city_service_detail_brutal.html', context)
 
 
-@never_cache
+@public_page(last_modified=city_category_last_modified)
+@query_budget(6)
 def city_category_detail(request, city_slug, category_slug):
     """
     Страница категории услуг в конкретном городе.
@@ -274,96 +384,59 @@ def city_category_detail(request, city_slug, category_slug):
     return render(request, 'main/city_category_detail_brutal.html', context)
 
 
-@never_cache
+@public_page(last_modified=city_post_last_modified, on_hit=city_post_viewed)
+@query_budget(8)
 def city_post_detail(request, city_slug, post_slug):
     """
     Страница статьи блога в контексте конкретного города.
+    Региональная адаптация читается одной готовой строкой вместе с полями
+    города (main/regional_posts.py).
     """
-    city = get_object_or_404(City, slug=city_slug, is_active=True)
-    post = get_object_or_404(Post, slug=post_slug, is_published=True)
-    
-    # Инкремент просмотров (для базовой статьи)
-    session_key = f"viewed_post_{post.pk}"
-    if not request.session.get(session_key):
-        Post.objects.filter(pk=post.pk).update(views_count=F('views_count') + 1)
-        post.refresh_from_db(fields=['views_count'])
-        request.session[session_key] = True
-    
-    # Получаем связанные статьи
-    related_posts = post.get_related_posts(limit=3)
-    
-    # Получаем региональную адаптацию
-    from main.models import RegionalPostAdaptation
-    try:
-        regional_adaptation = RegionalPostAdaptation.objects.get(
-            post=post, 
-            city=city, 
-            is_active=True
-        )
-        
-        # Создаем объект с региональными данными
-        class RegionalPost:
-            def __init__(self, post, adaptation):
-                self.base_post = post
-                self.adaptation = adaptation
-                
-            @property
-            def title(self):
-                return self.adaptation.get_title()
-                
-            @property
-            def content(self):
-                return self.adaptation.get_content()
-                
-            @property
-            def description(self):
-                return self.adaptation.get_description()
-                
-            def __getattr__(self, name):
-                return getattr(self.base_post, name)
-        
-        # Инкремент просмотров для региональной адаптации
-        regional_session_key = f"viewed_regional_{regional_adaptation.pk}"
-        if not request.session.get(regional_session_key):
-            RegionalPostAdaptation.objects.filter(pk=regional_adaptation.pk).update(views_count=F('views_count') + 1)
-            regional_adaptation.refresh_from_db(fields=['views_count'])
-            request.session[regional_session_key] = True
-        
-        regional_post = RegionalPost(post, regional_adaptation)
-        
-    except RegionalPostAdaptation.DoesNotExist:
-        # Если нет региональной адаптации, используем базовую статью
-        regional_post = post
-    
+    post = RegionalPostPage.objects.filter(city_slug=city_slug, post_slug=post_slug, is_published=True).first()
+    if post is None:
+        # Нет активной адаптации: базовая статья
+        city = get_object_or_404(City, slug=city_slug, is_active=True)
+        post = get_object_or_404(Post, slug=post_slug, is_published=True)
+        count_regional_view(request, post.pk, None)
+    else:
+        city = post.get_city()
+        count_regional_view(request, post.post_id, post.adaptation_id)
+
     context = {
-        'title': f"{regional_post.title} | {city.name}",
+        'title': f"{post.title} | {city.name}",
         'city': city,
-        'post': regional_post,
-        'related_posts': related_posts,
-        'seo_object': regional_post,
+        'post': post,
+        # Метод, а не список: статьи загружаются, только если шаблон их выводит
+        'related_posts': post.get_related_posts,
+        'seo_object': post,
         'page_type': 'city_post_detail',
-        'page_slug': f"{city.slug}/{post.slug}",
+        'page_slug': f"{city.slug}/{post_slug}",
     }
     return render(request, 'main/city_post_detail_brutal.html', context)
 
 
+@private_page
+@query_budget(1)
 def set_city(request, slug):
     """
-    Устанавливает выбранный город в сессии пользователя
+    Устанавливает выбранный город в сессии пользователя.
+    Город ищется в справочнике (main/city_directory.py) без запросов к БД,
+    поэтому подходят и старые/английские slug: /set-city/moskva/.
+    Без поиска опечаток: slug в URL не должен выбирать другой город.
     """
-    from .models import City
-    
-    try:
-        city = City.objects.get(slug=slug, is_active=True)
-        request.session['user_city'] = slug
-        
-        # Перенаправляем на страницу выбранного города
-        return redirect('main:city_detail', slug=slug)
-    except City.DoesNotExist:
+    directory = get_city_directory()
+    city = directory.get(slug) or directory.resolve(slug, fuzzy=False)
+    if city is None:
         # Если город не найден, перенаправляем на список городов
         return redirect('main:city_list')
 
+    request.session['user_city'] = city.slug
+    # Перенаправляем на страницу выбранного города
+    return redirect('main:city_detail', slug=city.slug)
+
 
+@private_page
+@query_budget(2)
 def contacts(request):
     """
     Страница контактов с формой обратной связи
@@ -388,6 +461,8 @@ def contacts(request):
     return render(request, 'main/contacts_brutal.html', context)
 
 
+@public_page()
+@query_budget(2)
 def privacy_policy(request):
     """
     Страница политики конфиденциальности
@@ -401,7 +476,8 @@ def privacy_policy(request):
 
 # --- Портфолио ---
 
-# @cache_page(300)  # КЭШИРОВАНИЕ ОТКЛЮЧЕНО
+@public_page(last_modified=portfolio_last_modified, query=('q', 'category', 'type', 'page', 'featured_page'))
+@query_budget(9)
 def portfolio_list(request):
     """
     Страница со списком всех работ в портфолио с фильтрацией и поиском
@@ -415,7 +491,7 @@ def portfolio_list(request):
     project_type = request.GET.get('type')
     
     current_category = None
-    filtered_projects = PortfolioItem.objects.filter(is_published=True).order_by('order', '-created_at')
+    filtered_projects = PortfolioItem.objects.filter(is_published=True).select_related('category').order_by('order', '-created_at')
     
     if category_slug:
         try:
@@ -426,12 +502,7 @@ def portfolio_list(request):
     
     # Поиск по названию, описанию и клиенту
     if query:
-        from django.db.models import Q
-        filtered_projects = filtered_projects.filter(
-            Q(title__icontains=query) |
-            Q(short_description__icontains=query) |
-            Q(client_name__icontains=query)
-        ).distinct()
+        filtered_projects = filtered_projects.filter(pk__in=site_search.search_filter(query, 'main.portfolioitem'))
     
     # Пагинация для всех работ
     paginator = Paginator(filtered_projects, 9)  # 9 работ на страницу
@@ -442,7 +513,7 @@ def portfolio_list(request):
     featured_projects = PortfolioItem.objects.filter(
         is_published=True, 
         is_featured=True
-    ).order_by('order', '-created_at')
+    ).select_related('category').order_by('order', '-created_at')
     
     # Пагинация для рекомендуемых проектов
     featured_paginator = Paginator(featured_projects, 6)  # 6 рекомендуемых проектов на страницу
@@ -479,6 +550,8 @@ def portfolio_list(request):
     return render(request, 'main/portfolio_list_brutal.html', context)
 
 
+@public_page(last_modified=portfolio_last_modified, query=('page',))
+@query_budget(8)
 def portfolio_category(request, slug):
     """
     Отображение проектов конкретной категории портфолио
@@ -487,7 +560,7 @@ def portfolio_category(request, slug):
     projects_list = PortfolioItem.objects.filter(
         is_published=True, 
         category=category
-    ).order_by('order', '-created_at')
+    ).select_related('category').order_by('order', '-created_at')
     
     paginator = Paginator(projects_list, 9)
     page_number = request.GET.get('page')
@@ -509,6 +582,8 @@ def portfolio_category(request, slug):
     return render(request, 'main/portfolio_category_brutal.html', context)
 
 
+@public_page(last_modified=portfolio_last_modified)
+@query_budget(9)
 def portfolio_detail(request, category_slug, project_slug):
     """
     Детальная страница работы из портфолио с указанием категории
@@ -533,6 +608,7 @@ def portfolio_detail(request, category_slug, project_slug):
     return render(request, 'main/portfolio_detail_brutal.html', context)
 
 
+@public_page(last_modified=portfolio_last_modified)
 def portfolio_detail_legacy(request, slug):
     """
     Старый URL для обратной совместимости - делает редирект на новый URL или отображает проект
@@ -562,6 +638,39 @@ def portfolio_detail_legacy(request, slug):
                     permanent=True)
 
 
+@public_page(last_modified=search_last_modified, query=('q', 'type', 'page'))
+@query_budget(8)
+def search(request):
+    """
+    Единый поиск по статьям, услугам, портфолио, FAQ и глоссарию (см. main/search.py)
+    """
+    query = request.GET.get('q', '').strip()
+    current_type = request.GET.get('type', '')
+    if current_type not in site_search.SOURCES:
+        current_type = ''
+
+    hits = site_search.search(query, current_type or None) if query else []
+    paginator = Paginator(hits, 10)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    # Подсветка только для текущей страницы результатов
+    results = site_search.highlight(page_obj.object_list, query) if hits else []
+
+    context = {
+        'title': f'Поиск: "{query}"' if query else 'Поиск по сайту',
+        'search_query': query,
+        'search_types': [(value, source.type_name) for value, source in site_search.SOURCES.items()],
+        'current_type': current_type,
+        'page_obj': page_obj,
+        'results': results,
+        'seo_object': None,
+        'page_type': 'search',
+        'page_slug': None,
+    }
+    return render(request, 'main/search_brutal.html', context)
+
+
+@public_page(last_modified=sitemap_last_modified)
+@query_budget(14)
 def sitemap_page(request):
     """
     HTML-страница карты сайта с красивым дизайном
@@ -569,13 +678,18 @@ def sitemap_page(request):
     # Получаем все данные для карты сайта
     service_categories = ServiceCategory.objects.all().prefetch_related('services')
     all_services = Service.objects.filter(is_published=True)  # Все услуги для подсчета
-    blog_categories = Category.objects.all().prefetch_related('post_set')
+    # Пять последних статей каждой категории (число статей — из счетчика published_count)
+    blog_categories = Category.objects.prefetch_related(Prefetch(
+        'post_set',
+        queryset=Post.objects.filter(is_published=True).order_by('-published_date')[:5],
+        to_attr='latest_posts',
+    ))
     blog_posts = Post.objects.filter(is_published=True).select_related('category')
     cities = City.objects.all()
-    faq_categories = FAQCategory.objects.filter(is_active=True).prefetch_related('faq_items')
+    faq_categories = FAQCategory.objects.filter(is_active=True)
     
     # Подсчитываем общее количество вопросов
-    total_faq_count = sum(category.faq_items.count() for category in faq_categories)
+    total_faq_count = sum(category.published_count for category in faq_categories)
     
     # Создаем структуру карты сайта
     sitemap_data = {
@@ -606,7 +720,8 @@ def sitemap_page(request):
 
 # --- FAQ (Вопрос-Ответ) ---
 
-@never_cache
+@public_page(last_modified=faq_last_modified, query=('category', 'search'))
+@query_budget(6)
 def faq_list(request):
     """
     Список всех FAQ с фильтрацией по категориям и поиском
@@ -631,10 +746,7 @@ def faq_list(request):
             
             # Поиск по вопросам и ответам
             if search_query:
-                faq_items = faq_items.filter(
-                    Q(question__icontains=search_query) | 
-                    Q(answer__icontains=search_query)
-                )
+                faq_items = faq_items.filter(pk__in=site_search.search_filter(search_query, 'main.faqitem'))
             
             # Группируем вопросы по категориям
             for item in faq_items:
@@ -650,10 +762,7 @@ def faq_list(request):
         
         # Применяем поиск
         if search_query:
-            all_items = all_items.filter(
-                Q(question__icontains=search_query) | 
-                Q(answer__icontains=search_query)
-            )
+            all_items = all_items.filter(pk__in=site_search.search_filter(search_query, 'main.faqitem'))
         
         # Группируем по категориям
         for item in all_items:
@@ -692,7 +801,8 @@ def faq_list(request):
     return render(request, 'main/faq_brutal.html', context)
 
 
-@never_cache
+@public_page(last_modified=faq_last_modified, query=('search',))
+@query_budget(5)
 def faq_category(request, slug):
     """
     FAQ по конкретной категории
@@ -708,10 +818,7 @@ def faq_category(request, slug):
     # Поиск по вопросам и ответам
     search_query = request.GET.get('search', '').strip()
     if search_query:
-        faq_items = faq_items.filter(
-            Q(question__icontains=search_query) | 
-            Q(answer__icontains=search_query)
-        )
+        faq_items = faq_items.filter(pk__in=site_search.search_filter(search_query, 'main.faqitem'))
     
     # SEO данные
     seo_title = f"{category.name} - Часто задаваемые вопросы | Isakov Agency"
@@ -731,7 +838,8 @@ def faq_category(request, slug):
     return render(request, 'main/faq_category_brutal.html', context)
 
 
-@never_cache
+@public_page(last_modified=faq_last_modified)
+@query_budget(6)
 def faq_item(request, category_slug, item_slug):
     """
     Отдельный вопрос-ответ
@@ -766,82 +874,31 @@ def faq_item(request, category_slug, item_slug):
 
 # --- Глоссарий ---
 
-@never_cache
+@public_page(last_modified=glossary_index_modified, query=('category', 'search', 'alphabet'))
+@query_budget(4)
 def glossary_list(request):
     """
-    Список всех терминов глоссария с фильтрацией по категориям, алфавиту и поиском
+    Список всех терминов глоссария с фильтрацией по категориям, алфавиту и поиском.
+    Данные берутся из индекса глоссария в памяти (main/glossary_index.py).
     """
-    # Получаем все активные категории
-    categories = GlossaryCategory.objects.filter(is_active=True).order_by('order', 'name')
+    index = get_glossary_index()
+    categories = index.categories
     
     # Фильтрация по категории
     category_slug = request.GET.get('category')
-    selected_category = None
-    glossary_by_category = {}
+    selected_category = index.category_by_slug.get(category_slug) if category_slug else None
     search_query = request.GET.get('search', '').strip()
     alphabet_filter = request.GET.get('alphabet')
     
-    if category_slug:
-        try:
-            selected_category = GlossaryCategory.objects.get(slug=category_slug, is_active=True)
-            # Получаем термины только для выбранной категории
-            glossary_terms = GlossaryTerm.objects.filter(
-                category=selected_category,
-                is_published=True
-            ).order_by('term')
-            
-            # Фильтрация по алфавиту
-            if alphabet_filter:
-                if alphabet_filter == 'ru':
-                    # Русские буквы
-                    glossary_terms = glossary_terms.filter(term__regex=r'^[А-Яа-я]')
-                elif alphabet_filter == 'en':
-                    # Английские буквы
-                    glossary_terms = glossary_terms.filter(term__regex=r'^[A-Za-z]')
-                elif alphabet_filter != 'all':
-                    # Конкретная буква
-                    glossary_terms = glossary_terms.filter(term__istartswith=alphabet_filter)
-            
-            # Поиск по терминам и определениям
-            if search_query:
-                glossary_terms = glossary_terms.filter(
-                    Q(term__icontains=search_query) | 
-                    Q(definition__icontains=search_query)
-                )
-            
-            # Группируем термины по категориям
-            for term in glossary_terms:
-                category = term.category
-                if category not in glossary_by_category:
-                    glossary_by_category[category] = []
-                glossary_by_category[category].append(term)
-        except GlossaryCategory.DoesNotExist:
-            selected_category = None
+    if selected_category:
+        # Термины только выбранной категории, по алфавиту
+        glossary_terms = index.filter(selected_category.slug, alphabet_filter, search_query)
     else:
         # Если категория не выбрана - показываем ВСЕ термины по всем категориям
-        all_terms = GlossaryTerm.objects.filter(is_published=True).select_related('category').order_by('category__order', 'term')
-        
-        # Применяем фильтры
-        if alphabet_filter:
-            if alphabet_filter == 'ru':
-                all_terms = all_terms.filter(term__regex=r'^[А-Яа-я]')
-            elif alphabet_filter == 'en':
-                all_terms = all_terms.filter(term__regex=r'^[A-Za-z]')
-            elif alphabet_filter != 'all':
-                all_terms = all_terms.filter(term__istartswith=alphabet_filter)
-        
-        if search_query:
-            all_terms = all_terms.filter(
-                Q(term__icontains=search_query) | 
-                Q(definition__icontains=search_query)
-            )
-        
-        # Группируем по категориям
-        for term in all_terms:
-            category = term.category
-            if category not in glossary_by_category:
-                glossary_by_category[category] = []
-            glossary_by_category[category].append(term)
+        glossary_terms = index.filter(None, alphabet_filter, search_query, grouped=True)
+    
+    # Группируем по категориям
+    glossary_by_category = index.group_by_category(glossary_terms)
     
     # SEO данные
     seo_title = "Глоссарий терминов | Isakov Agency"
@@ -880,39 +937,21 @@ def glossary_list(request):
     return render(request, 'main/glossary_brutal.html', context)
 
 
-@never_cache
+@public_page(last_modified=glossary_index_modified, query=('alphabet', 'search'))
+@query_budget(2)
 def glossary_category(request, slug):
     """
-    Глоссарий по конкретной категории
+    Глоссарий по конкретной категории (из индекса глоссария в памяти)
     """
-    category = get_object_or_404(GlossaryCategory, slug=slug, is_active=True)
+    index = get_glossary_index()
+    category = index.category_by_slug.get(slug)
+    if category is None:
+        raise Http404("Категория не найдена")
 
-    # Получаем все опубликованные термины этой категории
-    glossary_terms = GlossaryTerm.objects.filter(
-        category=category,
-        is_published=True
-    ).order_by('term')
-
-    # Фильтрация по алфавиту
+    # Фильтрация по алфавиту и поиск по терминам и определениям
     alphabet_filter = request.GET.get('alphabet')
-    if alphabet_filter:
-        if alphabet_filter == 'ru':
-            # Русские буквы
-            glossary_terms = glossary_terms.filter(term__regex=r'^[А-Яа-я]')
-        elif alphabet_filter == 'en':
-            # Английские буквы
-            glossary_terms = glossary_terms.filter(term__regex=r'^[A-Za-z]')
-        elif alphabet_filter != 'all':
-            # Конкретная буква
-            glossary_terms = glossary_terms.filter(term__istartswith=alphabet_filter)
-
-    # Поиск по терминам и определениям
     search_query = request.GET.get('search', '').strip()
-    if search_query:
-        glossary_terms = glossary_terms.filter(
-            Q(term__icontains=search_query) | 
-            Q(definition__icontains=search_query)
-        )
+    glossary_terms = index.filter(category.slug, alphabet_filter, search_query)
 
     # SEO данные
     seo_title = f"{category.name} - Глоссарий | Isakov Agency"
@@ -928,7 +967,7 @@ def glossary_category(request, slug):
         'seo_description': seo_description,
         'seo_keywords': seo_keywords,
         'category': category,
-        'glossary_terms': glossary_terms,
+        'terms': glossary_terms,
         'search_query': search_query,
         'alphabet_filter': alphabet_filter,
         'alphabet_ru': alphabet_ru,
@@ -939,7 +978,29 @@ def glossary_category(request, slug):
     return render(request, 'main/glossary_category_brutal.html', context)
 
 
-@never_cache
+@public_page(last_modified=glossary_index_modified, query=('q',))
+@query_budget(2)
+def glossary_autocomplete(request):
+    """
+    Автодополнение терминов глоссария (JSON, без запросов к БД)
+    """
+    index = get_glossary_index()
+    results = [
+        {
+            'term': entry.term,
+            'category': entry.category.name,
+            'url': reverse('main:glossary_term', kwargs={
+                'category_slug': entry.category.slug,
+                'term_slug': entry.slug,
+            }),
+        }
+        for entry in index.autocomplete(request.GET.get('q', ''))
+    ]
+    return JsonResponse({'results': results})
+
+
+@public_page(last_modified=glossary_last_modified)
+@query_budget(6)
 def glossary_term(request, category_slug, term_slug):
     """
     Отдельный термин глоссария
@@ -971,6 +1032,8 @@ def glossary_term(request, category_slug, term_slug):
     return render(request, 'main/glossary_term_brutal.html', context)
 
 
+@public_page(last_modified=author_last_modified, query=('q', 'category', 'page'))
+@query_budget(8)
 def author_detail(request, slug):
     """
     Страница автора статьи с поиском, пагинацией и статистикой
@@ -1002,62 +1065,17 @@ def author_detail(request, slug):
     current_category_slug = request.GET.get('category') or ''
     posts_qs = base_qs
     if search_query:
-        posts_qs = posts_qs.filter(
-            Q(title__icontains=search_query) |
-            Q(excerpt__icontains=search_query) |
-            Q(content__icontains=search_query)
-        )
+        posts_qs = posts_qs.filter(pk__in=site_search.search_filter(search_query, 'blog.post'))
     if current_category_slug:
         posts_qs = posts_qs.filter(category__slug=current_category_slug)
 
     # Пагинация
-    paginator = Paginator(posts_qs.order_by('-published_date'), 9)
+    paginator = Paginator(posts_qs.select_related('category').order_by('-published_date'), 9)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
 
-    # Статистика
-    total_posts = base_qs.count()
-    first_post = base_qs.order_by('published_date').first()
-    last_post = base_qs.order_by('-published_date').first()
-    
-    # Расчет времени чтения с использованием метода get_reading_time
-    # Для суммирования используем числовое значение (автоподсчет или извлечение из текста)
-    total_reading_time = 0
-    for post in base_qs:
-        # Если указано вручную, пытаемся извлечь число, иначе используем автоподсчет
-        if post.reading_time_minutes:
-            # Пытаемся найти число в тексте (например, "5 минут" или "Ну около 8 минут")
-            numbers = re.findall(r'\d+', post.reading_time_minutes)
-            if numbers:
-                reading_time = int(numbers[0])
-            else:
-                # Если не нашли число, используем автоподсчет
-                content_length = len(post.content)
-                reading_time = max(1, int((content_length + 500) / 200))
-        else:
-            # Автоподсчет
-            content_length = len(post.content)
-            reading_time = max(1, int((content_length + 500) / 200))
-        total_reading_time += reading_time
-    
-    reading_time_total_min = total_reading_time
-
-    # Преобразуем категории в словарь {category_object: count}
-    categories_data = (
-        base_qs.values('category__id', 'category__name', 'category__slug')
-        .annotate(count=Count('id'))
-        .order_by('-count', 'category__name')
-    )
-    
-    from blog.models import Category
-    categories_stats = {}
-    for cat_data in categories_data:
-        if cat_data['category__id']:
-            try:
-                category = Category.objects.get(id=cat_data['category__id'])
-                categories_stats[category] = cat_data['count']
-            except Category.DoesNotExist:
-                pass
+    # Статистика: один сгруппированный запрос, результат в кэше
+    stats = get_author_stats(slug, base_qs)
 
     # SEO
     seo_title = f"{author.get_full_name()} - Автор | Isakov Agency"
@@ -1069,16 +1087,17 @@ def author_detail(request, slug):
         'seo_description': seo_description,
         'seo_keywords': seo_keywords,
         'author': author,
-        'posts': base_qs.order_by('-published_date'),  # Все посты автора для шаблона
+        'posts': page_obj.object_list,
         'page_obj': page_obj,
+        'is_paginated': page_obj.has_other_pages(),
         'search_query': search_query,
         'current_category_slug': current_category_slug,
-        'total_posts': total_posts,
-        'total_read_time': reading_time_total_min,  # Переименовано для совместимости
-        'reading_time_total_min': reading_time_total_min,
-        'first_published': first_post.published_date if first_post else None,
-        'last_published': last_post.published_date if last_post else None,
-        'categories_stats': categories_stats,
+        'total_posts': stats.total_posts,
+        'total_read_time': stats.reading_time,  # Переименовано для совместимости
+        'reading_time_total_min': stats.reading_time,
+        'first_published': stats.first_published,
+        'last_published': stats.last_published,
+        'categories_stats': stats.categories,
         'page_type': 'author_detail',
     }
 
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:12
+
+import django_ckeditor_5.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimplePage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seo_title', models.CharField(blank=True, help_text='Рекомендуется 50-60 символов. Если не указан, будет использован обычный заголовок.', max_length=60, null=True, verbose_name='SEO заголовок (title)')),
+                ('seo_description', models.TextField(blank=True, help_text='Рекомендуется 150-160 символов. Краткое описание страницы для поисковых систем.', max_length=160, null=True, verbose_name='SEO описание (description)')),
+                ('seo_index', models.BooleanField(default=True, help_text='Разрешить поисковым системам индексировать эту страницу', verbose_name='Индексировать страницу')),
+                ('seo_canonical', models.URLField(blank=True, help_text='Укажите канонический URL, если страница доступна по нескольким адресам', max_length=500, null=True, verbose_name='Канонический URL')),
+                ('title', models.CharField(max_length=200, verbose_name='Заголовок')),
+                ('slug', models.SlugField(max_length=200, unique=True, verbose_name='URL-идентификатор')),
+                ('content', django_ckeditor_5.fields.CKEditor5Field(blank=True, verbose_name='Содержимое')),
+                ('show_in_header', models.BooleanField(default=False, verbose_name='Показывать в хэдере')),
+                ('show_in_footer', models.BooleanField(default=True, verbose_name='Показывать в футере')),
+                ('order', models.IntegerField(default=100, verbose_name='Порядок отображения')),
+                ('is_published', models.BooleanField(default=True, verbose_name='Опубликовано')),
+                ('show_breadcrumbs', models.BooleanField(default=True, help_text='Включить/выключить отображение хлебных крошек на этой странице', verbose_name='Показывать хлебные крошки')),
+                ('custom_breadcrumbs', models.JSONField(blank=True, default=list, help_text='Оставьте пустым для автоматических крошек. Формат: [{"title": "Название", "url": "/url/"}]', verbose_name='Пользовательские хлебные крошки')),
+            ],
+            options={
+                'verbose_name': 'Страница',
+                'verbose_name_plural': 'Страницы',
+                'ordering': ['order', 'title'],
+            },
+        ),
+    ]
@@ -1,9 +1,10 @@
 from django.db import models
 from django_ckeditor_5.fields import CKEditor5Field
+from seo.breadcrumbs import BreadcrumbsMixin
 from seo.models import SEOModel
 
 
-class SimplePage(SEOModel):
+class SimplePage(BreadcrumbsMixin, SEOModel):
     """Простые произвольные страницы (например, Глоссарий)."""
     title = models.CharField(max_length=200, verbose_name="Заголовок")
     slug = models.SlugField(unique=True, max_length=200, verbose_name="URL-идентификатор")
@@ -27,6 +28,8 @@ class SimplePage(SEOModel):
         help_text="Оставьте пустым для автоматических крошек. Формат: [{\"title\": \"Название\", \"url\": \"/url/\"}]"
     )
 
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлено")
+
     class Meta:
         verbose_name = "Страница"
         verbose_name_plural = "Страницы"
@@ -39,8 +42,8 @@ class SimplePage(SEOModel):
         from django.urls import reverse
         return reverse('pages:detail', kwargs={'slug': self.slug})
     
-    def get_breadcrumbs(self):
-        """Возвращает хлебные крошки для страницы"""
+    def build_breadcrumbs(self):
+        """Собирает хлебные крошки для страницы"""
         if not self.show_breadcrumbs:
             return []
         
@@ -1,7 +1,16 @@
 from django.shortcuts import render, get_object_or_404
 from .models import SimplePage
+from main.http_cache import public_page, last_updated
+from main.instrumentation import query_budget
 
 
+def page_last_modified(request, slug):
+    """Дата изменения страницы (для ETag / Last-Modified)"""
+    return last_updated(SimplePage.objects.filter(slug=slug))
+
+
+@public_page(last_modified=page_last_modified)
+@query_budget(4)
 def page_detail(request, slug):
     page = get_object_or_404(SimplePage, slug=slug, is_published=True)
     return render(request, 'pages/detail.html', {
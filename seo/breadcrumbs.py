@@ -0,0 +1,187 @@
+# seo/breadcrumbs.py - Кэш хлебных крошек и BreadcrumbList JSON-LD
+#
+# Модели с крошками наследуют BreadcrumbsMixin и собирают цепочку в
+# build_breadcrumbs() — как раньше в get_breadcrumbs(). Готовая цепочка
+# хранится в кэше компактно: кортеж Crumb(title, url) плюс JSON-LD.
+#
+# Ключ кэша содержит версию крошек. Сигналы (main/signals.py) увеличивают ее,
+# когда у модели с крошками меняется заголовок, slug, родитель или настройки
+# крошек, а также при изменении seo.Breadcrumb — тогда все цепочки, где
+# объект был предком, собираются заново.
+#
+# Для списков: prefetch_breadcrumbs(objects) — два обращения к кэшу и
+# один запрос на каждого предка для объектов, которых в кэше не было.
+
+import json
+from collections import namedtuple
+
+from django.conf import settings
+from django.db.models import prefetch_related_objects
+from django.utils.safestring import mark_safe
+
+from main.cache import bump_version, get_version, local_cache, shared_cache
+
+BREADCRUMBS_VERSION_KEY = 'breadcrumbs:version'
+BREADCRUMBS_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Поля, от которых зависят цепочки (объекта и его потомков)
+BREADCRUMB_FIELDS = (
+    'title', 'name', 'term', 'question', 'slug', 'category_id', 'post_id', 'city_id',
+    'show_breadcrumbs', 'custom_breadcrumbs',
+)
+
+Crumb = namedtuple('Crumb', 'title url')
+BreadcrumbTrail = namedtuple('BreadcrumbTrail', 'crumbs json_ld')
+
+
+def get_breadcrumbs_version():
+    return get_version(BREADCRUMBS_VERSION_KEY)
+
+
+def invalidate_breadcrumbs():
+    """Сбрасывает все закэшированные цепочки"""
+    bump_version(BREADCRUMBS_VERSION_KEY)
+
+
+def breadcrumb_state(obj):
+    """Значения полей, от которых зависят крошки (для сравнения до и после сохранения)"""
+    return tuple(getattr(obj, field, None) for field in BREADCRUMB_FIELDS)
+
+
+def build_json_ld(crumbs):
+    """BreadcrumbList (schema.org) для цепочки"""
+    if not crumbs:
+        return ''
+    data = {
+        '@context': 'https://schema.org',
+        '@type': 'BreadcrumbList',
+        'itemListElement': [
+            {
+                '@type': 'ListItem',
+                'position': position,
+                'name': crumb.title,
+                'item': settings.SITE_URL + crumb.url if crumb.url.startswith('/') else crumb.url,
+            }
+            for position, crumb in enumerate(crumbs, 1)
+        ],
+    }
+    # Экранируем <, чтобы текст не мог закрыть тег <script>
+    return json.dumps(data, ensure_ascii=False).replace('<', '\\u003c')
+
+
+def make_trail(items):
+    """Цепочка из списка словарей {"title", "url"} (автоматических или из custom_breadcrumbs)"""
+    crumbs = tuple(
+        Crumb(str(item.get('title', '')), str(item.get('url', '')))
+        for item in items or () if isinstance(item, dict)
+    )
+    return BreadcrumbTrail(crumbs, build_json_ld(crumbs))
+
+
+def _city_pk(city):
+    return city.pk if city else 0
+
+
+def _cache_key(version, obj, city):
+    return f'breadcrumbs:{version}:{obj._meta.label_lower}:{obj.pk}:{_city_pk(city)}'
+
+
+def _build_trail(obj, city):
+    if city is not None:
+        return make_trail(obj.build_breadcrumbs(city))
+    return make_trail(obj.build_breadcrumbs())
+
+
+def prefetch_breadcrumbs(objects, city=None):
+    """
+    Загружает цепочки для списка объектов одной модели (карточки на страницах-списках).
+    После вызова obj.get_breadcrumbs() не обращается ни к кэшу, ни к БД.
+    """
+    objects = [obj for obj in objects if obj.pk is not None]
+    if not objects:
+        return objects
+    model = type(objects[0])
+    if not model.breadcrumbs_by_city:
+        city = None
+
+    version = get_breadcrumbs_version()
+    if version is None:
+        missing = objects
+        found = {}
+    else:
+        keys = {_cache_key(version, obj, city): obj for obj in objects}
+        found = local_cache().get_many(keys)
+        rest = [key for key in keys if key not in found]
+        if rest:
+            shared = shared_cache().get_many(rest)
+            if shared:
+                local_cache().set_many(shared)
+            found.update(shared)
+        missing = [obj for key, obj in keys.items() if key not in found]
+
+    if missing:
+        # Предков (категории, статью, город) загружаем одним запросом на связь
+        prefetch_related_objects(missing, *model.breadcrumb_parents)
+        built = {}
+        for obj in missing:
+            trail = _build_trail(obj, city)
+            obj._breadcrumb_trails = {**getattr(obj, '_breadcrumb_trails', {}), _city_pk(city): trail}
+            if version is not None:
+                built[_cache_key(version, obj, city)] = trail
+        if built:
+            shared_cache().set_many(built, BREADCRUMBS_CACHE_TIMEOUT)
+            local_cache().set_many(built)
+
+    if version is not None:
+        for key, trail in found.items():
+            obj = keys[key]
+            obj._breadcrumb_trails = {**getattr(obj, '_breadcrumb_trails', {}), _city_pk(city): trail}
+    return objects
+
+
+class BreadcrumbsMixin:
+    """Кэшируемые хлебные крошки модели; цепочку собирает build_breadcrumbs()"""
+
+    # Связи, которые нужны build_breadcrumbs() (для prefetch_breadcrumbs)
+    breadcrumb_parents = ()
+    # Принимает ли build_breadcrumbs() город (крошки в контексте города)
+    breadcrumbs_by_city = False
+
+    def get_breadcrumb_trail(self, city=None):
+        if not self.breadcrumbs_by_city:
+            city = None
+        trails = getattr(self, '_breadcrumb_trails', None)
+        if trails and _city_pk(city) in trails:
+            return trails[_city_pk(city)]
+        if self.pk is None:
+            return _build_trail(self, city)
+        prefetch_breadcrumbs([self], city)
+        return self._breadcrumb_trails[_city_pk(city)]
+
+    def get_breadcrumbs(self, city=None):
+        """Возвращает хлебные крошки: кортеж Crumb(title, url)"""
+        return self.get_breadcrumb_trail(city).crumbs
+
+    def get_breadcrumbs_json_ld(self, city=None):
+        """Возвращает BreadcrumbList JSON-LD для вставки в <script type="application/ld+json">"""
+        return mark_safe(self.get_breadcrumb_trail(city).json_ld)
+
+
+# --- Настройки seo.Breadcrumb ---
+
+def get_breadcrumb_configs():
+    """{(page_type, page_slug): Breadcrumb} — вся таблица настроек, один запрос на версию"""
+    from .models import Breadcrumb
+
+    version = get_breadcrumbs_version()
+    key = f'breadcrumbs:{version}:configs'
+    configs = local_cache().get(key) if version is not None else None
+    if configs is None:
+        configs = shared_cache().get(key) if version is not None else None
+        if configs is None:
+            configs = {(config.page_type, config.page_slug): config for config in Breadcrumb.objects.all()}
+            if version is not None:
+                shared_cache().set(key, configs, BREADCRUMBS_CACHE_TIMEOUT)
+        if version is not None:
+            local_cache().set(key, configs)
+    return configs
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Breadcrumb',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('page_type', models.CharField(choices=[('home', 'Главная страница'), ('service_category', 'Категория услуг'), ('service_detail', 'Детальная страница услуги'), ('post_list', 'Список статей блога'), ('post_detail', 'Детальная страница статьи'), ('category_posts', 'Статьи по категории'), ('page_detail', 'Произвольная страница'), ('search', 'Поиск')], help_text='Выберите тип страницы для настройки хлебных крошек', max_length=20, verbose_name='Тип страницы')),
+                ('page_slug', models.SlugField(blank=True, help_text='Оставьте пустым для общих настроек типа страницы. Укажите slug для конкретной страницы.', max_length=200, null=True, verbose_name='Slug страницы')),
+                ('show_breadcrumbs', models.BooleanField(default=True, help_text='Включить/выключить отображение хлебных крошек на этой странице', verbose_name='Показывать хлебные крошки')),
+                ('custom_breadcrumbs', models.JSONField(blank=True, default=list, help_text='JSON массив с пользовательскими хлебными крошками. Формат: [{"title": "Название", "url": "/url/"}]', verbose_name='Пользовательские хлебные крошки')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'Хлебные крошки',
+                'verbose_name_plural': 'Хлебные крошки',
+                'ordering': ['page_type', 'page_slug'],
+                'unique_together': {('page_type', 'page_slug')},
+            },
+        ),
+    ]
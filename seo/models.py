@@ -272,21 +272,19 @@ class Breadcrumb(models.Model):
         Сначала ищет настройки для конкретной страницы (по slug),
         затем для общего типа страницы.
         """
+        # Таблица настроек закэширована целиком (seo/breadcrumbs.py)
+        from .breadcrumbs import get_breadcrumb_configs
+        configs = get_breadcrumb_configs()
+
         # Сначала ищем настройки для конкретной страницы
         if page_slug:
-            breadcrumb_config = cls.objects.filter(
-                page_type=page_type,
-                page_slug=page_slug
-            ).first()
+            breadcrumb_config = configs.get((page_type, page_slug))
             
             if breadcrumb_config:
                 return breadcrumb_config.get_breadcrumbs(context)
         
         # Если не найдено, ищем общие настройки для типа страницы
-        breadcrumb_config = cls.objects.filter(
-            page_type=page_type,
-            page_slug__isnull=True
-        ).first()
+        breadcrumb_config = configs.get((page_type, None))
         
         if breadcrumb_config:
             return breadcrumb_config.get_breadcrumbs(context)
@@ -1,4 +1,5 @@
 from django import template
+from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.conf import settings
 from ..models import Breadcrumb
@@ -101,6 +102,22 @@ def breadcrumbs(obj):
     }
 
 
+@register.simple_tag
+def breadcrumbs_json_ld(obj, city=None):
+    """
+    Выводит BreadcrumbList JSON-LD для объекта (цепочка берется из кэша крошек).
+
+    Использование:
+    {% breadcrumbs_json_ld seo_object city %}
+    """
+    if not obj or not hasattr(obj, 'get_breadcrumbs_json_ld'):
+        return ''
+    json_ld = obj.get_breadcrumbs_json_ld(city)
+    if not json_ld:
+        return ''
+    return format_html('<script type="application/ld+json">{}</script>', json_ld)
+
+
 @register.simple_tag
 def get_breadcrumbs(page_type, page_slug=None, context=None):
     """Возвращает список хлебных крошек для использования в шаблонах"""
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from seo_management.publish import get_files_root, publish_seo_files
+
+
+class Command(BaseCommand):
+    help = 'Записывает sitemap.xml, шарды sitemap и robots.txt (с .gz) для отдачи через nginx'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Перезаписать все файлы, даже если разделы не менялись',
+        )
+
+    def handle(self, *args, **options):
+        written = publish_seo_files(force=options['force'])
+        if written:
+            self.stdout.write(
+                self.style.SUCCESS(f'✅ {get_files_root()}: записано файлов: {len(written)}')
+            )
+        else:
+            self.stdout.write('Изменений нет')
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:12
+
+import django.core.validators
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RobotsTxtSettings',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content', models.TextField(default='User-agent: *\nAllow: /\n\nSitemap: {sitemap_url}', help_text='Содержимое файла robots.txt. {sitemap_url} будет автоматически заменен на URL sitemap', verbose_name='Содержимое robots.txt')),
+                ('last_updated', models.DateTimeField(auto_now=True, verbose_name='Последнее обновление')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата создания')),
+            ],
+            options={
+                'verbose_name': 'Настройки Robots.txt',
+                'verbose_name_plural': 'Настройки Robots.txt',
+            },
+        ),
+        migrations.CreateModel(
+            name='SitemapSettings',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_enabled', models.BooleanField(default=True, help_text='Если отключено, sitemap.xml не будет генерироваться', verbose_name='Включить автоматическую генерацию sitemap')),
+                ('changefreq', models.CharField(choices=[('always', 'Всегда'), ('hourly', 'Каждый час'), ('daily', 'Ежедневно'), ('weekly', 'Еженедельно'), ('monthly', 'Ежемесячно'), ('yearly', 'Ежегодно'), ('never', 'Никогда')], default='weekly', help_text='Как часто обновляется контент на сайте', max_length=20, verbose_name='Частота изменения по умолчанию')),
+                ('priority', models.DecimalField(decimal_places=1, default=0.5, help_text='Приоритет страниц в sitemap (0.0 - 1.0)', max_digits=2, verbose_name='Приоритет по умолчанию')),
+                ('include_blog_posts', models.BooleanField(default=True, verbose_name='Включить статьи блога')),
+                ('include_services', models.BooleanField(default=True, verbose_name='Включить услуги')),
+                ('include_cities', models.BooleanField(default=True, verbose_name='Включить страницы городов')),
+                ('include_pages', models.BooleanField(default=True, verbose_name='Включить простые страницы')),
+                ('additional_urls', models.TextField(blank=True, help_text='Один URL на строку. Например: /special-page/', verbose_name='Дополнительные URL')),
+                ('last_updated', models.DateTimeField(auto_now=True, verbose_name='Последнее обновление')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата создания')),
+            ],
+            options={
+                'verbose_name': 'Настройки Sitemap',
+                'verbose_name_plural': 'Настройки Sitemap',
+            },
+        ),
+        migrations.CreateModel(
+            name='Redirect',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('old_path', models.CharField(help_text='Путь, с которого нужно делать редирект (например: /old-page/)', max_length=500, validators=[django.core.validators.RegexValidator(message='Путь должен начинаться с /', regex='^/.*')], verbose_name='Старый путь')),
+                ('new_path', models.CharField(help_text='Путь, на который нужно перенаправить (например: /new-page/ или https://example.com/)', max_length=500, validators=[django.core.validators.RegexValidator(message='Путь должен начинаться с / или http:// или https://', regex='^(/|https?://).*')], verbose_name='Новый путь')),
+                ('redirect_type', models.CharField(choices=[('301', '301 - Постоянный редирект'), ('302', '302 - Временный редирект')], default='301', help_text='301 - постоянный редирект (рекомендуется для SEO), 302 - временный', max_length=3, verbose_name='Тип редиректа')),
+                ('status', models.CharField(choices=[('active', 'Активен'), ('inactive', 'Неактивен')], default='active', help_text='Активен ли редирект', max_length=10, verbose_name='Статус')),
+                ('match_exact', models.BooleanField(default=True, help_text='Если включено, редирект сработает только при точном совпадении пути', verbose_name='Точное совпадение')),
+                ('case_sensitive', models.BooleanField(default=True, help_text='Учитывать ли регистр при сравнении путей', verbose_name='Учитывать регистр')),
+                ('description', models.TextField(blank=True, help_text='Описание причины создания редиректа', verbose_name='Описание')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата обновления')),
+                ('created_by', models.CharField(blank=True, help_text='Кто создал этот редирект', max_length=100, verbose_name='Создал')),
+            ],
+            options={
+                'verbose_name': 'Редирект',
+                'verbose_name_plural': 'Редиректы',
+                'ordering': ['-created_at'],
+                'unique_together': {('old_path', 'case_sensitive')},
+            },
+        ),
+    ]
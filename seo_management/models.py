@@ -126,6 +126,10 @@ Sitemap: {sitemap_url}""",
     def get_processed_content(self, request):
         """Возвращает обработанное содержимое robots.txt с подстановкой URL"""
         sitemap_url = request.build_absolute_uri(reverse('seo_management:sitemap'))
+        return self.render_content(sitemap_url)
+
+    def render_content(self, sitemap_url):
+        """Содержимое robots.txt с подстановкой готового URL sitemap"""
         return self.content.format(sitemap_url=sitemap_url)
 
 
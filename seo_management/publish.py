@@ -0,0 +1,177 @@
+# seo_management/publish.py - Готовые sitemap и robots.txt на диске
+#
+# Раздел sitemap, его шарды и robots.txt записываются в SEO_FILES_ROOT
+# вместе с .gz-копиями, чтобы nginx отдавал их сам (try_files + gzip_static,
+# см. deploy/nginx-seo-agency.conf), не обращаясь к Django.
+#
+# Сигналы увеличивают версии разделов (seo_management/sitemaps.py), а
+# publish_seo_files (deploy/seo-agency-seofiles.timer, раз в минуту)
+# проверяет только разделы, версия которых изменилась с прошлого запуска, и
+# перезаписывает в них только шарды, срез которых изменился (отпечаток строк
+# шарда сравнивается с сохраненным в манифесте).
+# Файлы пишутся во временный файл рядом и переименовываются — nginx никогда
+# не увидит недописанный файл.
+
+import gzip
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings as django_settings
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse
+
+from .models import RobotsTxtSettings
+from .sitemaps import (
+    SECTION_NAMES, SHARD_SIZE, get_section_version, get_sections, get_sitemap_settings,
+    render_index, render_urlset, shard_digest, shard_urls,
+)
+
+# Версии разделов и отпечатки шардов на момент последней публикации
+MANIFEST_NAME = '.published.json'
+ROBOTS_SECTION = 'robots'
+
+DEFAULT_ROBOTS = """User-agent: *
+Allow: /
+
+Sitemap: {sitemap_url}"""
+
+
+def get_files_root():
+    return Path(django_settings.SEO_FILES_ROOT)
+
+
+def get_site_url():
+    site_url = django_settings.SITE_URL
+    if not site_url:
+        raise ImproperlyConfigured('Укажите SITE_URL (или ALLOWED_HOSTS) для ссылок в sitemap.xml')
+    return site_url
+
+
+def write_atomic(path, chunks):
+    """Записывает path и path.gz из частей текста через временные файлы и rename"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    gz_fd, gz_tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.gz.')
+    try:
+        with os.fdopen(fd, 'wb') as raw, os.fdopen(gz_fd, 'wb') as gz_raw:
+            # mtime=0: одинаковое содержимое дает одинаковый .gz
+            with gzip.GzipFile(filename='', mode='wb', fileobj=gz_raw, mtime=0) as gz:
+                for chunk in chunks:
+                    data = chunk.encode('utf-8')
+                    raw.write(data)
+                    gz.write(data)
+            raw.flush()
+            os.fsync(raw.fileno())
+            gz_raw.flush()
+            os.fsync(gz_raw.fileno())
+        for tmp in (tmp_path, gz_tmp_path):
+            os.chmod(tmp, 0o644)
+        os.replace(gz_tmp_path, f'{path}.gz')
+        os.replace(tmp_path, path)
+    except BaseException:
+        for tmp in (tmp_path, gz_tmp_path):
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        raise
+
+
+def _read_manifest(root):
+    try:
+        with open(root / MANIFEST_NAME, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _shard_name(section, page):
+    return reverse('seo_management:sitemap_section', kwargs={'section': section, 'page': page}).lstrip('/')
+
+
+def publish_robots(root, site_url):
+    robots = RobotsTxtSettings.objects.order_by('pk').first()
+    sitemap_url = site_url + reverse('seo_management:sitemap')
+    content = robots.render_content(sitemap_url) if robots else DEFAULT_ROBOTS.format(sitemap_url=sitemap_url)
+    write_atomic(root / 'robots.txt', [content])
+
+
+def publish_seo_files(force=False):
+    """
+    Перезаписывает измененные разделы sitemap, индекс и robots.txt.
+    Возвращает список записанных файлов (без .gz).
+    """
+    root = get_files_root()
+    root.mkdir(parents=True, exist_ok=True)
+    site_url = get_site_url()
+    settings = get_sitemap_settings()
+
+    manifest = _read_manifest(root)
+    # Другой адрес сайта меняет все ссылки: перезаписываем все
+    if force or manifest.get('site_url') != site_url:
+        manifest = {}
+    published = manifest.get('versions', {})
+    published_shards = manifest.get('shards', {})
+    shards = {}
+    # Версии читаем до генерации: изменения во время записи попадут в следующий запуск
+    versions = {name: get_section_version(name) for name in SECTION_NAMES + (ROBOTS_SECTION,)}
+
+    def changed(name):
+        return versions[name] is None or published.get(name) != versions[name]
+
+    written = []
+    if changed(ROBOTS_SECTION) or not (root / 'robots.txt').exists():
+        publish_robots(root, site_url)
+        written.append('robots.txt')
+
+    shard_files = set()
+    index_shards = []
+    if settings.is_enabled:
+        for section in get_sections(settings):
+            count = section.count() if section.enabled else 0
+            if not count:
+                continue
+            lastmod = section.lastmod()
+            pages = (count + SHARD_SIZE - 1) // SHARD_SIZE
+            for page in range(1, pages + 1):
+                name = _shard_name(section.name, page)
+                shard_files.add(name)
+                index_shards.append(('/' + name, lastmod))
+                if not changed(section.name) and name in published_shards and (root / name).exists():
+                    shards[name] = published_shards[name]
+                    continue
+                shards[name] = shard_digest(section, settings, page)
+                if shards[name] != published_shards.get(name) or not (root / name).exists():
+                    write_atomic(root / name, render_urlset(shard_urls(section, settings, page), site_url))
+                    written.append(name)
+
+    # Индекс пишем последним: он ссылается только на уже записанные шарды
+    index_name = reverse('seo_management:sitemap').lstrip('/')
+    if settings.is_enabled:
+        if any(changed(name) for name in SECTION_NAMES) or not (root / index_name).exists():
+            write_atomic(root / index_name, [render_index(index_shards, site_url)])
+            written.append(index_name)
+    else:
+        # Sitemap отключен: убираем файлы, запросы уйдут в Django (404)
+        for name in (index_name, f'{index_name}.gz'):
+            if (root / name).exists():
+                os.unlink(root / name)
+
+    # Шарды, которых больше нет (раздел отключен или стал короче)
+    for path in root.glob('sitemap-*.xml'):
+        if path.name not in shard_files:
+            for stale in (path, Path(f'{path}.gz')):
+                if stale.exists():
+                    os.unlink(stale)
+
+    manifest = {
+        'site_url': site_url,
+        'versions': {name: version for name, version in versions.items() if version is not None},
+        'shards': shards,
+    }
+    fd, tmp_path = tempfile.mkstemp(dir=root, prefix=f'{MANIFEST_NAME}.')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, root / MANIFEST_NAME)
+    return written
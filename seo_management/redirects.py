@@ -0,0 +1,106 @@
+# seo_management/redirects.py - Скомпилированная таблица редиректов
+#
+# Активные редиректы (Redirect) загружаются одним запросом на версию и
+# раскладываются в памяти процесса:
+#   - точные совпадения (match_exact) — два словаря: с учетом регистра
+#     и по пути в нижнем регистре (case_sensitive=False);
+#   - совпадения по префиксу — два префиксных дерева (trie) по символам пути.
+# Поиск стоит O(длины пути) при любом числе редиректов.
+#
+# Сопоставление то же, что Redirect.is_match: завершающий "/" не учитывается,
+# префикс сравнивается по символам. Точное совпадение важнее префиксного,
+# из префиксов выбирается самый длинный, из одинаковых путей — самый новый
+# редирект (как первый в ordering = ['-created_at']).
+#
+# Версию увеличивают сигналы (main/signals.py) при сохранении и удалении
+# редиректа. Используется RedirectMiddleware (main/middleware.py).
+
+from collections import namedtuple
+
+from main.cache import VersionedSnapshot
+
+REDIRECTS_CACHE_TIMEOUT = 60 * 60 * 24
+
+RedirectTarget = namedtuple('RedirectTarget', 'pk new_path permanent')
+
+# Ключ листа в узле trie: ключи-символы всегда длины 1
+_END = ''
+
+
+def normalize_path(path):
+    return path.rstrip('/')
+
+
+class RedirectTable:
+    """Неизменяемая таблица редиректов (строится целиком, заменяется новой версией)"""
+
+    def __init__(self, rows):
+        self.exact = {}
+        self.exact_folded = {}
+        self.prefix = {}
+        self.prefix_folded = {}
+        self.size = 0
+
+        # rows идут от новых к старым: setdefault оставляет самый новый
+        for old_path, new_path, redirect_type, match_exact, case_sensitive, pk in rows:
+            key = normalize_path(old_path)
+            if not case_sensitive:
+                key = key.lower()
+            target = RedirectTarget(pk, new_path, redirect_type == '301')
+            if match_exact:
+                (self.exact if case_sensitive else self.exact_folded).setdefault(key, target)
+            else:
+                self._insert(self.prefix if case_sensitive else self.prefix_folded, key, target)
+            self.size += 1
+
+    @staticmethod
+    def _insert(root, key, target):
+        node = root
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault(_END, target)
+
+    @staticmethod
+    def _longest_prefix(root, path):
+        """(длина префикса, редирект) для самого длинного совпавшего префикса"""
+        best = (0, root.get(_END)) if _END in root else (-1, None)
+        node = root
+        for length, char in enumerate(path, 1):
+            node = node.get(char)
+            if node is None:
+                break
+            if _END in node:
+                best = (length, node[_END])
+        return best
+
+    def match(self, path):
+        """RedirectTarget для пути запроса или None"""
+        path = normalize_path(path)
+        folded = path.lower()
+
+        target = self.exact.get(path) or self.exact_folded.get(folded)
+        if target is not None:
+            return target
+
+        if not (self.prefix or self.prefix_folded):
+            return None
+        sensitive = self._longest_prefix(self.prefix, path)
+        insensitive = self._longest_prefix(self.prefix_folded, folded)
+        # При равной длине побеждает редирект с учетом регистра
+        return max(sensitive, insensitive, key=lambda item: item[0])[1]
+
+
+def build_redirect_table():
+    """Загружает активные редиректы из БД (один запрос)"""
+    from .models import Redirect
+
+    rows = Redirect.objects.filter(status='active').order_by('-created_at', '-pk').values_list(
+        'old_path', 'new_path', 'redirect_type', 'match_exact', 'case_sensitive', 'pk'
+    )
+    return RedirectTable(rows)
+
+
+# Таблица в памяти процесса: один запрос на версию (версию увеличивают сигналы)
+_table = VersionedSnapshot('redirects', build_redirect_table, REDIRECTS_CACHE_TIMEOUT)
+get_redirect_table = _table.get
+invalidate_redirects = _table.invalidate
@@ -0,0 +1,477 @@
+# seo_management/sitemaps.py - Генерация sitemap.xml по разделам
+#
+# /sitemap.xml отдает <sitemapindex> со ссылками на шарды:
+#   /sitemap-<раздел>-<номер>.xml  (не больше 50 000 URL в шарде)
+#
+# Шард читает из БД только свой срез раздела, формируется потоково и
+# кэшируется целиком после первой генерации. У каждого раздела своя версия
+# в общем кэше: сигналы (main/signals.py) увеличивают ее при сохранении
+# моделей раздела, от версии зависят ключ кэша и ETag.
+
+import hashlib
+from collections import namedtuple
+from itertools import islice
+
+from django.db.models import Max
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import escape
+
+from main.cache import bump_version, get_version
+from main.models import (
+    City, Service, ServiceCategory, PortfolioCategory, PortfolioItem, RegionalPostAdaptation,
+    FAQCategory, FAQItem, GlossaryCategory, GlossaryTerm, HomePage,
+)
+from blog.models import Post, Category
+from pages.models import SimplePage
+from .models import SitemapSettings
+
+# Ограничение протокола sitemaps.org на один файл
+SHARD_SIZE = 50000
+SHARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+SitemapUrl = namedtuple('SitemapUrl', 'location lastmod changefreq priority')
+SitemapSection = namedtuple('SitemapSection', 'name enabled count lastmod rows url')
+
+
+def get_sitemap_settings():
+    """Получает настройки sitemap или создает по умолчанию"""
+    settings, created = SitemapSettings.objects.get_or_create(
+        pk=1,
+        defaults={
+            'is_enabled': True,
+            'changefreq': 'weekly',
+            'priority': 0.5,
+            'include_blog_posts': True,
+            'include_services': True,
+            'include_cities': True,
+            'include_pages': True,
+        }
+    )
+    return settings
+
+
+def _max(*values):
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+def _last_updated(queryset, field='updated_at'):
+    return queryset.aggregate(value=Max(field))['value']
+
+
+# --- Разделы ---
+# Для каждого раздела: число URL, дата последнего изменения и строки по
+# номерам [start, stop) — шард читает из БД только свой срез (OFFSET/LIMIT,
+# для матрицы город × объект — свой диапазон городов), без обхода раздела
+# с начала. Строки — значения из БД, url(строка) строит SitemapUrl.
+
+def _published_posts():
+    return Post.objects.filter(is_published=True)
+
+
+def _active_cities():
+    return City.objects.filter(is_active=True)
+
+
+def _published_services():
+    return Service.objects.filter(is_published=True)
+
+
+def _post_location(slug, category_slug):
+    if category_slug:
+        return reverse('blog:post_detail', kwargs={'category_slug': category_slug, 'post_slug': slug})
+    return reverse('blog:post_detail_legacy', kwargs={'slug': slug})
+
+
+def _static_urls(settings):
+    home = _last_updated(HomePage.objects.filter(is_active=True))
+    blog = _max(_last_updated(_published_posts()), _last_updated(Category.objects.all()))
+    services = _max(_last_updated(_published_services()), _last_updated(ServiceCategory.objects.all()))
+    yield SitemapUrl('/', _max(home, blog, services), 'daily', 1.0)
+    yield SitemapUrl(reverse('blog:post_list'), blog, 'daily', 0.8)
+    yield SitemapUrl(reverse('services:service_list'), services, 'weekly', 0.9)
+    yield SitemapUrl(reverse('main:city_list'), _last_updated(_active_cities()), 'weekly', 0.7)
+    yield SitemapUrl(reverse('main:portfolio_list'), _last_updated(PortfolioItem.objects.all()), 'weekly', 0.7)
+    yield SitemapUrl(reverse('main:faq_list'), _last_updated(FAQItem.objects.all()), 'weekly', 0.6)
+    yield SitemapUrl(reverse('main:glossary_list'), _last_updated(GlossaryTerm.objects.all()), 'weekly', 0.6)
+    # Дополнительные URL из настроек
+    for url in settings.get_additional_urls_list():
+        yield SitemapUrl(url, settings.last_updated, settings.changefreq, settings.priority)
+
+
+def _slice_parts(parts, start, stop):
+    """
+    Строки [start, stop) раздела, составленного из querysets values_list
+    (идут подряд): (номер queryset, строка). Каждый queryset читается срезом.
+    """
+    for number, queryset in enumerate(parts):
+        if start >= stop:
+            return
+        count = queryset.count()
+        if start < count:
+            for row in queryset[start:min(stop, count)].iterator():
+                yield number, row
+        start = max(start - count, 0)
+        stop -= count
+
+
+def _parts_section(name, enabled, parts, lastmod, url):
+    """Раздел из querysets values_list; url((номер queryset, строка)) -> SitemapUrl"""
+    return SitemapSection(
+        name, enabled,
+        lambda: sum(queryset.count() for queryset in parts),
+        lastmod,
+        lambda settings, start, stop: _slice_parts(parts, start, stop),
+        url,
+    )
+
+
+def _blog_parts():
+    return [
+        Category.objects.filter(is_active=True).order_by('pk').values_list('slug', 'updated_at'),
+        _published_posts().order_by('pk').values_list('slug', 'category__slug', 'updated_at'),
+    ]
+
+
+def _blog_url(row):
+    number, values = row
+    if number == 0:
+        slug, updated_at = values
+        return SitemapUrl(reverse('blog:category_posts', kwargs={'slug': slug}), updated_at, 'weekly', 0.7)
+    slug, category_slug, updated_at = values
+    return SitemapUrl(_post_location(slug, category_slug), updated_at, 'monthly', 0.6)
+
+
+def _services_parts():
+    return [
+        ServiceCategory.objects.order_by('pk').values_list('slug', 'updated_at'),
+        _published_services().order_by('pk').values_list('slug', 'category__slug', 'updated_at'),
+    ]
+
+
+def _services_url(row):
+    number, values = row
+    if number == 0:
+        slug, updated_at = values
+        return SitemapUrl(reverse('services:service_category', kwargs={'slug': slug}), updated_at, 'weekly', 0.8)
+    slug, category_slug, updated_at = values
+    location = reverse('services:service_detail', kwargs={'category_slug': category_slug, 'service_slug': slug})
+    return SitemapUrl(location, updated_at, 'monthly', 0.7)
+
+
+def _cities_url(row):
+    slug, updated_at = row[1]
+    return SitemapUrl(reverse('main:city_detail', kwargs={'slug': slug}), updated_at, 'monthly', 0.6)
+
+
+def _city_product(inner, start, stop, extra_lastmod=None):
+    """
+    Строки (город, slug, lastmod) для [start, stop) матрицы город × объект.
+    inner — список (slug, updated_at); номер строки = номер города * len(inner) + номер объекта,
+    поэтому из БД читаются только города этого диапазона.
+    extra_lastmod(city_pks) -> {(pk города, slug): дата} — дополнительные даты изменения.
+    """
+    size = len(inner)
+    if not size or start >= stop:
+        return
+    first_city = start // size
+    cities = list(
+        _active_cities().order_by('pk').values_list('pk', 'slug', 'updated_at')[first_city:(stop + size - 1) // size]
+    )
+    extra = extra_lastmod([pk for pk, _, _ in cities]) if extra_lastmod else {}
+    position = first_city * size
+    for city_pk, city_slug, city_updated in cities:
+        for slug, updated_at in inner[max(start - position, 0):min(stop - position, size)]:
+            yield city_slug, slug, _max(city_updated, updated_at, extra.get((city_pk, slug)))
+        position += size
+
+
+def _city_product_url(view_name, inner_kwarg):
+    def url(row):
+        city_slug, slug, lastmod = row
+        location = reverse(view_name, kwargs={'city_slug': city_slug, inner_kwarg: slug})
+        return SitemapUrl(location, lastmod, 'monthly', 0.5)
+    return url
+
+
+def _city_services_rows(settings, start, stop):
+    services = list(_published_services().order_by('pk').values_list('slug', 'updated_at'))
+    return _city_product(services, start, stop)
+
+
+def _city_categories_rows(settings, start, stop):
+    categories = list(ServiceCategory.objects.order_by('pk').values_list('slug', 'updated_at'))
+    return _city_product(categories, start, stop)
+
+
+def _adaptations_lastmod(city_pks):
+    # Региональные адаптации меняют содержимое страницы статьи в городе
+    return {
+        (city_pk, post_slug): updated_at
+        for city_pk, post_slug, updated_at in RegionalPostAdaptation.objects.filter(
+            is_active=True, city_id__in=city_pks
+        ).values_list('city_id', 'post__slug', 'updated_at').iterator()
+    }
+
+
+def _city_posts_rows(settings, start, stop):
+    posts = list(_published_posts().order_by('pk').values_list('slug', 'updated_at'))
+    return _city_product(posts, start, stop, _adaptations_lastmod)
+
+
+def _portfolio_parts():
+    return [
+        PortfolioCategory.objects.filter(is_active=True).order_by('pk').values_list('slug', 'updated_at'),
+        PortfolioItem.objects.filter(is_published=True).order_by('pk').values_list(
+            'slug', 'category__slug', 'updated_at'
+        ),
+    ]
+
+
+def _portfolio_url(row):
+    number, values = row
+    if number == 0:
+        slug, updated_at = values
+        return SitemapUrl(reverse('main:portfolio_category', kwargs={'slug': slug}), updated_at, 'weekly', 0.6)
+    slug, category_slug, updated_at = values
+    if category_slug:
+        location = reverse('main:portfolio_detail', kwargs={'category_slug': category_slug, 'project_slug': slug})
+    else:
+        location = reverse('main:portfolio_detail_legacy', kwargs={'slug': slug})
+    return SitemapUrl(location, updated_at, 'monthly', 0.6)
+
+
+def _faq_parts():
+    return [
+        FAQCategory.objects.filter(is_active=True).order_by('pk').values_list('slug', 'updated_at'),
+        FAQItem.objects.filter(is_published=True, category__is_active=True).order_by('pk').values_list(
+            'slug', 'category__slug', 'updated_at'
+        ),
+    ]
+
+
+def _faq_url(row):
+    number, values = row
+    if number == 0:
+        slug, updated_at = values
+        return SitemapUrl(reverse('main:faq_category', kwargs={'slug': slug}), updated_at, 'weekly', 0.5)
+    slug, category_slug, updated_at = values
+    location = reverse('main:faq_item', kwargs={'category_slug': category_slug, 'item_slug': slug})
+    return SitemapUrl(location, updated_at, 'monthly', 0.5)
+
+
+def _glossary_parts():
+    return [
+        GlossaryCategory.objects.filter(is_active=True).order_by('pk').values_list('slug', 'updated_at'),
+        GlossaryTerm.objects.filter(is_published=True, category__is_active=True).order_by('pk').values_list(
+            'slug', 'category__slug', 'updated_at'
+        ),
+    ]
+
+
+def _glossary_url(row):
+    number, values = row
+    if number == 0:
+        slug, updated_at = values
+        return SitemapUrl(reverse('main:glossary_category', kwargs={'slug': slug}), updated_at, 'weekly', 0.5)
+    slug, category_slug, updated_at = values
+    location = reverse('main:glossary_term', kwargs={'category_slug': category_slug, 'term_slug': slug})
+    return SitemapUrl(location, updated_at, 'monthly', 0.5)
+
+
+def _pages_url(row):
+    slug, updated_at = row[1]
+    return SitemapUrl(reverse('pages:detail', kwargs={'slug': slug}), updated_at, 'monthly', 0.5)
+
+
+def get_sections(settings):
+    """Разделы sitemap с учетом настроек"""
+    active_cities = _active_cities()
+    published_posts = _published_posts()
+    published_services = _published_services()
+    cities = settings.include_cities
+    return [
+        SitemapSection(
+            'static', True,
+            lambda: 7 + len(settings.get_additional_urls_list()),
+            lambda: _max(
+                settings.last_updated,
+                _last_updated(HomePage.objects.filter(is_active=True)),
+                _last_updated(published_posts),
+                _last_updated(published_services),
+            ),
+            # Несколько URL: срез генератора
+            lambda settings, start, stop: islice(_static_urls(settings), start, stop),
+            lambda row: row,
+        ),
+        _parts_section(
+            'blog', settings.include_blog_posts, _blog_parts(),
+            lambda: _max(_last_updated(Category.objects.all()), _last_updated(published_posts)),
+            _blog_url,
+        ),
+        _parts_section(
+            'services', settings.include_services, _services_parts(),
+            lambda: _max(_last_updated(ServiceCategory.objects.all()), _last_updated(published_services)),
+            _services_url,
+        ),
+        _parts_section(
+            'cities', cities, [active_cities.order_by('pk').values_list('slug', 'updated_at')],
+            lambda: _last_updated(active_cities),
+            _cities_url,
+        ),
+        SitemapSection(
+            'city-services', cities and settings.include_services,
+            lambda: active_cities.count() * published_services.count(),
+            lambda: _max(_last_updated(active_cities), _last_updated(published_services)),
+            _city_services_rows,
+            _city_product_url('main:city_service_detail', 'service_slug'),
+        ),
+        SitemapSection(
+            'city-categories', cities and settings.include_services,
+            lambda: active_cities.count() * ServiceCategory.objects.count(),
+            lambda: _max(_last_updated(active_cities), _last_updated(ServiceCategory.objects.all())),
+            _city_categories_rows,
+            _city_product_url('main:city_category_detail', 'category_slug'),
+        ),
+        SitemapSection(
+            'city-posts', cities and settings.include_blog_posts,
+            lambda: active_cities.count() * published_posts.count(),
+            lambda: _max(
+                _last_updated(active_cities),
+                _last_updated(published_posts),
+                _last_updated(RegionalPostAdaptation.objects.all()),
+            ),
+            _city_posts_rows,
+            _city_product_url('main:city_post_detail', 'post_slug'),
+        ),
+        _parts_section(
+            'portfolio', True, _portfolio_parts(),
+            lambda: _max(_last_updated(PortfolioCategory.objects.all()), _last_updated(PortfolioItem.objects.all())),
+            _portfolio_url,
+        ),
+        _parts_section(
+            'faq', True, _faq_parts(),
+            lambda: _max(_last_updated(FAQCategory.objects.all()), _last_updated(FAQItem.objects.all())),
+            _faq_url,
+        ),
+        _parts_section(
+            'glossary', True, _glossary_parts(),
+            lambda: _max(_last_updated(GlossaryCategory.objects.all()), _last_updated(GlossaryTerm.objects.all())),
+            _glossary_url,
+        ),
+        _parts_section(
+            'pages', settings.include_pages,
+            [SimplePage.objects.filter(is_published=True).order_by('pk').values_list('slug', 'updated_at')],
+            lambda: _last_updated(SimplePage.objects.filter(is_published=True)),
+            _pages_url,
+        ),
+    ]
+
+
+SECTION_NAMES = ('static', 'blog', 'services', 'cities', 'city-services', 'city-categories',
+                 'city-posts', 'portfolio', 'faq', 'glossary', 'pages')
+
+
+# --- Версии разделов (инвалидация кэша шардов) ---
+
+def _version_key(section):
+    return f'sitemap:version:{section}'
+
+
+def get_section_version(section):
+    return get_version(_version_key(section))
+
+
+def invalidate_sections(*sections):
+    """Сбрасывает кэш шардов и индекса для разделов"""
+    for section in sections:
+        bump_version(_version_key(section))
+
+
+def make_etag(*parts):
+    return '"%s"' % hashlib.md5('|'.join(str(part) for part in parts).encode('utf-8'),
+                               usedforsecurity=False).hexdigest()
+
+
+# --- XML ---
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+
+def _format_lastmod(value):
+    return (value or timezone.now()).strftime('%Y-%m-%d')
+
+
+def render_urlset(urls, base_url):
+    """Потоково формирует <urlset> — по одной строке на URL"""
+    yield XML_HEADER + '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for url in urls:
+        yield (
+            '  <url>\n'
+            f'    <loc>{escape(base_url + url.location)}</loc>\n'
+            f'    <lastmod>{_format_lastmod(url.lastmod)}</lastmod>\n'
+            f'    <changefreq>{url.changefreq}</changefreq>\n'
+            f'    <priority>{url.priority}</priority>\n'
+            '  </url>\n'
+        )
+    yield '</urlset>\n'
+
+
+def render_index(shards, base_url):
+    """<sitemapindex> по списку (location, lastmod)"""
+    parts = [XML_HEADER, '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n']
+    for location, lastmod in shards:
+        parts.append(
+            '  <sitemap>\n'
+            f'    <loc>{escape(base_url + location)}</loc>\n'
+            f'    <lastmod>{_format_lastmod(lastmod)}</lastmod>\n'
+            '  </sitemap>\n'
+        )
+    parts.append('</sitemapindex>\n')
+    return ''.join(parts)
+
+
+def get_index_shards(settings):
+    """Список шардов [(location, lastmod)] для <sitemapindex>"""
+    shards = []
+    for section in get_sections(settings):
+        if not section.enabled:
+            continue
+        count = section.count()
+        if not count:
+            continue
+        lastmod = section.lastmod()
+        pages = (count + SHARD_SIZE - 1) // SHARD_SIZE
+        for page in range(1, pages + 1):
+            location = reverse('seo_management:sitemap_section', kwargs={'section': section.name, 'page': page})
+            shards.append((location, lastmod))
+    return shards
+
+
+def get_section(settings, name):
+    for section in get_sections(settings):
+        if section.name == name:
+            return section
+    return None
+
+
+def _shard_rows(section, settings, page):
+    start = (page - 1) * SHARD_SIZE
+    return section.rows(settings, start, start + SHARD_SIZE)
+
+
+def shard_urls(section, settings, page):
+    """URL шарда с номером page (с 1): читается только срез раздела"""
+    return map(section.url, _shard_rows(section, settings, page))
+
+
+def shard_digest(section, settings, page):
+    """
+    Отпечаток строк шарда (значения из БД, без построения URL и XML):
+    если он не изменился, не изменился и файл шарда
+    """
+    digest = hashlib.md5(usedforsecurity=False)
+    for row in _shard_rows(section, settings, page):
+        digest.update(repr(row).encode('utf-8'))
+    return digest.hexdigest()
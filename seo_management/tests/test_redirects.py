@@ -0,0 +1,89 @@
+# seo_management/tests/test_redirects.py - Скомпилированная таблица редиректов
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from main.bench import BENCH_CACHES, clear_caches
+from seo_management.models import Redirect
+from seo_management.redirects import RedirectTable
+
+
+def _row(pk, old_path, new_path, exact=True, case_sensitive=False, redirect_type='301'):
+    return old_path, new_path, redirect_type, exact, case_sensitive, pk
+
+
+class RedirectTableTest(SimpleTestCase):
+
+    def match(self, table, path):
+        target = table.match(path)
+        return target.new_path if target else None
+
+    def test_exact(self):
+        table = RedirectTable([
+            _row(2, '/old/', '/new/'),
+            _row(1, '/Case/', '/case-sensitive/', case_sensitive=True),
+        ])
+        self.assertEqual(self.match(table, '/old/'), '/new/')
+        self.assertEqual(self.match(table, '/old'), '/new/')
+        self.assertEqual(self.match(table, '/OLD/'), '/new/')
+        self.assertEqual(self.match(table, '/Case/'), '/case-sensitive/')
+        self.assertIsNone(self.match(table, '/case/'))
+        self.assertIsNone(self.match(table, '/old/page/'))
+        self.assertEqual(table.size, 2)
+
+    def test_prefix(self):
+        table = RedirectTable([
+            _row(3, '/blog/', '/articles/', exact=False),
+            _row(2, '/blog/seo/', '/articles/seo/', exact=False),
+            _row(1, '/blog/seo/audit/', '/audit/'),
+        ])
+        # Самый длинный префикс
+        self.assertEqual(self.match(table, '/blog/seo/links/'), '/articles/seo/')
+        self.assertEqual(self.match(table, '/blog/news/'), '/articles/')
+        # Точное совпадение важнее префиксного
+        self.assertEqual(self.match(table, '/blog/seo/audit/'), '/audit/')
+        self.assertIsNone(self.match(table, '/services/'))
+
+    def test_prefix_case(self):
+        table = RedirectTable([
+            _row(2, '/Docs/', '/sensitive/', exact=False, case_sensitive=True),
+            _row(1, '/docs/', '/folded/', exact=False),
+        ])
+        # При равной длине побеждает редирект с учетом регистра
+        self.assertEqual(self.match(table, '/Docs/page/'), '/sensitive/')
+        self.assertEqual(self.match(table, '/DOCS/page/'), '/folded/')
+
+    def test_newest_wins(self):
+        # rows идут от новых к старым
+        table = RedirectTable([
+            _row(2, '/old/', '/newest/', redirect_type='302'),
+            _row(1, '/old/', '/oldest/'),
+        ])
+        target = table.match('/old/')
+        self.assertEqual((target.pk, target.new_path, target.permanent), (2, '/newest/', False))
+
+    def test_empty(self):
+        self.assertIsNone(RedirectTable([]).match('/any/'))
+
+
+@override_settings(CACHES=BENCH_CACHES, ALLOWED_HOSTS=['testserver'], SECURE_SSL_REDIRECT=False)
+class RedirectMiddlewareTest(TestCase):
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+
+    def test_redirect(self):
+        redirect = Redirect.objects.create(old_path='/old-page/', new_path='/contacts/')
+        # Таблица строится одним запросом, дальше поиск без БД
+        self.client.get('/old-page/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/old-page/')
+        self.assertRedirects(response, 'http://testserver/contacts/', status_code=301, fetch_redirect_response=False)
+
+        # Сигналы сбрасывают таблицу при изменении редиректа
+        redirect.redirect_type = '302'
+        redirect.save()
+        self.assertEqual(self.client.get('/old-page/').status_code, 302)
+        redirect.status = 'inactive'
+        redirect.save()
+        self.assertEqual(self.client.get('/old-page/').status_code, 404)
@@ -0,0 +1,86 @@
+# seo_management/tests/test_sitemaps.py - Шарды sitemap.xml
+
+import re
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from blog.models import Category, Post
+from main.bench import BENCH_CACHES, clear_caches
+from main.models import City, Service, ServiceCategory
+
+LOC_RE = re.compile(r'<loc>https?://testserver(/[^<]*)</loc>')
+
+
+def locations(response):
+    content = b''.join(response.streaming_content) if response.streaming else response.content
+    return LOC_RE.findall(content.decode('utf-8'))
+
+
+@override_settings(CACHES=BENCH_CACHES, ALLOWED_HOSTS=['testserver'], SECURE_SSL_REDIRECT=False)
+@patch('seo_management.views.SHARD_SIZE', 4)
+@patch('seo_management.sitemaps.SHARD_SIZE', 4)
+class SitemapShardsTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Рубрика', slug='category')
+        cls.posts = [
+            Post.objects.create(category=cls.category, title=f'Статья {i}', slug=f'post-{i}', content='<p>Текст</p>')
+            for i in range(5)
+        ]
+        Post.objects.create(category=cls.category, title='Черновик', slug='draft', content='', is_published=False)
+
+        service_category = ServiceCategory.objects.create(title='Услуги', slug='services')
+        cls.services = [
+            Service.objects.create(category=service_category, title=f'Услуга {i}', slug=f'service-{i}')
+            for i in range(2)
+        ]
+        cls.cities = [City.objects.create(name=name, slug=slug) for name, slug in (
+            ('Москва', 'moscow'), ('Пермь', 'perm'), ('Казань', 'kazan'),
+        )]
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+
+    def test_index(self):
+        shards = locations(self.client.get('/sitemap.xml'))
+        # Рубрика и 5 статей — два шарда по 4 URL
+        self.assertIn('/sitemap-blog-1.xml', shards)
+        self.assertIn('/sitemap-blog-2.xml', shards)
+        self.assertNotIn('/sitemap-blog-3.xml', shards)
+        # 3 города × 2 услуги
+        self.assertIn('/sitemap-city-services-2.xml', shards)
+
+    def test_shards(self):
+        first = locations(self.client.get('/sitemap-blog-1.xml'))
+        second = locations(self.client.get('/sitemap-blog-2.xml'))
+        self.assertEqual(len(first), 4)
+        self.assertEqual(first + second, [self.category.get_absolute_url()] + [
+            post.get_absolute_url() for post in self.posts
+        ])
+        self.assertEqual(self.client.get('/sitemap-blog-3.xml').status_code, 404)
+
+    def test_city_product_shards(self):
+        urls = locations(self.client.get('/sitemap-city-services-1.xml'))
+        urls += locations(self.client.get('/sitemap-city-services-2.xml'))
+        self.assertEqual(urls, [
+            f'/cities/{city.slug}/services/{service.slug}/' for city in self.cities for service in self.services
+        ])
+
+    def test_cached_shard(self):
+        response = self.client.get('/sitemap-blog-2.xml')
+        etag = response['ETag']
+        # Шард попадает в кэш, когда отдан целиком
+        urls = locations(response)
+        cached = self.client.get('/sitemap-blog-2.xml')
+        self.assertFalse(cached.streaming)
+        self.assertEqual(locations(cached), urls)
+        self.assertEqual(self.client.get('/sitemap-blog-2.xml', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # Сохранение статьи меняет версию раздела
+        Post.objects.create(category=self.category, title='Новая', slug='new-post', content='<p>Текст</p>')
+        response = self.client.get('/sitemap-blog-2.xml', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(locations(response)[-1], Post.objects.get(slug='new-post').get_absolute_url())
@@ -5,5 +5,6 @@ app_name = 'seo_management'
 
 urlpatterns = [
     path('sitemap.xml', views.sitemap_view, name='sitemap'),
+    path('sitemap-<slug:section>-<int:page>.xml', views.sitemap_section_view, name='sitemap_section'),
     path('robots.txt', views.robots_txt_view, name='robots_txt'),
 ]
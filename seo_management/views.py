@@ -1,153 +1,93 @@
-from django.shortcuts import render
-from django.http import HttpResponse
-from django.contrib.sitemaps import Sitemap
-from django.urls import reverse
-from django.utils import timezone
-from .models import SitemapSettings, RobotsTxtSettings
-from main.models import Service, City
-from blog.models import Post
-from blog.models import Category
-from pages.models import SimplePage
-
-
-class DynamicSitemap(Sitemap):
-    """Динамический sitemap для всех страниц сайта"""
-    
-    def __init__(self):
-        self.settings = self.get_sitemap_settings()
-    
-    def get_sitemap_settings(self):
-        """Получает настройки sitemap или создает по умолчанию"""
-        settings, created = SitemapSettings.objects.get_or_create(
-            pk=1,
-            defaults={
-                'is_enabled': True,
-                'changefreq': 'weekly',
-                'priority': 0.5,
-                'include_blog_posts': True,
-                'include_services': True,
-                'include_cities': True,
-                'include_pages': True,
-            }
-        )
-        return settings
-    
-    def items(self):
-        """Возвращает все элементы для sitemap"""
-        if not self.settings.is_enabled:
-            return []
-        
-        items = []
-        
-        # Статические страницы
-        items.extend([
-            {'url': '/', 'lastmod': timezone.now(), 'changefreq': 'daily', 'priority': 1.0},
-            {'url': '/blog/', 'lastmod': timezone.now(), 'changefreq': 'daily', 'priority': 0.8},
-            {'url': '/services/', 'lastmod': timezone.now(), 'changefreq': 'weekly', 'priority': 0.9},
-        ])
-        
-        # Статьи блога
-        if self.settings.include_blog_posts:
-            for post in Post.objects.filter(is_published=True):
-                items.append({
-                    'url': post.get_absolute_url(),
-                    'lastmod': post.published_date,
-                    'changefreq': 'monthly',
-                    'priority': 0.6
-                })
-        
-        # Категории блога
-        if self.settings.include_blog_posts:
-            for category in Category.objects.filter(is_active=True):
-                items.append({
-                    'url': category.get_absolute_url(),
-                    'lastmod': timezone.now(),
-                    'changefreq': 'weekly',
-                    'priority': 0.7
-                })
-        
-        # Услуги
-        if self.settings.include_services:
-            for service in Service.objects.filter(is_published=True):
-                items.append({
-                    'url': service.get_absolute_url(),
-                    'lastmod': timezone.now(),
-                    'changefreq': 'monthly',
-                    'priority': 0.7
-                })
-        
-        # Города
-        if self.settings.include_cities:
-            for city in City.objects.filter(is_active=True):
-                items.append({
-                    'url': city.get_absolute_url(),
-                    'lastmod': timezone.now(),
-                    'changefreq': 'monthly',
-                    'priority': 0.6
-                })
-        
-        # Простые страницы
-        if self.settings.include_pages:
-            for page in SimplePage.objects.filter(is_published=True):
-                items.append({
-                    'url': page.get_absolute_url(),
-                    'lastmod': timezone.now(),
-                    'changefreq': 'monthly',
-                    'priority': 0.5
-                })
-        
-        # Дополнительные URL
-        for url in self.settings.get_additional_urls_list():
-            items.append({
-                'url': url,
-                'lastmod': timezone.now(),
-                'changefreq': self.settings.changefreq,
-                'priority': self.settings.priority
-            })
-        
-        return items
-    
-    def location(self, item):
-        """Возвращает URL элемента"""
-        return item['url']
-    
-    def lastmod(self, item):
-        """Возвращает дату последнего изменения"""
-        return item['lastmod']
-    
-    def changefreq(self, item):
-        """Возвращает частоту изменения"""
-        return item['changefreq']
-    
-    def priority(self, item):
-        """Возвращает приоритет"""
-        return item['priority']
+import zlib
+
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from .models import RobotsTxtSettings
+from .sitemaps import (
+    SECTION_NAMES, SHARD_CACHE_TIMEOUT, SHARD_SIZE, get_index_shards, get_section, get_section_version,
+    get_sitemap_settings, make_etag, render_index, render_urlset, shard_urls,
+)
+from main.cache import shared_cache
+
+
+def _base_url(request):
+    return f'{request.scheme}://{request.get_host()}'
+
+
+def _sitemap_response(content, etag):
+    response = HttpResponse(content, content_type='application/xml')
+    if etag:
+        response['ETag'] = etag
+    return response
 
 
 def sitemap_view(request):
-    """View для генерации sitemap.xml"""
-    sitemap = DynamicSitemap()
-    
+    """Индекс sitemap.xml со ссылками на шарды разделов"""
+    settings = get_sitemap_settings()
+
     # Проверяем, включен ли sitemap
-    if not sitemap.settings.is_enabled:
+    if not settings.is_enabled:
         return HttpResponse("Sitemap отключен", status=404)
-    
-    # Генерируем XML
-    xml_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    xml_content += '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
-    
-    for item in sitemap.items():
-        xml_content += '  <url>\n'
-        xml_content += f'    <loc>{request.build_absolute_uri(item["url"])}</loc>\n'
-        xml_content += f'    <lastmod>{item["lastmod"].strftime("%Y-%m-%d")}</lastmod>\n'
-        xml_content += f'    <changefreq>{item["changefreq"]}</changefreq>\n'
-        xml_content += f'    <priority>{item["priority"]}</priority>\n'
-        xml_content += '  </url>\n'
-    
-    xml_content += '</urlset>'
-    
-    response = HttpResponse(xml_content, content_type='application/xml')
-    response['Content-Disposition'] = 'attachment; filename="sitemap.xml"'
+
+    base_url = _base_url(request)
+    versions = [get_section_version(name) for name in SECTION_NAMES]
+    etag = None if None in versions else make_etag(base_url, *versions)
+    if etag:
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+    cache = shared_cache()
+    key = f'sitemap:index:{etag}'
+    content = cache.get(key) if etag else None
+    if content is None:
+        content = render_index(get_index_shards(settings), base_url)
+        if etag:
+            cache.set(key, content, SHARD_CACHE_TIMEOUT)
+    return _sitemap_response(content, etag)
+
+
+def _cache_shard(chunks, key):
+    """Отдает части шарда и после последней кладет шард целиком в кэш"""
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    content = ''.join(parts).encode('utf-8')
+    shared_cache().set(key, zlib.compress(content), SHARD_CACHE_TIMEOUT)
+
+
+def sitemap_section_view(request, section, page):
+    """Шард sitemap: до 50 000 URL одного раздела, формируется потоково"""
+    settings = get_sitemap_settings()
+    if not settings.is_enabled:
+        return HttpResponse("Sitemap отключен", status=404)
+
+    sitemap_section = get_section(settings, section)
+    if sitemap_section is None or not sitemap_section.enabled or page < 1:
+        raise Http404("Раздел sitemap не найден")
+
+    base_url = _base_url(request)
+    version = get_section_version(section)
+    etag = None if version is None else make_etag(base_url, section, page, version)
+    if etag:
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        cached = shared_cache().get(f'sitemap:shard:{etag}')
+        if cached is not None:
+            return _sitemap_response(zlib.decompress(cached), etag)
+
+    if page > 1 and (page - 1) * SHARD_SIZE >= sitemap_section.count():
+        raise Http404("Страница sitemap не найдена")
+
+    chunks = render_urlset(shard_urls(sitemap_section, settings, page), base_url)
+    if etag:
+        chunks = _cache_shard(chunks, f'sitemap:shard:{etag}')
+    response = StreamingHttpResponse(chunks, content_type='application/xml')
+    if etag:
+        response['ETag'] = etag
     return response
 
 
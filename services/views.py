@@ -1,11 +1,19 @@
 from django.shortcuts import render, get_object_or_404
 from django.core.paginator import Paginator
-from django.db.models import Q
 # from django.views.decorators.cache import cache_page  # ОТКЛЮЧЕНО
 from main.models import ServiceCategory, Service
+from main.http_cache import public_page, last_updated
+from main.instrumentation import query_budget
+from main.search import search_filter
 
 
-# @cache_page(300)  # КЭШИРОВАНИЕ ОТКЛЮЧЕНО
+def services_last_modified(request, *args, **kwargs):
+    """Дата изменения страниц услуг (для ETag / Last-Modified)"""
+    return last_updated(ServiceCategory, Service)
+
+
+@public_page(last_modified=services_last_modified, query=('q', 'category', 'page'))
+@query_budget(7)
 def service_list(request):
     categories = ServiceCategory.objects.all().order_by('order')
 
@@ -24,9 +32,7 @@ def service_list(request):
             current_category = None
 
     if query:
-        filtered_services = filtered_services.filter(
-            Q(title__icontains=query) | Q(short_description__icontains=query)
-        )
+        filtered_services = filtered_services.filter(pk__in=search_filter(query, 'main.service'))
 
     # Пагинация, как в блоге
     paginator = Paginator(filtered_services, 9)
@@ -50,6 +56,8 @@ def service_list(request):
     })
 
 
+@public_page(last_modified=services_last_modified, query=('page',))
+@query_budget(7)
 def service_category_detail(request, slug):
 	category = get_object_or_404(ServiceCategory, slug=slug)
 	services_in_category = Service.objects.filter(category=category, is_published=True).order_by('order')
@@ -70,6 +78,8 @@ def service_category_detail(request, slug):
 	})
 
 
+@public_page(last_modified=services_last_modified)
+@query_budget(12)
 def service_detail(request, category_slug, service_slug):
 	# Получаем категорию для проверки
 	category = get_object_or_404(ServiceCategory, slug=category_slug)